@@ -0,0 +1,90 @@
+"""Step 5 chart backends: matplotlib PNGs vs inline SVG.
+
+For a small and a large infographic it reports, per backend:
+
+* cold — seconds to import the backend and draw the first set of charts
+  in a fresh interpreter (what a one-shot CLI run pays);
+* warm ms — mean time to draw all three charts once imported;
+* chart KB — what the charts add to ``infographic.html`` (raw and gzipped).
+
+Usage::
+
+    python benchmarks/bench_charts.py [--repeat 10]
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from local_notebooklm.steps.step5 import render_infographic_html  # noqa: E402
+from local_notebooklm.steps.step5_charts import generate_all_charts  # noqa: E402
+
+
+def infographic(topics: int, speakers: int, flow: int):
+    return {
+        "title": "Benchmark",
+        "summary": "Synthetic infographic data.",
+        "topics": [{"name": f"Topic number {i}", "description": "...", "importance": 1 + i % 5}
+                   for i in range(topics)],
+        "speakers": [{"label": f"Speaker {i + 1}", "role": "Host", "line_count": 10 + 7 * i}
+                     for i in range(speakers)],
+        "conversation_flow": [{"speaker": f"Speaker {i % speakers + 1}", "topic": f"Point {i}"}
+                              for i in range(flow)],
+    }
+
+
+CASES = {"small": infographic(3, 2, 6), "large": infographic(12, 5, 30)}
+
+_COLD = """
+import json, sys, time
+start = time.perf_counter()
+from local_notebooklm.steps.step5_charts import generate_all_charts
+generate_all_charts(json.loads(sys.argv[1]), backend=sys.argv[2])
+print(time.perf_counter() - start)
+"""
+
+
+def cold_seconds(data, backend: str) -> float:
+    out = subprocess.run([sys.executable, "-c", _COLD, json.dumps(data), backend],
+                         cwd=ROOT.parent, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def warm_ms(data, backend: str, repeat: int) -> float:
+    generate_all_charts(data, backend=backend)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        generate_all_charts(data, backend=backend)  # no output_dir: nothing is cached
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def html_overhead(data, backend: str):
+    base = render_infographic_html(data).encode("utf-8")
+    full = render_infographic_html(data, charts=generate_all_charts(data, backend=backend)).encode("utf-8")
+    return (len(full) - len(base)) / 1024, (len(gzip.compress(full)) - len(gzip.compress(base))) / 1024
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    print(f"{'case':<6} {'backend':<11} {'cold s':>7} {'warm ms':>8} {'chart KB':>9} {'gzip KB':>8}")
+    for case, data in CASES.items():
+        for backend in ("matplotlib", "svg"):
+            raw_kb, gz_kb = html_overhead(data, backend)
+            print(f"{case:<6} {backend:<11} {cold_seconds(data, backend):>7.2f} "
+                  f"{warm_ms(data, backend, args.repeat):>8.1f} {raw_kb:>9.1f} {gz_kb:>8.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
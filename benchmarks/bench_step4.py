@@ -0,0 +1,155 @@
+"""Step 4 throughput benchmark against the local fake TTS server.
+
+Starts ``fake_tts_server.py`` in a subprocess (so its allocations don't
+count) and runs :func:`~local_notebooklm.steps.step4.step4` over
+synthetic scripts for every combination of turn count, output format,
+TTS concurrency and segment mode (files, or ``in_memory`` PCM).  For each
+run it reports:
+
+* segments/s — TTS requests completed per wall-clock second;
+* first — seconds until the first segment was synthesized;
+* peak MB — peak Python/NumPy heap (tracemalloc) during the run, which
+  covers assembly and encoding;
+* the size and duration of the podcast produced.
+
+Usage::
+
+    python benchmarks/bench_step4.py [--turns 20,80] [--formats wav,opus]
+        [--concurrency 1,4,8] [--modes files,memory] [--chars 200]
+        [--latency-ms 50] [--ms-per-char 1] [--error-rate 0]
+"""
+
+import argparse
+import itertools
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import soundfile as sf
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+
+from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns  # noqa: E402
+from local_notebooklm.steps.helpers import set_provider  # noqa: E402
+from local_notebooklm.steps.step4 import step4  # noqa: E402
+
+WORDS = ("the model reads every source and the hosts talk it through with "
+         "examples questions and a few tangents along the way").split()
+
+
+def script(turns: int, chars: int):
+    """Alternating two-speaker turns of about *chars* characters each."""
+    words = itertools.cycle(WORDS)
+    pairs = []
+    for i in range(turns):
+        text = ""
+        while len(text) < chars:
+            text += next(words) + " "
+        pairs.append((f"Speaker {i % 2 + 1}", text.strip().capitalize() + "."))
+    return pairs
+
+
+def start_server(args):
+    cmd = [sys.executable, str(ROOT / "fake_tts_server.py"), "--port", "0",
+           "--latency-ms", str(args.latency_ms), "--ms-per-char", str(args.ms_per_char),
+           "--error-rate", str(args.error_rate), "--max-concurrency", str(args.server_concurrency)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline().strip()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"fake TTS server did not start: {line!r}")
+    return proc, line.split("listening on ", 1)[1] + "/v1"
+
+
+def run_once(url, work_dir: Path, turns, output_format, concurrency, mode, measure_memory):
+    config = {
+        "Text-To-Speech-Model": {
+            # The fake server speaks OpenAI's API, including its "pcm" format
+            "provider": {"name": "openai", "endpoint": url},
+            "model": "tts-1",
+            "audio_format": "wav",
+            "output_format": output_format,
+            "max_concurrency": concurrency,
+            "cache": False,
+            "resume": False,
+            "in_memory": mode == "memory",
+        },
+        "Host-Speaker-Voice": "alloy",
+        "Co-Host-Speaker-1-Voice": "echo",
+        "Co-Host-Speaker-2-Voice": "fable",
+        "Co-Host-Speaker-3-Voice": "onyx",
+        "Co-Host-Speaker-4-Voice": "nova",
+    }
+    write_turns(work_dir / "podcast_ready_data.jsonl", turns_from_pairs(turns))
+    client = set_provider("custom", {"endpoint": url, "key": "bench"})
+    first = []
+    segments = [0]
+
+    def progress(done, total):
+        segments[0] = total
+        if not first:
+            first.append(time.perf_counter())
+
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        final = step4(client=client, config=config, input_dir=str(work_dir),
+                      output_dir=str(work_dir / "out"), progress_callback=progress)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else 0
+        if measure_memory:
+            tracemalloc.stop()
+    info = sf.info(final)
+    return {
+        "segments": segments[0],
+        "seconds": elapsed,
+        "seg_per_s": segments[0] / elapsed,
+        "first": first[0] - start if first else float("nan"),
+        "peak_mb": peak / 1e6,
+        "audio_s": info.duration,
+        "size_mb": Path(final).stat().st_size / 1e6,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--turns", default="20,80")
+    ap.add_argument("--formats", default="wav,opus")
+    ap.add_argument("--concurrency", default="1,4,8")
+    ap.add_argument("--modes", default="files,memory")
+    ap.add_argument("--chars", type=int, default=200, help="characters per turn")
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--ms-per-char", type=float, default=1.0)
+    ap.add_argument("--error-rate", type=float, default=0.0,
+                    help="injected HTTP 500s (retried by Step 4; slow)")
+    ap.add_argument("--server-concurrency", type=int, default=0, help="0 = unlimited")
+    ap.add_argument("--no-memory", action="store_true", help="skip tracemalloc (it slows Step 4 down)")
+    args = ap.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    proc, url = start_server(args)
+    try:
+        print(f"{'turns':>5} {'segs':>5} {'format':<6} {'conc':>4} {'mode':<6} {'seconds':>8} "
+              f"{'segs/s':>7} {'first':>6} {'peak MB':>8} {'audio s':>8} {'MB':>6}")
+        for n, fmt, conc, mode in itertools.product(
+                [int(t) for t in args.turns.split(",")], args.formats.split(","),
+                [int(c) for c in args.concurrency.split(",")], args.modes.split(",")):
+            with tempfile.TemporaryDirectory() as tmp:
+                r = run_once(url, Path(tmp), script(n, args.chars), fmt, conc, mode, not args.no_memory)
+            print(f"{n:>5} {r['segments']:>5} {fmt:<6} {conc:>4} {mode:<6} {r['seconds']:>8.2f} "
+                  f"{r['seg_per_s']:>7.1f} {r['first']:>6.2f} {r['peak_mb']:>8.1f} "
+                  f"{r['audio_s']:>8.1f} {r['size_mb']:>6.2f}", flush=True)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
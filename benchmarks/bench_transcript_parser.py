@@ -0,0 +1,183 @@
+"""Throughput and recovery benchmark for the Step 3 transcript parser.
+
+Runs the single-pass parser and the previous multi-strategy parser
+(``legacy_transcript_parser.py``) over:
+
+* ``corpus/transcripts.jsonl`` — LLM outputs in the shapes models return
+  (strict lists, fenced code, broken quoting, dialogue, JSON, truncation),
+  each with the expected turns.  Add captured outputs as more lines of
+  ``{"name", "raw", "turns"}``;
+* seeded fuzzed variants of every sample (dropped brackets, stray quotes,
+  byte noise, unclosed strings, chatty preambles, ...);
+* large inputs (a long transcript and pathological repetitions) where
+  quadratic behaviour shows up.
+
+For each parser it reports throughput (MB/s) and recovery — the share of
+expected turns found in the output, compared by normalized speaker and
+text.
+
+Usage::
+
+    python benchmarks/bench_transcript_parser.py [--repeat 5] [--fuzz 20] [--seed 0]
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+sys.path.insert(0, str(ROOT))
+
+from local_notebooklm.steps.transcript_parser import (  # noqa: E402
+    normalize_speaker,
+    parse_transcript_flexible,
+    parse_transcript_with_shape,
+)
+import legacy_transcript_parser  # noqa: E402
+
+CORPUS = ROOT / "corpus" / "transcripts.jsonl"
+PARSERS = {
+    "single-pass": parse_transcript_flexible,
+    "legacy": legacy_transcript_parser.parse_transcript_flexible,
+}
+
+
+def load_corpus(path=CORPUS):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Fuzzers: each returns (raw, expected_turns)
+# ---------------------------------------------------------------------------
+
+def _drop_outer_bracket(rng, raw, turns):
+    if rng.random() < 0.5:
+        cut = raw.rfind("]")
+        return (raw[:cut] + raw[cut + 1:] if cut >= 0 else raw), turns
+    start = raw.find("[")
+    return (raw[:start] + raw[start + 1:] if start >= 0 else raw), turns
+
+
+def _chatty_preamble(rng, raw, turns):
+    pre = rng.choice(["Sure! ", "Here's the transcript you asked for:\n", "Of course.\n\n"])
+    post = rng.choice(["", "\n\nI hope this helps!", "\n(Note: kept it concise.)"])
+    return pre + raw + post, turns
+
+
+def _truncate(rng, raw, turns):
+    cut = rng.randint(len(raw) // 2, len(raw))
+    kept = raw[:cut]
+    # Only turns whose text survived intact can be expected back
+    return kept, [t for t in turns if t[1] in kept and kept.index(t[1]) + len(t[1]) < len(kept) - 2]
+
+
+def _byte_noise(rng, raw, turns):
+    chars = list(raw)
+    for _ in range(max(1, len(chars) // 200)):
+        chars.insert(rng.randrange(len(chars)), rng.choice("([{'\"\\:,}])"))
+    noisy = "".join(chars)
+    return noisy, [t for t in turns if t[1] in noisy]
+
+
+def _stray_quotes(rng, raw, turns):
+    # Corrupts the first turn's text only
+    return raw.replace("', '", "', ' '", 1), turns[1:] if "', '" in raw else turns
+
+
+def _duplicate_fence(rng, raw, turns):
+    return f"```\n{raw}\n```\n```python\n", turns
+
+
+FUZZERS = [_drop_outer_bracket, _chatty_preamble, _truncate, _byte_noise, _stray_quotes, _duplicate_fence]
+
+
+def fuzzed_cases(corpus, per_sample, seed):
+    rng = random.Random(seed)
+    cases = []
+    for sample in corpus:
+        for i in range(per_sample):
+            fuzz = FUZZERS[i % len(FUZZERS)]
+            raw, turns = fuzz(rng, sample["raw"], sample["turns"])
+            cases.append({"name": f"{sample['name']}+{fuzz.__name__.strip('_')}", "raw": raw, "turns": turns})
+    return cases
+
+
+def large_cases(corpus):
+    base = corpus[0]
+    big_turns = base["turns"] * 400
+    big_raw = repr([tuple(t) for t in big_turns])
+    return [
+        {"name": "long_list", "raw": big_raw, "turns": big_turns},
+        {"name": "long_list_unterminated", "raw": big_raw[:-2], "turns": big_turns[:-1]},
+        {"name": "apostrophes_50k", "raw": "it's " * 10000, "turns": []},
+        {"name": "open_parens_50k", "raw": "(" * 50000, "turns": []},
+        {"name": "open_tuples", "raw": "[('Speaker 1', '" * 5000, "turns": []},
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _key(speaker, text):
+    return normalize_speaker(speaker), re.sub(r"\s+", " ", text).strip()
+
+
+def recall(parsed, expected):
+    if not expected:
+        return 1.0
+    got = {_key(s, t) for s, t in parsed}
+    return sum(_key(s, t) in got for s, t in expected) / len(expected)
+
+
+def run(cases, parse, repeat):
+    total_bytes = sum(len(c["raw"].encode("utf-8")) for c in cases) * repeat
+    recalls = []
+    start = time.perf_counter()
+    for r in range(repeat):
+        for case in cases:
+            parsed = parse(case["raw"])
+            if r == 0:
+                recalls.append(recall(parsed, case["turns"]))
+    elapsed = time.perf_counter() - start
+    return total_bytes / elapsed / 1e6, sum(recalls) / len(recalls), elapsed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--fuzz", type=int, default=len(FUZZERS) * 2, help="fuzzed variants per sample")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    corpus = load_corpus()
+    suites = {
+        "corpus": corpus,
+        "fuzzed": fuzzed_cases(corpus, args.fuzz, args.seed),
+        "large": large_cases(corpus),
+    }
+
+    print(f"{'suite':<8} {'cases':>6} {'parser':<12} {'MB/s':>9} {'recovery':>9} {'seconds':>8}")
+    for suite, cases in suites.items():
+        for name, parse in PARSERS.items():
+            mbps, rec, secs = run(cases, parse, 1 if suite == "large" else args.repeat)
+            print(f"{suite:<8} {len(cases):>6} {name:<12} {mbps:>9.2f} {rec:>8.1%} {secs:>8.2f}")
+
+    shapes = {}
+    for case in suites["corpus"] + suites["fuzzed"]:
+        shape = parse_transcript_with_shape(case["raw"]).shape
+        shapes[shape] = shapes.get(shape, 0) + 1
+    print("\nshapes matched by the single-pass parser:",
+          ", ".join(f"{k}={v}" for k, v in sorted(shapes.items(), key=lambda kv: -kv[1])))
+
+
+if __name__ == "__main__":
+    main()
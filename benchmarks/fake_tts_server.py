@@ -0,0 +1,186 @@
+"""Local stand-in for OpenAI's ``POST /v1/audio/speech``, for benchmarks.
+
+Returns deterministic audio instead of speech: a tone whose pitch follows
+the voice, lasting ``--seconds-per-char`` per input character, so segment
+lengths and the assembled podcast behave like the real thing without any
+TTS quota.  Knobs:
+
+* latency: ``--latency-ms`` per request plus ``--ms-per-char``;
+* concurrency: ``--max-concurrency`` requests are served at a time; more
+  wait for a slot, or get HTTP 429 with ``--reject-over-limit``;
+* errors: ``--error-rate`` of requests fail with HTTP 500 (seeded, so a
+  run is reproducible).
+
+Formats: ``wav``, ``flac``, ``mp3``, ``opus`` (Ogg) and raw ``pcm``
+(16-bit mono, 24 kHz — like OpenAI's).  Point a ``custom`` provider's
+``endpoint`` at ``http://127.0.0.1:<port>/v1``.
+
+Usage::
+
+    python benchmarks/fake_tts_server.py [--port 8880] [--ms-per-char 2] [--max-concurrency 4]
+
+The first line printed is ``listening on http://127.0.0.1:<port>``.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import soundfile as sf
+
+SAMPLE_RATE = 24000
+FORMATS = {  # response_format -> (soundfile format, subtype, content type)
+    "wav": ("WAV", "PCM_16", "audio/wav"),
+    "flac": ("FLAC", "PCM_16", "audio/flac"),
+    "mp3": ("MP3", "MPEG_LAYER_III", "audio/mpeg"),
+    "opus": ("OGG", "OPUS", "audio/ogg"),
+    "pcm": (None, None, "audio/pcm"),
+}
+
+
+def synthesize(text: str, voice: str, seconds_per_char: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Deterministic int16 "speech" for *text*: a voice-pitched tone with a syllable envelope."""
+    frames = max(1, int(len(text) * seconds_per_char * sample_rate))
+    pitch = 110 + int(hashlib.sha256(voice.encode()).hexdigest()[:4], 16) % 220
+    t = np.arange(frames, dtype=np.float32) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return (np.sin(2 * np.pi * pitch * t) * envelope * 0.3 * 32767).astype("<i2")
+
+
+def encode(samples: np.ndarray, response_format: str, sample_rate: int = SAMPLE_RATE) -> bytes:
+    fmt, subtype, _ = FORMATS[response_format]
+    if fmt is None:
+        return samples.tobytes()
+    buf = io.BytesIO()
+    sf.write(buf, samples, sample_rate, format=fmt, subtype=subtype)
+    return buf.getvalue()
+
+
+class FakeTTSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency_ms: float = 0.0, ms_per_char: float = 0.0,
+                 seconds_per_char: float = 0.06, max_concurrency: int = 0,
+                 reject_over_limit: bool = False, error_rate: float = 0.0, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.latency_ms = latency_ms
+        self.ms_per_char = ms_per_char
+        self.seconds_per_char = seconds_per_char
+        self.reject_over_limit = reject_over_limit
+        self.error_rate = error_rate
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rejected": 0, "active": 0, "peak_active": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+            if key == "active":
+                self.stats["peak_active"] = max(self.stats["peak_active"], self.stats["active"])
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeTTSServer
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def _reply(self, status: int, body: bytes, content_type: str = "application/json", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str, headers=()):
+        self._reply(status, json.dumps({"error": {"message": message}}).encode(), headers=headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.server._lock:
+                self._reply(200, json.dumps(self.server.stats).encode())
+        else:
+            self._error(404, "not found")
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/audio/speech":
+            return self._error(404, "not found")
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            text, voice = request["input"], request.get("voice", "alloy")
+            response_format = request.get("response_format", "mp3")
+        except (ValueError, KeyError) as e:
+            return self._error(400, f"bad request: {e}")
+        if response_format not in FORMATS:
+            return self._error(400, f"unsupported response_format: {response_format}")
+
+        server = self.server
+        server._bump("requests")
+        if server.slots is not None and not server.slots.acquire(blocking=not server.reject_over_limit):
+            server._bump("rejected")
+            return self._error(429, "rate limit exceeded", headers=[("Retry-After", "1")])
+        server._bump("active")
+        try:
+            time.sleep((server.latency_ms + server.ms_per_char * len(text)) / 1000)
+            if server.should_fail():
+                server._bump("errors")
+                return self._error(500, "injected failure")
+            body = encode(synthesize(text, voice, server.seconds_per_char), response_format)
+        finally:
+            server._bump("active", -1)
+            if server.slots is not None:
+                server.slots.release()
+        self._reply(200, body, FORMATS[response_format][2])
+
+
+def start(**kwargs) -> FakeTTSServer:
+    """Start a :class:`FakeTTSServer` on a background thread; call ``shutdown()`` to stop."""
+    server = FakeTTSServer(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8880, help="0 picks a free port")
+    ap.add_argument("--latency-ms", type=float, default=50.0, help="fixed latency per request")
+    ap.add_argument("--ms-per-char", type=float, default=1.0, help="extra latency per input character")
+    ap.add_argument("--seconds-per-char", type=float, default=0.06, help="audio produced per character")
+    ap.add_argument("--max-concurrency", type=int, default=0, help="0 = unlimited")
+    ap.add_argument("--reject-over-limit", action="store_true", help="answer 429 instead of queueing")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    server = FakeTTSServer(
+        (args.host, args.port), args.latency_ms, args.ms_per_char, args.seconds_per_char,
+        args.max_concurrency, args.reject_over_limit, args.error_rate, args.seed,
+    )
+    print(f"listening on {server.url.rsplit('/v1', 1)[0]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""The multi-strategy transcript parser that Step 3 used before the
+single-pass parser, kept verbatim as the benchmark baseline."""
+
+import json
+import logging
+import re
+from ast import literal_eval
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_speaker(s: str) -> str:
+    """Normalize 'speaker1', 'SPEAKER 1', 'Speaker_2' → 'Speaker N'."""
+    m = re.search(r'(\d+)', s)
+    return f"Speaker {m.group(1)}" if m else "Speaker 1"
+
+
+def _validate_parsed(data) -> bool:
+    """Check if data is a non-empty list of (str, str) tuples/lists."""
+    if not isinstance(data, list) or not data:
+        return False
+    for item in data:
+        if not isinstance(item, (tuple, list)) or len(item) < 2:
+            return False
+        if not isinstance(item[0], str) or not isinstance(item[1], str):
+            return False
+    return True
+
+
+def _extract_tuples_regex(text: str) -> List[Tuple[str, str]]:
+    """Extract ('Speaker N', 'text') patterns with regex."""
+    results = []
+    # Double-quoted tuples
+    for m in re.finditer(
+        r'\(\s*"(Speaker\s*\d+)"\s*,\s*"((?:[^"\\]|\\.)*)"\s*\)',
+        text, re.DOTALL | re.IGNORECASE
+    ):
+        results.append((_normalize_speaker(m.group(1)), m.group(2).replace('\\"', '"').strip()))
+
+    if len(results) >= 2:
+        return results
+
+    # Single-quoted tuples
+    results = []
+    for m in re.finditer(
+        r"\(\s*'(Speaker\s*\d+)'\s*,\s*'((?:[^'\\]|\\.)*)'\s*\)",
+        text, re.DOTALL | re.IGNORECASE
+    ):
+        results.append((_normalize_speaker(m.group(1)), m.group(2).replace("\\'", "'").strip()))
+
+    if len(results) >= 2:
+        return results
+
+    # Mixed quotes — more lenient
+    results = []
+    for m in re.finditer(
+        r"""\(\s*['"](Speaker\s*\d+)['"]\s*,\s*['"](.+?)['"]\s*\)""",
+        text, re.DOTALL | re.IGNORECASE
+    ):
+        results.append((_normalize_speaker(m.group(1)), m.group(2).strip()))
+
+    return results if len(results) >= 2 else []
+
+
+def _extract_plain_dialogue(text: str) -> List[Tuple[str, str]]:
+    """Extract 'Speaker N: text' plain dialogue format (with optional markdown bold)."""
+    results = []
+    # Split on speaker labels
+    parts = re.split(
+        r'(?:^|\n)\s*\*{0,2}(Speaker\s*\d+)\*{0,2}\s*[:：\-—]\s*',
+        text, flags=re.IGNORECASE
+    )
+    # parts: [preamble, speaker1, text1, speaker2, text2, ...]
+    if len(parts) >= 3:
+        for i in range(1, len(parts) - 1, 2):
+            speaker = parts[i].strip()
+            dialogue = parts[i + 1].strip()
+            dialogue = re.sub(r'\s+', ' ', dialogue)
+            if dialogue:
+                results.append((_normalize_speaker(speaker), dialogue))
+
+    return results if len(results) >= 1 else []
+
+
+def _extract_json_dialogue(text: str) -> List[Tuple[str, str]]:
+    """Extract dialogue from JSON array format."""
+    try:
+        json_match = re.search(r'\[[\s\S]*\]', text)
+        if not json_match:
+            return []
+        data = json.loads(json_match.group())
+        if not isinstance(data, list):
+            return []
+        results = []
+        for item in data:
+            if isinstance(item, dict):
+                speaker = str(item.get("speaker", item.get("Speaker", "Speaker 1")))
+                dialogue = str(item.get("text", item.get("dialogue",
+                               item.get("content", item.get("line", "")))))
+                if dialogue:
+                    results.append((_normalize_speaker(speaker), dialogue))
+            elif isinstance(item, (list, tuple)) and len(item) >= 2:
+                results.append((_normalize_speaker(str(item[0])), str(item[1])))
+        return results if len(results) >= 1 else []
+    except Exception:
+        return []
+
+
+def parse_transcript_flexible(raw_text: str) -> List[Tuple[str, str]]:
+    """Parse LLM transcript output using multiple fallback strategies.
+
+    Tries in order:
+      1. literal_eval (strict Python list-of-tuples)
+      2. Regex for ("Speaker N", "text") tuple patterns
+      3. 'Speaker N: text' plain dialogue
+      4. JSON array of objects
+      5. Single-speaker monologue fallback
+    """
+    raw = (raw_text or "").strip()
+    if not raw:
+        return []
+
+    # Clean common unicode curly quotes / smart punctuation
+    cleaned = raw.replace('\u2018', "'").replace('\u2019', "'")
+    cleaned = cleaned.replace('\u201c', '"').replace('\u201d', '"')
+    cleaned = cleaned.replace('\u2026', '...')
+    # Strip markdown code fences
+    cleaned = re.sub(r'^```(?:python)?\s*\n?', '', cleaned, flags=re.MULTILINE)
+    cleaned = re.sub(r'\n?```\s*$', '', cleaned, flags=re.MULTILINE)
+    cleaned = cleaned.strip()
+
+    # Strategy 1: literal_eval
+    try:
+        data = literal_eval(cleaned)
+        if _validate_parsed(data):
+            return [(str(s), str(t)) for s, t in data]
+    except Exception:
+        pass
+
+    # Strategy 2: Regex tuple extraction
+    results = _extract_tuples_regex(cleaned)
+    if results:
+        logger.info(f"Transcript parsed via regex tuple extraction ({len(results)} turns)")
+        return results
+
+    # Strategy 3: Plain dialogue format
+    results = _extract_plain_dialogue(cleaned)
+    if results:
+        logger.info(f"Transcript parsed via plain dialogue extraction ({len(results)} turns)")
+        return results
+
+    # Strategy 4: JSON array
+    results = _extract_json_dialogue(cleaned)
+    if results:
+        logger.info(f"Transcript parsed via JSON extraction ({len(results)} turns)")
+        return results
+
+    # Strategy 5: Single-speaker monologue fallback
+    mono = re.sub(r'[\[\]\(\)]', ' ', cleaned)
+    mono = re.sub(r'\s+', ' ', mono).strip()
+    if len(mono) > 30:
+        logger.warning("All parsing strategies failed — using single-speaker monologue fallback")
+        return [("Speaker 1", mono)]
+
+    return []
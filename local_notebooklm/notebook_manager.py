@@ -382,8 +382,12 @@ class NotebookManager:
         if not dest_path.endswith(".zip"):
             dest_path += ".zip"
 
+        from local_notebooklm.steps.tts_cache import CACHE_DIRNAME
+
         with zipfile.ZipFile(dest_path, "w", zipfile.ZIP_DEFLATED) as zf:
             for root, _dirs, files in os.walk(nb_dir):
+                # The TTS cache only duplicates segments already exported
+                _dirs[:] = [d for d in _dirs if d != CACHE_DIRNAME]
                 for fname in files:
                     abs_path = os.path.join(root, fname)
                     arc_name = os.path.relpath(abs_path, nb_dir)
@@ -401,6 +405,11 @@ class NotebookManager:
         with zipfile.ZipFile(zip_path, "r") as zf:
             zf.extractall(nb_dir)
 
+        # Never unpickle archive contents: convert legacy .pkl artifacts
+        # with the data-only loader and drop anything it refuses.
+        from local_notebooklm.steps.artifacts import migrate_directory
+        migrate_directory(nb_dir, remove=True)
+
         # Determine name: use provided, or from metadata, or fallback
         meta_path = self._metadata_path(nb_id)
         if os.path.exists(meta_path):
@@ -0,0 +1,311 @@
+"""Declarative pipeline engine: steps as a DAG with content-hash stamps.
+
+Each :class:`Node` declares the nodes it depends on, its parameters, any
+external input files and the files its result consists of.  After a node
+runs, ``<stamp_dir>/<node>.json`` records its *key* — a hash of its
+parameters, the content of its input files and the output digests of its
+dependencies — together with its result and the digest of its outputs.
+
+:meth:`Pipeline.run` then works like ``make``: a node whose key is
+unchanged and whose output files are untouched is reused; anything else
+reruns, and because dependents hash their dependencies' *outputs*, a
+rerun that reproduces the same files stops the invalidation there.
+Independent nodes run concurrently.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+STAMP_DIR = ".stamps"
+STAMP_VERSION = 1
+
+# Node outcomes
+RAN = "ran"            # ran and was stamped
+CACHED = "cached"      # reused from its stamp (or, with reuse, found on disk)
+FAILED = "failed"      # raised; dependents are skipped
+MISSING = "missing"    # reuse was requested but there was nothing to reuse
+SKIPPED = "skipped"    # a dependency failed or was missing
+CANCELLED = "cancelled"
+
+OK = (RAN, CACHED)
+
+
+class PipelineError(Exception):
+    pass
+
+
+@dataclass
+class Node:
+    """One step of a :class:`Pipeline`.
+
+    *run* receives ``{dependency name: dependency result}`` and returns
+    the node's result, which must be JSON-serializable (paths as str).
+    *outputs* maps that result to the files it consists of.  *discover*
+    finds a result left on disk without a stamp (e.g. by an older
+    version), for nodes that callers ask to reuse.
+    """
+
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    inputs: Tuple[Union[str, Path], ...] = ()
+    outputs: Callable[[Any], Iterable[Union[str, Path]]] = lambda result: ()
+    discover: Optional[Callable[[], Any]] = None
+
+
+@dataclass
+class NodeResult:
+    status: str
+    result: Any = None
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _hash_json(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _input_hash(source: Union[str, Path]) -> str:
+    """Content hash of an input file, or of the string itself (e.g. a URL)."""
+    path = Path(str(source))
+    try:
+        if path.is_file():
+            return _sha256_file(path)
+    except OSError:
+        pass
+    return hashlib.sha256(str(source).encode("utf-8")).hexdigest()
+
+
+class Pipeline:
+    """A DAG of :class:`Node`\\ s whose results are stamped under *stamp_dir*."""
+
+    def __init__(self, nodes: Sequence[Node], stamp_dir: Union[str, Path]):
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise PipelineError(f"Duplicate pipeline node {node.name!r}")
+            self.nodes[node.name] = node
+        for node in nodes:
+            unknown = [d for d in node.deps if d not in self.nodes]
+            if unknown:
+                raise PipelineError(f"Node {node.name!r} depends on unknown {unknown}")
+        self.order = self._toposort()
+        self.stamp_dir = Path(stamp_dir)
+        self._stamp_lock = threading.Lock()
+
+    def _toposort(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, chain: Tuple[str, ...]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise PipelineError(f"Pipeline cycle: {' -> '.join(chain + (name,))}")
+            state[name] = 1
+            for dep in self.nodes[name].deps:
+                visit(dep, chain + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, ())
+        return order
+
+    # -- stamps -------------------------------------------------------------
+
+    def stamp_path(self, name: str) -> Path:
+        return self.stamp_dir / (name.replace("/", "__") + ".json")
+
+    def _read_stamp(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            stamp = json.loads(self.stamp_path(name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return stamp if isinstance(stamp, dict) and stamp.get("version") == STAMP_VERSION else None
+
+    def _write_stamp(self, name: str, stamp: Dict[str, Any]) -> None:
+        path = self.stamp_path(name)
+        tmp = path.with_suffix(".tmp")
+        try:
+            with self._stamp_lock:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(stamp, indent=1, default=str), encoding="utf-8")
+                os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write pipeline stamp {path}: {e}")
+
+    def _outputs(self, node: Node, result: Any) -> Dict[str, Dict[str, Any]]:
+        """``{path: {size, mtime_ns, sha256}}`` for the node's existing output files."""
+        files = {}
+        try:
+            paths = list(node.outputs(result))
+        except Exception as e:
+            logger.debug(f"No outputs for {node.name}: {e}")
+            paths = []
+        for p in paths:
+            path = Path(str(p))
+            try:
+                st = path.stat()
+                if path.is_file():
+                    files[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                        "sha256": _sha256_file(path)}
+            except OSError:
+                continue
+        return files
+
+    @staticmethod
+    def _digest(result: Any, outputs: Dict[str, Dict[str, Any]]) -> str:
+        if outputs:
+            return _hash_json(sorted((Path(p).name, o["sha256"]) for p, o in outputs.items()))
+        return _hash_json(result)
+
+    @staticmethod
+    def _outputs_intact(outputs: Dict[str, Dict[str, Any]]) -> bool:
+        for path, info in outputs.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if st.st_size != info["size"] or st.st_mtime_ns != info["mtime_ns"]:
+                return False
+        return True
+
+    def key(self, name: str, dep_digests: Dict[str, str]) -> str:
+        node = self.nodes[name]
+        return _hash_json({
+            "node": name,
+            "params": node.params,
+            "inputs": {str(src): _input_hash(src) for src in node.inputs},
+            "deps": {dep: dep_digests[dep] for dep in node.deps},
+        })
+
+    def is_fresh(self, name: str, key: str) -> Optional[Dict[str, Any]]:
+        """The node's stamp if it was made for *key* and its outputs are untouched."""
+        stamp = self._read_stamp(name)
+        if stamp and stamp.get("key") == key and self._outputs_intact(stamp.get("outputs", {})):
+            return stamp
+        return None
+
+    # -- running ------------------------------------------------------------
+
+    def _needed(self, targets: Optional[Iterable[str]]) -> List[str]:
+        if targets is None:
+            return list(self.order)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.nodes:
+                raise PipelineError(f"Unknown pipeline node {name!r}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.nodes[name].deps)
+        return [n for n in self.order if n in needed]
+
+    def run(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        force: Iterable[str] = (),
+        reuse: Iterable[str] = (),
+        on_event: Optional[Callable[[str, str], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, NodeResult]:
+        """Bring *targets* (default: every node) up to date.
+
+        Nodes in *force* rerun even if fresh; nodes in *reuse* are taken
+        from their stamp (or ``discover``) whatever their key.
+        *on_event(node, status)* is called with ``"running"`` when a node
+        starts and with its final status.  A failed node only stops its
+        dependents; independent nodes still run.
+        """
+        names = self._needed(targets)
+        force, reuse = set(force), set(reuse)
+        results: Dict[str, NodeResult] = {}
+        digests: Dict[str, str] = {}
+        running: Dict[Any, Tuple[str, str, float]] = {}  # future -> (node, key, start)
+        workers = max_workers or max(1, len(names))
+
+        def finish(name: str, outcome: NodeResult, digest: Optional[str] = None):
+            results[name] = outcome
+            if digest is not None:
+                digests[name] = digest
+            if on_event:
+                on_event(name, outcome.status)
+
+        def start(pool, name: str) -> None:
+            """Finish *name* from its stamp, or submit it to *pool*."""
+            node = self.nodes[name]
+            if name in reuse:
+                stamp = self._read_stamp(name)
+                if stamp is not None:
+                    return finish(name, NodeResult(CACHED, stamp.get("result")), stamp.get("digest"))
+                result = node.discover() if node.discover else None
+                if result is None:
+                    return finish(name, NodeResult(MISSING, error=PipelineError(
+                        f"No output found for {name}; cannot skip it")))
+                return finish(name, NodeResult(CACHED, result),
+                              self._digest(result, self._outputs(node, result)))
+
+            key = self.key(name, digests)
+            stamp = None if name in force else self.is_fresh(name, key)
+            if stamp is not None:
+                return finish(name, NodeResult(CACHED, stamp.get("result")), stamp.get("digest"))
+            if on_event:
+                on_event(name, "running")
+            inputs = {dep: results[dep].result for dep in node.deps}
+            running[pool.submit(node.run, inputs)] = (name, key, time.monotonic())
+
+        def collect(fut) -> None:
+            name, key, started = running.pop(fut)
+            node = self.nodes[name]
+            elapsed = time.monotonic() - started
+            try:
+                result = fut.result()
+            except Exception as e:
+                logger.warning(f"Pipeline step {name} failed: {e}")
+                return finish(name, NodeResult(FAILED, error=e, seconds=elapsed))
+            outputs = self._outputs(node, result)
+            digest = self._digest(result, outputs)
+            self._write_stamp(name, {"version": STAMP_VERSION, "key": key, "result": result,
+                                     "outputs": outputs, "digest": digest})
+            finish(name, NodeResult(RAN, result, seconds=elapsed), digest)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline") as pool:
+            while len(results) < len(names):
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                for name in names:  # topological order: a cached node readies its dependents
+                    if name in results or any(running[f][0] == name for f in running):
+                        continue
+                    deps = self.nodes[name].deps
+                    if cancelled:
+                        finish(name, NodeResult(CANCELLED))
+                    elif any(d in results and results[d].status not in OK for d in deps):
+                        finish(name, NodeResult(SKIPPED))
+                    elif all(d in results for d in deps) and len(running) < workers:
+                        start(pool, name)
+                if running:
+                    for fut in wait(list(running), return_when=FIRST_COMPLETED)[0]:
+                        collect(fut)
+        return results
@@ -31,6 +31,7 @@ class PipelineJob:
     total_steps: int = 0
     step_label: str = ""
     step_times: list[float] = field(default_factory=list)
+    branches: dict[str, str] = field(default_factory=dict)  # concurrent step -> label
     error: str = ""
     failed_step: int | None = None
     log_text: str = ""
@@ -48,6 +49,7 @@ class PipelineJob:
                 "total_steps": self.total_steps,
                 "step_label": self.step_label,
                 "step_times": list(self.step_times),
+                "branches": dict(self.branches),
                 "error": self.error,
                 "failed_step": self.failed_step,
                 "log_text": self.log_text,
@@ -62,6 +64,18 @@ class PipelineJob:
                     setattr(self, k, v)
             self._persist()
 
+    def update_branch(self, name: str, label: str | None) -> None:
+        """Set (or, with *label* None, clear) the progress label of one of
+        the steps running concurrently; ``step_label`` shows them all."""
+        with self._lock:
+            if label is None:
+                self.branches.pop(name, None)
+            else:
+                self.branches[name] = label
+            if self.branches:
+                self.step_label = " | ".join(self.branches.values())
+            self._persist()
+
     def _persist(self) -> None:
         """Write current state to disk (called under lock)."""
         state = {
@@ -70,6 +84,7 @@ class PipelineJob:
             "total_steps": self.total_steps,
             "step_label": self.step_label,
             "step_times": list(self.step_times),
+            "branches": dict(self.branches),
             "error": self.error,
             "failed_step": self.failed_step,
             "gen_start": self.gen_start,
@@ -1,13 +1,364 @@
 from pathlib import Path
+import threading
 
+from .pipeline import CACHED, FAILED, MISSING, OK, STAMP_DIR, Node, Pipeline
 from .steps.helpers import set_provider
 from .steps.step1 import step1
 from .steps.step2 import step2
 from .steps.step3 import step3
+from .steps.step23 import promote_script, step23
 from .steps.step4 import step4
 from .steps.step5 import step5
 from .config import validate_config, ConfigValidationError
 
+MAX_VARIANT_WORKERS = 4  # concurrent Step 2-5 branches in a multi-variant run
+# Each branch runs Step 4 alongside Step 5
+MAX_PIPELINE_WORKERS = MAX_VARIANT_WORKERS * 2
+
+
+def parse_variant(spec):
+    """Normalize a variant given as ``"format:length:style"``, a tuple or a dict.
+
+    Missing length/style default to ``medium``/``normal``.  Returns a dict
+    with ``format``, ``length`` and ``style`` keys.
+    """
+    if isinstance(spec, str):
+        parts = [p.strip() for p in spec.split(":")]
+    elif isinstance(spec, dict):
+        parts = [spec.get("format"), spec.get("length"), spec.get("style")]
+    else:
+        parts = list(spec)
+    if not parts or not parts[0] or len(parts) > 3:
+        raise ValueError(f"Invalid variant {spec!r}: expected format[:length[:style]]")
+    parts += [None] * (3 - len(parts))
+    return {
+        "format": parts[0],
+        "length": parts[1] or "medium",
+        "style": parts[2] or "normal",
+    }
+
+
+def _variant_names(variants):
+    """Directory name per variant, suffixed when the same combination repeats."""
+    names = []
+    for v in variants:
+        base = f"{v['format']}-{v['length']}-{v['style']}"
+        name, n = base, 2
+        while name in names:
+            name, n = f"{base}-{n}", n + 1
+        names.append(name)
+    return names
+
+
+def _progress_printer(step, unit):
+    """A ``(done, total)`` progress callback that prints about every 10%."""
+    def report(done, total):
+        if done == total or done % max(1, total // 10) == 0:
+            print(f"{step}: {done}/{total} {unit} done")
+    return report
+
+
+STEP_LABELS = {
+    "step1": "Step 1: Processing input document",
+    "step2": "Step 2: Generating transcript",
+    "step3": "Step 3: Optimizing for text-to-speech",
+    "step4": "Step 4: Generating audio",
+    "step5": "Step 5: Generating infographic",
+}
+
+_STEP3_FILES = ("podcast_ready_data.jsonl", "podcast_ready_data.txt", "podcast_ready_data.pkl")
+_STEP5_FILES = ("infographic_data.json", "infographic.html", "infographic.png",
+                "infographic.pptx", "infographic.mp4")
+
+
+def step_number(node_name):
+    """``"summary-short-normal/step3"`` → 3."""
+    return int(node_name.rsplit("step", 1)[1])
+
+
+def _newest(directory, *patterns):
+    """Most recently modified file matching the first pattern that matches any."""
+    for pattern in patterns:
+        files = list(Path(directory).glob(pattern))
+        if files:
+            return str(max(files, key=lambda f: f.stat().st_mtime))
+    return None
+
+
+_SECRET_KEYS = ("key", "api_key", "token", "secret", "password")
+
+
+def _model_params(model_config):
+    """A model's config for stamping: the provider's name and endpoint
+    decide what a step produces (like Step 4's segment cache key), its
+    credentials don't."""
+    params = dict(model_config)
+    provider = params.get("provider")
+    if isinstance(provider, dict):
+        params["provider"] = {k: v for k, v in provider.items() if k.lower() not in _SECRET_KEYS}
+    return params
+
+
+def with_live_audio(config):
+    """*config* with Step 4's live preview (``Text-To-Speech-Model.progressive``)
+    turned on unless it sets the key itself, for callers that stream the audio."""
+    tts = {"progressive": True, **config.get("Text-To-Speech-Model", {})}
+    return {**config, "Text-To-Speech-Model": tts}
+
+
+def step1_node(config, client, input_path, output_dir, system_prompt):
+    """Pipeline node for Step 1; its result is the cleaned text file."""
+    return Node(
+        name="step1",
+        run=lambda inputs: step1(
+            client=client,
+            input_path=input_path,
+            config=config,
+            output_dir=str(output_dir),
+            system_prompt=system_prompt,
+        ),
+        inputs=(input_path,),
+        params={
+            "Step1": config["Step1"],
+            "model": _model_params(config["Small-Text-Model"]),
+            "system_prompt": system_prompt,
+        },
+        outputs=lambda result: [result],
+        discover=lambda: _newest(output_dir, "*.txt"),
+    )
+
+
+def branch_nodes(
+    config,
+    clients,
+    system_prompts,
+    output_dirs,
+    format_type,
+    length,
+    style,
+    preference,
+    language,
+    outputs=None,
+    prefix="",
+    transcript=True,
+    skip_to=None,
+    progress=None,
+):
+    """Pipeline nodes for Steps 2-5 of one (format, length, style) branch.
+
+    Nodes are named ``<prefix>stepN`` and build on the ``step1`` node.
+    Step 2 hashes *style* (among others) while Step 1 doesn't, so a new
+    style reruns this branch and reuses Step 1.  Without *transcript*,
+    Steps 2-4 are left out and Step 5 reads Step 1's text instead.
+    *progress(node, done, total)* receives Step 4 and 5 progress; by
+    default it is printed.
+    """
+    _, big_text_client, tts_client = clients
+    fused = config["Step2"].get("mode") == "fused"
+    big_model = _model_params(config["Big-Text-Model"])
+    names = {n: f"{prefix}step{n}" for n in (2, 3, 4, 5)}
+    label = f"[{prefix[:-1]}] " if prefix else ""
+
+    want_audio = outputs is None or "Podcast Audio" in outputs
+    want_html = outputs is None or "Infographic HTML" in outputs
+    want_png = outputs is None or "Infographic PNG" in outputs
+    want_pptx = outputs is None or "PPTX Slides" in outputs
+
+    def progress_for(n, unit):
+        if progress is None:
+            return _progress_printer(f"{label}Step {n}", unit)
+        return lambda done, total: progress(names[n], done, total)
+
+    fused_ran = threading.Event()
+
+    def run_step2(inputs):
+        if fused:
+            transcript_file, _ = step23(
+                client=big_text_client,
+                config=config,
+                input_file=inputs["step1"],
+                step2_dir=str(output_dirs["step2"]),
+                step3_dir=str(output_dirs["step3"]),
+                format_type=format_type,
+                length=length,
+                style=style,
+                preference_text=preference,
+                system_prompt=system_prompts["step2"],
+                language=language
+            )
+            fused_ran.set()
+            return transcript_file
+        _, transcript_file = step2(
+            client=big_text_client,
+            config=config,
+            input_file=inputs["step1"],
+            output_dir=str(output_dirs["step2"]),
+            format_type=format_type,
+            length=length,
+            style=style,
+            preference_text=preference,
+            system_prompt=system_prompts["step2"]
+        )
+        return transcript_file
+
+    def run_step3(inputs):
+        # A fused Step 2 that just ran wrote Step 3's output too; one
+        # reused from disk may still be promoted
+        transcript_file = inputs[names[2]]
+        if fused_ran.is_set():
+            return str(output_dirs["step3"])
+        if not (fused and promote_script(transcript_file, str(output_dirs["step3"]))):
+            step3(
+                client=big_text_client,
+                config=config,
+                input_file=transcript_file,
+                output_dir=str(output_dirs["step3"]),
+                format_type=format_type,
+                system_prompt=system_prompts["step3"],
+                language=language
+            )
+        return str(output_dirs["step3"])
+
+    def run_step4(inputs):
+        return str(step4(
+            client=tts_client,
+            config=config,
+            input_dir=inputs[names[3]],
+            output_dir=str(output_dirs["step4"]),
+            progress_callback=progress_for(4, "audio segments"),
+        ))
+
+    source = names[3] if transcript else "step1"
+
+    def run_step5(inputs):
+        input_dir = inputs[source] if transcript else str(Path(inputs[source]).parent)
+        step5(
+            client=big_text_client,
+            config=config,
+            input_dir=input_dir,
+            output_dir=str(output_dirs["step5"]),
+            generate_html=want_html,
+            generate_png=want_png,
+            generate_pptx=want_pptx,
+            progress_callback=progress_for(5, "infographic stages"),
+        )
+        return str(output_dirs["step5"])
+
+    def step3_files(directory):
+        return [Path(directory) / f for f in _STEP3_FILES]
+
+    nodes = []
+    if transcript:
+        nodes.append(Node(
+            name=names[2],
+            run=run_step2,
+            deps=("step1",),
+            params={
+                "Step2": config["Step2"],
+                "model": big_model,
+                "format": format_type,
+                "length": length,
+                "style": style,
+                "preference": preference,
+                "language": language if fused else None,
+                "system_prompt": system_prompts["step2"],
+            },
+            outputs=lambda result: [result],
+            discover=lambda: _newest(output_dirs["step2"], "*.jsonl", "*.pkl"),
+        ))
+        nodes.append(Node(
+            name=names[3],
+            run=run_step3,
+            deps=(names[2],),
+            params={
+                "Step3": config.get("Step3"),
+                "model": big_model,
+                "format": format_type,
+                "language": language,
+                "system_prompt": system_prompts["step3"],
+                "fused": fused,
+            },
+            outputs=step3_files,
+            discover=lambda: str(output_dirs["step3"]) if any(
+                f.exists() for f in step3_files(output_dirs["step3"])) else None,
+        ))
+        if want_audio and (not skip_to or skip_to <= 4):
+            nodes.append(Node(
+                name=names[4],
+                run=run_step4,
+                deps=(names[3],),
+                params={
+                    # the live preview file doesn't change the final audio
+                    "tts": {k: v for k, v in _model_params(config.get("Text-To-Speech-Model", {})).items()
+                            if k != "progressive"},
+                    "voices": {k: v for k, v in config.items() if k.endswith("-Voice")},
+                },
+                outputs=lambda result: [result],
+            ))
+    if (want_html or want_png or want_pptx) and (not skip_to or skip_to <= 5):
+        nodes.append(Node(
+            name=names[5],
+            run=run_step5,
+            deps=(source,),
+            params={
+                "Step5": config.get("Step5", {}),
+                "model": big_model,
+                "html": want_html,
+                "png": want_png,
+                "pptx": want_pptx,
+            },
+            outputs=lambda result: [Path(result) / f for f in _STEP5_FILES],
+        ))
+    return nodes
+
+
+def skip_to_sets(node_names, skip_to):
+    """``(force, reuse)`` for :meth:`Pipeline.run` given a ``skip_to`` step.
+
+    Steps before *skip_to* are reused as they are on disk and the rest
+    rerun, stamps or not.  Without *skip_to* both are empty and the
+    stamps decide.
+    """
+    if not skip_to:
+        return set(), set()
+    force = {n for n in node_names if step_number(n) >= skip_to}
+    return force, set(node_names) - force
+
+
+def _print_event(name, status):
+    prefix, _, step = name.rpartition("/")
+    label = (f"[{prefix}] " if prefix else "") + STEP_LABELS[step]
+    if status == "running":
+        print(f"{label}...")
+    elif status == CACHED:
+        print(f"{label}: up to date, reusing its output")
+
+
+def _branch_result(results, prefix=""):
+    """``(success, result)`` for one branch from :meth:`Pipeline.run`'s results.
+
+    A failed Step 1-4 fails the branch; Step 5 failing is not fatal.
+    """
+    for n in (1, 2, 3, 4):
+        outcome = results.get("step1" if n == 1 else f"{prefix}step{n}")
+        if outcome is None:
+            continue
+        if outcome.status == MISSING:
+            return False, f"No output files found from Step {n}. Cannot skip this step."
+        if outcome.status == FAILED:
+            return False, f"Error during generation: {outcome.error}"
+    infographic = results.get(f"{prefix}step5")
+    if infographic is not None and infographic.status == FAILED:
+        print(f"Step 5 (infographic) failed (non-fatal): {infographic.error}")
+    elif infographic is not None and infographic.status in OK:
+        print("Infographic generated successfully!")
+    audio = results.get(f"{prefix}step4")
+    if audio is not None and audio.status in OK:
+        print(f"Audio generation complete! File: {audio.result}")
+        return True, audio.result
+    return True, "Process completed successfully (without audio generation)"
+
+
 def podcast_processor(
     input_path,
     config_path=None,
@@ -19,7 +370,30 @@ def podcast_processor(
     skip_to: int = None,
     language: str = "english",
     outputs: list = None,
+    variants: list = None,
+    live_audio: bool = False,
 ):
+    """Run the pipeline for *input_path*.
+
+    Returns ``(success, result)`` where *result* is the audio path or an
+    error message.  When *variants* — a list of ``(format, length, style)``
+    tuples, ``"format:length:style"`` strings or dicts — is given, Step 1
+    runs once and Steps 2-5 run concurrently per variant; *result* is then
+    a ``{variant_name: (success, result)}`` dict and *format_type*,
+    *length* and *style* are ignored.
+
+    Steps are stamped under ``<output_dir>/.stamps`` with a hash of their
+    inputs and parameters, and only steps whose stamp no longer matches
+    rerun: changing *style* reruns Steps 2-5 and reuses Step 1.
+    *skip_to* reuses the earlier steps' output as it is and reruns the
+    rest unconditionally.
+    """
+    if variants:
+        try:
+            variants = [parse_variant(v) for v in variants]
+        except (TypeError, ValueError) as e:
+            return False, str(e)
+
     # Load config
     if config_path:
         import json
@@ -34,6 +408,8 @@ def podcast_processor(
         validate_config(config)
     except ConfigValidationError as e:
         return False, f"Invalid configuration: {e}"
+    if live_audio:
+        config = with_live_audio(config)
     
     # Create output directories
     output_base = Path(output_dir)
@@ -45,7 +421,8 @@ def podcast_processor(
         "step5": output_base / "step5"
     }
     
-    for dir_path in output_dirs.values():
+    # Variant runs only share Step 1; their other steps live under variants/
+    for dir_path in ([output_dirs["step1"]] if variants else output_dirs.values()):
         dir_path.mkdir(parents=True, exist_ok=True)
     
     # Set up clients
@@ -54,10 +431,6 @@ def podcast_processor(
     tts_client = set_provider(config=config["Text-To-Speech-Model"]["provider"])
     
     try:
-        # Initialize variables for file paths that might be skipped
-        cleaned_text_file = None
-        transcript_file = None
-        
         # Extract system prompts for each step (with fallbacks to general system prompt)
         system_prompts = {}
         for step_name in ["step1", "step2", "step3"]:
@@ -70,110 +443,53 @@ def podcast_processor(
             else:
                 system_prompts[step_name] = None
         
-        # Step 1: Extract and clean text
-        if not skip_to or skip_to <= 1:
-            print("Step 1: Processing input document...")
-            cleaned_text_file = step1(
-                client=small_text_client,
-                input_path=input_path,
-                config=config,
-                output_dir=str(output_dirs["step1"]),
-                system_prompt=system_prompts["step1"]
-            )
-        else:
-            # If skipping, find the most recent output file from step1
-            print("Skipping Step 1, looking for existing output...")
-            step1_files = list(output_dirs["step1"].glob("*.txt"))
-            if step1_files:
-                cleaned_text_file = str(sorted(step1_files, key=lambda x: x.stat().st_mtime, reverse=True)[0])
-                print(f"Using existing file from Step 1: {cleaned_text_file}")
-            else:
-                error_msg = "No output files found from Step 1. Cannot skip this step."
-                print(error_msg)
-                return False, error_msg
-        
-        # Step 2: Generate transcript
-        if not skip_to or skip_to <= 2:
-            print("Step 2: Generating transcript...")
-            _, transcript_file = step2(
-                client=big_text_client,
-                config=config,
-                input_file=cleaned_text_file,
-                output_dir=str(output_dirs["step2"]),
-                format_type=format_type,
-                length=length,
-                style=style,
-                preference_text=preference,
-                system_prompt=system_prompts["step2"]
-            )
-        else:
-            # If skipping, find the most recent output file from step2
-            print("Skipping Step 2, looking for existing output...")
-            step2_files = list(output_dirs["step2"].glob("*.pkl"))
-            if step2_files:
-                transcript_file = str(sorted(step2_files, key=lambda x: x.stat().st_mtime, reverse=True)[0])
-                print(f"Using existing file from Step 2: {transcript_file}")
-            else:
-                error_msg = "No output files found from Step 2. Cannot skip this step."
-                print(error_msg)
-                return False, error_msg
-        
-        # Step 3: Optimize for TTS
-        if not skip_to or skip_to <= 3:
-            print("Step 3: Optimizing for text-to-speech...")
-            step3(
-                client=big_text_client,
-                config=config,
-                input_file=transcript_file,
-                output_dir=str(output_dirs["step3"]),
-                format_type=format_type,
-                system_prompt=system_prompts["step3"],
-                language=language
-            )
-        else:
-            print("Skipping Step 3, assuming files exist in output directory...")
-        
-        # Determine which outputs to produce
-        want_audio = outputs is None or "Podcast Audio" in outputs
-        want_html = outputs is None or "Infographic HTML" in outputs
-        want_png = outputs is None or "Infographic PNG" in outputs
-        want_pptx = outputs is None or "PPTX Slides" in outputs
-        want_any_infographic = want_html or want_png or want_pptx
-
-        # Step 4: Generate audio
-        if want_audio and (not skip_to or skip_to <= 4):
-            print("Step 4: Generating audio...")
-            final_audio_path = step4(
-                client=tts_client,
-                config=config,
-                input_dir=str(output_dirs["step3"]),
-                output_dir=str(output_dirs["step4"])
+        # One graph: Step 1, then Steps 2-5 once or per variant.  Stamps
+        # under <output_dir>/.stamps decide what is already up to date.
+        clients = (small_text_client, big_text_client, tts_client)
+        nodes = [step1_node(config, small_text_client, input_path,
+                            output_dirs["step1"], system_prompts["step1"])]
+        if not variants:
+            nodes += branch_nodes(
+                config, clients, system_prompts, output_dirs,
+                format_type, length, style, preference, language,
+                outputs=outputs, skip_to=skip_to,
             )
-
-            print(f"Audio generation complete! File: {final_audio_path}")
         else:
-            final_audio_path = None
-
-        # Step 5: Generate infographic (non-fatal)
-        if want_any_infographic and (not skip_to or skip_to <= 5):
-            try:
-                print("Step 5: Generating infographic...")
-                step5(
-                    client=big_text_client,
-                    config=config,
-                    input_dir=str(output_dirs["step3"]),
-                    output_dir=str(output_dirs["step5"]),
-                    generate_html=want_html,
-                    generate_png=want_png,
-                    generate_pptx=want_pptx,
+            # Each variant writes to <output_dir>/variants/<format>-<length>-<style>/
+            for name, variant in zip(_variant_names(variants), variants):
+                variant_base = output_base / "variants" / name
+                variant_dirs = {
+                    step: variant_base / step for step in ("step2", "step3", "step4", "step5")
+                }
+                for dir_path in variant_dirs.values():
+                    dir_path.mkdir(parents=True, exist_ok=True)
+                nodes += branch_nodes(
+                    config, clients, system_prompts, variant_dirs,
+                    variant["format"], variant["length"], variant["style"],
+                    preference, language, outputs=outputs,
+                    prefix=f"{name}/", skip_to=skip_to,
                 )
-                print("Infographic generated successfully!")
-            except Exception as e:
-                print(f"Step 5 (infographic) failed (non-fatal): {e}")
 
-        if final_audio_path:
-            return True, final_audio_path
-        return True, "Process completed successfully (without audio generation)"
+        pipeline = Pipeline(nodes, output_base / STAMP_DIR)
+        force, reuse = skip_to_sets(pipeline.nodes, skip_to)
+        results = pipeline.run(
+            force=force, reuse=reuse, on_event=_print_event,
+            max_workers=MAX_PIPELINE_WORKERS,
+        )
+
+        if not variants:
+            success, result = _branch_result(results)
+            if not success:
+                print(result)
+            return success, result
+
+        # Variant branches share the provider clients, so a 429 seen by
+        # one backs off all of them
+        variant_results = {}
+        for name in _variant_names(variants):
+            success, result = variant_results[name] = _branch_result(results, f"{name}/")
+            print(f"[{name}] {'Done' if success else 'Failed'}: {result}")
+        return all(ok for ok, _ in variant_results.values()), variant_results
 
     except Exception as e:
         error_msg = f"Error during generation: {str(e)}"
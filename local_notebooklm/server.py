@@ -1,15 +1,17 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from enum import Enum
 from typing import Optional
 import tempfile
 import os
+import re
 import shutil
 from pydantic import BaseModel
 import uuid
 
 # Import the processor
 from .processor import podcast_processor
+from .steps.live_audio import follow, live_audio_path, read_range
 
 # Create FastAPI app
 app = FastAPI(
@@ -78,12 +80,22 @@ class PodcastStatusResponse(BaseModel):
     status: str
     result: Optional[dict] = None
     audio_url: Optional[str] = None
+    stream_url: Optional[str] = None
     infographic_url: Optional[str] = None
     pptx_url: Optional[str] = None
 
 # Dictionary to store job statuses
 job_status = {}
 
+_AUDIO_MEDIA_TYPES = {
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".flac": "audio/flac",
+    ".aac": "audio/aac",
+}
+
 # Function to process podcast in background
 def process_podcast(
     job_id: str,
@@ -105,12 +117,17 @@ def process_podcast(
             style=style,
             preference=preference,
             output_dir=output_dir,
-            skip_to=skip_to
+            skip_to=skip_to,
+            live_audio=True,  # for /stream-podcast
         )
         
         if success:
+            # Step 4 returns the final audio path (its extension follows output_format)
+            podcast_audio_path = result if isinstance(result, str) and os.path.exists(result) \
+                else os.path.join(output_dir, "step4", "podcast.wav")
+
             # Copy the final audio file to a persistent location
-            audio_filename = f"{job_id}_podcast.wav"
+            audio_filename = f"{job_id}_podcast{os.path.splitext(podcast_audio_path)[1]}"
             final_audio_path = os.path.join(output_dir, audio_filename)
 
             # Check for infographic
@@ -126,7 +143,6 @@ def process_podcast(
                 pptx_url = f"/download-pptx/{job_id}"
 
             # Check if the audio file exists
-            podcast_audio_path = os.path.join(output_dir, "step3/podcast.wav")
             if os.path.exists(podcast_audio_path):
                 shutil.copy(podcast_audio_path, final_audio_path)
                 job_status[job_id] = {
@@ -179,10 +195,11 @@ def process_podcast(
             if os.path.exists(segments_dir):
                 shutil.rmtree(segments_dir)
                 
-            # Remove data pkl file
-            data_file = os.path.join(job_output_dir, "podcast_ready_data.pkl")
-            if os.path.exists(data_file):
-                os.remove(data_file)
+            # Remove intermediate transcript artifacts
+            for name in ("podcast_ready_data.jsonl", "podcast_ready_data.pkl"):
+                data_file = os.path.join(job_output_dir, name)
+                if os.path.exists(data_file):
+                    os.remove(data_file)
                 
             # Don't remove podcast.wav here as we've already copied it
     except Exception as e:
@@ -223,13 +240,13 @@ async def generate_podcast(
     os.makedirs(output_dir, exist_ok=True)
     
     # Update job status
-    job_status[job_id] = {"status": "processing"}
+    job_status[job_id] = {"status": "processing", "output_dir": output_dir}
     
     # Add the task to background tasks
     background_tasks.add_task(
         process_podcast,
         job_id=job_id,
-        input_path=pdf_path,
+        pdf_path=pdf_path,
         config_path=config_path,
         format_type=format_type,
         length=length,
@@ -257,6 +274,7 @@ async def get_job_status(job_id: str):
         status=job_info["status"],
         result=job_info.get("result"),
         audio_url=job_info.get("audio_url"),
+        stream_url=f"/stream-podcast/{job_id}" if job_info["status"] == "processing" else None,
         infographic_url=job_info.get("infographic_url"),
         pptx_url=job_info.get("pptx_url"),
     )
@@ -333,10 +351,68 @@ async def download_podcast(job_id: str, background_tasks: BackgroundTasks):
     # Add deletion task to background tasks
     background_tasks.add_task(delete_file_after_download)
     
+    extension = os.path.splitext(audio_path)[1]
     return FileResponse(
         path=audio_path, 
-        filename=f"podcast_{job_id}.wav", 
-        media_type="audio/wav"
+        filename=f"podcast_{job_id}{extension}", 
+        media_type=_AUDIO_MEDIA_TYPES.get(extension, "application/octet-stream")
+    )
+
+_BYTE_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+@app.get("/stream-podcast/{job_id}")
+def stream_podcast(job_id: str, request: Request):
+    """Play the podcast while Step 4 is still generating it.
+
+    Without a Range header the response follows the growing WAV until the
+    job ends.  With ``Range: bytes=start-[end]`` it returns what exists so
+    far as 206 with an unknown total (``bytes a-b/*``).  Finished jobs are
+    served from the final file.
+    """
+    if job_id not in job_status:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job_info = job_status[job_id]
+
+    if job_info["status"] != "processing":
+        audio_path = job_info.get("audio_path")
+        if not audio_path or not os.path.exists(audio_path):
+            raise HTTPException(status_code=404, detail="Audio file not found")
+        return FileResponse(path=audio_path,
+                            media_type=_AUDIO_MEDIA_TYPES.get(os.path.splitext(audio_path)[1], "application/octet-stream"))
+
+    live_path = live_audio_path(os.path.join(job_info["output_dir"], "step4"))
+    if not live_path.exists():
+        raise HTTPException(status_code=404, detail="No audio generated yet",
+                            headers={"Retry-After": "2"})
+
+    range_header = request.headers.get("range")
+    if range_header is None:
+        return StreamingResponse(
+            follow(live_path, lambda: job_status.get(job_id, {}).get("status") != "processing"),
+            media_type=_AUDIO_MEDIA_TYPES[live_path.suffix],
+        )
+
+    match = _BYTE_RANGE.match(range_header.strip())
+    if not match:
+        raise HTTPException(status_code=416, detail="Only bytes=start-[end] ranges are supported")
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else None
+    try:
+        data, size = read_range(live_path, start, end)
+    except FileNotFoundError:  # Step 4 just finished; the client retries the final file
+        raise HTTPException(status_code=404, detail="Live audio finished", headers={"Retry-After": "1"})
+    if not data:
+        raise HTTPException(status_code=416, detail="Range not yet available",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return Response(
+        content=data,
+        status_code=206,
+        media_type=_AUDIO_MEDIA_TYPES[live_path.suffix],
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{start + len(data) - 1}/*",
+        },
     )
 
 # Health check endpoint
@@ -354,6 +430,7 @@ async def root():
             {"path": "/generate-podcast/", "method": "POST", "description": "Generate a podcast from PDF"},
             {"path": "/job-status/{job_id}", "method": "GET", "description": "Check status of a job"},
             {"path": "/download-podcast/{job_id}", "method": "GET", "description": "Download the generated podcast audio file"},
+            {"path": "/stream-podcast/{job_id}", "method": "GET", "description": "Stream the podcast audio while it is being generated (supports Range)"},
             {"path": "/download-infographic/{job_id}", "method": "GET", "description": "Download the generated infographic HTML"},
             {"path": "/download-pptx/{job_id}", "method": "GET", "description": "Download the generated PPTX slide deck"},
             {"path": "/health", "method": "GET", "description": "API health check"}
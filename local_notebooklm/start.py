@@ -1,6 +1,10 @@
 import argparse, sys
 
-from .processor import podcast_processor
+from .processor import parse_variant, podcast_processor
+
+FORMAT_CHOICES = ["podcast", "interview", "panel-discussion", "debate", "summary", "narration", "storytelling", "explainer", "lecture", "tutorial", "q-and-a", "news-report", "executive-brief", "meeting-minutes", "analysis"]
+LENGTH_CHOICES = ["short", "medium", "long", "very-long"]
+STYLE_CHOICES = ["normal", "friendly", "professional", "academic", "casual", "technical", "gen-z", "funny"]
 
 def main():
     parser = argparse.ArgumentParser(description="Generate a podcast from a PDF document")
@@ -10,15 +14,36 @@ def main():
     
     # Optional arguments
     parser.add_argument("--config", type=str, help="Path to a custom config file", default="./ollama_config.json")
-    parser.add_argument("--format", type=str, choices=["podcast", "interview", "panel-discussion", "debate", "summary", "narration", "storytelling", "explainer", "lecture", "tutorial", "q-and-a", "news-report", "executive-brief", "meeting-minutes", "analysis"], default="summary", help="Output format type")
-    parser.add_argument("--length", type=str, choices=["short", "medium", "long", "very-long"], default="medium", help="Content length")
-    parser.add_argument("--style", type=str, choices=["normal", "friendly", "professional", "academic", "casual", "technical", "gen-z", "funny"], default="normal", help="Content style")
+    parser.add_argument("--format", type=str, choices=FORMAT_CHOICES, default="summary", help="Output format type")
+    parser.add_argument("--length", type=str, choices=LENGTH_CHOICES, default="medium", help="Content length")
+    parser.add_argument("--style", type=str, choices=STYLE_CHOICES, default="normal", help="Content style")
     parser.add_argument("--preference", type=str, help="Additional preferences or instructions")
     parser.add_argument("--output-dir", type=str, default="./output", help="Directory to store output files")
     parser.add_argument("--skip-to", type=int, choices=[1, 2, 3, 4, 5], help="Skip to a specific step (1-5)")
     parser.add_argument("--language", type=str, help="Additional preferences or instructions")
+    parser.add_argument(
+        "--variant", type=str, action="append", metavar="FORMAT[:LENGTH[:STYLE]]",
+        help="Generate this variant (repeatable). Step 1 runs once and all variants "
+             "run concurrently into <output-dir>/variants/; overrides --format/--length/--style",
+    )
     
     args = parser.parse_args()
+
+    variants = None
+    if args.variant:
+        variants = []
+        for spec in args.variant:
+            try:
+                variant = parse_variant(spec)
+            except ValueError as e:
+                parser.error(str(e))
+            if variant["format"] not in FORMAT_CHOICES:
+                parser.error(f"invalid variant format: {variant['format']!r}")
+            if variant["length"] not in LENGTH_CHOICES:
+                parser.error(f"invalid variant length: {variant['length']!r}")
+            if variant["style"] not in STYLE_CHOICES:
+                parser.error(f"invalid variant style: {variant['style']!r}")
+            variants.append(variant)
     
     # Call the main process function with parsed arguments
     success, result = podcast_processor(
@@ -30,10 +55,14 @@ def main():
         preference=args.preference,
         output_dir=args.output_dir,
         skip_to=args.skip_to,
-        language=args.language
+        language=args.language,
+        variants=variants,
     )
 
-    if success:
+    if variants and isinstance(result, dict):
+        for name, (ok, detail) in result.items():
+            print(f"{'✅' if ok else '❌'} {name}: {detail}")
+    elif success:
         print(f"✅ Podcast generated at: {result}")
     else:
         print(f"❌ Failed: {result}")
@@ -0,0 +1,319 @@
+"""Versioned transcript artifacts shared by Steps 2-5 and the web UI.
+
+Intermediate transcripts are stored as UTF-8 JSON Lines instead of
+pickled strings::
+
+    {"format": "local-notebooklm/turns", "version": 1, "kind": "script"}
+    {"speaker": "Speaker 1", "text": "Hello", "start": 0, "end": 5, "hash": "..."}
+    ...
+
+The first line is a header; each following line is one :class:`Turn`.
+``start``/``end`` are character offsets of the turn's text in the source
+it was parsed from (for turns built from pairs, in the newline-joined
+text of all turns).  ``hash`` is a short content hash of speaker + text,
+used by later steps to detect which turns changed.
+
+Readers stream the file line by line, so long transcripts are never held
+as several full copies.  Legacy ``.pkl`` artifacts are converted with
+:func:`migrate_pickle`, which refuses pickles that reference any class
+or function and therefore cannot execute code from imported notebooks.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import re
+from ast import literal_eval
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "local-notebooklm/turns"
+ARTIFACT_VERSION = 1
+
+TRANSCRIPT_KIND = "transcript"  # Step 2 free-form dialogue
+SCRIPT_KIND = "script"          # Step 3 TTS-ready speaker turns
+
+_SPEAKER_LINE = re.compile(r"\**(Speaker\s*\d+)\**\s*[:：]\s*", re.IGNORECASE)
+
+
+class ArtifactError(Exception):
+    pass
+
+
+def content_hash(speaker: str, text: str) -> str:
+    """Short, stable hash of one turn's content."""
+    digest = hashlib.sha256(f"{speaker}\x1f{text}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class Turn:
+    """One speaker turn.  Unpacks like the legacy ``(speaker, text)`` tuple."""
+
+    __slots__ = ("speaker", "text", "start", "end", "digest")
+
+    def __init__(self, speaker: str, text: str, start: int = 0,
+                 end: Optional[int] = None, digest: Optional[str] = None):
+        self.speaker = speaker
+        self.text = text
+        self.start = start
+        self.end = start + len(text) if end is None else end
+        self.digest = digest or content_hash(speaker, text)
+
+    def __iter__(self):
+        yield self.speaker
+        yield self.text
+
+    def __eq__(self, other):
+        if isinstance(other, Turn):
+            return (self.speaker, self.text) == (other.speaker, other.text)
+        if isinstance(other, tuple):
+            return (self.speaker, self.text) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.speaker, self.text))  # equal to the matching tuple's hash
+
+    def __repr__(self):
+        return f"Turn({self.speaker!r}, {self.text[:40]!r}, start={self.start}, end={self.end})"
+
+    def as_tuple(self) -> Tuple[str, str]:
+        return (self.speaker, self.text)
+
+    def to_record(self) -> dict:
+        return {"speaker": self.speaker, "text": self.text,
+                "start": self.start, "end": self.end, "hash": self.digest}
+
+    @classmethod
+    def from_record(cls, record: dict) -> "Turn":
+        return cls(record["speaker"], record["text"],
+                   record.get("start", 0), record.get("end"), record.get("hash"))
+
+
+# ---------------------------------------------------------------------------
+# Building turns
+# ---------------------------------------------------------------------------
+
+def turns_from_pairs(pairs: Iterable[Tuple[str, str]]) -> List[Turn]:
+    """Wrap ``(speaker, text)`` pairs; offsets index the newline-joined texts."""
+    turns = []
+    offset = 0
+    for speaker, text in pairs:
+        speaker, text = str(speaker), str(text)
+        turns.append(Turn(speaker, text, offset))
+        offset += len(text) + 1
+    return turns
+
+
+def turns_from_text(text: str) -> List[Turn]:
+    """Split free-form dialogue into one turn per non-empty line.
+
+    Lines starting with a ``Speaker N:`` label are attributed to that
+    speaker; any other line keeps an empty speaker.  Offsets point into
+    *text* so the original can be located exactly.
+    """
+    turns = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        body = line.rstrip("\r\n")
+        stripped = body.strip()
+        if stripped:
+            lead = len(body) - len(body.lstrip())
+            m = _SPEAKER_LINE.match(body, lead)
+            if m:
+                speaker = re.sub(r"\s+", " ", m.group(1)).title()
+                content_start = m.end()
+            else:
+                speaker = ""
+                content_start = lead
+            content = body[content_start:].rstrip()
+            start = offset + content_start
+            turns.append(Turn(speaker, content, start, start + len(content)))
+        offset += len(line)
+    return turns
+
+
+def render_text(turns: Iterable[Turn]) -> str:
+    """Render turns as ``Speaker N: text`` lines (unattributed lines as-is)."""
+    return "\n".join(f"{t.speaker}: {t.text}" if t.speaker else t.text for t in turns)
+
+
+# ---------------------------------------------------------------------------
+# Reading / writing
+# ---------------------------------------------------------------------------
+
+class TurnWriter:
+    """Stream turns to a ``.jsonl`` artifact; the file appears atomically on close."""
+
+    def __init__(self, path: Union[str, Path], kind: str = SCRIPT_KIND):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._fh = open(self._tmp, "w", encoding="utf-8")
+        self._fh.write(json.dumps({"format": ARTIFACT_FORMAT,
+                                   "version": ARTIFACT_VERSION,
+                                   "kind": kind}) + "\n")
+        self.count = 0
+
+    def write(self, turn: Turn) -> None:
+        self._fh.write(json.dumps(turn.to_record(), ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._fh.closed:
+            return
+        self._fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_turns(path: Union[str, Path], turns: Iterable[Turn], kind: str = SCRIPT_KIND) -> Path:
+    with TurnWriter(path, kind) as writer:
+        for turn in turns:
+            writer.write(turn)
+    return Path(path)
+
+
+def read_header(path: Union[str, Path]) -> dict:
+    with open(path, "r", encoding="utf-8") as fh:
+        return _parse_header(fh.readline(), path)
+
+
+def _parse_header(line: str, path) -> dict:
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ArtifactError(f"{path}: invalid artifact header: {e}")
+    if not isinstance(header, dict) or header.get("format") != ARTIFACT_FORMAT:
+        raise ArtifactError(f"{path}: not a {ARTIFACT_FORMAT} artifact")
+    if header.get("version", 0) > ARTIFACT_VERSION:
+        raise ArtifactError(
+            f"{path}: artifact version {header.get('version')} is newer than "
+            f"supported version {ARTIFACT_VERSION}"
+        )
+    return header
+
+
+def iter_turns(path: Union[str, Path]) -> Iterator[Turn]:
+    """Yield turns one at a time from a ``.jsonl`` artifact."""
+    try:
+        fh = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Transcript artifact not found: {path}")
+    with fh:
+        _parse_header(fh.readline(), path)
+        for lineno, line in enumerate(fh, 2):
+            if not line.strip():
+                continue
+            try:
+                yield Turn.from_record(json.loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ArtifactError(f"{path}:{lineno}: invalid turn record: {e}")
+
+
+def read_turns(path: Union[str, Path]) -> List[Turn]:
+    return list(iter_turns(path))
+
+
+# ---------------------------------------------------------------------------
+# Legacy pickle migration
+# ---------------------------------------------------------------------------
+
+class _DataOnlyUnpickler(pickle.Unpickler):
+    """Unpickler that only accepts plain data (str/list/tuple/dict/numbers).
+
+    Those types never need ``find_class``; anything that does — and with
+    it every code-execution gadget — is rejected.
+    """
+
+    def find_class(self, module, name):
+        raise ArtifactError(f"Refusing to load pickled object {module}.{name}")
+
+
+def load_legacy_pickle(path: Union[str, Path]):
+    """Safely load a legacy ``.pkl`` artifact containing plain data only."""
+    with open(path, "rb") as fh:
+        return _DataOnlyUnpickler(io.BytesIO(fh.read())).load()
+
+
+def _turns_from_legacy(data) -> Tuple[List[Turn], str]:
+    if isinstance(data, (list, tuple)):
+        return turns_from_pairs((item[0], item[1]) for item in data), SCRIPT_KIND
+    if isinstance(data, str):
+        try:
+            parsed = literal_eval(data.strip())
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            parsed = None
+        if isinstance(parsed, list) and all(
+            isinstance(item, (list, tuple)) and len(item) >= 2 for item in parsed
+        ) and parsed:
+            return turns_from_pairs((item[0], item[1]) for item in parsed), SCRIPT_KIND
+        return turns_from_text(data), TRANSCRIPT_KIND
+    raise ArtifactError(f"Unsupported legacy artifact content: {type(data).__name__}")
+
+
+def migrate_pickle(pkl_path: Union[str, Path], remove: bool = False) -> Path:
+    """Convert a legacy ``.pkl`` artifact to ``.jsonl`` next to it.
+
+    Returns the new path.  With *remove*, the pickle is deleted afterwards.
+    """
+    pkl_path = Path(pkl_path)
+    turns, kind = _turns_from_legacy(load_legacy_pickle(pkl_path))
+    jsonl_path = write_turns(pkl_path.with_suffix(".jsonl"), turns, kind)
+    logger.info(f"Migrated {pkl_path} → {jsonl_path} ({len(turns)} turns)")
+    if remove:
+        pkl_path.unlink(missing_ok=True)
+    return jsonl_path
+
+
+def migrate_directory(root: Union[str, Path], remove: bool = True) -> List[Path]:
+    """Migrate every legacy ``.pkl`` artifact under *root*.  Returns new paths.
+
+    Pickles that fail the data-only check are deleted (when *remove*) but
+    never loaded.
+    """
+    migrated = []
+    for pkl_path in Path(root).rglob("*.pkl"):
+        try:
+            migrated.append(migrate_pickle(pkl_path, remove=remove))
+        except Exception as e:
+            logger.warning(f"Could not migrate {pkl_path}: {e}")
+            if remove:
+                pkl_path.unlink(missing_ok=True)
+    return migrated
+
+
+def resolve_artifact(path: Union[str, Path]) -> Path:
+    """Return the ``.jsonl`` artifact for *path*, migrating a legacy pickle if needed.
+
+    *path* may name the ``.jsonl`` file, the legacy ``.pkl`` file or the
+    extension-less stem (``step3/podcast_ready_data``).
+    """
+    path = Path(path)
+    stem = path.with_suffix("") if path.suffix in (".jsonl", ".pkl") else path
+    jsonl_path = stem.with_name(stem.name + ".jsonl")
+    pkl_path = stem.with_name(stem.name + ".pkl")
+    if jsonl_path.exists() and not (
+        pkl_path.exists() and pkl_path.stat().st_mtime > jsonl_path.stat().st_mtime
+    ):
+        return jsonl_path
+    if pkl_path.exists():
+        return migrate_pickle(pkl_path)
+    raise FileNotFoundError(f"Transcript artifact not found: {jsonl_path}")
@@ -0,0 +1,337 @@
+"""Streaming assembly of TTS segments into the final podcast file.
+
+Segments are copied block by block into one output file, so peak memory is
+a few blocks no matter how long the podcast is.  Samples are read and
+written in the output's native dtype (``int16`` for 16-bit PCM), never as
+a float64 copy of the whole episode.
+
+The output takes the first segment's sample rate and channel count unless
+they are given explicitly.  Segments that differ are converted on the fly:
+channels are mixed down or duplicated and the sample rate is converted by
+streaming linear interpolation.  Compressed outputs are encoded as the
+blocks arrive (see :mod:`.audio_encode`).  Segments held in memory as
+:class:`PcmSegment` buffers are appended the same way, without a file.  Missing or unreadable segments raise
+:class:`AssemblyError` unless the caller opts into skipping them; either
+way they are listed in the returned :class:`AssemblyReport`.
+"""
+
+import io
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from .audio_encode import Encoding, encoding_for, open_writer, supported_rate
+
+logger = logging.getLogger(__name__)
+
+BLOCK_FRAMES = 65536
+
+# numpy dtype that carries each subtype's samples without conversion
+_SUBTYPE_DTYPE = {
+    "PCM_S8": "int16",
+    "PCM_U8": "int16",
+    "PCM_16": "int16",
+    "PCM_24": "int32",
+    "PCM_32": "int32",
+    "FLOAT": "float32",
+    "DOUBLE": "float64",
+}
+_BIT_DEPTH_SUBTYPE = {8: "PCM_U8", 16: "PCM_16", 24: "PCM_24", 32: "PCM_32"}
+_DTYPE_SUBTYPE = {"int16": "PCM_16", "int32": "PCM_32", "float32": "FLOAT", "float64": "DOUBLE"}
+PCM_DEFAULT_RATE = 24000  # OpenAI's "pcm" response format
+
+
+class AssemblyError(Exception):
+    pass
+
+
+class AssemblyReport(NamedTuple):
+    path: Path
+    sample_rate: int
+    channels: int
+    frames: int
+    segments: int
+    missing: List[Path]     # skipped because they were missing or unreadable
+    converted: List[Path]   # resampled or channel-mapped
+    size_bytes: int = 0
+    seconds: float = 0.0    # spent reading, converting and encoding
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def pcm_bytes(self) -> int:
+        """Size of the same audio as a 16-bit WAV, for comparing encodings."""
+        return 44 + self.frames * self.channels * 2
+
+
+class PcmSegment(NamedTuple):
+    """A decoded segment kept in memory: ``(frames, channels)`` samples."""
+    samples: np.ndarray
+    sample_rate: int
+
+    @property
+    def samplerate(self) -> int:  # soundfile.info-like, for SegmentAssembler._open
+        return self.sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def subtype(self) -> str:
+        return _DTYPE_SUBTYPE.get(self.samples.dtype.name, "FLOAT")
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def write(self, path: Union[str, Path]) -> None:
+        sf.write(str(path), self.samples, self.sample_rate, subtype=self.subtype)
+
+
+def decode_segment(data: bytes, response_format: str) -> PcmSegment:
+    """Decode one TTS response held in memory.
+
+    ``pcm`` / ``pcm_<rate>`` responses are raw 16-bit little-endian mono
+    and are used as-is; anything else is decoded by libsndfile.
+    """
+    kind, _, rate = response_format.partition("_")
+    if kind == "pcm":
+        samples = np.frombuffer(data[:len(data) // 2 * 2], dtype="<i2").reshape(-1, 1)
+        return PcmSegment(samples, int(rate) if rate.isdigit() else PCM_DEFAULT_RATE)
+    try:
+        samples, sample_rate = sf.read(io.BytesIO(data), dtype="int16", always_2d=True)
+    except (RuntimeError, sf.LibsndfileError) as e:
+        raise AssemblyError(f"Cannot decode {response_format} audio: {e}")
+    return PcmSegment(samples, sample_rate)
+
+
+def subtype_for_bit_depth(audio_format: str, bit_depth: Optional[int]) -> Optional[str]:
+    """Subtype for a ``wav_16000_16``-style bit depth, if the format supports it."""
+    subtype = _BIT_DEPTH_SUBTYPE.get(bit_depth)
+    if subtype and sf.check_format(audio_format.upper(), subtype):
+        return subtype
+    return None
+
+
+class _LinearResampler:
+    """Linear-interpolation resampler that keeps state across blocks."""
+
+    def __init__(self, src_rate: int, dst_rate: int):
+        self.step = src_rate / dst_rate  # source frames per output frame
+        self.pos = 0.0                   # next output position, in source frames
+        self.tail = None                 # last source frame of the previous block
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        buf = block if self.tail is None else np.concatenate([self.tail, block])
+        n = len(buf)
+        count = max(0, math.ceil((n - 1 - self.pos) / self.step)) if n > 1 else 0
+        positions = self.pos + self.step * np.arange(count)
+        idx = positions.astype(np.int64)
+        frac = (positions - idx)[:, None].astype(np.float32)
+        out = buf[idx] * (1 - frac) + buf[np.minimum(idx + 1, n - 1)] * frac
+        self.pos = self.pos + self.step * count - (n - 1)
+        self.tail = buf[-1:]
+        return out
+
+
+def _map_channels(block: np.ndarray, channels: int) -> np.ndarray:
+    have = block.shape[1]
+    if have == channels:
+        return block
+    if channels == 1:
+        return block.mean(axis=1, keepdims=True)
+    if have == 1:
+        return np.repeat(block, channels, axis=1)
+    raise AssemblyError(f"Cannot map {have} channels to {channels}")
+
+
+class SegmentAssembler:
+    """Append segments to one output file as they become available.
+
+    The output is opened on the first :meth:`append_file` so its format can
+    follow the first segment.  It is written to a ``.part`` file and moved
+    into place by :meth:`close`, unless *progressive* is set: then it is
+    written in place and its header is flushed after every segment, so
+    readers can play it while it grows.
+    """
+
+    def __init__(
+        self,
+        output_path: Union[str, Path],
+        sample_rate: Optional[int] = None,
+        channels: Optional[int] = None,
+        subtype: Optional[str] = None,
+        block_frames: int = BLOCK_FRAMES,
+        progressive: bool = False,
+        bitrate_kbps: Optional[int] = None,
+    ):
+        self.path = Path(output_path)
+        suffix = self.path.suffix.lstrip(".").lower()
+        self.encoding = encoding_for(self.path) or Encoding(suffix, suffix, suffix.upper(), None, None)
+        self.bitrate_kbps = bitrate_kbps
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.subtype = subtype
+        self.block_frames = block_frames
+        self.frames = 0
+        self.segments = 0
+        self.seconds = 0.0
+        self.converted: List[Path] = []
+        self.progressive = progressive
+        self._tmp = self.path if progressive else self.path.with_name(self.path.name + ".part")
+        self._out = None
+        self._dtype = "float32"
+
+    def _open(self, info) -> None:
+        encoding = self.encoding
+        self.sample_rate = supported_rate(encoding, self.sample_rate or info.samplerate)
+        self.channels = self.channels or info.channels
+        if encoding.subtype:
+            self.subtype = encoding.subtype
+        elif not self.subtype and encoding.format:
+            self.subtype = (info.subtype if sf.check_format(encoding.format, info.subtype)
+                            else sf.default_subtype(encoding.format))
+        self._dtype = _SUBTYPE_DTYPE.get(self.subtype, "float32")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._out = open_writer(self._tmp, encoding, self.sample_rate, self.channels,
+                                self.subtype, self.bitrate_kbps)
+
+    def append(self, segment: Union[str, Path, PcmSegment]) -> int:
+        """Append a segment file or in-memory :class:`PcmSegment`."""
+        if isinstance(segment, PcmSegment):
+            return self.append_pcm(segment)
+        return self.append_file(segment)
+
+    def append_file(self, segment: Union[str, Path]) -> int:
+        """Copy one segment into the output.  Returns frames written."""
+        started = time.perf_counter()
+        segment = Path(segment)
+        try:
+            src = sf.SoundFile(segment)
+        except (RuntimeError, OSError, sf.LibsndfileError) as e:
+            raise AssemblyError(f"Cannot read audio segment {segment}: {e}")
+        with src:
+            blocks = lambda dtype: src.blocks(blocksize=self.block_frames, dtype=dtype, always_2d=True)
+            return self._append(src, blocks, segment, started)
+
+    def append_pcm(self, segment: PcmSegment, label: str = "<memory>") -> int:
+        """Append an in-memory segment.  Returns frames written."""
+        started = time.perf_counter()
+        samples = segment.samples
+
+        def blocks(dtype: str) -> Iterator[np.ndarray]:
+            for i in range(0, len(samples), self.block_frames):
+                block = samples[i:i + self.block_frames]
+                if block.dtype != dtype:  # only ever asked for float32 then
+                    scale = float(2 ** (8 * block.dtype.itemsize - 1)) if block.dtype.kind == "i" else 1.0
+                    block = block.astype(dtype) / scale
+                yield block
+
+        return self._append(segment, blocks, label, started)
+
+    def _append(self, src, blocks: Callable[[str], Iterator[np.ndarray]], label, started: float) -> int:
+        if self._out is None:
+            self._open(src)
+        same_layout = src.samplerate == self.sample_rate and src.channels == self.channels
+        if not same_layout:
+            self.converted.append(label)
+        resampler = (_LinearResampler(src.samplerate, self.sample_rate)
+                     if src.samplerate != self.sample_rate else None)
+        written = 0
+        dtype = self._dtype if same_layout else "float32"
+        if isinstance(src, PcmSegment) and src.samples.dtype != dtype:
+            dtype = "float32"
+        for block in blocks(dtype):
+            if not same_layout:
+                block = _map_channels(block, self.channels)
+                if resampler is not None:
+                    block = resampler.process(block)
+            self._out.write(block)
+            written += len(block)
+        if self.progressive:
+            self._out.flush()  # also rewrites the header sizes
+        self.frames += written
+        self.segments += 1
+        self.seconds += time.perf_counter() - started
+        return written
+
+    def close(self) -> Path:
+        if self._out is None:
+            raise AssemblyError("No audio segments were assembled")
+        started = time.perf_counter()
+        self._out.close()
+        self.seconds += time.perf_counter() - started
+        if self._tmp != self.path:
+            os.replace(self._tmp, self.path)
+        return self.path
+
+    def report(self, missing: Iterable[Path] = ()) -> AssemblyReport:
+        size = self.path.stat().st_size if self.path.exists() else 0
+        return AssemblyReport(self.path, self.sample_rate, self.channels, self.frames,
+                              self.segments, list(missing), self.converted, size, self.seconds)
+
+    def abort(self) -> None:
+        if self._out is not None:
+            try:
+                self._out.close()
+            except Exception as e:  # e.g. ffmpeg exiting early; the output is dropped anyway
+                logger.debug(f"Error closing aborted output {self._tmp}: {e}")
+        self._tmp.unlink(missing_ok=True)
+
+
+def assemble_segments(
+    segments: Iterable[Union[str, Path]],
+    output_path: Union[str, Path],
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+    subtype: Optional[str] = None,
+    skip_missing: bool = False,
+    bitrate_kbps: Optional[int] = None,
+) -> AssemblyReport:
+    """Stream *segments*, in order, into *output_path*.
+
+    Every segment is checked before anything is written.  Missing or
+    unreadable ones raise :class:`AssemblyError` listing all of them,
+    unless *skip_missing* is set, in which case they are left out, logged
+    and reported.
+    """
+    segments = [Path(s) for s in segments]
+    if not segments:
+        raise AssemblyError("No audio segments to assemble")
+
+    missing = []
+    for segment in segments:
+        try:
+            sf.info(str(segment))
+        except Exception:
+            missing.append(segment)
+    if missing:
+        names = ", ".join(p.name for p in missing[:10]) + (" ..." if len(missing) > 10 else "")
+        if not skip_missing:
+            raise AssemblyError(f"{len(missing)} of {len(segments)} audio segment(s) missing or unreadable: {names}")
+        logger.warning(f"Skipping {len(missing)} missing or unreadable segment(s): {names}")
+
+    assembler = SegmentAssembler(output_path, sample_rate, channels, subtype,
+                                 bitrate_kbps=bitrate_kbps)
+    try:
+        for segment in segments:
+            if segment not in missing:
+                assembler.append_file(segment)
+        assembler.close()
+    except BaseException:
+        assembler.abort()
+        raise
+
+    if assembler.converted:
+        logger.info(f"Converted {len(assembler.converted)} segment(s) to "
+                    f"{assembler.sample_rate} Hz / {assembler.channels} channel(s)")
+    return assembler.report(missing)
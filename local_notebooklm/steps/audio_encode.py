@@ -0,0 +1,144 @@
+"""Encoders for the final podcast file.
+
+:class:`~.audio_assembly.SegmentAssembler` writes through :func:`open_writer`,
+so a compressed podcast is encoded block by block straight from the
+segment stream, without an intermediate WAV of the whole episode.
+
+* ``opus`` (Ogg Opus), ``ogg`` (Ogg Vorbis), ``mp3``, ``flac`` and ``wav``
+  are written by libsndfile (through soundfile);
+* ``aac`` (ADTS) is piped to ``ffmpeg`` as 16-bit PCM, and needs ffmpeg
+  on ``PATH``.
+
+Lossy bitrates are given in kbps.  libsndfile only takes a 0-1
+"compression level"; for MP3 (constant bitrate) and Opus it maps linearly
+onto the codec's bitrate range, which :func:`compression_level` inverts.
+Vorbis is quality-based, so its bitrate is approximate.
+"""
+
+import logging
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+
+class Encoding(NamedTuple):
+    name: str
+    extension: str
+    format: Optional[str]    # libsndfile major format; None for ffmpeg
+    subtype: Optional[str]
+    default_kbps: Optional[int]
+    sample_rates: tuple = ()  # rates the codec accepts; empty = any
+
+
+ENCODINGS: Dict[str, Encoding] = {
+    "wav": Encoding("wav", "wav", "WAV", None, None),
+    "flac": Encoding("flac", "flac", "FLAC", None, None),
+    "mp3": Encoding("mp3", "mp3", "MP3", "MPEG_LAYER_III", 128,
+                    (8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000)),
+    "ogg": Encoding("ogg", "ogg", "OGG", "VORBIS", 96),
+    "opus": Encoding("opus", "opus", "OGG", "OPUS", 64, (8000, 12000, 16000, 24000, 48000)),
+    "aac": Encoding("aac", "aac", None, None, 96),
+}
+_BY_EXTENSION = {e.extension: e for e in ENCODINGS.values()}
+
+# Bitrate ranges libsndfile maps compression levels 0..1 onto (kbps).
+# MP3's depends on the MPEG version, which follows the sample rate.
+_MP3_KBPS = {32000: (320, 32), 16000: (160, 8), 0: (64, 8)}  # by minimum rate
+_OPUS_KBPS_PER_CHANNEL = (256, 6)
+_VORBIS_KBPS = (320, 32)  # rough; Vorbis is quality-based VBR
+
+
+class EncoderUnavailableError(Exception):
+    pass
+
+
+def encoding_for(path: Union[str, Path]) -> Optional[Encoding]:
+    return _BY_EXTENSION.get(Path(path).suffix.lstrip(".").lower())
+
+
+def supported_rate(encoding: Encoding, sample_rate: int) -> int:
+    """*sample_rate* if *encoding* accepts it, else the nearest higher rate it does."""
+    if not encoding.sample_rates or sample_rate in encoding.sample_rates:
+        return sample_rate
+    higher = [r for r in encoding.sample_rates if r >= sample_rate]
+    return min(higher) if higher else max(encoding.sample_rates)
+
+
+def compression_level(encoding: Encoding, kbps: float, channels: int = 1,
+                      sample_rate: int = 44100) -> Optional[float]:
+    """libsndfile compression level that gives roughly *kbps*."""
+    if encoding.subtype == "MPEG_LAYER_III":
+        high, low = next(v for rate, v in _MP3_KBPS.items() if sample_rate >= rate)
+    elif encoding.subtype == "OPUS":
+        high, low = _OPUS_KBPS_PER_CHANNEL
+        kbps = kbps / max(1, channels)
+    elif encoding.subtype == "VORBIS":
+        high, low = _VORBIS_KBPS
+    else:
+        return None
+    # libsndfile rejects exactly 1.0 for MP3
+    return float(np.clip((high - kbps) / (high - low), 0.0, 0.99))
+
+
+class _FfmpegWriter:
+    """Minimal SoundFile-like writer that pipes 16-bit PCM into ffmpeg."""
+
+    def __init__(self, path, sample_rate: int, channels: int, kbps: int):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise EncoderUnavailableError("AAC output needs ffmpeg on PATH")
+        self._proc = subprocess.Popen(
+            [ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+             "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "-",
+             "-c:a", "aac", "-b:a", f"{kbps}k", "-f", "adts", str(path)],
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+    def write(self, block: np.ndarray) -> None:
+        if block.dtype.kind == "f":
+            block = (np.clip(block, -1.0, 1.0) * 32767).astype("<i2")
+        elif block.dtype != np.int16:
+            block = (block >> (8 * block.dtype.itemsize - 16)).astype("<i2")
+        self._proc.stdin.write(np.ascontiguousarray(block).tobytes())
+
+    def flush(self) -> None:
+        self._proc.stdin.flush()
+
+    def close(self) -> None:
+        if self._proc.stdin.closed:
+            return
+        self._proc.stdin.close()
+        error = self._proc.stderr.read().decode(errors="replace").strip()
+        if self._proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to encode AAC: {error}")
+
+
+def open_writer(
+    path: Union[str, Path],
+    encoding: Encoding,
+    sample_rate: int,
+    channels: int,
+    subtype: Optional[str] = None,
+    bitrate_kbps: Optional[int] = None,
+):
+    """Open *path* for writing blocks in *encoding*.
+
+    Returns an object with ``write(block)``, ``flush()`` and ``close()``
+    (a :class:`soundfile.SoundFile` for libsndfile formats).
+    """
+    kbps = bitrate_kbps or encoding.default_kbps
+    if encoding.format is None:
+        return _FfmpegWriter(path, sample_rate, channels, kbps)
+    kwargs = {}
+    if kbps and encoding.subtype:
+        kwargs["compression_level"] = compression_level(encoding, kbps, channels, sample_rate)
+        if encoding.subtype == "MPEG_LAYER_III":
+            kwargs["bitrate_mode"] = "CONSTANT"
+    return sf.SoundFile(path, "w", samplerate=sample_rate, channels=channels,
+                        subtype=encoding.subtype or subtype, format=encoding.format, **kwargs)
@@ -0,0 +1,273 @@
+"""Long-lived headless Chromium for Step 5's PNG export.
+
+Launching Chromium costs seconds and hundreds of MB, so instead of one
+browser per infographic the process keeps a single :class:`BrowserPool`
+(see :func:`get_browser_pool`) that every job — CLI, web UI or API
+server — renders through.
+
+Playwright objects are bound to the event loop that created them, so the
+pool owns a background thread running an asyncio loop; :meth:`render` is
+a plain blocking call that any thread may make.  Up to ``size`` pages
+render concurrently and are reused between jobs.  A watchdog checks the
+browser every ``health_interval`` seconds, and a browser that crashed or
+disconnected is relaunched — on the next check, or immediately when a
+render notices, in which case the render is retried once.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES = 2
+DEFAULT_VIEWPORT = (1024, 768)
+
+Launcher = Callable[[], Awaitable[Tuple[Any, Callable[[], Awaitable[None]]]]]
+
+
+class BrowserUnavailableError(Exception):
+    pass
+
+
+async def launch_chromium():
+    """Start Playwright and headless Chromium; returns ``(browser, stop)``."""
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError as exc:
+        raise BrowserUnavailableError("Playwright is not installed") from exc
+
+    pw = await async_playwright().start()
+    try:
+        browser = await pw.chromium.launch()
+    except Exception:
+        await pw.stop()
+        raise
+
+    async def stop():
+        try:
+            await browser.close()
+        finally:
+            await pw.stop()
+
+    return browser, stop
+
+
+class BrowserPool:
+    """A shared headless browser with a pool of reusable pages."""
+
+    def __init__(self, size: int = DEFAULT_PAGES, viewport: Tuple[int, int] = DEFAULT_VIEWPORT,
+                 timeout: float = 60.0, health_interval: float = 30.0,
+                 launcher: Optional[Launcher] = None):
+        self.size = max(1, size)
+        self.viewport = {"width": viewport[0], "height": viewport[1]}
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.launches = 0  # also identifies the current browser
+        self._launcher = launcher or launch_chromium
+        self._browser = None
+        self._stop: Optional[Callable[[], Awaitable[None]]] = None
+        self._idle: List[Any] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    # -- loop thread --------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._closed:
+                raise BrowserUnavailableError("Browser pool is shut down")
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, daemon=True,
+                                                name="browser-pool")
+                self._thread.start()
+                self._loop = loop
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+            return self._loop
+
+    def _call(self, coro, timeout: Optional[float] = None):
+        try:
+            loop = self._ensure_loop()
+        except BaseException:
+            coro.close()
+            raise
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    async def _setup(self) -> None:
+        # asyncio primitives must be created on the loop they are used from
+        self._slots = asyncio.Semaphore(self.size)
+        self._launch_lock = asyncio.Lock()
+        if self.health_interval > 0:
+            self._watchdog = asyncio.ensure_future(self._watch())
+
+    # -- browser lifecycle --------------------------------------------------
+
+    def _alive(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if not self._alive():
+                if self._browser is not None:
+                    logger.warning("Headless browser disconnected — relaunching")
+                await self._teardown()
+                self._browser, self._stop = await self._launcher()
+                self.launches += 1
+            return self._browser
+
+    async def _teardown(self) -> None:
+        stop, self._stop = self._stop, None
+        self._browser = None
+        self._idle.clear()
+        if stop is not None:
+            try:
+                await stop()
+            except Exception as exc:
+                logger.debug(f"Error closing browser: {exc}")
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            if self._browser is not None and not self._alive():
+                try:
+                    await self._ensure_browser()
+                except Exception as exc:
+                    logger.warning(f"Could not relaunch headless browser: {exc}")
+            self._idle = [p for p in self._idle if not p.is_closed()]
+
+    # -- pages --------------------------------------------------------------
+
+    async def _acquire(self):
+        """A page and the launch it belongs to, holding one of the ``size`` slots."""
+        await self._slots.acquire()
+        try:
+            browser = await self._ensure_browser()
+            while self._idle:
+                page = self._idle.pop()
+                if not page.is_closed():
+                    return page, self.launches
+            return await browser.new_page(viewport=self.viewport), self.launches
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _release(self, page, launch: int, reuse: bool) -> None:
+        try:
+            if reuse and launch == self.launches and self._alive() and not page.is_closed():
+                self._idle.append(page)
+            elif not page.is_closed():
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        finally:
+            self._slots.release()
+
+    async def _render(self, html: str, png_path: str) -> str:
+        timeout_ms = self.timeout * 1000
+        for attempt in (1, 2):
+            page, launch = await self._acquire()
+            try:
+                await page.set_viewport_size(self.viewport)
+                await page.set_content(html, wait_until="networkidle", timeout=timeout_ms)
+                height = await page.evaluate("document.body.scrollHeight")
+                await page.set_viewport_size({"width": self.viewport["width"], "height": height})
+                await page.screenshot(path=png_path, full_page=True, timeout=timeout_ms)
+            except Exception:
+                await self._release(page, launch, reuse=False)
+                if attempt == 1 and not self._alive():
+                    continue  # the browser died under us: relaunch and retry once
+                raise
+            await self._release(page, launch, reuse=True)
+            return png_path
+
+    # -- public API ---------------------------------------------------------
+
+    def render(self, html: str, png_path: str) -> str:
+        """Screenshot *html* (full page) to *png_path*; blocks until done."""
+        return self._call(self._render(html, png_path))
+
+    def start(self) -> None:
+        """Launch the browser now rather than on the first render."""
+        self._call(self._ensure_browser())
+
+    def warm(self) -> None:
+        """Start launching the browser in the background, without waiting."""
+        async def launch():
+            try:
+                await self._ensure_browser()
+            except Exception as exc:
+                logger.debug(f"Could not launch headless browser: {exc}")
+
+        try:
+            asyncio.run_coroutine_threadsafe(launch(), self._ensure_loop())
+        except BrowserUnavailableError:
+            pass
+
+    def healthy(self) -> bool:
+        """True if the browser is up and a page can evaluate script."""
+        async def check():
+            page, launch = await self._acquire()
+            try:
+                ok = await page.evaluate("1 + 1") == 2
+            except Exception:
+                await self._release(page, launch, reuse=False)
+                return False
+            await self._release(page, launch, reuse=True)
+            return ok
+
+        try:
+            return self._call(check(), timeout=self.timeout)
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        """Close the browser and stop the loop thread."""
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+            self._closed = True
+        if loop is None:
+            return
+
+        async def shutdown():
+            watchdog = getattr(self, "_watchdog", None)
+            if watchdog is not None:
+                watchdog.cancel()
+            await self._teardown()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(self.timeout)
+        except Exception as exc:
+            logger.debug(f"Error shutting down browser pool: {exc}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(self.timeout)
+        loop.close()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(size: int = DEFAULT_PAGES) -> BrowserPool:
+    """The process-wide pool, created on first use (later *size*\\ s are ignored)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(size=size)
+        return _pool
+
+
+@atexit.register
+def shutdown_browser_pool() -> None:
+    """Close the process-wide pool, if one was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -4,8 +4,11 @@ from openai import OpenAI, AzureOpenAI
 from anthropic import Anthropic
 from elevenlabs import save
 from google import genai
+import json
 import logging
+import threading
 import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +80,85 @@ def wait_for_next_step(seconds: float = 2):
     time.sleep(seconds)
 
 
+class OrderedStream:
+    """Re-order results that finish out of order into a growing prefix.
+
+    Producers call ``put(index, item)`` as work completes.  Items are
+    released strictly in index order: once every earlier index is in,
+    subscribers are called with ``(index, item)`` and blocked iterators
+    wake up.  ``close()`` marks the end of the stream; passing *error*
+    makes iterators raise it after the last released item.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._emit_lock = threading.Lock()
+        self._pending: Dict[int, Any] = {}
+        self._released: List[Any] = []
+        self._subscribers: List[Any] = []
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def ready(self) -> int:
+        """Number of items released so far (length of the in-order prefix)."""
+        with self._cond:
+            return len(self._released)
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def subscribe(self, callback) -> None:
+        """Register ``callback(index, item)``; replays the prefix released so far."""
+        with self._emit_lock:
+            with self._cond:
+                already = list(self._released)
+                self._subscribers.append(callback)
+            for idx, item in enumerate(already):
+                callback(idx, item)
+
+    def put(self, index: int, item: Any) -> None:
+        with self._emit_lock:
+            with self._cond:
+                if self._closed:
+                    raise ValueError("Cannot put into a closed OrderedStream")
+                self._pending[index] = item
+                start = len(self._released)
+                while len(self._released) in self._pending:
+                    self._released.append(self._pending.pop(len(self._released)))
+                newly = self._released[start:]
+                subscribers = list(self._subscribers)
+                if newly:
+                    self._cond.notify_all()
+            # Callbacks run under the emit lock so they observe strict order
+            for offset, released in enumerate(newly):
+                for callback in subscribers:
+                    callback(start + offset, released)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._closed = True
+            self._error = error
+            self._cond.notify_all()
+
+    def __iter__(self):
+        idx = 0
+        while True:
+            with self._cond:
+                while idx >= len(self._released) and not self._closed:
+                    self._cond.wait()
+                if idx < len(self._released):
+                    item = self._released[idx]
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            yield item
+            idx += 1
+
+
 def set_provider(
     provider_name: Optional[Literal['openai', 'lmstudio', 'ollama', 'groq', 'azure', 'google', 'anthropic', 'elevenlabs', 'custom']] = None,
     config: Optional[Dict[str, Any]] = None
@@ -175,6 +257,36 @@ def _is_rate_limit_error(e: Exception) -> bool:
     return type(e).__name__ == "RateLimitError"
 
 
+# Per-client 429 backoff shared by every thread using the same client, so
+# concurrent pipeline branches back off together instead of each hammering
+# the provider until it gives up.
+_rate_limit_lock = threading.Lock()
+_rate_limit_until: "weakref.WeakKeyDictionary[Any, float]" = weakref.WeakKeyDictionary()
+
+
+def _wait_for_rate_limit(client) -> None:
+    """Sleep until any backoff recorded for *client* has expired."""
+    with _rate_limit_lock:
+        try:
+            until = _rate_limit_until.get(client, 0.0)
+        except TypeError:  # client can't be weakly referenced
+            return
+    remaining = until - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def _record_rate_limit(client, delay: float) -> None:
+    """Make every caller sharing *client* wait at least *delay* seconds."""
+    with _rate_limit_lock:
+        until = time.monotonic() + delay
+        try:
+            if until > _rate_limit_until.get(client, 0.0):
+                _rate_limit_until[client] = until
+        except TypeError:
+            pass
+
+
 def _call_llm(client, messages, model, max_tokens, temperature) -> str:
     """Single LLM call without retry. Returns raw response text."""
     if isinstance(client, genai.Client):
@@ -246,6 +358,7 @@ def generate_text(
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
+            _wait_for_rate_limit(client)
             text = _call_llm(client, messages, model, max_tokens, temperature)
 
             # Validate response is non-empty
@@ -262,6 +375,7 @@ def generate_text(
                 delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
                 if is_rate_limit:
                     delay = max(delay, 10)  # Wait at least 10s on rate limit
+                    _record_rate_limit(client, delay)
                     logger.warning(f"Rate limited (429). Waiting {delay}s before retry {attempt + 1}/{MAX_RETRIES}...")
                 else:
                     logger.warning(f"generate_text attempt {attempt}/{MAX_RETRIES} failed: {e}. Retrying in {delay}s...")
@@ -275,36 +389,308 @@ def generate_text(
     raise RuntimeError(f"generate_text failed after {MAX_RETRIES} attempts: {last_error}")
 
 
-def generate_speech(
+# ---------------------------------------------------------------------------
+# Structured output
+# ---------------------------------------------------------------------------
+
+# How a provider is asked for schema-conforming JSON:
+#   json_schema — OpenAI-style ``response_format`` (OpenAI, Azure, LM Studio,
+#                 Ollama's /v1 endpoint, recent llama.cpp servers)
+#   json_object — ``response_format={"type": "json_object"}``; JSON but no schema
+#   grammar     — GBNF grammar generated from the schema (llama.cpp ``grammar``)
+#   tool        — Anthropic forced tool call whose input schema is the schema
+#   off         — never; callers parse free text as before
+STRUCTURED_MODES = ("auto", "json_schema", "json_object", "grammar", "tool", "off")
+
+_HOST_MODES = {
+    "api.groq.com": "json_object",
+}
+
+# Providers that rejected a structured request are not asked again
+_structured_unsupported: "weakref.WeakKeyDictionary[Any, set]" = weakref.WeakKeyDictionary()
+_structured_lock = threading.Lock()
+
+
+class StructuredOutputError(Exception):
+    """The provider returned structured output that is not valid JSON.
+
+    *raw* holds the reply as received, so callers can repair it locally
+    instead of generating it again.
+    """
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+class CallStats:
+    """Thread-safe counters of LLM calls by step and outcome.
+
+    Steps count every rewrite/extraction call plus how it was served
+    (``structured``, ``text``), any ``fixup`` calls spent repairing
+    unparseable output, and ``structured_fixup`` for structured replies
+    that had to be repaired locally, so fix-up rates can be compared
+    across providers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def incr(self, step: str, key: str, n: int = 1) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(step, {})
+            counts[key] = counts.get(key, 0) + n
+
+    def get(self, step: str, key: str) -> int:
+        with self._lock:
+            return self._counts.get(step, {}).get(key, 0)
+
+    def rate(self, step: str, key: str, total_key: str = "calls") -> float:
+        with self._lock:
+            counts = self._counts.get(step, {})
+            total = counts.get(total_key, 0)
+            return counts.get(key, 0) / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {step: dict(counts) for step, counts in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def summary(self, step: str) -> str:
+        with self._lock:
+            counts = dict(self._counts.get(step, {}))
+        calls = counts.get("calls", 0)
+        parts = [f"{calls} call(s)"]
+        for key in ("structured", "text", "fixup", "structured_fixup"):
+            if counts.get(key):
+                pct = f" ({counts[key] / calls:.0%})" if calls else ""
+                parts.append(f"{counts[key]} {key}{pct}")
+        return ", ".join(parts)
+
+
+llm_stats = CallStats()
+
+
+def structured_output_mode(client: Any, requested: Optional[str] = "auto") -> str:
+    """Resolve the structured-output mode to use for *client*.
+
+    An explicit mode from config wins; ``auto`` picks by client type and
+    endpoint.  Unknown client types get ``off``.
+    """
+    requested = (requested or "auto").lower()
+    if requested not in STRUCTURED_MODES:
+        raise ValueError(f"Unknown structured_output mode: {requested}")
+    if requested != "auto":
+        mode = requested
+    elif isinstance(client, Anthropic):
+        mode = "tool"
+    elif isinstance(client, (OpenAI, AzureOpenAI)):
+        base_url = str(getattr(client, "base_url", "") or "")
+        mode = next((m for host, m in _HOST_MODES.items() if host in base_url), "json_schema")
+    else:
+        mode = "off"
+
+    with _structured_lock:
+        try:
+            if mode in _structured_unsupported.get(client, ()):
+                return "off"
+        except TypeError:
+            pass
+    return mode
+
+
+def _mark_structured_unsupported(client, mode: str) -> None:
+    with _structured_lock:
+        try:
+            _structured_unsupported.setdefault(client, set()).add(mode)
+        except TypeError:
+            pass
+
+
+def _is_unsupported_error(e: Exception) -> bool:
+    """Detect a provider rejecting the structured-output request itself."""
+    status = getattr(e, "status_code", None)
+    if status in (404, 501):
+        return True
+    err_str = str(e).lower()
+    mentions = any(s in err_str for s in (
+        "response_format", "json_schema", "grammar", "tool", "not supported", "unsupported",
+    ))
+    # A 400 for an unrelated reason (context length, bad model) is a real error
+    return mentions and status in (None, 400, 422)
+
+
+def _gbnf_literal(s: str) -> str:
+    return json.dumps(s)
+
+
+def json_schema_to_gbnf(schema: Dict[str, Any]) -> str:
+    """Translate the JSON Schema subset used by the steps into a GBNF grammar.
+
+    Supports objects (properties emitted in declaration order), arrays,
+    strings, string enums, integers, numbers and booleans.
+    """
+    rules: Dict[str, str] = {}
+
+    def visit(node: Dict[str, Any], name: str) -> str:
+        if "enum" in node:
+            rules[name] = " | ".join(_gbnf_literal(json.dumps(v)) for v in node["enum"]) + " ws"
+            return name
+        kind = node.get("type")
+        if kind == "object":
+            props = node.get("properties", {})
+            parts = []
+            for i, (key, sub) in enumerate(props.items()):
+                sep = '"," ws ' if i else ""
+                parts.append(f'{sep}{_gbnf_literal(json.dumps(key))} ws ":" ws {visit(sub, f"{name}-{i}")}')
+            rules[name] = '"{" ws ' + " ".join(parts) + (" " if parts else "") + '"}" ws'
+            return name
+        if kind == "array":
+            item = visit(node.get("items", {"type": "string"}), f"{name}-item")
+            rules[name] = f'"[" ws ({item} ("," ws {item})*)? "]" ws'
+            return name
+        if kind in ("string", "integer", "number", "boolean"):
+            return kind
+        raise ValueError(f"Unsupported schema type for grammar: {kind}")
+
+    root = visit(schema, "root")
+    if root != "root":
+        rules["root"] = root
+    lines = [f"root ::= {rules.pop('root')}"]
+    lines += [f"{name} ::= {body}" for name, body in rules.items()]
+    lines += [
+        r'string ::= "\"" ( [^"\\\x00-\x1f] | "\\" ( ["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] ) )* "\"" ws',
+        r'integer ::= "-"? [0-9]+ ws',
+        r'number ::= "-"? [0-9]+ ("." [0-9]+)? ([eE] [-+]? [0-9]+)? ws',
+        r'boolean ::= ("true" | "false") ws',
+        r'ws ::= [ \t\n]*',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _call_structured(client, messages, model, schema, schema_name, max_tokens, temperature, mode):
+    """Single structured call without retry.  Returns the decoded JSON value."""
+    if mode == "tool":
+        system_message = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        response = client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_message,
+            messages=[{"role": m["role"], "content": m.get("content", "")}
+                      for m in messages if m.get("role") in ("user", "assistant")],
+            tools=[{
+                "name": schema_name,
+                "description": f"Return the {schema_name.replace('_', ' ')}.",
+                "input_schema": schema,
+            }],
+            tool_choice={"type": "tool", "name": schema_name},
+        )
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use":
+                return block.input
+        text = "".join(getattr(block, "text", "") or "" for block in response.content)
+        raise StructuredOutputError("Response contained no tool call", raw=text)
+
+    kwargs: Dict[str, Any] = {}
+    if mode == "json_schema":
+        kwargs["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "schema": schema, "strict": True},
+        }
+    elif mode == "json_object":
+        kwargs["response_format"] = {"type": "json_object"}
+    elif mode == "grammar":
+        kwargs["extra_body"] = {"grammar": json_schema_to_gbnf(schema)}
+    else:
+        raise ValueError(f"Unsupported structured_output mode: {mode}")
+
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        **kwargs,
+    )
+    content = response.choices[0].message.content or ""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Structured response is not valid JSON: {e}", raw=content)
+
+
+def generate_structured(
     client: Any = None,
-    text: str = None,
-    voice: str = "alloy",
-    model_name: str = "tts-1",
-    response_format: str = "wav",
-    output_path: str = "output"
-):
+    messages: Optional[List[Dict]] = None,
+    model: str = "gpt-4o-mini",
+    schema: Optional[Dict[str, Any]] = None,
+    schema_name: str = "response",
+    max_tokens: int = 512,
+    temperature: float = 0.7,
+    mode: Optional[str] = "auto",
+) -> Optional[Any]:
+    """Ask the provider for JSON matching *schema* and return it decoded.
+
+    Returns ``None`` only when the provider can't do structured output
+    (mode ``off``, or the request was rejected); callers then fall back
+    to free-text generation and parsing.  A rejected mode is remembered
+    per client so later calls skip it.  A reply that isn't valid JSON
+    raises :class:`StructuredOutputError` carrying the raw reply, for
+    the caller to repair without another generation.  Transient
+    failures are retried like :func:`generate_text`.
+    """
+    if client is None:
+        raise ValueError("Client is required")
+    if not messages:
+        raise ValueError("Messages are required")
+    if not schema:
+        raise ValueError("Schema is required")
+
+    mode = structured_output_mode(client, mode)
+    if mode == "off":
+        return None
+
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            if isinstance(client, ElevenLabs):
-                file_extension = response_format.split('_')[0].split('-')[0]
-                audio = client.text_to_speech.convert(
-                    text=text,
-                    voice_id=voice,
-                    model_id=model_name,
-                    output_format=response_format,
-                )
-                save(audio=audio, filename=str(f"{output_path}.{file_extension}"))
-            else:
-                with client.audio.speech.with_streaming_response.create(
-                    model=model_name,
-                    voice=voice,
-                    input=text,
-                    response_format=response_format
-                ) as response:
-                    response.stream_to_file(str(f"{output_path}.{response_format}"))
+            _wait_for_rate_limit(client)
+            return _call_structured(client, messages, model, schema, schema_name,
+                                    max_tokens, temperature, mode)
+        except StructuredOutputError:
+            raise
+        except Exception as e:
+            last_error = e
+            if _is_rate_limit_error(e):
+                if attempt < MAX_RETRIES:
+                    delay = max(RETRY_BASE_DELAY * (2 ** (attempt - 1)), 10)
+                    _record_rate_limit(client, delay)
+                    logger.warning(f"Rate limited (429). Waiting {delay}s before retry {attempt + 1}/{MAX_RETRIES}...")
+                    time.sleep(delay)
+                    continue
+            elif _is_unsupported_error(e):
+                logger.info(f"Provider rejected structured output ({mode}); using text parsing: {e}")
+                _mark_structured_unsupported(client, mode)
+                return None
+            elif attempt < MAX_RETRIES:
+                delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                logger.warning(f"generate_structured attempt {attempt}/{MAX_RETRIES} failed: {e}. Retrying in {delay}s...")
+                time.sleep(delay)
+                continue
+
+    raise RuntimeError(f"generate_structured failed after {MAX_RETRIES} attempts: {last_error}")
 
-            return f"{output_path}.{response_format}"
+
+def _with_tts_retries(client, request, name: str):
+    """Call *request()* with the TTS retry and shared 429 backoff policy."""
+    last_error = None
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            _wait_for_rate_limit(client)
+            return request()
 
         except Exception as e:
             last_error = e
@@ -313,11 +699,75 @@ def generate_speech(
                 delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
                 if is_rate_limit:
                     delay = max(delay, 10)
+                    _record_rate_limit(client, delay)
                     logger.warning(f"TTS rate limited (429). Waiting {delay}s before retry {attempt + 1}/{MAX_RETRIES}...")
                 else:
-                    logger.warning(f"generate_speech attempt {attempt}/{MAX_RETRIES} failed: {e}. Retrying in {delay}s...")
+                    logger.warning(f"{name} attempt {attempt}/{MAX_RETRIES} failed: {e}. Retrying in {delay}s...")
                 time.sleep(delay)
             else:
-                logger.error(f"generate_speech failed after {MAX_RETRIES} attempts: {e}")
+                logger.error(f"{name} failed after {MAX_RETRIES} attempts: {e}")
+
+    raise RuntimeError(f"{name} failed after {MAX_RETRIES} attempts: {last_error}")
+
 
-    raise RuntimeError(f"generate_speech failed after {MAX_RETRIES} attempts: {last_error}")
\ No newline at end of file
+def generate_speech(
+    client: Any = None,
+    text: str = None,
+    voice: str = "alloy",
+    model_name: str = "tts-1",
+    response_format: str = "wav",
+    output_path: str = "output"
+):
+    def request():
+        if isinstance(client, ElevenLabs):
+            file_extension = response_format.split('_')[0].split('-')[0]
+            audio = client.text_to_speech.convert(
+                text=text,
+                voice_id=voice,
+                model_id=model_name,
+                output_format=response_format,
+            )
+            save(audio=audio, filename=str(f"{output_path}.{file_extension}"))
+        else:
+            with client.audio.speech.with_streaming_response.create(
+                model=model_name,
+                voice=voice,
+                input=text,
+                response_format=response_format
+            ) as response:
+                response.stream_to_file(str(f"{output_path}.{response_format}"))
+
+        return f"{output_path}.{response_format}"
+
+    return _with_tts_retries(client, request, "generate_speech")
+
+
+def speech_bytes(
+    client: Any = None,
+    text: str = None,
+    voice: str = "alloy",
+    model_name: str = "tts-1",
+    response_format: str = "pcm",
+) -> bytes:
+    """Like :func:`generate_speech`, but return the audio instead of saving it.
+
+    Use ``response_format="pcm"`` (OpenAI, 24 kHz) or ``"pcm_<rate>"``
+    (ElevenLabs) for raw 16-bit mono samples that need no decoding.
+    """
+    def request():
+        if isinstance(client, ElevenLabs):
+            return b"".join(client.text_to_speech.convert(
+                text=text,
+                voice_id=voice,
+                model_id=model_name,
+                output_format=response_format,
+            ))
+        with client.audio.speech.with_streaming_response.create(
+            model=model_name,
+            voice=voice,
+            input=text,
+            response_format=response_format
+        ) as response:
+            return response.read()
+
+    return _with_tts_retries(client, request, "speech_bytes")
@@ -0,0 +1,196 @@
+"""Progressive playback of the podcast while Step 4 is still running.
+
+Step 4 appends each segment, in turn order, to ``podcast.live.wav`` as
+soon as it and every earlier segment are synthesized, and flushes the WAV
+header after each one, so the file is always a valid, growing recording.
+When the step finishes the live file becomes ``podcast.wav`` (or is
+removed once ``podcast.<format>`` is encoded).
+
+:func:`follow` tails that file for HTTP clients: it yields the header
+with open-ended RIFF/data sizes (the usual convention for streamed WAV,
+so players keep reading) and then the sample bytes as they are written.
+:func:`follow_frames` decodes the same stream into numpy blocks for UIs
+that play PCM chunks.
+"""
+
+import logging
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LIVE_AUDIO_NAME = "podcast.live.wav"
+POLL_INTERVAL = 0.5
+CHUNK_BYTES = 64 * 1024
+_OPEN_ENDED = 0xFFFFFFFF
+
+_WAVE_FORMAT_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavLayout(NamedTuple):
+    data_offset: int    # first sample byte
+    data_size: int      # as recorded in the header when it was read
+    sample_rate: int
+    channels: int
+    bits: int
+    is_float: bool
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.bits // 8
+
+
+def read_layout(head: bytes) -> Optional[WavLayout]:
+    """Parse the RIFF chunks up to ``data``.  ``None`` if *head* is incomplete."""
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    pos, fmt = 12, None
+    while pos + 8 <= len(head):
+        chunk_id, size = head[pos:pos + 4], struct.unpack_from("<I", head, pos + 4)[0]
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            if body + 16 > len(head):
+                return None
+            tag, channels, rate, _, _, bits = struct.unpack_from("<HHIIHH", head, body)
+            if tag == _WAVE_FORMAT_EXTENSIBLE and body + 26 <= len(head):
+                tag = struct.unpack_from("<H", head, body + 24)[0]
+            fmt = (rate, channels, bits, tag == _WAVE_FORMAT_FLOAT)
+        elif chunk_id == b"data":
+            return WavLayout(body, size, *fmt) if fmt else None
+        pos = body + size + (size & 1)
+    return None
+
+
+def open_ended_header(head: bytes, layout: WavLayout) -> bytes:
+    """*head* (up to the first sample) with RIFF and data sizes left open."""
+    patched = bytearray(head[:layout.data_offset])
+    struct.pack_into("<I", patched, 4, _OPEN_ENDED)
+    struct.pack_into("<I", patched, layout.data_offset - 4, _OPEN_ENDED)
+    return bytes(patched)
+
+
+def _wait_for_layout(fh, finished, poll_interval) -> Optional[Tuple[bytes, WavLayout]]:
+    while True:
+        fh.seek(0)
+        head = fh.read(4096)
+        layout = read_layout(head)
+        if layout is not None:
+            return head, layout
+        if finished():
+            return None
+        time.sleep(poll_interval)
+
+
+def follow(
+    path: Union[str, Path],
+    finished: Callable[[], bool],
+    poll_interval: float = POLL_INTERVAL,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> Iterator[bytes]:
+    """Yield the growing WAV at *path* until *finished* returns True.
+
+    Waits for the file to appear.  The open handle keeps reading after
+    Step 4 renames or removes the live file, so the stream always ends
+    with the last sample.
+    """
+    path = Path(path)
+    while not path.exists():
+        if finished():
+            return
+        time.sleep(poll_interval)
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:  # finished between the check and the open
+        return
+    with fh:
+        found = _wait_for_layout(fh, finished, poll_interval)
+        if found is None:
+            return
+        head, layout = found
+        yield open_ended_header(head, layout)
+        pos = layout.data_offset
+        fh.seek(pos)
+        while True:
+            chunk = fh.read(chunk_bytes)
+            if chunk:
+                pos += len(chunk)
+                yield chunk
+                continue
+            if finished() or not path.exists():
+                # Final header: stop at the recorded data size, skipping any trailing chunks
+                fh.seek(0)
+                final = read_layout(fh.read(layout.data_offset))
+                end = layout.data_offset + final.data_size if final else None
+                fh.seek(pos)
+                rest = fh.read() if end is None else fh.read(max(0, end - pos))
+                if rest:
+                    yield rest
+                return
+            time.sleep(poll_interval)
+
+
+def _decode(buf: bytes, layout: WavLayout) -> np.ndarray:
+    if layout.is_float:
+        data = np.frombuffer(buf, dtype="<f4" if layout.bits == 32 else "<f8")
+    elif layout.bits == 8:
+        data = np.frombuffer(buf, dtype=np.uint8).astype(np.int16) - 128
+        data = (data << 8).astype(np.int16)
+    elif layout.bits == 24:
+        b = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3).astype(np.uint32)
+        data = ((b[:, 0] << 8) | (b[:, 1] << 16) | (b[:, 2] << 24)).view(np.int32)
+    else:
+        data = np.frombuffer(buf, dtype="<i2" if layout.bits == 16 else "<i4")
+    return data.reshape(-1, layout.channels)
+
+
+def follow_frames(
+    path: Union[str, Path],
+    finished: Callable[[], bool],
+    poll_interval: float = POLL_INTERVAL,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Like :func:`follow`, but yield ``(sample_rate, frames)`` blocks."""
+    stream = follow(path, finished, poll_interval)
+    head = next(stream, None)
+    if head is None:
+        return
+    layout = read_layout(head)
+    pending = b""
+    for chunk in stream:
+        pending += chunk
+        usable = len(pending) - len(pending) % layout.frame_bytes
+        if usable:
+            yield layout.sample_rate, _decode(pending[:usable], layout)
+            pending = pending[usable:]
+
+
+def live_audio_path(step4_dir: Union[str, Path]) -> Path:
+    return Path(step4_dir) / LIVE_AUDIO_NAME
+
+
+def read_range(path: Union[str, Path], start: int, end: Optional[int] = None) -> Tuple[bytes, int]:
+    """Bytes ``start..end`` (inclusive) of the growing WAV at *path*.
+
+    Returns ``(data, current_size)``; header bytes in the range carry the
+    open-ended sizes :func:`follow` uses, so a player fetching the file
+    piecewise keeps requesting past what exists now.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        stop = size if end is None else min(end + 1, size)
+        if start >= stop:
+            return b"", size
+        fh.seek(start)
+        data = fh.read(stop - start)
+        fh.seek(0)
+        head = fh.read(4096)
+    layout = read_layout(head)
+    if layout is not None and start < layout.data_offset:
+        header = open_ended_header(head, layout)[start:]
+        data = header[:len(data)] + data[len(header):]
+    return data, size
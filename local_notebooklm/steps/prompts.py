@@ -312,6 +312,75 @@ DO NOT include episode titles, named speakers, intros, or section headers—ONLY
 """
 
 
+step2_map_segment_prompt = """You are writing ONE segment from the middle of a {length} {style} {format_type} transcript. {preference_text}
+
+This is segment {part} of the episode. Other writers are producing the other segments in parallel, and a separate writer will add the opening and the closing.
+
+Rules:
+- Turn ONLY the source material below into dialogue for this segment.
+- DO NOT greet the audience, introduce the show or the speakers, or say goodbye.
+- DO NOT summarize what came before or tease what comes next.
+- Label every line as 'Speaker 1', 'Speaker 2', etc., exactly as in the rest of the transcript.
+- Output ONLY the dialogue, no titles or section headers."""
+
+
+step2_reduce_prompt = """You are the lead writer of a {length} {style} {format_type} transcript. {preference_text}
+
+The body of the episode has already been written as separate segments. Below are the opening lines of each segment, in order.
+
+Write TWO short pieces of dialogue that frame the episode:
+1. An OPENING that introduces the topic and the speakers and leads naturally into the first segment.
+2. A CLOSING that wraps up the main points covered by the segments and says goodbye.
+
+Label every line as 'Speaker 1', 'Speaker 2', etc. Output the OPENING, then a line containing only {separator}, then the CLOSING. Output nothing else."""
+
+
+step2_section_summary_prompt = """You are condensing one section of a long document so that a {format_type} can later be written about the whole document.
+
+Summarize the section below in at most {target_chars} characters.
+- Keep concrete facts, names, numbers, definitions, arguments and examples.
+- Drop repetition, boilerplate, citations and formatting noise.
+- Write plain prose in the order the material appears. No headings, no markdown, no commentary about the task."""
+
+
+step2_merge_summary_prompt = """You are combining consecutive summaries of a long document into a single summary of the larger part they cover.
+
+Merge the summaries below into at most {target_chars} characters.
+- Preserve the order of ideas and the most important facts, names and numbers.
+- Remove overlap between the summaries.
+- Write plain prose. No headings, no markdown, no commentary about the task."""
+
+
+step3_concurrent_context_prompt = """This is part {part} of {total} of the transcript. Other writers are rewriting the other parts at the same time, so you will NOT see their output.
+
+Outline of the whole transcript, one line per part:
+{outline}
+
+The source just BEFORE your part (already covered by the previous writer, for context only):
+{before}
+
+The source just AFTER your part (will be covered by the next writer, for context only):
+{after}
+
+Rewrite ONLY the text of your part. Pick up naturally from where the previous part leaves off and lead into the next one. Keep the same speakers and voices throughout."""
+
+
+step23_fused_instruction = """OUTPUT FORMAT — THIS OVERRIDES ANY FORMAT INSTRUCTION ABOVE:
+The script goes straight to a text-to-speech engine, so write the final, ready-to-record version in {language} now. There is no later editing pass.
+
+Return ONLY a Python list of tuples, one tuple per speaker turn, in order:
+
+[
+  ("Speaker 1", "text spoken by Speaker 1"),
+  ("Speaker 2", "text spoken by Speaker 2")
+]
+
+- Label speakers only as "Speaker 1", "Speaker 2", etc. ONLY ONE SPEAKER CAN TALK AT A TIME.
+- Every text is read aloud exactly as written: no stage directions, sound effects, markdown, episode titles, chapter titles or section headers.
+- Keep the "umm", "hmm" and interruptions inside the spoken text.
+- Escape quotes so the list is valid Python, and do not wrap it in ```."""
+
+
 step3_system_promp = """You are an international award-winning screenwriter, content re-writer, content formater, and translator.
 
 You have been working with multiple award-winning creators across {format_type}.
@@ -455,6 +524,13 @@ def map_step3_system_prompt(format_type, language) -> str:
     return step3_system_promp.format(format_type=format_type, language=language)
 
 
+def map_step23_system_prompt(length, style, format_type, preference_text, language, system_prompt=None) -> str:
+    """Step 2's writing prompt (or a custom one) with Step 3's output rules appended."""
+    if system_prompt is None:
+        system_prompt = map_step2_system_prompt(length=length, style=style, format_type=format_type, preference_text=preference_text)
+    return system_prompt + "\n\n" + step23_fused_instruction.format(language=language)
+
+
 step5_system_prompt = """You are a world-class content analyst. Given a podcast transcript, extract structured metadata as a single JSON object.
 
 Return ONLY valid JSON (no markdown fences, no commentary). The JSON must contain these keys:
@@ -485,4 +561,44 @@ Rules:
 - "line_count" is your best estimate of how many dialogue turns each speaker has.
 - "role" should be one of: Host, Co-Host, Guest, Narrator, Moderator, Panelist.
 - Extract ONLY information present in the transcript. Do not invent content.
-- Return raw JSON only — no markdown code fences, no extra text."""
\ No newline at end of file
+- Return raw JSON only — no markdown code fences, no extra text."""
+
+step5_chunk_system_prompt = """You are a world-class content analyst. You are given ONE PART of a longer podcast transcript. Extract structured metadata for this part only, as a single JSON object.
+
+Return ONLY valid JSON (no markdown fences, no commentary). The JSON must contain these keys:
+
+{
+  "summary": "1-2 sentences on what this part covers",
+  "topics": [
+    {"name": "Topic Name", "description": "Brief description", "importance": 4}
+  ],
+  "key_takeaways": ["First key takeaway", "Second key takeaway"],
+  "notable_quotes": [
+    {"speaker": "Speaker 1", "quote": "The exact quote from the transcript"}
+  ],
+  "speakers": [
+    {"label": "Speaker 1", "role": "Host", "line_count": 12}
+  ],
+  "conversation_flow": [
+    {"speaker": "Speaker 1", "topic": "Introduction"}
+  ]
+}
+
+Rules:
+- "importance" is an integer from 1 (minor) to 5 (central theme).
+- Include 1-4 topics, 1-3 key takeaways, 1-2 notable quotes, and every speaker in this part.
+- "conversation_flow" should have 2-4 entries showing the progression within this part.
+- "role" should be one of: Host, Co-Host, Guest, Narrator, Moderator, Panelist.
+- Quotes must be copied exactly from the transcript.
+- Extract ONLY information present in this part. Do not invent content.
+- Return raw JSON only — no markdown code fences, no extra text."""
+
+
+step5_headline_system_prompt = """You are a world-class content analyst. You are given the summaries of consecutive parts of one podcast episode, followed by its main topics.
+
+Return ONLY valid JSON (no markdown fences, no commentary) with these keys:
+
+{
+  "title": "A concise, engaging title for this podcast episode",
+  "summary": "A 2-3 sentence summary of the whole episode"
+}"""
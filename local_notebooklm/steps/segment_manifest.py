@@ -0,0 +1,100 @@
+"""Per-segment manifest that makes Step 4 resumable.
+
+``segments/manifest.json`` records, for every planned TTS request, the
+:func:`~.tts_cache.segment_key` of its text and voice, the voice, and the
+segment file's size and duration once it is done (or the error if it
+failed).  It is rewritten atomically as each segment finishes, so after
+a crash or a provider failure on segment 57 of 80 a rerun (or
+``skip_to=4``) only synthesizes segments that are missing, failed, or
+whose text or voice changed.
+
+Unlike the :class:`~.tts_cache.SegmentCache`, which can be disabled or
+shared, the manifest costs no copies: completed segments are reused in
+place.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .segment_plan import segment_duration
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+DONE = "done"
+FAILED = "failed"
+
+
+class SegmentManifest:
+    """Thread-safe record of Step 4's segments, saved after every update."""
+
+    def __init__(self, path: Union[str, Path], load: bool = True):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        if load:
+            self._entries = self._read()
+
+    def _read(self) -> Dict[int, Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable segment manifest {self.path}: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return {entry["segment"]: entry for entry in data.get("segments", [])
+                if isinstance(entry, dict) and "segment" in entry}
+
+    def entry(self, index: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(index)
+
+    def reusable(self, index: int, key: str, path: Union[str, Path]) -> bool:
+        """True if segment *index* was completed for *key* and *path* is still that file."""
+        entry = self.entry(index)
+        if not entry or entry.get("status") != DONE or entry.get("key") != key:
+            return False
+        try:
+            return os.path.getsize(path) == entry.get("bytes")
+        except OSError:
+            return False
+
+    def retain(self, count: int) -> None:
+        """Forget segments beyond *count* (left over from a longer plan)."""
+        with self._lock:
+            self._entries = {i: e for i, e in self._entries.items() if i <= count}
+
+    def record(self, index: int, key: str, voice: str, path: Union[str, Path],
+               error: Optional[BaseException] = None) -> None:
+        """Mark segment *index* done (or failed with *error*) and save."""
+        path = Path(path)
+        entry = {"segment": index, "file": path.name, "key": key, "voice": voice}
+        if error is None:
+            entry.update(status=DONE, bytes=path.stat().st_size, duration=segment_duration(path))
+        else:
+            entry.update(status=FAILED, error=str(error))
+        with self._lock:
+            self._entries[index] = entry
+            self._save()
+
+    def _save(self) -> None:
+        data = {"version": MANIFEST_VERSION,
+                "segments": [self._entries[i] for i in sorted(self._entries)]}
+        tmp = self.path.with_suffix(".tmp")  # saves are serialized by the lock
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write segment manifest {self.path}: {e}")
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,175 @@
+"""Plan Step 4's TTS requests from the script's speaker turns.
+
+One request per turn wastes a round trip on every "Right!" and sends
+monologues long enough to hit ``TTS_TIMEOUT`` as a single request that
+cannot be parallelized.  The planner instead:
+
+* splits turns longer than ``max_chars`` at sentence boundaries (then
+  clause boundaries, then spaces) into pieces of at most ``max_chars``;
+* packs consecutive pieces that use the same voice into one request, up
+  to ``max_chars``.
+
+Every planned segment remembers which turns it carries and how many
+characters of each, so :func:`turn_timings` can map the synthesized
+durations back to per-turn start/end times.
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CHARS = 1200  # ~75 s of speech; well below provider input limits
+TIMING_FILENAME = "timing.json"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"'”’)\]])\s+|(?<=[。！？])\s*")
+_CLAUSE_END = re.compile(r"(?<=[,;:—])\s+")
+_SPACE = re.compile(r"\s+")
+
+
+class Piece(NamedTuple):
+    turn: int
+    chars: int
+
+
+class PlannedSegment(NamedTuple):
+    speaker: str              # first speaker; every piece uses the same voice
+    voice: str
+    text: str
+    pieces: Tuple[Piece, ...]
+
+    @property
+    def turns(self) -> List[int]:
+        return sorted({p.turn for p in self.pieces})
+
+
+def _pack(parts: Iterable[str], max_chars: int) -> List[str]:
+    """Join consecutive *parts* with spaces into chunks of at most *max_chars*."""
+    chunks, current = [], ""
+    for part in parts:
+        if current and len(current) + 1 + len(part) > max_chars:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """Split *text* into pieces of at most *max_chars*, at the coarsest boundary that fits."""
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    parts = []
+    for sentence in filter(None, _SENTENCE_END.split(text)):
+        if len(sentence) <= max_chars:
+            parts.append(sentence)
+            continue
+        for clause in filter(None, _CLAUSE_END.split(sentence)):
+            if len(clause) <= max_chars:
+                parts.append(clause)
+                continue
+            for word in _SPACE.split(clause):
+                # Unbroken runs (URLs, scripts without spaces) are cut hard
+                parts.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+    return _pack(parts, max_chars)
+
+
+def plan_segments(
+    turns: Sequence[Tuple[str, str]],
+    voice_for: Callable[[str], str],
+    max_chars: int = DEFAULT_MAX_CHARS,
+) -> List[PlannedSegment]:
+    """Turn ``(speaker, text)`` turns into TTS requests.
+
+    ``max_chars <= 0`` keeps the original one request per turn.
+    """
+    if max_chars <= 0:
+        return [PlannedSegment(speaker, voice_for(speaker), text, (Piece(i, len(text)),))
+                for i, (speaker, text) in enumerate(turns)]
+
+    plan: List[PlannedSegment] = []
+    for i, (speaker, text) in enumerate(turns):
+        voice = voice_for(speaker)
+        for piece in split_text(text, max_chars):
+            last = plan[-1] if plan else None
+            if last and last.voice == voice and len(last.text) + 1 + len(piece) <= max_chars:
+                plan[-1] = last._replace(text=f"{last.text} {piece}",
+                                         pieces=last.pieces + (Piece(i, len(piece)),))
+            else:
+                plan.append(PlannedSegment(speaker, voice, piece, (Piece(i, len(piece)),)))
+    return plan
+
+
+def turn_timings(
+    plan: Sequence[PlannedSegment],
+    durations: Sequence[float],
+    turns: Sequence[Tuple[str, str]],
+) -> Dict[str, list]:
+    """Start/end times of every segment and turn in the assembled audio.
+
+    A segment's duration is shared among its pieces by character count.
+    Segments with no duration (``None``, e.g. skipped as missing) take no
+    time, and turns entirely inside them are left out.
+    """
+    segments, spans = [], {}
+    clock = 0.0
+    for index, (segment, duration) in enumerate(zip(plan, durations), start=1):
+        duration = duration or 0.0
+        segments.append({"segment": index, "start": round(clock, 3),
+                         "end": round(clock + duration, 3), "turns": segment.turns})
+        total_chars = sum(p.chars for p in segment.pieces) or 1
+        offset = clock
+        for piece in segment.pieces:
+            length = duration * piece.chars / total_chars
+            if duration:
+                start, end = spans.get(piece.turn, (offset, offset))
+                spans[piece.turn] = (min(start, offset), offset + length)
+            offset += length
+        clock += duration
+    timed_turns = [
+        {"turn": i, "speaker": turns[i][0], "start": round(start, 3), "end": round(end, 3)}
+        for i, (start, end) in sorted(spans.items())
+    ]
+    return {"segments": segments, "turns": timed_turns}
+
+
+def segment_duration(path: Union[str, Path]) -> Optional[float]:
+    try:
+        info = sf.info(str(path))
+    except Exception:
+        return None
+    return info.frames / info.samplerate
+
+
+def write_timing(
+    path: Union[str, Path],
+    plan: Sequence[PlannedSegment],
+    segment_files: Sequence[Path],
+    turns: Sequence[Tuple[str, str]],
+    skipped: Iterable[Path] = (),
+    durations: Optional[Sequence[Optional[float]]] = None,
+) -> Path:
+    """Write :func:`turn_timings` for the assembled segments to *path*.
+
+    Segment durations are read from *segment_files* unless the caller
+    already knows them (*durations*, ``None`` for skipped segments).
+    """
+    if durations is None:
+        skipped = set(skipped)
+        durations = [None if f in skipped else segment_duration(f) for f in segment_files]
+    timing = turn_timings(plan, durations, turns)
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(timing, f, indent=1)
+    os.replace(tmp, path)
+    return path
@@ -1,4 +1,4 @@
-from .helpers import generate_text, FormatType, wait_for_next_step
+from .helpers import generate_text, FormatType, wait_for_next_step, OrderedStream
 from typing import Optional, List, Dict, Any
 from .prompts import step1_prompt
 from ..loaders import load_input, LoaderError
@@ -77,8 +77,15 @@ def step1(
     config: Optional[Dict[str, Any]] = None,
     output_dir: str = None,
     format_type: FormatType = "podcast",
-    system_prompt: str = None
+    system_prompt: str = None,
+    stream: Optional[OrderedStream] = None
 ) -> str:
+    """Extract and clean the input document.
+
+    When *stream* is given, each cleaned chunk is also ``put`` into it in
+    document order as soon as all earlier chunks are done, and the stream
+    is closed (with the failure, if any) when Step 1 finishes.
+    """
     try:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -100,32 +107,26 @@ def step1(
         max_tokens = config["Step1"]["max_tokens"]
         temperature = config["Step1"]["temperature"]
 
-        if num_chunks <= 1:
-            # Single chunk — no need for thread pool overhead
-            results = {}
-            for i, chunk in enumerate(chunks):
-                results[i] = process_chunk(
-                    client=client,
-                    text_chunk=chunk,
-                    chunk_num=i,
-                    format_type=format_type,
-                    system_prompt=system_prompt,
-                    model_name=model_name,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                )
-        else:
-            # Parallel chunk processing — each chunk is independently cleaned
-            workers = min(MAX_WORKERS, num_chunks)
-            logger.info(f"Using {workers} parallel workers")
-            results = {}
-            errors = []
-
-            with ThreadPoolExecutor(max_workers=workers) as pool:
-                future_to_idx = {}
+        # Cleaned chunks are released in document order as soon as every
+        # earlier chunk is done; the output file grows with that prefix so
+        # downstream consumers can start before the slowest chunk returns.
+        ordered = OrderedStream()
+        out_file = open(output_file, 'w', encoding='utf-8')
+
+        def _write_chunk(idx, text):
+            out_file.write(text + "\n")
+            out_file.flush()
+            if stream is not None:
+                stream.put(idx, text)
+
+        ordered.subscribe(_write_chunk)
+        errors = []
+
+        try:
+            if num_chunks <= 1:
+                # Single chunk — no need for thread pool overhead
                 for i, chunk in enumerate(chunks):
-                    fut = pool.submit(
-                        process_chunk,
+                    ordered.put(i, process_chunk(
                         client=client,
                         text_chunk=chunk,
                         chunk_num=i,
@@ -134,33 +135,61 @@ def step1(
                         model_name=model_name,
                         max_tokens=max_tokens,
                         temperature=temperature,
+                    ))
+            else:
+                # Parallel chunk processing — each chunk is independently cleaned
+                workers = min(MAX_WORKERS, num_chunks)
+                logger.info(f"Using {workers} parallel workers")
+
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    future_to_idx = {}
+                    for i, chunk in enumerate(chunks):
+                        fut = pool.submit(
+                            process_chunk,
+                            client=client,
+                            text_chunk=chunk,
+                            chunk_num=i,
+                            format_type=format_type,
+                            system_prompt=system_prompt,
+                            model_name=model_name,
+                            max_tokens=max_tokens,
+                            temperature=temperature,
+                        )
+                        future_to_idx[fut] = i
+
+                    for fut in tqdm(as_completed(future_to_idx), total=num_chunks, desc="Processing chunks", disable=None):
+                        idx = future_to_idx[fut]
+                        try:
+                            ordered.put(idx, fut.result())
+                        except Exception as e:
+                            errors.append(f"Chunk {idx}: {e}")
+
+                if errors:
+                    raise ChunkProcessingError(
+                        f"{len(errors)} chunk(s) failed:\n  " + "\n  ".join(errors)
                     )
-                    future_to_idx[fut] = i
-
-                for fut in tqdm(as_completed(future_to_idx), total=num_chunks, desc="Processing chunks", disable=None):
-                    idx = future_to_idx[fut]
-                    try:
-                        results[idx] = fut.result()
-                    except Exception as e:
-                        errors.append(f"Chunk {idx}: {e}")
-
-            if errors:
-                raise ChunkProcessingError(
-                    f"{len(errors)} chunk(s) failed:\n  " + "\n  ".join(errors)
-                )
-
-        # Write results in original order
-        with open(output_file, 'w', encoding='utf-8') as out_file:
-            for i in range(num_chunks):
-                out_file.write(results[i] + "\n")
-                out_file.flush()
+        except Exception:
+            out_file.close()
+            # Never leave a truncated file behind for skip_to to pick up
+            output_file.unlink(missing_ok=True)
+            raise
+
+        out_file.close()
+        ordered.close()
+        if stream is not None:
+            stream.close()
 
         logger.info("Processing complete")
         return str(output_file)
 
     except (DocumentProcessingError, ChunkProcessingError, LoaderError) as e:
         logger.error(f"Processing failed: {str(e)}")
+        if stream is not None and not stream.closed:
+            stream.close(error=e)
         raise
     except Exception as e:
         logger.error(f"Unexpected error during processing: {str(e)}")
-        raise DocumentProcessingError(f"Document processing failed: {str(e)}")
+        error = DocumentProcessingError(f"Document processing failed: {str(e)}")
+        if stream is not None and not stream.closed:
+            stream.close(error=error)
+        raise error
@@ -1,13 +1,20 @@
 from .helpers import generate_text, wait_for_next_step, FormatType, LengthType, StyleType
-from .prompts import map_step2_system_prompt
-from typing import Any, Dict, Optional
-import logging, pickle, time
+from .prompts import map_step2_system_prompt, step2_map_segment_prompt, step2_reduce_prompt
+from .step2_brief import build_document_brief, SummarizationError
+from .artifacts import TRANSCRIPT_KIND, turns_from_text, write_turns
+from typing import Any, Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import logging, time
 from pathlib import Path
 from tqdm import tqdm
 
 
 logger = logging.getLogger(__name__)
 
+MAX_WORKERS = 4  # parallel LLM calls for map-reduce segments
+REDUCE_SEPARATOR = "===CLOSING==="
+REDUCE_EXCERPT_CHARS = 400  # opening excerpt of each segment shown to the reduce pass
+
 class TranscriptError(Exception):
     pass
 class FileReadError(TranscriptError):
@@ -38,6 +45,90 @@ def read_input_file(filename: str) -> str:
     except IOError as e:
         raise FileReadError(f"Could not read file '{filename}': {str(e)}")
 
+def split_with_overlap(input_text: str, chunk_size: int, overlap_size: int) -> List[str]:
+    """Split text into fixed-size character chunks that overlap by *overlap_size*."""
+    chunks = []
+    start = 0
+    while start < len(input_text):
+        end = min(start + chunk_size, len(input_text))
+        chunks.append(input_text[start:end])
+        start = end - overlap_size if end < len(input_text) else end
+    return chunks
+
+
+def generate_transcript_map_reduce(
+    client,
+    model_name,
+    chunks: Iterable[str],
+    length,
+    style,
+    format_type,
+    preference_text,
+    max_tokens,
+    temperature,
+    max_workers: int = MAX_WORKERS,
+) -> str:
+    """Generate a long transcript as independent segments plus one framing pass.
+
+    Map: every chunk becomes a body segment in its own LLM call, run
+    concurrently (chunks are submitted as they are read, so *chunks* may
+    be a live stream).  Reduce: one short call writes the opening and
+    closing from excerpts of the segments, so the result has a single
+    consistent intro and outro.
+    """
+    try:
+        segment_futures = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for i, chunk in enumerate(chunks, 1):
+                conversation = [
+                    {"role": "system", "content": step2_map_segment_prompt.format(
+                        length=length, style=style, format_type=format_type,
+                        preference_text=preference_text or "", part=i,
+                    )},
+                    {"role": "user", "content": chunk},
+                ]
+                segment_futures.append(pool.submit(
+                    generate_text,
+                    client=client,
+                    model=model_name,
+                    messages=conversation,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                ))
+
+            segments = []
+            for fut in tqdm(segment_futures, desc="Generating segments"):
+                segments.append(fut.result().strip())
+
+        logger.info(f"Map phase produced {len(segments)} segments; writing opening and closing")
+
+        excerpts = "\n\n".join(
+            f"Segment {i}:\n{segment[:REDUCE_EXCERPT_CHARS]}"
+            for i, segment in enumerate(segments, 1)
+        )
+        conversation = [
+            {"role": "system", "content": step2_reduce_prompt.format(
+                length=length, style=style, format_type=format_type,
+                preference_text=preference_text or "", separator=REDUCE_SEPARATOR,
+            )},
+            {"role": "user", "content": excerpts},
+        ]
+        framing = generate_text(
+            client=client,
+            model=model_name,
+            messages=conversation,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        opening, _, closing = framing.partition(REDUCE_SEPARATOR)
+
+        parts = [opening.strip(), *segments, closing.strip()]
+        return "\n".join(part for part in parts if part)
+
+    except Exception as e:
+        raise TranscriptGenerationError(f"Failed to generate map-reduce transcript: {str(e)}")
+
+
 def generate_transcript(
     client,
     model_name,
@@ -50,7 +141,10 @@ def generate_transcript(
     max_tokens,
     temperature,
     chunk_token_limit,
-    overlap_percent
+    overlap_percent,
+    mode: str = "sequential",
+    num_chunks: Optional[int] = None,
+    max_workers: int = MAX_WORKERS
 ) -> str:
     try:
         wait_for_next_step()
@@ -62,16 +156,30 @@ def generate_transcript(
         if estimated_tokens > chunk_token_limit:
             # Convert token count to character count for chunking
             chunk_size = int(chunk_token_limit * 3.5)
-            overlap_size = int(chunk_size * overlap_percent / 100)
-            
+
+            if mode == "map_reduce":
+                # Segments are written independently, so they get disjoint
+                # chunks; overlapping ones would make adjacent segments repeat
+                if num_chunks:
+                    chunk_size = -(-len(input_text) // num_chunks)
+                chunks = split_with_overlap(input_text, chunk_size, 0)
+                logger.info(f"Map-reduce over {len(chunks)} chunks with {max_workers} workers")
+                return generate_transcript_map_reduce(
+                    client=client,
+                    model_name=model_name,
+                    chunks=chunks,
+                    length=length,
+                    style=style,
+                    format_type=format_type,
+                    preference_text=preference_text,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    max_workers=max_workers,
+                )
+
             # Create chunks with overlap
-            chunks = []
-            start = 0
-            while start < len(input_text):
-                end = min(start + chunk_size, len(input_text))
-                chunks.append(input_text[start:end])
-                start = end - overlap_size if end < len(input_text) else end
-            
+            overlap_size = int(chunk_size * overlap_percent / 100)
+            chunks = split_with_overlap(input_text, chunk_size, overlap_size)
             logger.info(f"Input split into {len(chunks)} chunks with {overlap_percent}% overlap (chunk_token_limit: {chunk_token_limit})")
             
             # First chunk - generate the beginning of the transcript
@@ -134,6 +242,44 @@ def generate_transcript(
     except Exception as e:
         raise TranscriptGenerationError(f"Failed to generate transcript: {str(e)}")
 
+def condense_input(client, config: Dict[str, Any], input_text: str, format_type: str, output_dir: Path) -> str:
+    """Condense book-length inputs to a bounded brief (``Step2.brief_threshold_chars``).
+
+    Returns *input_text* unchanged when no threshold is set or it fits.
+    """
+    step_cfg = config["Step2"]
+    brief_threshold = step_cfg.get("brief_threshold_chars")
+    if not brief_threshold or len(input_text) <= brief_threshold:
+        return input_text
+
+    logger.info(f"Input is {len(input_text)} chars; building hierarchical brief...")
+    brief = build_document_brief(
+        client=client,
+        model_name=config["Big-Text-Model"]["model"],
+        text=input_text,
+        format_type=format_type,
+        cache_dir=str(output_dir / "brief_cache"),
+        section_chars=step_cfg.get("brief_section_chars", 12000),
+        fan_in=step_cfg.get("brief_fan_in", 4),
+        brief_chars=step_cfg.get("brief_chars", 12000),
+        max_tokens=step_cfg["max_tokens"],
+        temperature=step_cfg["temperature"],
+        max_workers=step_cfg.get("max_workers", MAX_WORKERS),
+    )
+    (output_dir / "document_brief.txt").write_text(brief, encoding="utf-8")
+    return brief
+
+
+def _save_transcript(transcript: str, output_dir: Path, input_file: Optional[str]):
+    output_file = output_dir / 'data'
+    write_turns(f"{output_file}.jsonl", turns_from_text(transcript), kind=TRANSCRIPT_KIND)
+    with open(f"{output_file}.txt", 'w') as file:
+        file.write(transcript)
+
+    logger.info(f"Transcript saved to: {output_file}")
+    return str(input_file), str(f"{output_file}.jsonl")
+
+
 def step2(
     client: Any = None,
     config: Optional[Dict[str, Any]] = None,
@@ -149,8 +295,17 @@ def step2(
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        step_cfg = config["Step2"]
+        mode = step_cfg.get("mode", "sequential")
+        if mode == "fused":
+            raise InvalidParameterError("Step2 mode 'fused' runs Steps 2 and 3 together; call step23() instead")
+        if mode not in ("sequential", "map_reduce"):
+            raise InvalidParameterError(f"Unknown Step2 mode: {mode}")
+
         logger.info(f"Reading input file: {input_file}")
         input_text = read_input_file(input_file)
+
+        input_text = condense_input(client, config, input_text, format_type, output_dir)
         
         logger.info(f"Generating {length} {style} transcript...")
         transcript = generate_transcript(
@@ -164,20 +319,16 @@ def step2(
             preference_text=preference_text,
             max_tokens=config["Step2"]["max_tokens"],
             temperature=config["Step2"]["temperature"],
-            chunk_token_limit=config["Step2"].get("chunk_token_limit", 2000),
-            overlap_percent=config["Step2"].get("overlap_percent", 10)
+            chunk_token_limit=step_cfg.get("chunk_token_limit", 2000),
+            overlap_percent=step_cfg.get("overlap_percent", 10),
+            mode=mode,
+            num_chunks=step_cfg.get("map_reduce_chunks"),
+            max_workers=step_cfg.get("max_workers", MAX_WORKERS),
         )
 
-        output_file = output_dir / 'data'
-        with open(f"{output_file}.pkl", 'wb') as file:
-            pickle.dump(transcript, file)
-        with open(f"{output_file}.txt", 'w') as file:
-            file.write(transcript)
-
-        logger.info(f"Transcript saved to: {output_file}")
-        return str(input_file), str(f"{output_file}.pkl")
+        return _save_transcript(transcript, output_dir, input_file)
 
-    except (FileReadError, TranscriptGenerationError, InvalidParameterError) as e:
+    except (FileReadError, TranscriptGenerationError, InvalidParameterError, SummarizationError) as e:
         logger.error(f"Transcript generation failed: {str(e)}")
         raise
     except Exception as e:
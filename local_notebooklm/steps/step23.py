@@ -0,0 +1,159 @@
+"""Steps 2+3 fused — write TTS-ready speaker turns in one generation.
+
+Normally Step 2 writes a free-form transcript and Step 3 spends a second
+Big-Text-Model pass rewriting all of it into ``(speaker, text)`` turns.
+With ``Step2.mode = "fused"`` the Step 2 writing prompt carries Step 3's
+output rules instead, so a single generation yields the final turns:
+about half the big-model calls, tokens and latency, and the same
+artifacts as the two steps:
+
+* ``step2/data.jsonl`` / ``data.txt`` — the turns as a ``script`` artifact
+  and as ``Speaker N: text`` lines;
+* ``step3/podcast_ready_data.jsonl`` / ``.txt`` — exactly what Step 3 writes.
+
+Long inputs go through the Step 2 brief and Step 3's chunked rewrite
+(``Step3.mode``) with the fused prompt.  Resuming with ``skip_to=3``
+promotes the Step 2 script artifact without another LLM call.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .artifacts import SCRIPT_KIND, iter_turns, read_header, render_text, turns_from_pairs, write_turns
+from .helpers import STRUCTURED_MODES, FormatType, LengthType, StyleType
+from .prompts import map_step23_system_prompt
+from .step2 import TranscriptError as Step2Error, condense_input, read_input_file
+from .step2_brief import SummarizationError
+from .step3 import (
+    MAX_WORKERS,
+    TranscriptError as Step3Error,
+    generate_rewritten_transcript,
+    generate_rewritten_transcript_concurrent,
+    generate_rewritten_transcript_with_overlap,
+    parse_rewritten_transcript,
+    save_podcast_ready,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptError(Exception):
+    pass
+class FileReadError(TranscriptError):
+    pass
+class TranscriptGenerationError(TranscriptError):
+    pass
+class InvalidParameterError(TranscriptError):
+    pass
+
+
+def promote_script(input_file: str, output_dir: str) -> Optional[str]:
+    """Write Step 3's artifacts from a fused Step 2 ``script`` artifact.
+
+    Returns the output path stem, or ``None`` when *input_file* is a
+    free-form Step 2 transcript (or a legacy pickle) that still needs
+    Step 3.
+    """
+    if not str(input_file).endswith(".jsonl") or read_header(input_file).get("kind") != SCRIPT_KIND:
+        return None
+    parsed = [turn.as_tuple() for turn in iter_turns(input_file)]
+    if not parsed:
+        return None
+    output_file = save_podcast_ready(parsed, output_dir)
+    logger.info(f"Promoted fused script {input_file} to {output_file}")
+    return str(output_file)
+
+
+def step23(
+    client: Any = None,
+    config: Optional[Dict[str, Any]] = None,
+    input_file: str = None,
+    step2_dir: str = None,
+    step3_dir: str = None,
+    format_type: FormatType = "podcast",
+    length: LengthType = "medium",
+    style: StyleType = "normal",
+    preference_text: str = "nothing",
+    system_prompt: str = None,
+    language: str = "english",
+) -> Tuple[str, str]:
+    """Generate TTS-ready turns straight from the Step 1 text.
+
+    Returns ``(step2_artifact, step3_output_stem)``.
+    """
+    try:
+        step2_cfg, step3_cfg = config["Step2"], config["Step3"]
+        mode = step3_cfg.get("mode", "sequential")
+        if mode not in ("sequential", "concurrent"):
+            raise InvalidParameterError(f"Unknown Step3 mode: {mode}")
+        structured_output = config["Big-Text-Model"].get("structured_output", "auto")
+        if structured_output not in STRUCTURED_MODES:
+            raise InvalidParameterError(f"Unknown structured_output mode: {structured_output}")
+
+        step2_dir, step3_dir = Path(step2_dir), Path(step3_dir)
+        step2_dir.mkdir(parents=True, exist_ok=True)
+        step3_dir.mkdir(parents=True, exist_ok=True)
+        model_name = config["Big-Text-Model"]["model"]
+
+        logger.info(f"Reading input file: {input_file}")
+        try:
+            input_text = read_input_file(input_file)
+        except Step2Error as e:
+            raise FileReadError(str(e))
+
+        try:
+            input_text = condense_input(client, config, input_text, format_type, step2_dir)
+
+            generation = dict(
+                client=client,
+                model_name=model_name,
+                input_text=input_text,
+                format_type=format_type,
+                system_prompt=map_step23_system_prompt(
+                    length=length, style=style, format_type=format_type,
+                    preference_text=preference_text, language=language,
+                    system_prompt=system_prompt,
+                ),
+                max_tokens=step2_cfg["max_tokens"],
+                temperature=step2_cfg["temperature"],
+                language=language,
+                structured_output=structured_output,
+            )
+            chunk_size = int(step2_cfg.get("chunk_token_limit", 2000) * 3.5)
+            logger.info(f"Generating {length} {style} TTS-ready transcript in one pass...")
+            if len(input_text) <= chunk_size:
+                transcript = generate_rewritten_transcript(**generation)
+            elif mode == "concurrent":
+                transcript = generate_rewritten_transcript_concurrent(
+                    chunk_size=chunk_size,
+                    overlap_percent=step2_cfg.get("overlap_percent", 10),
+                    max_workers=step3_cfg.get("max_workers", MAX_WORKERS),
+                    **generation,
+                )
+            else:
+                transcript = generate_rewritten_transcript_with_overlap(
+                    chunk_size=chunk_size,
+                    overlap_percent=step2_cfg.get("overlap_percent", 10),
+                    **generation,
+                )
+
+            parsed = parse_rewritten_transcript(client, model_name, transcript, step3_cfg["max_tokens"])
+        except (Step3Error, SummarizationError) as e:
+            raise TranscriptGenerationError(str(e))
+
+        turns = turns_from_pairs(parsed)
+        step2_file = write_turns(step2_dir / "data.jsonl", turns, kind=SCRIPT_KIND)
+        with open(step2_dir / "data.txt", "w") as file:
+            file.write(render_text(turns))
+
+        output_file = save_podcast_ready(parsed, step3_dir)
+        logger.info(f"Fused transcript saved to: {step2_file} and {output_file}")
+        return str(step2_file), str(output_file)
+
+    except (FileReadError, TranscriptGenerationError, InvalidParameterError) as e:
+        logger.error(f"Fused transcript generation failed: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during fused transcript generation: {str(e)}")
+        raise TranscriptError(f"Fused transcript generation failed: {str(e)}")
@@ -0,0 +1,171 @@
+"""Step 2 — Hierarchical document brief for book-length inputs.
+
+Long documents are split into sections that are summarized in parallel.
+Consecutive summaries are then merged, ``fan_in`` at a time and again in
+parallel, until everything fits in ``brief_chars``.  Each level is cached
+on disk by content hash (plus model, prompt and format), so re-running
+Step 2 with a different style or length reuses the brief instead of paying for it again.
+
+The tree has ``log_fan_in(sections)`` levels, so end-to-end latency grows
+with the depth of the tree rather than the length of the document, and
+Step 2 always receives a bounded-size input.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .helpers import generate_text
+from .prompts import step2_merge_summary_prompt, step2_section_summary_prompt
+from .step1 import create_word_bounded_chunks
+
+logger = logging.getLogger(__name__)
+
+SECTION_CHARS = 12000   # size of a leaf section fed to one summary call
+FAN_IN = 4              # summaries merged per call at each higher level
+BRIEF_CHARS = 12000     # upper bound on the brief handed to Step 2
+MAX_WORKERS = 4
+
+
+class SummarizationError(Exception):
+    pass
+
+
+def _cache_key(kind: str, target_chars: int, text: str, **settings: Any) -> str:
+    """Hash of *text* plus everything that shapes its summary (model,
+    prompt, format, sampling), so changing any of them misses the cache."""
+    digest = hashlib.sha256()
+    digest.update(f"{kind}:{target_chars}:".encode("utf-8"))
+    digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _LevelCache:
+    """JSON file per tree level mapping content hash → summary."""
+
+    def __init__(self, cache_dir: Optional[Path], level: int):
+        self.path = cache_dir / f"level_{level}.json" if cache_dir else None
+        self.entries: Dict[str, str] = {}
+        if self.path and self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable summary cache {self.path}: {e}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.entries, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _summarize_level(
+    client,
+    model_name: str,
+    inputs: List[str],
+    kind: str,
+    system_prompt: str,
+    target_chars: int,
+    cache: _LevelCache,
+    max_tokens: int,
+    temperature: float,
+    max_workers: int,
+    format_type: str,
+) -> List[str]:
+    """Summarize every input concurrently, serving repeats from *cache*."""
+    settings = dict(model=model_name, prompt=system_prompt, format_type=format_type,
+                    max_tokens=max_tokens, temperature=temperature)
+    keys = [_cache_key(kind, target_chars, text, **settings) for text in inputs]
+    missing = [i for i, key in enumerate(keys) if key not in cache.entries]
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as pool:
+            futures = {
+                i: pool.submit(
+                    generate_text,
+                    client=client,
+                    model=model_name,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": inputs[i]},
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                for i in missing
+            }
+            for i, fut in futures.items():
+                cache.entries[keys[i]] = fut.result().strip()
+        cache.save()
+
+    logger.info(
+        f"Summarized {len(inputs)} {kind} input(s) "
+        f"({len(inputs) - len(missing)} from cache)"
+    )
+    return [cache.entries[key] for key in keys]
+
+
+def build_document_brief(
+    client: Any,
+    model_name: str,
+    text: str,
+    format_type: str = "podcast",
+    cache_dir: Optional[str] = None,
+    section_chars: int = SECTION_CHARS,
+    fan_in: int = FAN_IN,
+    brief_chars: int = BRIEF_CHARS,
+    max_tokens: int = 2048,
+    temperature: float = 0.3,
+    max_workers: int = MAX_WORKERS,
+) -> str:
+    """Reduce *text* to a brief of at most about *brief_chars* characters.
+
+    Returns *text* unchanged when it already fits.
+    """
+    if len(text) <= brief_chars:
+        return text
+    if fan_in < 2:
+        raise SummarizationError("fan_in must be at least 2")
+
+    cache_path = Path(cache_dir) if cache_dir else None
+    # Each summary is sized so that one merge of fan_in of them fits the budget
+    target_chars = max(500, brief_chars // fan_in)
+
+    try:
+        sections = create_word_bounded_chunks(text, section_chars)
+        logger.info(f"Building document brief from {len(sections)} sections")
+
+        level = 1
+        summaries = _summarize_level(
+            client, model_name, sections, "section",
+            step2_section_summary_prompt.format(format_type=format_type, target_chars=target_chars),
+            target_chars, _LevelCache(cache_path, level),
+            max_tokens, temperature, max_workers, format_type,
+        )
+
+        merge_prompt = step2_merge_summary_prompt.format(target_chars=target_chars)
+        while len(summaries) > 1 and sum(len(s) + 2 for s in summaries) > brief_chars:
+            level += 1
+            groups = [
+                "\n\n".join(summaries[i:i + fan_in])
+                for i in range(0, len(summaries), fan_in)
+            ]
+            summaries = _summarize_level(
+                client, model_name, groups, "merge", merge_prompt,
+                target_chars, _LevelCache(cache_path, level),
+                max_tokens, temperature, max_workers, format_type,
+            )
+
+        brief = "\n\n".join(summaries)
+        logger.info(f"Document brief: {len(text)} → {len(brief)} chars in {level} level(s)")
+        return brief
+
+    except Exception as e:
+        raise SummarizationError(f"Failed to build document brief: {str(e)}")
@@ -1,14 +1,48 @@
-from .helpers import generate_text, FormatType, wait_for_next_step
-from .prompts import map_step3_system_prompt
+from .helpers import STRUCTURED_MODES, StructuredOutputError, generate_structured, generate_text, llm_stats, FormatType, wait_for_next_step
+from .prompts import map_step3_system_prompt, step3_concurrent_context_prompt
+from .step2 import split_with_overlap
+from .transcript_parser import STRUCTURED_SHAPES, normalize_speaker, parse_transcript_flexible, parse_transcript_with_shape
+from .artifacts import SCRIPT_KIND, iter_turns, load_legacy_pickle, render_text, turns_from_pairs, write_turns
 from typing import Dict, Any, Optional, List, Tuple
-from ast import literal_eval
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
 from pathlib import Path
-import logging, pickle, re, json
+import json, logging, re
 from tqdm import tqdm
 
 
 logger = logging.getLogger(__name__)
 
+MAX_WORKERS = 4         # parallel chunk rewrites in concurrent mode
+SEAM_WINDOW = 3         # turns compared on each side of a chunk boundary
+SEAM_SIMILARITY = 0.8   # word-sequence similarity treated as a repeated turn
+OUTLINE_LINE_CHARS = 160
+
+# Requested from providers that support structured output; the result is
+# re-rendered as the Python list the rest of Step 3 already parses
+TRANSCRIPT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "turns": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "speaker": {"type": "string"},
+                    "text": {"type": "string"},
+                },
+                "required": ["speaker", "text"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["turns"],
+    "additionalProperties": False,
+}
+_STRUCTURED_INSTRUCTION = """
+            OUTPUT FORMAT OVERRIDE: instead of a Python list, return a JSON object {"turns": [{"speaker": "Speaker 1", "text": "..."}, ...]} with one entry per dialogue turn, in order.
+            """
+
 class TranscriptError(Exception):
     pass
 class FileReadError(TranscriptError):
@@ -19,175 +53,86 @@ class InvalidParameterError(TranscriptError):
     pass
 
 def read_pickle_file(filename: str) -> str:
+    """Read a legacy Step 2 ``.pkl`` artifact (plain data only)."""
     try:
-        with open(filename, 'rb') as file:
-            content = pickle.load(file)
-        return content
+        return load_legacy_pickle(filename)
     except FileNotFoundError:
         raise FileReadError(f"File '{filename}' not found")
     except Exception as e:
         raise FileReadError(f"Failed to read pickle file: {str(e)}")
 
 
-# ---------------------------------------------------------------------------
-# Robust transcript parser — multi-strategy fallback
-# ---------------------------------------------------------------------------
-
-def _normalize_speaker(s: str) -> str:
-    """Normalize 'speaker1', 'SPEAKER 1', 'Speaker_2' → 'Speaker N'."""
-    m = re.search(r'(\d+)', s)
-    return f"Speaker {m.group(1)}" if m else "Speaker 1"
-
-
-def _validate_parsed(data) -> bool:
-    """Check if data is a non-empty list of (str, str) tuples/lists."""
-    if not isinstance(data, list) or not data:
-        return False
-    for item in data:
-        if not isinstance(item, (tuple, list)) or len(item) < 2:
-            return False
-        if not isinstance(item[0], str) or not isinstance(item[1], str):
-            return False
-    return True
-
-
-def _extract_tuples_regex(text: str) -> List[Tuple[str, str]]:
-    """Extract ('Speaker N', 'text') patterns with regex."""
-    results = []
-    # Double-quoted tuples
-    for m in re.finditer(
-        r'\(\s*"(Speaker\s*\d+)"\s*,\s*"((?:[^"\\]|\\.)*)"\s*\)',
-        text, re.DOTALL | re.IGNORECASE
-    ):
-        results.append((_normalize_speaker(m.group(1)), m.group(2).replace('\\"', '"').strip()))
-
-    if len(results) >= 2:
-        return results
-
-    # Single-quoted tuples
-    results = []
-    for m in re.finditer(
-        r"\(\s*'(Speaker\s*\d+)'\s*,\s*'((?:[^'\\]|\\.)*)'\s*\)",
-        text, re.DOTALL | re.IGNORECASE
-    ):
-        results.append((_normalize_speaker(m.group(1)), m.group(2).replace("\\'", "'").strip()))
-
-    if len(results) >= 2:
-        return results
-
-    # Mixed quotes — more lenient
-    results = []
-    for m in re.finditer(
-        r"""\(\s*['"](Speaker\s*\d+)['"]\s*,\s*['"](.+?)['"]\s*\)""",
-        text, re.DOTALL | re.IGNORECASE
-    ):
-        results.append((_normalize_speaker(m.group(1)), m.group(2).strip()))
-
-    return results if len(results) >= 2 else []
-
-
-def _extract_plain_dialogue(text: str) -> List[Tuple[str, str]]:
-    """Extract 'Speaker N: text' plain dialogue format (with optional markdown bold)."""
-    results = []
-    # Split on speaker labels
-    parts = re.split(
-        r'(?:^|\n)\s*\*{0,2}(Speaker\s*\d+)\*{0,2}\s*[:：\-—]\s*',
-        text, flags=re.IGNORECASE
-    )
-    # parts: [preamble, speaker1, text1, speaker2, text2, ...]
-    if len(parts) >= 3:
-        for i in range(1, len(parts) - 1, 2):
-            speaker = parts[i].strip()
-            dialogue = parts[i + 1].strip()
-            dialogue = re.sub(r'\s+', ' ', dialogue)
-            if dialogue:
-                results.append((_normalize_speaker(speaker), dialogue))
-
-    return results if len(results) >= 1 else []
+def read_transcript_file(filename: str) -> str:
+    """Read the Step 2 transcript from a ``.jsonl`` artifact or a legacy ``.pkl``."""
+    if str(filename).endswith('.pkl'):
+        return read_pickle_file(filename)
+    try:
+        return render_text(iter_turns(filename))
+    except FileNotFoundError:
+        raise FileReadError(f"File '{filename}' not found")
+    except Exception as e:
+        raise FileReadError(f"Failed to read transcript file: {str(e)}")
 
 
-def _extract_json_dialogue(text: str) -> List[Tuple[str, str]]:
-    """Extract dialogue from JSON array format."""
-    try:
-        json_match = re.search(r'\[[\s\S]*\]', text)
-        if not json_match:
-            return []
-        data = json.loads(json_match.group())
-        if not isinstance(data, list):
-            return []
-        results = []
-        for item in data:
-            if isinstance(item, dict):
-                speaker = str(item.get("speaker", item.get("Speaker", "Speaker 1")))
-                dialogue = str(item.get("text", item.get("dialogue",
-                               item.get("content", item.get("line", "")))))
-                if dialogue:
-                    results.append((_normalize_speaker(speaker), dialogue))
-            elif isinstance(item, (list, tuple)) and len(item) >= 2:
-                results.append((_normalize_speaker(str(item[0])), str(item[1])))
-        return results if len(results) >= 1 else []
-    except Exception:
+def _turns_from_structured(data) -> List[Tuple[str, str]]:
+    if not isinstance(data, dict) or not isinstance(data.get("turns"), list):
         return []
+    turns = []
+    for item in data["turns"]:
+        if isinstance(item, dict) and isinstance(item.get("text"), str) and item["text"].strip():
+            turns.append((normalize_speaker(str(item.get("speaker", ""))), item["text"].strip()))
+    return turns
 
 
-def parse_transcript_flexible(raw_text: str) -> List[Tuple[str, str]]:
-    """Parse LLM transcript output using multiple fallback strategies.
+def _generate_turns_text(client, model_name, conversation, max_tokens, temperature, structured_output="auto") -> str:
+    """One rewrite call.  Uses schema-constrained output when the provider
+    supports it and falls back to free text (parsed as before) otherwise.
 
-    Tries in order:
-      1. literal_eval (strict Python list-of-tuples)
-      2. Regex for ("Speaker N", "text") tuple patterns
-      3. 'Speaker N: text' plain dialogue
-      4. JSON array of objects
-      5. Single-speaker monologue fallback
+    A structured reply that is malformed or has no usable turns is
+    repaired locally with the flexible parser rather than generated
+    again; if that fails too it is returned as text for the usual
+    fix-up path.
     """
-    raw = (raw_text or "").strip()
-    if not raw:
-        return []
-
-    # Clean common unicode curly quotes / smart punctuation
-    cleaned = raw.replace('\u2018', "'").replace('\u2019', "'")
-    cleaned = cleaned.replace('\u201c', '"').replace('\u201d', '"')
-    cleaned = cleaned.replace('\u2026', '...')
-    # Strip markdown code fences
-    cleaned = re.sub(r'^```(?:python)?\s*\n?', '', cleaned, flags=re.MULTILINE)
-    cleaned = re.sub(r'\n?```\s*$', '', cleaned, flags=re.MULTILINE)
-    cleaned = cleaned.strip()
-
-    # Strategy 1: literal_eval
-    try:
-        data = literal_eval(cleaned)
-        if _validate_parsed(data):
-            return [(str(s), str(t)) for s, t in data]
-    except Exception:
-        pass
+    llm_stats.incr("step3", "calls")
+    if structured_output != "off":
+        structured_conversation = [dict(m) for m in conversation]
+        structured_conversation[0]["content"] += "\n" + _STRUCTURED_INSTRUCTION
+        try:
+            data = generate_structured(
+                client=client,
+                model=model_name,
+                messages=structured_conversation,
+                schema=TRANSCRIPT_SCHEMA,
+                schema_name="podcast_transcript",
+                max_tokens=max_tokens,
+                temperature=temperature,
+                mode=structured_output,
+            )
+            raw = None if data is None else json.dumps(data, ensure_ascii=False)
+        except StructuredOutputError as e:
+            data, raw = None, e.raw
+        if raw is not None:
+            turns = _turns_from_structured(data)
+            if turns:
+                llm_stats.incr("step3", "structured")
+                return str(turns)
+            llm_stats.incr("step3", "structured_fixup")
+            turns = parse_transcript_flexible(raw)
+            if turns:
+                return str(turns)
+            logger.warning("Structured transcript had no usable turns; passing it on as text")
+            return raw
+
+    llm_stats.incr("step3", "text")
+    return generate_text(
+        client=client,
+        model=model_name,
+        messages=conversation,
+        max_tokens=max_tokens,
+        temperature=temperature,
+    )
 
-    # Strategy 2: Regex tuple extraction
-    results = _extract_tuples_regex(cleaned)
-    if results:
-        logger.info(f"Transcript parsed via regex tuple extraction ({len(results)} turns)")
-        return results
-
-    # Strategy 3: Plain dialogue format
-    results = _extract_plain_dialogue(cleaned)
-    if results:
-        logger.info(f"Transcript parsed via plain dialogue extraction ({len(results)} turns)")
-        return results
-
-    # Strategy 4: JSON array
-    results = _extract_json_dialogue(cleaned)
-    if results:
-        logger.info(f"Transcript parsed via JSON extraction ({len(results)} turns)")
-        return results
-
-    # Strategy 5: Single-speaker monologue fallback
-    mono = re.sub(r'[\[\]\(\)]', ' ', cleaned)
-    mono = re.sub(r'\s+', ' ', mono).strip()
-    if len(mono) > 30:
-        logger.warning("All parsing strategies failed — using single-speaker monologue fallback")
-        return [("Speaker 1", mono)]
 
-    return []
-    
 def generate_rewritten_transcript(
     client,
     model_name,
@@ -196,7 +141,8 @@ def generate_rewritten_transcript(
     max_tokens,
     temperature,
     format_type,
-    language
+    language,
+    structured_output="auto",
 ) -> str:
     try:
         wait_for_next_step()
@@ -208,18 +154,140 @@ def generate_rewritten_transcript(
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": input_text},
         ]
-        out = generate_text(
-            client=client,
-            model=model_name,
-            messages=conversation,
-            max_tokens=max_tokens,
-            temperature=temperature
+        out = _generate_turns_text(
+            client, model_name, conversation, max_tokens, temperature, structured_output
         )
         return out
 
     except Exception as e:
         raise TranscriptGenerationError(f"Failed to generate transcript: {str(e)}")
 
+_CHUNK_FORMAT_INSTRUCTION = """
+            CRITICALLY IMPORTANT: Your output MUST be in the exact format of a Python list of tuples, where each tuple contains a speaker name and their dialogue. 
+            Example format: [('Speaker1', 'This is what Speaker1 says.'), ('Speaker2', 'This is Speaker2's response.')]
+            Ensure all quotes are properly escaped and the entire response must be valid Python syntax that can be parsed by literal_eval().
+            """
+
+_GOODBYE_PHRASES = ["goodbye", "bye", "farewell", "until next time", "see you",
+                    "thanks for listening", "that's all", "wrapping up",
+                    "concluding", "end of", "final thoughts"]
+
+
+def _chunk_system_prompt(system_prompt, format_type, language, is_final_chunk) -> str:
+    """System prompt for one chunk, with the strict output format and position rules."""
+    if system_prompt == None:
+        chunk_system_prompt = map_step3_system_prompt(format_type=format_type, language=language) + "\n" + _CHUNK_FORMAT_INSTRUCTION
+    else:
+        chunk_system_prompt = system_prompt + "\n" + _CHUNK_FORMAT_INSTRUCTION
+
+    if not is_final_chunk:
+        chunk_system_prompt += "\n\nIMPORTANT: Since this is not the final part of the conversation, DO NOT include any goodbyes, conclusions, or wrap-ups. The conversation should continue naturally."
+    return chunk_system_prompt
+
+
+def _parse_chunk_output(client, model_name, chunk_transcript, i, max_tokens) -> List[Tuple[str, str]]:
+    """Parse one chunk's output, falling back to an LLM fix and then a monologue."""
+    logger.debug(f"Raw chunk {i+1} (first 200 chars): {chunk_transcript[:200]}...")
+    chunk_data = parse_transcript_flexible(chunk_transcript)
+    if chunk_data:
+        return chunk_data
+
+    logger.warning(f"Flexible parser failed on chunk {i+1}. Trying LLM fix...")
+    llm_stats.incr("step3", "fixup")
+    fix_prompt = [
+        {"role": "system", "content": "Convert the following text into valid Python syntax as a list of tuples with format: [('Speaker 1', 'Text1'), ('Speaker 2', 'Text2'), ...]. Return ONLY the Python list."},
+        {"role": "user", "content": chunk_transcript}
+    ]
+    try:
+        fixed = generate_text(client=client, model=model_name,
+                              messages=fix_prompt, max_tokens=max_tokens, temperature=0.3)
+        chunk_data = parse_transcript_flexible(fixed)
+    except Exception:
+        pass
+    if chunk_data:
+        return chunk_data
+
+    # Last resort: treat entire chunk output as monologue
+    mono = re.sub(r'[\[\]\(\)\{\}]', ' ', chunk_transcript)
+    mono = re.sub(r'\s+', ' ', mono).strip()
+    if len(mono) > 20:
+        logger.warning(f"Using monologue fallback for chunk {i+1} ({len(mono)} chars)")
+        return [("Speaker 1", mono)]
+    logger.error(f"All parsers failed on chunk {i+1}. Raw (300 chars): {chunk_transcript[:300]}...")
+    raise TranscriptGenerationError(f"Failed to parse chunk {i+1} after all strategies")
+
+
+def _soften_goodbyes(chunk_data: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Cut goodbye-like phrases out of a non-final chunk."""
+    filtered = []
+    for speaker, text in chunk_data:
+        found = next((p for p in _GOODBYE_PHRASES if p in text.lower()), None)
+        if not found:
+            filtered.append((speaker, text))
+        else:
+            modified = text.lower().split(found)[0]
+            filtered.append((speaker, modified + "let's continue our discussion."))
+    return filtered
+
+
+def _is_repeat(a: str, b: str, threshold: float) -> bool:
+    """True when turn texts *a* and *b* say essentially the same thing."""
+    a_words = re.findall(r'\w+', a.lower())
+    b_words = re.findall(r'\w+', b.lower())
+    if not a_words or not b_words:
+        return False
+    shorter, longer = sorted((a_words, b_words), key=len)
+    # One turn restating the other verbatim inside a longer line
+    if len(shorter) >= 4 and " ".join(shorter) in " ".join(longer):
+        return True
+    return SequenceMatcher(None, a_words, b_words).ratio() >= threshold
+
+
+def smooth_seams(
+    parts: List[List[Tuple[str, str]]],
+    window: int = SEAM_WINDOW,
+    threshold: float = SEAM_SIMILARITY,
+) -> List[Tuple[str, str]]:
+    """Join independently written chunk transcripts into one.
+
+    At every boundary, leading turns of the next part that repeat one of
+    the last *window* turns already kept are dropped (chunks written from
+    overlapping source tend to restate the same point), and if the seam
+    then joins two turns by the same speaker they are merged into one.
+    """
+    combined: List[Tuple[str, str]] = []
+    for part in parts:
+        part = list(part)
+        if combined:
+            tail = combined[-window:]
+            drop = 0
+            while drop < min(window, len(part)) and any(
+                _is_repeat(part[drop][1], text, threshold) for _, text in tail
+            ):
+                drop += 1
+            if drop:
+                logger.debug(f"Seam smoothing dropped {drop} repeated turn(s)")
+            part = part[drop:]
+            if part and part[0][0] == combined[-1][0]:
+                speaker, text = combined[-1]
+                combined[-1] = (speaker, f"{text} {part[0][1]}")
+                part = part[1:]
+        combined.extend(part)
+    return combined
+
+
+def build_outline(chunks: List[str], width: int = OUTLINE_LINE_CHARS) -> str:
+    """Deterministic one-line-per-part outline taken from each part's opening sentence."""
+    lines = []
+    for i, chunk in enumerate(chunks, 1):
+        text = re.sub(r'\s+', ' ', chunk).strip()
+        sentence = re.split(r'(?<=[.!?])\s', text, maxsplit=1)[0]
+        if len(sentence) > width:
+            sentence = sentence[:width].rsplit(' ', 1)[0] + "..."
+        lines.append(f"{i}. {sentence}")
+    return "\n".join(lines)
+
+
 def generate_rewritten_transcript_with_overlap(
     client,
     model_name,
@@ -230,27 +298,21 @@ def generate_rewritten_transcript_with_overlap(
     system_prompt,
     language,
     chunk_size=8000,
-    overlap_percent=20
+    overlap_percent=20,
+    structured_output="auto",
 ) -> str:
     """Generate transcript in chunks with overlap for seamless continuation."""
     try:
         wait_for_next_step()
         
-        # Calculate overlap size in characters
-        overlap_size = int(chunk_size * (overlap_percent / 100))
-        
         # Split the input text into chunks with overlap
-        chunks = []
-        start = 0
-        while start < len(input_text):
-            end = min(start + chunk_size, len(input_text))
-            chunks.append(input_text[start:end])
-            start = end - overlap_size if end < len(input_text) else end
+        overlap_size = int(chunk_size * (overlap_percent / 100))
+        chunks = split_with_overlap(input_text, chunk_size, overlap_size)
         
         logger.info(f"Processing transcript in {len(chunks)} chunks with {overlap_percent}% overlap")
         
-        # Process each chunk and combine results
-        combined_transcript = []
+        # Process each chunk; the parsed parts are joined by smooth_seams()
+        parts = []
         
         # Add tqdm progress bar
         for i, chunk in tqdm(enumerate(chunks), total=len(chunks), desc="Processing transcript chunks"):
@@ -261,92 +323,32 @@ def generate_rewritten_transcript_with_overlap(
             is_final_chunk = (i == len(chunks) - 1)
             
             if i > 0:
-                context = f"IMPORTANT: This is a continuation of a previous transcript. The last part was:\n{combined_transcript[-3:] if len(combined_transcript) >= 3 else combined_transcript}\nContinue the conversation seamlessly from here, maintaining the same style and tone."
+                previous = parts[-1][-3:]
+                context = f"IMPORTANT: This is a continuation of a previous transcript. The last part was:\n{previous}\nContinue the conversation seamlessly from here, maintaining the same style and tone."
             
             if not is_final_chunk:
                 context += "\n\nIMPORTANT: DO NOT conclude the conversation or say goodbyes. This is the middle of the conversation, not the end."
             else:
                 context += "\n\nThis is the final part of the conversation. You may conclude naturally if appropriate."
             
-            # Be more explicit about the format required
-            format_instruction = """
-            CRITICALLY IMPORTANT: Your output MUST be in the exact format of a Python list of tuples, where each tuple contains a speaker name and their dialogue. 
-            Example format: [('Speaker1', 'This is what Speaker1 says.'), ('Speaker2', 'This is Speaker2's response.')]
-            Ensure all quotes are properly escaped and the entire response must be valid Python syntax that can be parsed by literal_eval().
-            """
-            
-            # Customize system prompt based on chunk position
-            if system_prompt == None:
-                chunk_system_prompt = map_step3_system_prompt(format_type=format_type, language=language) + "\n" + format_instruction
-            else:
-                chunk_system_prompt = system_prompt + "\n" + format_instruction
-                
-            if not is_final_chunk:
-                chunk_system_prompt += "\n\nIMPORTANT: Since this is not the final part of the conversation, DO NOT include any goodbyes, conclusions, or wrap-ups. The conversation should continue naturally."
-            
+            chunk_system_prompt = _chunk_system_prompt(system_prompt, format_type, language, is_final_chunk)
+
             conversation = [
                 {"role": "system", "content": chunk_system_prompt},
                 {"role": "user", "content": f"{chunk}\n\n{context}"},
             ]
             
             # Get response from model
-            chunk_transcript = generate_text(
-                client=client,
-                model=model_name,
-                messages=conversation,
-                max_tokens=max_tokens,
-                temperature=temperature,
+            chunk_transcript = _generate_turns_text(
+                client, model_name, conversation, max_tokens, temperature, structured_output
             )
 
-            # Parse chunk using flexible multi-strategy parser
-            logger.debug(f"Raw chunk {i+1} (first 200 chars): {chunk_transcript[:200]}...")
-            chunk_data = parse_transcript_flexible(chunk_transcript)
-
-            if not chunk_data:
-                logger.warning(f"Flexible parser failed on chunk {i+1}. Trying LLM fix...")
-                fix_prompt = [
-                    {"role": "system", "content": "Convert the following text into valid Python syntax as a list of tuples with format: [('Speaker 1', 'Text1'), ('Speaker 2', 'Text2'), ...]. Return ONLY the Python list."},
-                    {"role": "user", "content": chunk_transcript}
-                ]
-                try:
-                    fixed = generate_text(client=client, model=model_name,
-                                          messages=fix_prompt, max_tokens=max_tokens, temperature=0.3)
-                    chunk_data = parse_transcript_flexible(fixed)
-                except Exception:
-                    pass
-
-                if not chunk_data:
-                    # Last resort: treat entire chunk output as monologue
-                    mono = re.sub(r'[\[\]\(\)\{\}]', ' ', chunk_transcript)
-                    mono = re.sub(r'\s+', ' ', mono).strip()
-                    if len(mono) > 20:
-                        logger.warning(f"Using monologue fallback for chunk {i+1} ({len(mono)} chars)")
-                        chunk_data = [("Speaker 1", mono)]
-                    else:
-                        logger.error(f"All parsers failed on chunk {i+1}. Raw (300 chars): {chunk_transcript[:300]}...")
-                        raise TranscriptGenerationError(f"Failed to parse chunk {i+1} after all strategies")
-
-            # Filter goodbye-like messages in non-final chunks
+            chunk_data = _parse_chunk_output(client, model_name, chunk_transcript, i, max_tokens)
             if not is_final_chunk:
-                goodbye_phrases = ["goodbye", "bye", "farewell", "until next time", "see you",
-                                   "thanks for listening", "that's all", "wrapping up",
-                                   "concluding", "end of", "final thoughts"]
-                filtered = []
-                for speaker, text in chunk_data:
-                    found = next((p for p in goodbye_phrases if p in text.lower()), None)
-                    if not found:
-                        filtered.append((speaker, text))
-                    else:
-                        modified = text.lower().split(found)[0]
-                        filtered.append((speaker, modified + "let's continue our discussion."))
-                chunk_data = filtered
-
-            # Merge into combined transcript
-            if i == 0:
-                combined_transcript.extend(chunk_data)
-            else:
-                skip_count = min(2, max(1, len(chunk_data) // 10))
-                combined_transcript.extend(chunk_data[skip_count:])
+                chunk_data = _soften_goodbyes(chunk_data)
+            parts.append(chunk_data)
+
+        combined_transcript = smooth_seams(parts)
 
         # Convert back to string representation
         return str(combined_transcript)
@@ -354,9 +356,124 @@ def generate_rewritten_transcript_with_overlap(
     except Exception as e:
         raise TranscriptGenerationError(f"Failed to generate transcript with overlap: {str(e)}")
 
+
+def generate_rewritten_transcript_concurrent(
+    client,
+    model_name,
+    input_text,
+    max_tokens,
+    temperature,
+    format_type,
+    system_prompt,
+    language,
+    chunk_size=8000,
+    overlap_percent=20,
+    max_workers=MAX_WORKERS,
+    structured_output="auto",
+) -> str:
+    """Rewrite all chunks at once, anchoring continuity in the source text.
+
+    Chunks do not overlap.  Instead each prompt shows the neighbouring
+    source text (``overlap_percent`` of a chunk on either side) and a
+    deterministic outline of every part, so no chunk waits for the
+    previous one's output.  Boundaries are cleaned up by smooth_seams().
+    """
+    try:
+        wait_for_next_step()
+
+        overlap_size = int(chunk_size * (overlap_percent / 100))
+        chunks = [input_text[i:i + chunk_size] for i in range(0, len(input_text), chunk_size)]
+        outline = build_outline(chunks)
+        logger.info(f"Rewriting transcript in {len(chunks)} concurrent chunks")
+
+        def rewrite(i: int) -> List[Tuple[str, str]]:
+            is_final_chunk = (i == len(chunks) - 1)
+            context = step3_concurrent_context_prompt.format(
+                part=i + 1,
+                total=len(chunks),
+                outline=outline,
+                before=chunks[i - 1][-overlap_size:] if i > 0 and overlap_size else "(start of the document)",
+                after=chunks[i + 1][:overlap_size] if not is_final_chunk and overlap_size else "(end of the document)",
+            )
+            conversation = [
+                {"role": "system", "content": _chunk_system_prompt(system_prompt, format_type, language, is_final_chunk)},
+                {"role": "user", "content": f"{chunks[i]}\n\n{context}"},
+            ]
+            chunk_transcript = _generate_turns_text(
+                client, model_name, conversation, max_tokens, temperature, structured_output
+            )
+            chunk_data = _parse_chunk_output(client, model_name, chunk_transcript, i, max_tokens)
+            return chunk_data if is_final_chunk else _soften_goodbyes(chunk_data)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            futures = [pool.submit(rewrite, i) for i in range(len(chunks))]
+            parts = [f.result() for f in tqdm(futures, desc="Processing transcript chunks")]
+
+        return str(smooth_seams(parts))
+
+    except Exception as e:
+        raise TranscriptGenerationError(f"Failed to generate concurrent transcript: {str(e)}")
+
 def validate_transcript_format(transcript: str) -> bool:
-    """Check if transcript can be parsed into valid (speaker, text) pairs."""
-    return bool(parse_transcript_flexible(transcript))
+    """Check if transcript is in one of the structured (speaker, text) shapes."""
+    return parse_transcript_with_shape(transcript).shape in STRUCTURED_SHAPES
+
+
+def parse_rewritten_transcript(client, model_name, transcript, max_tokens) -> List[Tuple[str, str]]:
+    """Parse rewritten output into turns, trying an LLM fix-up and then a monologue."""
+    # ── Flexible parsing with multi-strategy fallback ────────
+    parsed = parse_transcript_flexible(transcript)
+
+    if not parsed:
+        logger.warning("Flexible parser failed on raw output. Trying LLM fix...")
+        llm_stats.incr("step3", "fixup")
+        fix_prompt = [
+            {"role": "system", "content": "Convert the following text into valid Python syntax as a list of tuples with format: [('Speaker 1', 'Text1'), ('Speaker 2', 'Text2'), ...]. Return ONLY the Python list, nothing else."},
+            {"role": "user", "content": transcript}
+        ]
+        try:
+            fixed = generate_text(
+                client=client,
+                model=model_name,
+                messages=fix_prompt,
+                max_tokens=max_tokens,
+                temperature=0.3,
+            )
+            parsed = parse_transcript_flexible(fixed)
+        except Exception:
+            pass
+
+    if not parsed:
+        # Last resort: force monologue from raw LLM output
+        mono = re.sub(r'[\[\]\(\)\{\}]', ' ', transcript)
+        mono = re.sub(r'\s+', ' ', mono).strip()
+        if len(mono) > 20:
+            logger.warning(f"All strategies failed — forcing monologue fallback ({len(mono)} chars)")
+            parsed = [("Speaker 1", mono)]
+        else:
+            logger.error(f"All parsing strategies failed. Raw (300 chars): {transcript[:300]}...")
+            raise TranscriptGenerationError(
+                "Could not parse transcript into speaker-dialogue pairs after all strategies "
+                "(literal_eval, regex tuples, plain dialogue, JSON, monologue fallback). "
+                "The LLM model may be too small for structured output — try a larger model (3b+)."
+            )
+
+    logger.info(f"Transcript parsed successfully: {len(parsed)} dialogue turns")
+    return parsed
+
+
+def save_podcast_ready(parsed: List[Tuple[str, str]], output_dir) -> Path:
+    """Write the Step 3 artifacts and return their path stem.
+
+    The .jsonl artifact feeds Steps 4/5, the .txt keeps the editable
+    list-of-tuples form shown in the web UI.
+    """
+    output_file = Path(output_dir) / 'podcast_ready_data'
+    write_turns(f'{output_file}.jsonl', turns_from_pairs(parsed), kind=SCRIPT_KIND)
+
+    with open(f'{output_file}.txt', 'w') as file:
+        file.write(str(parsed))
+    return output_file
 
 
 def step3(
@@ -369,23 +486,26 @@ def step3(
     language: str = "english"
 ) -> str:
     try:
+        mode = config["Step3"].get("mode", "sequential")
+        if mode not in ("sequential", "concurrent"):
+            raise InvalidParameterError(f"Unknown Step3 mode: {mode}")
+
+        structured_output = config["Big-Text-Model"].get("structured_output", "auto")
+        if structured_output not in STRUCTURED_MODES:
+            raise InvalidParameterError(f"Unknown structured_output mode: {structured_output}")
+
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        input_path = input_file
-        if not input_file.endswith('.pkl'):
-            input_path = f"{input_path}.pkl"
-
         # Read input file
         logger.info(f"Reading input file: {input_file}")
-        input_text = read_pickle_file(input_file)
+        input_text = read_transcript_file(input_file)
 
         logger.info(f"Optimizing transcript for TTS...")
 
         # Check if we need to generate in chunks with overlap
         if len(input_text) > config["Step3"].get("chunk_size", 8000):
-            logger.info("Input text is large, generating transcript in chunks with overlap...")
-            transcript = generate_rewritten_transcript_with_overlap(
+            chunk_kwargs = dict(
                 client=client,
                 model_name=config["Big-Text-Model"]["model"],
                 input_text=input_text,
@@ -395,8 +515,18 @@ def step3(
                 temperature=config["Step1"]["temperature"],
                 chunk_size=config["Step3"].get("chunk_size", 8000),
                 overlap_percent=config["Step3"].get("overlap_percent", 10),
-                language=language
+                language=language,
+                structured_output=structured_output,
             )
+            if mode == "concurrent":
+                logger.info("Input text is large, rewriting chunks concurrently...")
+                transcript = generate_rewritten_transcript_concurrent(
+                    max_workers=config["Step3"].get("max_workers", MAX_WORKERS),
+                    **chunk_kwargs,
+                )
+            else:
+                logger.info("Input text is large, generating transcript in chunks with overlap...")
+                transcript = generate_rewritten_transcript_with_overlap(**chunk_kwargs)
         else:
             # Generate rewritten transcript in one go
             logger.info(f"Generating rewritten transcript...")
@@ -408,57 +538,16 @@ def step3(
                 format_type=format_type,
                 max_tokens=config["Step3"]["max_tokens"],
                 temperature=config["Step1"]["temperature"],
-                language=language
+                language=language,
+                structured_output=structured_output,
             )
 
-        # ── Flexible parsing with multi-strategy fallback ────────
-        parsed = parse_transcript_flexible(transcript)
-
-        if not parsed:
-            logger.warning("Flexible parser failed on raw output. Trying LLM fix...")
-            fix_prompt = [
-                {"role": "system", "content": "Convert the following text into valid Python syntax as a list of tuples with format: [('Speaker 1', 'Text1'), ('Speaker 2', 'Text2'), ...]. Return ONLY the Python list, nothing else."},
-                {"role": "user", "content": transcript}
-            ]
-            try:
-                fixed = generate_text(
-                    client=client,
-                    model=config["Big-Text-Model"]["model"],
-                    messages=fix_prompt,
-                    max_tokens=config["Step3"]["max_tokens"],
-                    temperature=0.3,
-                )
-                parsed = parse_transcript_flexible(fixed)
-            except Exception:
-                pass
-
-        if not parsed:
-            # Last resort: force monologue from raw LLM output
-            mono = re.sub(r'[\[\]\(\)\{\}]', ' ', transcript)
-            mono = re.sub(r'\s+', ' ', mono).strip()
-            if len(mono) > 20:
-                logger.warning(f"All strategies failed — forcing monologue fallback ({len(mono)} chars)")
-                parsed = [("Speaker 1", mono)]
-            else:
-                logger.error(f"All parsing strategies failed. Raw (300 chars): {transcript[:300]}...")
-                raise TranscriptGenerationError(
-                    "Could not parse transcript into speaker-dialogue pairs after all strategies "
-                    "(literal_eval, regex tuples, plain dialogue, JSON, monologue fallback). "
-                    "The LLM model may be too small for structured output — try a larger model (3b+)."
-                )
-
-        # Use the parsed list as the canonical transcript
-        transcript = str(parsed)
-        logger.info(f"Transcript parsed successfully: {len(parsed)} dialogue turns")
-
-        # Save transcript
-        output_file = output_dir / 'podcast_ready_data'
-        with open(f'{output_file}.pkl', 'wb') as file:
-            pickle.dump(transcript, file)
-
-        with open(f'{output_file}.txt', 'w') as file:
-            file.write(transcript)
+        parsed = parse_rewritten_transcript(
+            client, config["Big-Text-Model"]["model"], transcript, config["Step3"]["max_tokens"]
+        )
+        logger.info(f"Step 3 LLM calls so far: {llm_stats.summary('step3')}")
 
+        output_file = save_podcast_ready(parsed, output_dir)
         logger.info(f"Rewritten transcript saved to: {output_file}")
         return str(input_file), str(output_file)
 
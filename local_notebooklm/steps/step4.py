@@ -1,51 +1,73 @@
-from .helpers import wait_for_next_step, generate_speech
-from typing import List, Tuple, Dict, Any, Optional
-import logging, pickle, ast, re
+from .helpers import generate_speech, speech_bytes
+from .artifacts import iter_turns, load_legacy_pickle, resolve_artifact
+from .audio_assembly import (
+    PCM_DEFAULT_RATE,
+    AssemblyError,
+    PcmSegment,
+    SegmentAssembler,
+    decode_segment,
+    subtype_for_bit_depth,
+)
+from .audio_encode import ENCODINGS
+from .live_audio import live_audio_path
+from .segment_manifest import MANIFEST_FILENAME, SegmentManifest
+from .segment_plan import DEFAULT_MAX_CHARS, TIMING_FILENAME, plan_segments, write_timing
+from .tts_cache import CACHE_DIRNAME, DEFAULT_CACHE_MB, SegmentCache, segment_key
+from typing import Callable, List, Tuple, Dict, Any, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import logging, ast, os, threading, weakref
 from pathlib import Path
-import soundfile as sf
 from tqdm import tqdm
-import numpy as np
 
 
 logger = logging.getLogger(__name__)
 
+# Concurrent TTS requests per provider; Text-To-Speech-Model.max_concurrency
+# overrides.  Local servers that synthesize one request at a time get 1.
+TTS_CONCURRENCY = {
+    "openai": 8,
+    "azure": 4,
+    "elevenlabs": 4,
+    "groq": 4,
+    "custom": 8,
+    "lmstudio": 1,
+    "ollama": 1,
+}
+DEFAULT_TTS_CONCURRENCY = 4
+
+# Raw 16-bit mono PCM response formats for Text-To-Speech-Model.in_memory:
+# provider -> (response_format template, sample rates offered)
+PCM_FORMATS = {
+    "openai": ("pcm", (24000,)),
+    "azure": ("pcm", (24000,)),
+    "elevenlabs": ("pcm_{rate}", (16000, 22050, 24000, 44100)),
+}
+
+# One semaphore per TTS client, so Step 4 runs from concurrent pipeline
+# branches (multi-variant runs) share the provider's limit
+_slots_lock = threading.Lock()
+_provider_slots: "weakref.WeakKeyDictionary[Any, Tuple[int, threading.BoundedSemaphore]]" = weakref.WeakKeyDictionary()
+
+ProgressCallback = Callable[[int, int], None]
+SegmentCallback = Callable[[Union[Path, PcmSegment]], Any]
+
 class AudioGenerationError(Exception):
     pass
 
 def load_podcast_data(data_path: Path) -> List[Tuple[str, str]]:
+    """Load speaker turns from a ``.jsonl`` artifact or a legacy ``.pkl``."""
     try:
-        with open(data_path, 'rb') as file:
-            podcast_text = pickle.load(file)
-        return ast.literal_eval(podcast_text)
+        if str(data_path).endswith('.pkl'):
+            data = load_legacy_pickle(data_path)
+            if isinstance(data, str):  # older Step 3 pickled the repr of the turn list
+                data = ast.literal_eval(data)
+            return [(item[0], item[1]) for item in data]
+        return [turn.as_tuple() for turn in iter_turns(data_path)]
     except FileNotFoundError:
         raise FileNotFoundError(f"Podcast data file not found: {data_path}")
-    except (ValueError, SyntaxError) as e:
+    except (ValueError, SyntaxError, TypeError, IndexError) as e:
         raise ValueError(f"Invalid podcast data format: {str(e)}")
 
-def concatenate_audio_files(segment_dir: Path, format: str = "wav") -> Tuple[np.ndarray, int]:
-    audio_files = sorted(
-        segment_dir.glob(f"*podcast_segment_*.{format}"),
-        key=lambda x: int(re.search(r'segment_(\d+)\.wav', str(x)).group(1))
-    )
-    
-    if not audio_files:
-        raise FileNotFoundError(f"No audio segments found in {segment_dir}")
-    
-    # Read the first file to get the sample rate
-    first_data, sample_rate = sf.read(audio_files[0])
-    audio_data = [first_data]
-    
-    # Read the rest of the files
-    for file in audio_files[1:]:
-        try:
-            data, _ = sf.read(file)
-            audio_data.append(data)
-        except Exception as e:
-            logger.error(f"Failed to read audio file {file}: {str(e)}")
-            continue
-    
-    return np.concatenate(audio_data), sample_rate
-
 def generate_speaker_audio(
     client,
     model_name,
@@ -55,7 +77,6 @@ def generate_speaker_audio(
     response_format
 ) -> None:
     try:
-        wait_for_next_step()
         generate_speech(
             client=client,
             model_name=model_name,
@@ -64,8 +85,9 @@ def generate_speaker_audio(
             voice=voice,
             response_format=response_format
         )
-        # Validate that the audio file was created
-        output_file = output_path.with_suffix(f".{response_format}")
+        # Validate that the audio file was created (ElevenLabs formats such
+        # as mp3_44100_128 are saved with the bare extension)
+        output_file = output_path.with_suffix(f".{response_format.split('_')[0].split('-')[0]}")
         if not output_file.exists():
             raise AudioGenerationError(f"Audio file was not generated at {output_file}")
     except Exception as e:
@@ -88,19 +110,245 @@ def parse_audio_format(format_string):
     
     return audio_format, sample_rate, bit_depth
 
+def voice_for_speaker(config: Dict[str, Any], speaker: str) -> str:
+    """Map ``Speaker N`` to its configured voice (unknown speakers → co-host 1)."""
+    voices = {
+        "Speaker 1": config["Host-Speaker-Voice"],
+        "Speaker 2": config["Co-Host-Speaker-1-Voice"],
+        "Speaker 3": config["Co-Host-Speaker-2-Voice"],
+        "Speaker 4": config["Co-Host-Speaker-3-Voice"],
+        "Speaker 5": config["Co-Host-Speaker-4-Voice"],
+    }
+    return voices.get(speaker, config["Co-Host-Speaker-1-Voice"])
+
+
+def tts_concurrency(config: Dict[str, Any]) -> int:
+    """Concurrent TTS requests allowed for the configured provider."""
+    tts_cfg = config["Text-To-Speech-Model"]
+    if "max_concurrency" in tts_cfg:
+        return max(1, int(tts_cfg["max_concurrency"]))
+    provider = (tts_cfg.get("provider") or {}).get("name", "")
+    return TTS_CONCURRENCY.get(provider, DEFAULT_TTS_CONCURRENCY)
+
+
+def segment_cache_for(config: Dict[str, Any], output_dir: Path) -> Optional[SegmentCache]:
+    """The TTS segment cache configured for this run, or None if disabled.
+
+    Defaults to ``<output_dir>/tts_cache``; point ``cache_dir`` at a shared
+    directory to reuse segments across notebooks.
+    """
+    tts_cfg = config["Text-To-Speech-Model"]
+    if tts_cfg.get("cache", True) is False:
+        return None
+    root = tts_cfg.get("cache_dir") or Path(output_dir) / CACHE_DIRNAME
+    return SegmentCache(root, int(tts_cfg.get("cache_max_mb", DEFAULT_CACHE_MB)) * 1024 * 1024)
+
+
+def _slots_for(client, limit: int) -> threading.BoundedSemaphore:
+    """The request slots shared by every run on *client*.
+
+    A different *limit* (config or ``TTS_CONCURRENCY`` changed) replaces
+    them; requests already holding the old slots release those.
+    """
+    with _slots_lock:
+        try:
+            current = _provider_slots.get(client)
+            if current is None or current[0] != limit:
+                current = _provider_slots[client] = (limit, threading.BoundedSemaphore(limit))
+            return current[1]
+        except TypeError:  # client can't be weakly referenced
+            return threading.BoundedSemaphore(limit)
+
+
+def in_memory_format(config: Dict[str, Any], sample_rate: Optional[int] = None) -> str:
+    """Response format to request when segments are kept in memory.
+
+    Raw PCM where the provider offers it (see :data:`PCM_FORMATS`), so
+    segments need no decoding; otherwise ``audio_format``, decoded in memory.
+    """
+    tts_cfg = config["Text-To-Speech-Model"]
+    provider = (tts_cfg.get("provider") or {}).get("name", "")
+    if provider not in PCM_FORMATS:
+        return tts_cfg.get("audio_format", "wav")
+    template, rates = PCM_FORMATS[provider]
+    return template.format(rate=sample_rate if sample_rate in rates else PCM_DEFAULT_RATE)
+
+
+def synthesize_segments(
+    client,
+    config: Dict[str, Any],
+    podcast_data: List[Tuple[str, str]],
+    segments_dir: Path,
+    response_format: str,
+    progress_callback: Optional[ProgressCallback] = None,
+    cache: Optional[SegmentCache] = None,
+    on_segment: Optional[SegmentCallback] = None,
+    manifest: Optional[SegmentManifest] = None,
+    in_memory: bool = False,
+    keep_files: bool = True,
+    max_buffered: Optional[int] = None,
+) -> List[Path]:
+    """Synthesize every turn with bounded concurrency.
+
+    Requests run on a thread pool (the provider SDK clients are
+    synchronous) limited by :func:`tts_concurrency`.  Segments that
+    *manifest* records as already done for the same text and voice are
+    reused in place; turns found in *cache* are copied instead of
+    synthesized.  Each finished or failed segment is recorded in
+    *manifest*.  Returns the segment files in turn order, whatever order
+    they finished in.  The first failure cancels the segments not yet
+    started and is raised.
+
+    *on_segment*, if given, receives each segment in turn order as soon
+    as it and all earlier segments are done.  With *in_memory* that is a
+    :class:`PcmSegment` decoded from the response rather than a file, and
+    segment files (WAV) are only written with *keep_files*.
+    *max_buffered* caps how many segments may be in flight or waiting
+    for an earlier one, which bounds the audio held in memory.
+    """
+    tts_cfg = config["Text-To-Speech-Model"]
+    provider_cfg = tts_cfg.get("provider") or {}
+    model_name = tts_cfg["model"]
+    raw_extension = response_format.split('_')[0].split('-')[0]
+    extension = "wav" if in_memory else raw_extension
+    limit = tts_concurrency(config)
+    slots = _slots_for(client, limit)
+    total = len(podcast_data)
+    paths = [segments_dir / f"podcast_segment_{i}.{extension}" for i in range(1, total + 1)]
+    if in_memory and not keep_files:
+        manifest = None  # nothing on disk to resume from
+    if manifest is not None:
+        manifest.retain(total)
+
+    def synthesize_bytes(text: str, voice: str) -> bytes:
+        try:
+            with slots:
+                return speech_bytes(client=client, text=text, voice=voice,
+                                    model_name=model_name, response_format=response_format)
+        except Exception as e:
+            raise AudioGenerationError(f"Failed to generate audio: {str(e)}")
+
+    def synthesize(i: int) -> Tuple[str, Union[Path, PcmSegment]]:
+        """Produce segment *i*; returns where it came from and the segment."""
+        speaker, text = podcast_data[i]
+        voice = voice_for_speaker(config, speaker)
+        key = segment_key(provider_cfg.get("name", ""), provider_cfg.get("endpoint", ""),
+                          model_name, voice, response_format, text)
+        if manifest is not None and manifest.reusable(i + 1, key, paths[i]):
+            return "resumed", paths[i]
+        source = "cached"
+        segment: Union[Path, PcmSegment] = paths[i]
+        try:
+            if in_memory:
+                data = cache.read(key, raw_extension) if cache is not None else None
+                if data is None:
+                    source = "synthesized"
+                    data = synthesize_bytes(text, voice)
+                    if cache is not None:
+                        cache.store_bytes(key, raw_extension, data)
+                segment = decode_segment(data, response_format)
+                if keep_files:
+                    segment.write(paths[i])
+            elif cache is None or not cache.fetch(key, extension, paths[i]):
+                source = "synthesized"
+                with slots:
+                    generate_speaker_audio(
+                        client=client,
+                        text=text,
+                        model_name=model_name,
+                        output_path=segments_dir / f"podcast_segment_{i + 1}",
+                        voice=voice,
+                        response_format=response_format
+                    )
+                if cache is not None:
+                    cache.store(key, extension, paths[i])
+        except Exception as e:
+            if manifest is not None:
+                manifest.record(i + 1, key, voice, paths[i], error=e)
+            raise
+        if manifest is not None:
+            manifest.record(i + 1, key, voice, paths[i])
+        return source, segment
+
+    window = max(1, max_buffered) if on_segment and max_buffered else total
+    logger.info(f"Synthesizing {total} segments with up to {limit} concurrent requests"
+                + (f", {window} buffered" if window < total else ""))
+    done = delivered = submitted = 0
+    sources = {"resumed": 0, "cached": 0, "synthesized": 0}
+    results: Dict[int, Union[Path, PcmSegment]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(limit, total))) as pool, \
+            tqdm(total=total, desc="Generating podcast segments") as bar:
+        futures = {}
+        pending = set()
+        while True:
+            # Only start segments within the window past the last one delivered
+            while submitted < min(total, delivered + window):
+                fut = pool.submit(synthesize, submitted)
+                futures[fut] = submitted
+                pending.add(fut)
+                submitted += 1
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                index = futures.pop(fut)  # the future holds the segment; don't keep it alive
+                error = fut.exception()
+                if error is not None:
+                    for other in pending:
+                        other.cancel()
+                    raise AudioGenerationError(f"Segment {index + 1}/{total} failed: {error}")
+                done += 1
+                source, results[index] = fut.result()
+                sources[source] += 1
+                bar.update(1)
+                if progress_callback:
+                    progress_callback(done, total)
+            while on_segment and delivered in results:
+                try:
+                    on_segment(results.pop(delivered))
+                except Exception:
+                    for other in pending:
+                        other.cancel()
+                    raise
+                delivered += 1
+
+    if sources["resumed"]:
+        logger.info(f"Resumed {sources['resumed']}/{total} segments completed by an earlier run")
+    if cache is not None:
+        logger.info(f"Reused {sources['cached']}/{total} segments from the TTS cache")
+        cache.evict()
+    return paths
+
+
 def step4(
     client: Any = None,
     config: Optional[Dict[str, Any]] = None,
     input_dir: str = None,
-    output_dir: str = None
+    output_dir: str = None,
+    progress_callback: Optional[ProgressCallback] = None,
 ) -> Path:
-    model_name = config["Text-To-Speech-Model"]["model"]
-    host = config["Host-Speaker-Voice"]
-    co_host_1 = config["Co-Host-Speaker-1-Voice"]
-    co_host_2 = config["Co-Host-Speaker-2-Voice"]
-    co_host_3 = config["Co-Host-Speaker-3-Voice"]
-    co_host_4 = config["Co-Host-Speaker-4-Voice"]
-    response_format = config["Text-To-Speech-Model"].get("audio_format", "wav")
+    """Synthesize the Step 3 script and assemble ``podcast.<format>``.
+
+    Segments are synthesized in ``audio_format`` and the podcast is
+    encoded in ``output_format`` (default: the same) while they arrive;
+    ``keep_wav`` also keeps a ``podcast.wav``.  Returns the path of the
+    ``output_format`` file.
+
+    Progress is recorded in ``segments/manifest.json``; unless
+    ``Text-To-Speech-Model.resume`` is off, a rerun after a failure only
+    synthesizes the segments that are missing or changed.  With
+    ``in_memory``, responses are requested as raw PCM where the provider
+    supports it and go straight to the assembler; segment files are only
+    written with ``keep_segments``.
+
+    *progress_callback*, if given, is called as ``(done, total)`` after
+    each segment finishes.  With ``Text-To-Speech-Model.progressive`` (set
+    by the server and web UI for their live players), the audio is also
+    appended to ``podcast.live.wav`` as it becomes available in turn order
+    (see :mod:`.live_audio`).
+    """
+    tts_cfg = config["Text-To-Speech-Model"]
+    response_format = tts_cfg.get("audio_format", "wav")
     
     try:
         input_dir = Path(input_dir)
@@ -115,43 +363,98 @@ def step4(
         segments_dir = output_dir / "segments"
         segments_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load podcast data
-        podcast_data = load_podcast_data(input_dir / "podcast_ready_data.pkl")
-        
-        # Generate audio segments
-        for i, (speaker, text) in enumerate(tqdm(podcast_data, desc="Generating podcast segments"), 1):
-            output_path = segments_dir / f"podcast_segment_{i}"
-
-            if speaker == "Speaker 1":
-                current_voice = host
-            elif speaker == "Speaker 2":
-                current_voice = co_host_1
-            elif speaker == "Speaker 3":
-                current_voice = co_host_2
-            elif speaker == "Speaker 4":
-                current_voice = co_host_3
-            elif speaker == "Speaker 5":
-                current_voice = co_host_4
-            else:
-                current_voice = co_host_1
-
-            generate_speaker_audio(
-                client=client,
-                text=text,
-                model_name=model_name,
-                output_path=output_path,
-                voice=current_voice,
-                response_format=response_format
+        # Load podcast data and plan the TTS requests
+        podcast_data = load_podcast_data(resolve_artifact(input_dir / "podcast_ready_data"))
+        plan = plan_segments(podcast_data, lambda speaker: voice_for_speaker(config, speaker),
+                             int(tts_cfg.get("max_segment_chars", DEFAULT_MAX_CHARS)))
+        logger.info(f"Planned {len(plan)} TTS requests for {len(podcast_data)} turns")
+
+        output_format = tts_cfg.get("output_format") or audio_format
+        if output_format not in ENCODINGS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        encoding = ENCODINGS[output_format]
+        final_path = f"{output_dir}/podcast.{encoding.extension}"
+        wav_path = f"{output_dir}/podcast.wav"
+        want_wav = output_format == "wav" or tts_cfg.get("keep_wav", False)
+        skip_missing = tts_cfg.get("skip_missing_segments", False)
+        # In-memory mode keeps decoded responses in a bounded queue and only
+        # writes segment files for the cache (raw bytes) or keep_segments
+        in_memory = tts_cfg.get("in_memory", False)
+        keep_files = not in_memory or tts_cfg.get("keep_segments", False)
+        request_format = in_memory_format(config, sample_rate) if in_memory else response_format
+
+        # Sinks are fed each segment in turn order while synthesis runs, so
+        # the final files are ready right after the last segment
+        wav_sink = encoder = None
+        if tts_cfg.get("progressive", False):
+            live_path = live_audio_path(output_dir)
+            live_path.unlink(missing_ok=True)  # a reader must never see a stale run
+            wav_sink = SegmentAssembler(live_path, sample_rate, subtype=subtype_for_bit_depth("wav", bit_depth),
+                                        progressive=True)
+        elif want_wav:
+            wav_sink = SegmentAssembler(wav_path, sample_rate, subtype=subtype_for_bit_depth("wav", bit_depth))
+        if output_format != "wav":
+            encoder = SegmentAssembler(final_path, sample_rate,
+                                       subtype=subtype_for_bit_depth(output_format, bit_depth),
+                                       bitrate_kbps=tts_cfg.get("output_bitrate_kbps"))
+        sinks = [sink for sink in (wav_sink, encoder) if sink]
+        missing = []
+        durations: List[Optional[float]] = []
+
+        def append_segment(segment: Union[Path, PcmSegment]) -> None:
+            for n, sink in enumerate(sinks):
+                try:
+                    frames = sink.append(segment)
+                except AssemblyError as e:
+                    if not skip_missing or n:  # too late to skip once another sink has it
+                        raise
+                    logger.warning(f"Skipping segment: {e}")
+                    missing.append(segment)
+                    durations.append(None)
+                    return
+                if n == 0:
+                    durations.append(frames / sink.sample_rate)
+
+        try:
+            segment_files = synthesize_segments(
+                client, config, [(seg.speaker, seg.text) for seg in plan], segments_dir,
+                request_format, progress_callback,
+                cache=segment_cache_for(config, output_dir),
+                on_segment=append_segment,
+                manifest=SegmentManifest(segments_dir / MANIFEST_FILENAME,
+                                         load=tts_cfg.get("resume", True)),
+                in_memory=in_memory,
+                keep_files=keep_files,
+                max_buffered=(int(tts_cfg.get("max_buffered_segments", 2 * tts_concurrency(config)))
+                              if in_memory else None),
             )
-        
-        # Concatenate all segments
-        logger.info("Concatenating audio segments...")
-        final_audio, detected_sample_rate = concatenate_audio_files(segments_dir, audio_format)
-        
-        # Save final podcast with the detected sample rate
-        final_path = f"{output_dir}/podcast.{audio_format}"
-        sf.write(str(final_path), final_audio, detected_sample_rate)
-        logger.info(f"Podcast generated successfully at {final_path}")
+            for sink in sinks:
+                sink.close()
+            if wav_sink and wav_sink.progressive:
+                if want_wav:
+                    os.replace(wav_sink.path, wav_path)
+                else:
+                    wav_sink.path.unlink()
+        except BaseException as e:
+            for sink in sinks:
+                sink.abort()
+            if isinstance(e, AssemblyError):
+                raise AudioGenerationError(str(e))
+            raise
+
+        report = (encoder or wav_sink).report(missing)._replace(path=Path(final_path))
+        if encoder:
+            kbps = tts_cfg.get("output_bitrate_kbps") or encoding.default_kbps
+            rate_label = f" at {kbps} kbps" if kbps else ""
+            logger.info(
+                f"Encoded {encoding.name}{rate_label}: {report.size_bytes / 1e6:.1f} MB vs "
+                f"{report.pcm_bytes / 1e6:.1f} MB as 16-bit WAV "
+                f"({report.pcm_bytes / max(report.size_bytes, 1):.1f}x smaller) in {report.seconds:.1f}s"
+            )
+        write_timing(output_dir / TIMING_FILENAME, plan, segment_files, podcast_data,
+                     durations=durations)
+        logger.info(f"Podcast generated successfully at {final_path} "
+                    f"({report.duration:.1f}s, {report.sample_rate} Hz, {report.segments} segments)")
         
         return final_path
         
@@ -10,13 +10,17 @@ Step 5 failure is **non-fatal** — the pipeline still returns audio.
 import html
 import json
 import logging
-import pickle
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from .helpers import generate_text
-from .prompts import step5_system_prompt
+from .artifacts import iter_turns, load_legacy_pickle, render_text, turns_from_text
+from .browser_pool import DEFAULT_PAGES, get_browser_pool
+from .helpers import StructuredOutputError, generate_structured, generate_text, llm_stats
+from .prompts import step5_chunk_system_prompt, step5_headline_system_prompt, step5_system_prompt
+from .step1 import create_word_bounded_chunks
 
 try:
     from .step5_pptx import render_infographic_pptx, render_video
@@ -25,7 +29,7 @@ except ImportError:
     _HAS_PPTX_MODULE = False
 
 try:
-    from .step5_charts import generate_all_charts
+    from .step5_charts import DEFAULT_CHART_WORKERS, generate_all_charts, warm_chart_workers
     _HAS_CHARTS = True
 except ImportError:
     _HAS_CHARTS = False
@@ -57,10 +61,13 @@ def load_transcript_text(input_dir: str) -> str:
         if text.strip():
             return text
 
+    jsonl_path = input_path / "podcast_ready_data.jsonl"
+    if jsonl_path.exists():
+        return render_text(iter_turns(jsonl_path))
+
     pkl_path = input_path / "podcast_ready_data.pkl"
     if pkl_path.exists():
-        with open(pkl_path, "rb") as f:
-            data = pickle.load(f)
+        data = load_legacy_pickle(pkl_path)
         if isinstance(data, str):
             return data
         if isinstance(data, list):
@@ -78,7 +85,7 @@ def load_transcript_text(input_dir: str) -> str:
 
     raise InfographicError(
         f"No text found in {input_dir}. "
-        "Expected podcast_ready_data.txt, .pkl, or extracted_text.txt"
+        "Expected podcast_ready_data.txt, .jsonl, .pkl, or extracted_text.txt"
     )
 
 
@@ -90,23 +97,157 @@ _REQUIRED_KEYS = {"title", "summary", "topics", "key_takeaways",
                   "notable_quotes", "speakers", "conversation_flow"}
 
 
-def extract_structured_data(
+def _object(**properties) -> Dict[str, Any]:
+    return {"type": "object", "properties": properties,
+            "required": list(properties), "additionalProperties": False}
+
+
+def _array(items: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "array", "items": items}
+
+
+_STR = {"type": "string"}
+
+# Same shape as step5_system_prompt describes; requested from providers
+# with structured output so the reply needs no fence stripping or repair
+INFOGRAPHIC_SCHEMA = _object(
+    title=_STR,
+    summary=_STR,
+    topics=_array(_object(name=_STR, description=_STR, importance={"type": "integer"})),
+    key_takeaways=_array(_STR),
+    notable_quotes=_array(_object(speaker=_STR, quote=_STR)),
+    speakers=_array(_object(label=_STR, role=_STR, line_count={"type": "integer"})),
+    conversation_flow=_array(_object(speaker=_STR, topic=_STR)),
+)
+
+
+CHUNK_SCHEMA = _object(
+    summary=_STR,
+    topics=INFOGRAPHIC_SCHEMA["properties"]["topics"],
+    key_takeaways=_array(_STR),
+    notable_quotes=INFOGRAPHIC_SCHEMA["properties"]["notable_quotes"],
+    speakers=INFOGRAPHIC_SCHEMA["properties"]["speakers"],
+    conversation_flow=INFOGRAPHIC_SCHEMA["properties"]["conversation_flow"],
+)
+HEADLINE_SCHEMA = _object(title=_STR, summary=_STR)
+
+EXTRACTION_MODES = ("auto", "single", "chunked")
+DEFAULT_CHUNK_CHARS = 24000
+MAX_EXTRACTION_WORKERS = 4  # concurrent per-chunk extraction calls
+
+# How much of each list the merged infographic keeps
+_MAX_TOPICS = 6
+_MAX_TAKEAWAYS = 5
+_MAX_QUOTES = 4
+_MAX_FLOW = 10
+_MAX_SUMMARIES = 3  # chunk summaries joined when the headline call fails
+
+
+# Keys an infographic is blank without; a reply lacking them is not repaired
+_CORE_KEYS = ("title", "summary", "topics")
+
+
+def _parse_json_object(raw: str) -> Dict[str, Any]:
+    """Decode a JSON object from a reply, ignoring markdown fences and any
+    prose around the outermost braces."""
+    # Strip markdown fences if the model wraps the JSON
+    cleaned = raw.strip()
+    cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned)
+    cleaned = re.sub(r"\s*```$", "", cleaned)
+
+    try:
+        data = json.loads(cleaned)
+    except json.JSONDecodeError as exc:
+        start, end = cleaned.find("{"), cleaned.rfind("}")
+        try:
+            if start < 0 or end <= start:
+                raise exc
+            data = json.loads(cleaned[start:end + 1])
+        except json.JSONDecodeError:
+            raise InfographicError(f"LLM returned invalid JSON: {exc}\n{cleaned[:500]}")
+    if not isinstance(data, dict):
+        raise InfographicError(f"LLM returned {type(data).__name__}, expected a JSON object")
+    return data
+
+
+def _repair_structured(data: Any, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Make a structured reply fit *schema*: unwrap a single nested object
+    and fill missing list keys (takeaways, quotes, ...) with ``[]``.
+
+    Raises InfographicError if a core key (title, summary, topics) is
+    missing or empty, since filling it would render a blank infographic.
+    """
+    required = schema["required"]
+    if isinstance(data, dict) and len(data) == 1:
+        inner = next(iter(data.values()))
+        if isinstance(inner, dict) and set(inner) & set(required):
+            data = inner
+    if not isinstance(data, dict):
+        raise InfographicError(f"LLM returned {type(data).__name__}, expected a JSON object")
+    blank = [key for key in required if key in _CORE_KEYS
+             and (not data.get(key) or (isinstance(data[key], str) and not data[key].strip()))]
+    if blank:
+        raise InfographicError(f"LLM response missing or empty: {blank}")
+    missing = [key for key in required if key not in data]
+    unfillable = [key for key in missing if schema["properties"][key].get("type") != "array"]
+    if unfillable:
+        raise InfographicError(f"LLM response missing keys: {unfillable}")
+    if missing:
+        logger.warning(f"Structured reply missing {missing}; leaving them empty")
+    for key in missing:
+        data[key] = []
+    return data
+
+
+def _request_json(
     client: Any,
     config: Dict[str, Any],
-    transcript: str,
+    system_prompt: str,
+    content: str,
+    schema: Dict[str, Any],
+    schema_name: str,
+    max_tokens: int,
 ) -> Dict[str, Any]:
-    """Single LLM call → structured JSON with podcast metadata."""
+    """One extraction call: structured output if the provider supports it,
+    else free text parsed as JSON.
 
+    A malformed or incomplete structured reply is repaired locally (and
+    counted as a ``structured_fixup``) rather than generated again.
+    Raises InfographicError if the reply can't be made into an object
+    with every key *schema* requires (see :func:`_repair_structured`)."""
     step_cfg = config.get("Step5", {})
     model = config["Big-Text-Model"]["model"]
-    max_tokens = step_cfg.get("max_tokens", 4096)
     temperature = step_cfg.get("temperature", 0.4)
+    required = set(schema["required"])
 
     messages = [
-        {"role": "system", "content": step5_system_prompt},
-        {"role": "user", "content": transcript},
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": content},
     ]
 
+    llm_stats.incr("step5", "calls")
+    try:
+        data = generate_structured(
+            client=client,
+            messages=messages,
+            model=model,
+            schema=schema,
+            schema_name=schema_name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            mode=config["Big-Text-Model"].get("structured_output", "auto"),
+        )
+    except StructuredOutputError as e:
+        llm_stats.incr("step5", "structured_fixup")
+        return _repair_structured(_parse_json_object(e.raw), schema)
+    if isinstance(data, dict) and not required - set(data.keys()):
+        llm_stats.incr("step5", "structured")
+        return data
+    if data is not None:
+        llm_stats.incr("step5", "structured_fixup")
+        return _repair_structured(data, schema)
+
+    llm_stats.incr("step5", "text")
     raw = generate_text(
         client=client,
         messages=messages,
@@ -115,23 +256,253 @@ def extract_structured_data(
         temperature=temperature,
     )
 
-    # Strip markdown fences if the model wraps the JSON
-    cleaned = raw.strip()
-    cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned)
-    cleaned = re.sub(r"\s*```$", "", cleaned)
-
-    try:
-        data = json.loads(cleaned)
-    except json.JSONDecodeError as exc:
-        raise InfographicError(f"LLM returned invalid JSON: {exc}\n{cleaned[:500]}")
-
-    missing = _REQUIRED_KEYS - set(data.keys())
+    data = _parse_json_object(raw)
+    missing = required - set(data.keys())
     if missing:
         raise InfographicError(f"LLM response missing keys: {missing}")
 
     return data
 
 
+def speaker_stats(transcript: str) -> Dict[str, int]:
+    """Turns per ``Speaker N``, in order of first appearance.
+
+    Counted from the ``Speaker N:`` lines of the transcript, so the
+    infographic doesn't rely on the LLM's estimate.  Empty when no line
+    is attributed (e.g. Step 1 text in infographic-only mode).
+    """
+    counts: Dict[str, int] = {}
+    for turn in turns_from_text(transcript):
+        if turn.speaker:
+            counts[turn.speaker] = counts.get(turn.speaker, 0) + 1
+    return counts
+
+
+def _with_speaker_stats(data: Dict[str, Any], stats: Dict[str, int]) -> Dict[str, Any]:
+    """*data* with its speakers replaced by the counted ones, keeping the LLM's roles."""
+    if not stats:
+        return data
+    roles = {}
+    for spk in data.get("speakers") or []:
+        if isinstance(spk, dict) and spk.get("role"):
+            roles.setdefault(str(spk.get("label", "")).strip().lower(), spk["role"])
+    data["speakers"] = [
+        {"label": label,
+         "role": roles.get(label.lower(), "Host" if i == 0 else "Co-Host"),
+         "line_count": count}
+        for i, (label, count) in enumerate(stats.items())
+    ]
+    return data
+
+
+def chunk_transcript(transcript: str, chunk_chars: int) -> List[str]:
+    """Split *transcript* into pieces of at most about *chunk_chars*
+    characters, on line (turn) boundaries where possible."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in transcript.splitlines():
+        if not line.strip():
+            continue
+        pieces = [line] if len(line) <= chunk_chars else create_word_bounded_chunks(line, chunk_chars)
+        for piece in pieces:
+            if current and size + len(piece) + 1 > chunk_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _norm(text: Any) -> str:
+    return " ".join(re.findall(r"\w+", str(text).casefold()))
+
+
+def _round_robin(groups: List[List[Any]]):
+    """Items from each group in turn, so every chunk is represented."""
+    for i in range(max((len(g) for g in groups), default=0)):
+        for group in groups:
+            if i < len(group):
+                yield group[i]
+
+
+def _spread(items: List[Any], limit: int) -> List[Any]:
+    """At most *limit* items evenly spaced over *items*, keeping the ends."""
+    if len(items) <= limit:
+        return items
+    return [items[round(i * (len(items) - 1) / (limit - 1))] for i in range(limit)]
+
+
+def merge_chunk_extractions(parts: List[Dict[str, Any]], transcript: str) -> Dict[str, Any]:
+    """Combine per-chunk extractions (in transcript order) into one infographic.
+
+    Topics mentioned in several chunks are merged by name and ranked by
+    their summed importance; takeaways and quotes are deduplicated and
+    picked round-robin across chunks, preferring quotes found verbatim
+    in the transcript; the flow is concatenated and thinned out evenly.
+    ``title`` (the top topic) and ``summary`` (chunk summaries spread
+    over the whole transcript) are fallbacks for when
+    :func:`_headline` can't provide them.
+    """
+    topics: Dict[str, Dict[str, Any]] = {}
+    for order, part in enumerate(parts):
+        for topic in part.get("topics") or []:
+            key = _norm(topic.get("name", ""))
+            if not key:
+                continue
+            try:
+                importance = min(5, max(1, int(topic.get("importance", 3))))
+            except (TypeError, ValueError):
+                importance = 3
+            entry = topics.get(key)
+            if entry is None:
+                topics[key] = {"name": topic["name"], "description": topic.get("description", ""),
+                               "importance": importance, "score": importance, "first": order}
+            else:
+                entry["score"] += importance
+                if importance > entry["importance"]:
+                    entry.update(importance=importance, description=topic.get("description", ""))
+    ranked = sorted(topics.values(), key=lambda t: (-t["score"], t["first"]))[:_MAX_TOPICS]
+
+    def unique(items, key, limit):
+        seen, kept = set(), []
+        for item in items:
+            k = key(item)
+            if k and k not in seen:
+                seen.add(k)
+                kept.append(item)
+        return kept[:limit]
+
+    takeaways = unique(_round_robin([list(p.get("key_takeaways") or []) for p in parts]),
+                       _norm, _MAX_TAKEAWAYS)
+
+    haystack = _norm(transcript)
+    quotes = [q for q in _round_robin([list(p.get("notable_quotes") or []) for p in parts])
+              if isinstance(q, dict) and q.get("quote")]
+    quotes.sort(key=lambda q: _norm(q["quote"]) not in haystack)  # stable: verbatim first
+    quotes = unique(quotes, lambda q: _norm(q["quote"]), _MAX_QUOTES)
+
+    speakers: Dict[str, Dict[str, Any]] = {}
+    for part in parts:
+        for spk in part.get("speakers") or []:
+            label = str(spk.get("label", "")).strip()
+            if not label:
+                continue
+            entry = speakers.setdefault(label.lower(), {"label": label, "role": spk.get("role", ""),
+                                                        "line_count": 0})
+            try:
+                entry["line_count"] += int(spk.get("line_count", 0))
+            except (TypeError, ValueError):
+                pass
+
+    flow, last = [], None
+    for part in parts:
+        for step in part.get("conversation_flow") or []:
+            if not isinstance(step, dict):
+                continue
+            key = (_norm(step.get("speaker", "")), _norm(step.get("topic", "")))
+            if key != last:  # a chunk boundary can split one beat in two
+                flow.append(step)
+                last = key
+
+    summaries = [s for s in (str(p.get("summary", "")).strip() for p in parts) if s]
+
+    return {
+        "title": ranked[0]["name"] if ranked else "Podcast Infographic",
+        "summary": " ".join(_spread(summaries, _MAX_SUMMARIES)),
+        "topics": [{k: t[k] for k in ("name", "description", "importance")} for t in ranked],
+        "key_takeaways": takeaways,
+        "notable_quotes": quotes,
+        "speakers": list(speakers.values()),
+        "conversation_flow": _spread(flow, _MAX_FLOW),
+    }
+
+
+def _headline(client: Any, config: Dict[str, Any], parts: List[Dict[str, Any]],
+              merged: Dict[str, Any]) -> Dict[str, Any]:
+    """Title and overall summary from the chunk summaries — one small call."""
+    lines = [f"Part {i}: {p.get('summary', '')}" for i, p in enumerate(parts, 1)]
+    lines.append("Main topics: " + ", ".join(t["name"] for t in merged["topics"]))
+    try:
+        return _request_json(client, config, step5_headline_system_prompt, "\n".join(lines),
+                             HEADLINE_SCHEMA, "podcast_headline", max_tokens=512)
+    except Exception as exc:
+        logger.warning(f"Title/summary call failed, using the chunk summaries: {exc}")
+        return {"title": merged["title"], "summary": merged["summary"]}
+
+
+def extract_chunked(
+    client: Any,
+    config: Dict[str, Any],
+    transcript: str,
+    chunks: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Map-reduce extraction for long transcripts.
+
+    Each chunk is extracted concurrently with a smaller token budget,
+    the results are merged and ranked locally
+    (:func:`merge_chunk_extractions`), and a final small call writes the
+    title and summary from the chunk summaries.
+    """
+    step_cfg = config.get("Step5", {})
+    if chunks is None:
+        chunks = chunk_transcript(transcript, int(step_cfg.get("chunk_chars", DEFAULT_CHUNK_CHARS)))
+    max_tokens = step_cfg.get("chunk_max_tokens", 2048)
+    workers = max(1, min(int(step_cfg.get("max_concurrency", MAX_EXTRACTION_WORKERS)), len(chunks)))
+    logger.info(f"Extracting from {len(chunks)} transcript chunks ({workers} at a time)")
+
+    def extract(chunk: str) -> Dict[str, Any]:
+        return _request_json(client, config, step5_chunk_system_prompt, chunk,
+                             CHUNK_SCHEMA, "podcast_infographic_part", max_tokens)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(extract, chunk) for chunk in chunks]
+        parts = []
+        for i, fut in enumerate(futures, 1):
+            try:
+                parts.append(fut.result())
+            except Exception as exc:  # e.g. retries exhausted: one chunk doesn't sink the rest
+                logger.warning(f"Skipping transcript chunk {i}/{len(chunks)}: {exc}")
+    if not parts:
+        raise InfographicError(f"Extraction failed for all {len(chunks)} transcript chunks")
+
+    merged = merge_chunk_extractions(parts, transcript)
+    headline = _headline(client, config, parts, merged)
+    merged["title"] = headline.get("title") or merged["title"]
+    merged["summary"] = headline.get("summary") or merged["summary"]
+    return merged
+
+
+def extract_structured_data(
+    client: Any,
+    config: Dict[str, Any],
+    transcript: str,
+) -> Dict[str, Any]:
+    """LLM extraction → structured JSON with podcast metadata.
+
+    Short transcripts take a single call.  With ``Step5.extraction`` set
+    to ``"chunked"``, or ``"auto"`` (the default) and a transcript longer
+    than ``Step5.chunk_chars``, :func:`extract_chunked` is used instead.
+    Either way speaker turn counts are counted from the transcript.
+    """
+    step_cfg = config.get("Step5", {})
+    mode = step_cfg.get("extraction", "auto")
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown Step5.extraction {mode!r}; expected one of {EXTRACTION_MODES}")
+    chunks = None
+    if mode != "single":
+        chunks = chunk_transcript(transcript, int(step_cfg.get("chunk_chars", DEFAULT_CHUNK_CHARS)))
+
+    if mode == "chunked" or (mode == "auto" and len(chunks) > 1):
+        data = extract_chunked(client, config, transcript, chunks)
+    else:
+        data = _request_json(client, config, step5_system_prompt, transcript, INFOGRAPHIC_SCHEMA,
+                             "podcast_infographic", step_cfg.get("max_tokens", 4096))
+    return _with_speaker_stats(data, speaker_stats(transcript))
+
+
 # ---------------------------------------------------------------------------
 # 5c — HTML renderer
 # ---------------------------------------------------------------------------
@@ -145,8 +516,9 @@ def render_infographic_html(data: Dict[str, Any], charts: Optional[Dict] = None)
     """Generate a self-contained HTML infographic from structured data.
 
     *charts* maps chart names (``"topics"``, ``"speakers"``, ``"flow"``)
-    to ``(base64_data_uri, png_path)`` tuples.  When provided, ``<img>``
-    tags are embedded after the corresponding section.
+    to ``(base64_data_uri, png_path)`` tuples, or ``(svg_markup, svg_path)``
+    from the SVG chart backend.  When provided, each chart is embedded
+    after the corresponding section: PNGs as ``<img>`` tags, SVG inline.
     """
 
     _charts = charts or {}
@@ -154,12 +526,12 @@ def render_infographic_html(data: Dict[str, Any], charts: Optional[Dict] = None)
     def _chart_img(key: str) -> str:
         entry = _charts.get(key)
         if entry and entry[0]:
-            return (
-                f'\n<div style="text-align:center;margin-bottom:2rem">'
-                f'<img src="{entry[0]}" alt="{_esc(key)} chart" '
-                f'style="max-width:100%;border-radius:8px;border:1px solid #1e1e40">'
-                f'</div>'
-            )
+            style = "max-width:100%;border-radius:8px;border:1px solid #1e1e40"
+            if entry[0].startswith("<svg"):
+                chart = f'<div style="display:inline-block;overflow:hidden;{style}">{entry[0]}</div>'
+            else:
+                chart = f'<img src="{entry[0]}" alt="{_esc(key)} chart" style="{style}">'
+            return f'\n<div style="text-align:center;margin-bottom:2rem">{chart}</div>'
         return ""
 
     title = _esc(data.get("title", "Podcast Infographic"))
@@ -515,27 +887,33 @@ body {{
 # 5d — Optional PNG via Playwright
 # ---------------------------------------------------------------------------
 
-def render_png(html_path: str, png_path: str) -> Optional[str]:
+def _playwright_available() -> bool:
+    try:
+        import playwright.async_api  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def render_png(html_path: str, png_path: str, html_content: Optional[str] = None,
+               pages: int = DEFAULT_PAGES) -> Optional[str]:
     """Render the HTML infographic to PNG using Playwright.
 
+    Renders through the process-wide :class:`~.browser_pool.BrowserPool`,
+    so Chromium is launched once and its pages are reused across jobs.
+    The markup (*html_content*, or the contents of *html_path*) is loaded
+    with ``set_content``; *pages* sizes the pool when it is first started.
+
     Returns the PNG path on success, or *None* if Playwright is not installed.
     """
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
+    if not _playwright_available():
         logger.info("Playwright not installed — skipping PNG export.")
         return None
 
     try:
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch()
-            page = browser.new_page(viewport={"width": 1024, "height": 768})
-            page.goto(f"file://{html_path}")
-            page.wait_for_load_state("networkidle")
-            full_height = page.evaluate("document.body.scrollHeight")
-            page.set_viewport_size({"width": 1024, "height": full_height})
-            page.screenshot(path=png_path, full_page=True)
-            browser.close()
+        if html_content is None:
+            html_content = Path(html_path).read_text(encoding="utf-8")
+        get_browser_pool(pages).render(html_content, png_path)
         logger.info(f"PNG infographic saved to {png_path}")
         return png_path
     except Exception as exc:
@@ -555,6 +933,7 @@ def step5(
     generate_html: bool = True,
     generate_png: bool = True,
     generate_pptx: bool = True,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
 ) -> str:
     """Generate a visual infographic from the podcast transcript.
 
@@ -563,7 +942,10 @@ def step5(
 
     The *generate_html*, *generate_png*, and *generate_pptx* flags allow
     callers to skip individual outputs.  The LLM extraction (5a-5b) always
-    runs when any output is requested.
+    runs when any output is requested.  The outputs are then rendered
+    concurrently — HTML, PNG, and PPTX followed by its video — and
+    *progress_callback(done, total)* is called as the extraction and each
+    of them finishes.
     """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -572,6 +954,18 @@ def step5(
     logger.info("Step 5a: Loading transcript...")
     transcript = load_transcript_text(input_dir)
 
+    step_cfg = config.get("Step5", {})
+    want_charts = _HAS_CHARTS and (generate_html or generate_png or generate_pptx)
+    chart_backend = step_cfg.get("chart_backend", "matplotlib")
+    # The PPTX needs raster charts whichever backend draws the HTML ones
+    want_png_charts = want_charts and (chart_backend == "matplotlib" or generate_pptx)
+    chart_workers = int(step_cfg.get("chart_workers", DEFAULT_CHART_WORKERS)) if want_png_charts else 0
+    if want_png_charts:
+        warm_chart_workers(chart_workers)  # spawn and import pyplot during the LLM call
+    png_pages = int(step_cfg.get("png_pages", DEFAULT_PAGES))
+    if generate_png and _playwright_available():
+        get_browser_pool(png_pages).warm()  # launch Chromium during the LLM call, too
+
     # 5b — Extract structured data via LLM
     logger.info("Step 5b: Extracting structured data via LLM...")
     data = extract_structured_data(client, config, transcript)
@@ -584,14 +978,17 @@ def step5(
     # Generate charts (optional — returns empty dict if matplotlib is missing)
     charts = {}
     chart_pngs = {}
-    if _HAS_CHARTS and (generate_html or generate_png or generate_pptx):
+    if want_charts:
         try:
             logger.info("Generating infographic charts...")
-            charts = generate_all_charts(data, str(output_path))
+            if want_png_charts:
+                charts = generate_all_charts(data, str(output_path), workers=chart_workers)
             # Build a path-only dict for PPTX (only entries that have PNG files)
             chart_pngs = {
                 k: v[1] for k, v in charts.items() if v and v[1]
             }
+            if chart_backend != "matplotlib" and (generate_html or generate_png):
+                charts = generate_all_charts(data, str(output_path), backend=chart_backend)
             chart_count = sum(1 for v in charts.values() if v)
             logger.info(f"Generated {chart_count}/3 charts")
         except Exception as exc:
@@ -599,35 +996,61 @@ def step5(
 
     html_path = output_path / "infographic.html"
 
-    # 5c — Render HTML
+    # 5c — Render HTML; 5d-5f — PNG, and PPTX then video, from it concurrently
+    renders = []
     if generate_html or generate_png:
         logger.info("Step 5c: Rendering infographic HTML...")
         html_content = render_infographic_html(data, charts=charts or None)
-        html_path.write_text(html_content, encoding="utf-8")
-        logger.info(f"Saved infographic to {html_path}")
 
-    # 5d — Optional PNG
-    if generate_png and html_path.exists():
-        png_path = output_path / "infographic.png"
-        render_png(str(html_path.resolve()), str(png_path))
+        def write_html():
+            html_path.write_text(html_content, encoding="utf-8")
+            logger.info(f"Saved infographic to {html_path}")
 
-    # 5e — Optional PPTX
+        renders.append(write_html)
+        if generate_png:
+            png_path = output_path / "infographic.png"
+            renders.append(lambda: render_png(str(html_path.resolve()), str(png_path),
+                                              html_content=html_content, pages=png_pages))
     if generate_pptx and _HAS_PPTX_MODULE:
-        try:
-            pptx_path = output_path / "infographic.pptx"
-            pptx_result = render_infographic_pptx(
-                data, str(pptx_path), chart_images=chart_pngs or None,
-            )
-            if pptx_result:
-                logger.info(f"PPTX infographic saved to {pptx_result}")
-
-                # 5f — Optional video from PPTX
-                try:
-                    video_path = output_path / "infographic.mp4"
-                    render_video(str(pptx_path), str(video_path))
-                except Exception as exc:
-                    logger.warning(f"Video generation failed: {exc}")
-        except Exception as exc:
-            logger.warning(f"PPTX generation failed: {exc}")
+        renders.append(lambda: _render_pptx_and_video(data, output_path, chart_pngs))
+
+    done = [1]  # the extraction
+    total = 1 + len(renders)
+    done_lock = threading.Lock()
+    if progress_callback:
+        progress_callback(1, total)
+
+    def run(render):
+        render()
+        if progress_callback:
+            with done_lock:
+                done[0] += 1
+                progress_callback(done[0], total)
+
+    if renders:
+        with ThreadPoolExecutor(max_workers=len(renders)) as pool:
+            for fut in [pool.submit(run, render) for render in renders]:
+                fut.result()
 
     return str(html_path)
+
+
+def _render_pptx_and_video(data: Dict[str, Any], output_path: Path,
+                           chart_pngs: Dict[str, str]) -> None:
+    """5e/5f — PPTX deck, then the MP4 made from it (both non-fatal)."""
+    try:
+        pptx_path = output_path / "infographic.pptx"
+        pptx_result = render_infographic_pptx(
+            data, str(pptx_path), chart_images=chart_pngs or None,
+        )
+        if pptx_result:
+            logger.info(f"PPTX infographic saved to {pptx_result}")
+
+            # 5f — Optional video from PPTX
+            try:
+                video_path = output_path / "infographic.mp4"
+                render_video(str(pptx_path), str(video_path))
+            except Exception as exc:
+                logger.warning(f"Video generation failed: {exc}")
+    except Exception as exc:
+        logger.warning(f"PPTX generation failed: {exc}")
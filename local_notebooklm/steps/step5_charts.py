@@ -7,16 +7,37 @@ Generates matplotlib charts from structured podcast data:
 
 All charts use a cyberpunk dark theme matching the HTML/PPTX infographic.
 matplotlib is optional — functions return None if it is not installed.
+The ``svg`` backend (``svg_*_chart``) draws the same charts as inline SVG
+markup in pure Python, for the HTML infographic: no matplotlib import, no
+rasterizing, and a few KB of text instead of base64 PNGs.
+
+Each figure is PNG-encoded once; the same bytes become the data URI and
+the file.  :func:`generate_all_charts` can render the charts in parallel
+in persistent worker processes that already have pyplot imported (see
+:func:`warm_chart_workers`; off by default), and skips rendering when the PNGs for the
+same data are already on disk.
 """
 
 import base64
+import hashlib
+import html
 import io
+import math
+import json
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+CHART_CACHE_NAME = "chart_cache.json"
+_CHART_VERSION = 1  # bump when the charts' look changes, to invalidate caches
+
 # ---------------------------------------------------------------------------
 # Theme constants (cyberpunk dark, matching HTML/PPTX infographic)
 # ---------------------------------------------------------------------------
@@ -33,12 +54,21 @@ _GRID = "#1e1e40"
 
 _PALETTE = [_CYAN, _TEAL, _MAGENTA, _PINK, "#a855f7", "#facc15"]
 
+CHART_BACKENDS = ("matplotlib", "svg")
+
+
+_plt = None
+
 
 def _setup_cyberpunk_style():
     """Configure matplotlib for non-interactive rendering with cyberpunk theme.
 
-    Returns the ``matplotlib`` module, or raises ``ImportError``.
+    Returns the ``matplotlib.pyplot`` module, or raises ``ImportError``.
+    The theme is applied once per process.
     """
+    global _plt
+    if _plt is not None:
+        return _plt
     import matplotlib
     matplotlib.use("Agg")
     import matplotlib.pyplot as plt
@@ -58,23 +88,22 @@ def _setup_cyberpunk_style():
         "savefig.edgecolor": _BG,
         "font.size": 10,
     })
+    _plt = plt
     return plt
 
 
-def _fig_to_base64(fig) -> str:
-    """Render a matplotlib figure to a base64-encoded PNG data URI."""
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight", pad_inches=0.3)
-    buf.seek(0)
-    b64 = base64.b64encode(buf.read()).decode("ascii")
-    buf.close()
-    return f"data:image/png;base64,{b64}"
+def _png_data_uri(png: bytes) -> str:
+    return f"data:image/png;base64,{base64.b64encode(png).decode('ascii')}"
 
 
-def _fig_to_png(fig, path: str) -> str:
-    """Save a matplotlib figure to a PNG file and return the path."""
-    fig.savefig(path, format="png", bbox_inches="tight", pad_inches=0.3)
-    return path
+def _encode_figure(fig, output_path: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """PNG-encode *fig* once; returns ``(data_uri, png_path_or_None)``."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", pad_inches=0.3)
+    png = buf.getvalue()
+    if output_path:
+        Path(output_path).write_bytes(png)
+    return _png_data_uri(png), output_path
 
 
 # ---------------------------------------------------------------------------
@@ -124,10 +153,9 @@ def generate_topic_importance_chart(
 
     plt.tight_layout()
 
-    b64 = _fig_to_base64(fig)
-    png = _fig_to_png(fig, output_path) if output_path else None
+    result = _encode_figure(fig, output_path)
     plt.close(fig)
-    return (b64, png)
+    return result
 
 
 def generate_speaker_distribution_chart(
@@ -179,10 +207,9 @@ def generate_speaker_distribution_chart(
 
     plt.tight_layout()
 
-    b64 = _fig_to_base64(fig)
-    png = _fig_to_png(fig, output_path) if output_path else None
+    result = _encode_figure(fig, output_path)
     plt.close(fig)
-    return (b64, png)
+    return result
 
 
 def generate_conversation_flow_chart(
@@ -243,37 +270,359 @@ def generate_conversation_flow_chart(
 
     plt.tight_layout()
 
-    b64 = _fig_to_base64(fig)
-    png = _fig_to_png(fig, output_path) if output_path else None
+    result = _encode_figure(fig, output_path)
     plt.close(fig)
-    return (b64, png)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# SVG backend
+# ---------------------------------------------------------------------------
+
+_SVG_FONT = "DejaVu Sans, Helvetica, Arial, sans-serif"
+_CHAR_WIDTH = 0.6  # average glyph width per px of font size, for label layout
+
+
+def _x(text: Any) -> str:
+    return html.escape(str(text), quote=True)
+
+
+def _n(value: float) -> str:
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def _text_width(text: str, size: float) -> float:
+    return len(text) * size * _CHAR_WIDTH
+
+
+def _svg(width: float, height: float, title: str, body: List[str]) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_n(width)} {_n(height)}" '
+        f'width="{_n(width)}" height="{_n(height)}" role="img" aria-label="{_x(title)}" '
+        f'font-family="{_SVG_FONT}" style="max-width:100%;height:auto;background:{_BG}">'
+        f'<title>{_x(title)}</title>'
+        f'<rect width="100%" height="100%" fill="{_BG}"/>'
+        f'<text x="{_n(width / 2)}" y="28" text-anchor="middle" fill="{_CYAN}" '
+        f'font-size="17" font-weight="bold">{_x(title)}</text>'
+        + "".join(body) + "</svg>"
+    )
+
+
+def svg_topic_importance_chart(data: Dict[str, Any]) -> Optional[str]:
+    """Horizontal bar chart of topic importance scores, as SVG markup."""
+    topics = data.get("topics", [])
+    if not topics:
+        return None
+    names = [str(t.get("name", "?")) for t in topics]
+    scores = [int(t.get("importance", 0)) for t in topics]
+
+    row, top = 34, 52
+    left = 16 + max(_text_width(n, 12) for n in names)
+    plot_w = 420
+    width, height = left + plot_w + 40, top + row * len(names) + 46
+    scale = plot_w / 5.5
+    body = [f'<rect x="{_n(left)}" y="{top}" width="{plot_w}" height="{row * len(names)}" fill="{_CARD_BG}"/>']
+    for tick in range(6):
+        x = left + tick * scale
+        body.append(f'<line x1="{_n(x)}" y1="{top}" x2="{_n(x)}" y2="{top + row * len(names)}" '
+                    f'stroke="{_GRID}" stroke-dasharray="4 3"/>'
+                    f'<text x="{_n(x)}" y="{top + row * len(names) + 16}" text-anchor="middle" '
+                    f'fill="{_MUTED}" font-size="11">{tick}</text>')
+    for i, (name, score) in enumerate(zip(names, scores)):
+        y = top + i * row + row * 0.2
+        w = max(0, score) * scale
+        color = _PALETTE[i % len(_PALETTE)]
+        body.append(f'<text x="{_n(left - 8)}" y="{_n(y + row * 0.4)}" text-anchor="end" '
+                    f'dominant-baseline="middle" fill="{_MUTED}" font-size="12">{_x(name)}</text>'
+                    f'<rect x="{_n(left)}" y="{_n(y)}" width="{_n(w)}" height="{_n(row * 0.6)}" '
+                    f'rx="2" fill="{color}"/>'
+                    f'<text x="{_n(left + w + 6)}" y="{_n(y + row * 0.4)}" dominant-baseline="middle" '
+                    f'fill="{_BODY}" font-size="11">{score}</text>')
+    body.append(f'<text x="{_n(left + plot_w / 2)}" y="{height - 8}" text-anchor="middle" '
+                f'fill="{_BODY}" font-size="12">Importance</text>')
+    return _svg(width, height, "Topic Importance", body)
+
+
+def _arc_point(cx: float, cy: float, r: float, angle: float) -> str:
+    return f"{_n(cx + r * math.cos(angle))} {_n(cy - r * math.sin(angle))}"
+
+
+def svg_speaker_distribution_chart(data: Dict[str, Any]) -> Optional[str]:
+    """Donut chart of speaker line counts, as SVG markup."""
+    speakers = data.get("speakers", [])
+    if not speakers:
+        return None
+    labels = [str(s.get("label", "?")) for s in speakers]
+    counts = [int(s.get("line_count", 0)) for s in speakers]
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    outer, inner = 120, 72
+    pad = 24 + max(_text_width(l, 12) for l in labels)
+    width, height = 2 * (outer + pad), 2 * outer + 96
+    cx, cy = width / 2, 52 + outer + 10
+    body = []
+    angle = math.pi / 2  # start at the top and go counter-clockwise, like matplotlib
+    for i, (label, count) in enumerate(zip(labels, counts)):
+        if count <= 0:
+            continue
+        sweep = 2 * math.pi * count / total
+        end = angle + sweep
+        color = _PALETTE[i % len(_PALETTE)]
+        if count == total:  # a full ring can't be a single arc
+            body.append(f'<circle cx="{_n(cx)}" cy="{_n(cy)}" r="{(outer + inner) / 2}" fill="none" '
+                        f'stroke="{color}" stroke-width="{outer - inner}"/>')
+        else:
+            large = 1 if sweep > math.pi else 0
+            body.append(
+                f'<path d="M {_arc_point(cx, cy, outer, angle)} '
+                f'A {outer} {outer} 0 {large} 0 {_arc_point(cx, cy, outer, end)} '
+                f'L {_arc_point(cx, cy, inner, end)} '
+                f'A {inner} {inner} 0 {large} 1 {_arc_point(cx, cy, inner, angle)} Z" '
+                f'fill="{color}" stroke="{_BG}" stroke-width="2"/>'
+            )
+        mid = angle + sweep / 2
+        px, py = _arc_point(cx, cy, outer * 0.8, mid).split()
+        lx, ly = _arc_point(cx, cy, outer * 1.1, mid).split()
+        anchor = "start" if math.cos(mid) > 0.1 else "end" if math.cos(mid) < -0.1 else "middle"
+        body.append(f'<text x="{px}" y="{py}" text-anchor="middle" dominant-baseline="middle" '
+                    f'fill="{_BG}" font-size="11" font-weight="bold">{round(100 * count / total)}%</text>'
+                    f'<text x="{lx}" y="{ly}" text-anchor="{anchor}" dominant-baseline="middle" '
+                    f'fill="{_BODY}" font-size="12">{_x(label)}</text>')
+        angle = end
+    return _svg(width, height, "Speaker Distribution", body)
+
+
+def svg_conversation_flow_chart(data: Dict[str, Any]) -> Optional[str]:
+    """Timeline of conversation flow entries by speaker, as SVG markup."""
+    flow = data.get("conversation_flow", [])
+    if not flow:
+        return None
+    unique_speakers: List[str] = []
+    for entry in flow:
+        spk = str(entry.get("speaker", "?"))
+        if spk not in unique_speakers:
+            unique_speakers.append(spk)
+    speaker_y = {s: i for i, s in enumerate(unique_speakers)}
+
+    step, row, top = 72, 56, 60
+    left = 20 + max(_text_width(s, 12) for s in unique_speakers)
+    plot_w = max(420, step * len(flow))
+    plot_h = row * max(1, len(unique_speakers) - 1) + 48
+    width, height = left + plot_w + 24, top + plot_h + 48
+    x_of = lambda i: left + plot_w * (i + 0.5) / len(flow)
+    y_of = lambda spk: top + 34 + row * (len(unique_speakers) - 1 - speaker_y[spk])
+
+    body = [f'<rect x="{_n(left)}" y="{top}" width="{_n(plot_w)}" height="{plot_h}" fill="{_CARD_BG}"/>']
+    points = [(x_of(i), y_of(str(e.get("speaker", "?")))) for i, e in enumerate(flow)]
+    for i, (x, _) in enumerate(points):
+        body.append(f'<line x1="{_n(x)}" y1="{top}" x2="{_n(x)}" y2="{top + plot_h}" stroke="{_GRID}" '
+                    f'stroke-dasharray="4 3"/>'
+                    f'<text x="{_n(x)}" y="{top + plot_h + 16}" text-anchor="middle" fill="{_MUTED}" '
+                    f'font-size="11">{i + 1}</text>')
+    for spk in unique_speakers:
+        body.append(f'<text x="{_n(left - 8)}" y="{_n(y_of(spk))}" text-anchor="end" dominant-baseline="middle" '
+                    f'fill="{_MUTED}" font-size="12">{_x(spk)}</text>')
+    body.append(f'<polyline points="{" ".join(f"{_n(x)},{_n(y)}" for x, y in points)}" fill="none" '
+                f'stroke="{_GRID}" stroke-width="1.5" opacity="0.8"/>')
+    for entry, (x, y) in zip(flow, points):
+        color = _PALETTE[speaker_y[str(entry.get("speaker", "?"))] % len(_PALETTE)]
+        body.append(f'<circle cx="{_n(x)}" cy="{_n(y)}" r="7" fill="{color}" stroke="{_BG}" stroke-width="1.5"/>'
+                    f'<text x="{_n(x)}" y="{_n(y - 14)}" text-anchor="middle" fill="{_MUTED}" '
+                    f'font-size="10">{_x(entry.get("topic", ""))}</text>')
+    body.append(f'<text x="{_n(left + plot_w / 2)}" y="{height - 8}" text-anchor="middle" '
+                f'fill="{_BODY}" font-size="12">Segment</text>')
+    return _svg(width, height, "Conversation Flow", body)
 
 
 # ---------------------------------------------------------------------------
 # Dispatcher
 # ---------------------------------------------------------------------------
 
+_CHARTS = {
+    "topics": (generate_topic_importance_chart, "chart_topics.png"),
+    "speakers": (generate_speaker_distribution_chart, "chart_speakers.png"),
+    "flow": (generate_conversation_flow_chart, "chart_flow.png"),
+}
+_SVG_CHARTS = {
+    "topics": svg_topic_importance_chart,
+    "speakers": svg_speaker_distribution_chart,
+    "flow": svg_conversation_flow_chart,
+}
+
+# Worker processes are opt-in (Step5.chart_workers): spawned workers
+# re-import the caller's __main__, which re-runs scripts that call the
+# pipeline at module level without an ``if __name__ == "__main__":`` guard.
+DEFAULT_CHART_WORKERS = 0
+
+ChartResults = Dict[str, Optional[Tuple[str, Optional[str]]]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# pyplot's state is process-global, so in-process renders from concurrent
+# Step 5 runs take turns; worker processes each have their own.
+_inprocess_lock = threading.Lock()
+
+
+def _warm_worker() -> None:
+    """Import pyplot and draw a throwaway figure, so fonts and the Agg
+    backend are loaded before the first real chart."""
+    try:
+        plt = _setup_cyberpunk_style()
+    except ImportError:
+        return
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.set_title("warm")
+    fig.savefig(io.BytesIO(), format="png")
+    plt.close(fig)
+
+
+def _render_chart(name: str, data: Dict[str, Any], output_path: Optional[str]):
+    return _CHARTS[name][0](data, output_path)
+
+
+def _chart_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared chart worker pool, started on first use.
+
+    Workers are spawned (not forked: callers such as the web UI have
+    threads running) and import pyplot as they start.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+def _discard_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_chart_workers(workers: int = DEFAULT_CHART_WORKERS) -> None:
+    """Start the chart workers now, e.g. while Step 5 waits for the LLM,
+    so :func:`generate_all_charts` doesn't pay for spawning them and
+    importing pyplot."""
+    if workers <= 0:
+        return
+    try:
+        pool = _chart_pool(workers)
+        for _ in range(workers):
+            pool.submit(_warm_worker)
+    except Exception as exc:
+        logger.debug(f"Could not start chart workers: {exc}")
+
+
+def chart_data_key(data: Dict[str, Any]) -> str:
+    """Hash of the infographic data the charts are drawn from."""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{_CHART_VERSION}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def _load_cached(out: Path, key: str) -> Optional[ChartResults]:
+    try:
+        cached = json.loads((out / CHART_CACHE_NAME).read_text(encoding="utf-8"))
+        if cached.get("key") != key:
+            return None
+        results: ChartResults = {}
+        for name, filename in cached["charts"].items():
+            if filename is None:
+                results[name] = None
+            else:
+                path = out / filename
+                results[name] = (_png_data_uri(path.read_bytes()), str(path))
+        return results
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+
+
+def _store_cached(out: Path, key: str, results: ChartResults) -> None:
+    if not any(results.values()):  # probably no matplotlib; nothing worth caching
+        return
+    entry = {"key": key,
+             "charts": {name: Path(r[1]).name if r else None for name, r in results.items()}}
+    tmp = out / f".{CHART_CACHE_NAME}.tmp"
+    try:
+        tmp.write_text(json.dumps(entry, indent=1), encoding="utf-8")
+        os.replace(tmp, out / CHART_CACHE_NAME)
+    except OSError as exc:
+        logger.debug(f"Could not write chart cache: {exc}")
+
+
+def generate_svg_charts(data: Dict[str, Any], output_dir: Optional[str] = None) -> ChartResults:
+    """All charts from the ``svg`` backend.
+
+    Values are ``(svg_markup, svg_path_or_None)`` or ``None``; with
+    *output_dir* each chart is also saved as ``chart_<name>.svg``.
+    """
+    out = Path(output_dir) if output_dir else None
+    if out:
+        out.mkdir(parents=True, exist_ok=True)
+    results: ChartResults = {}
+    for name, render in _SVG_CHARTS.items():
+        markup = render(data)
+        path = None
+        if markup and out:
+            path = str(out / f"chart_{name}.svg")
+            Path(path).write_text(markup, encoding="utf-8")
+        results[name] = (markup, path) if markup else None
+    return results
+
+
 def generate_all_charts(
     data: Dict[str, Any],
     output_dir: Optional[str] = None,
-) -> Dict[str, Optional[Tuple[str, Optional[str]]]]:
+    workers: int = 0,
+    backend: str = "matplotlib",
+) -> ChartResults:
     """Generate all available charts and return a dict of results.
 
     Keys: ``"topics"``, ``"speakers"``, ``"flow"``
-    Values: ``(base64_data_uri, png_path_or_None)`` or ``None``
+    Values: ``(base64_data_uri, png_path_or_None)`` or ``None`` —
+    ``(svg_markup, svg_path_or_None)`` with ``backend="svg"``
+
+    With *workers* > 0 the charts render in parallel in the shared worker
+    pool, falling back to this process if the pool fails.  With
+    *output_dir*, charts already rendered there from the same *data* are
+    reused without rendering (see ``chart_cache.json``).
     """
+    if backend == "svg":
+        return generate_svg_charts(data, output_dir)
+    if backend != "matplotlib":
+        raise ValueError(f"Unknown chart backend: {backend!r} (expected one of {CHART_BACKENDS})")
+
     out = Path(output_dir) if output_dir else None
+    key = chart_data_key(data)
     if out:
         out.mkdir(parents=True, exist_ok=True)
+        cached = _load_cached(out, key)
+        if cached is not None:
+            logger.info("Charts unchanged since the last run; reusing them")
+            return cached
+
+    paths = {name: str(out / filename) if out else None for name, (_, filename) in _CHARTS.items()}
+    results: Optional[ChartResults] = None
+    if workers > 0:
+        try:
+            pool = _chart_pool(workers)
+            futures = {name: pool.submit(_render_chart, name, data, paths[name]) for name in _CHARTS}
+            results = {name: fut.result() for name, fut in futures.items()}
+        except Exception as exc:
+            logger.warning(f"Chart workers failed ({exc}); rendering in-process")
+            if isinstance(exc, BrokenProcessPool):
+                _discard_pool()
+    if results is None:
+        with _inprocess_lock:
+            results = {name: _render_chart(name, data, paths[name]) for name in _CHARTS}
 
-    return {
-        "topics": generate_topic_importance_chart(
-            data, str(out / "chart_topics.png") if out else None,
-        ),
-        "speakers": generate_speaker_distribution_chart(
-            data, str(out / "chart_speakers.png") if out else None,
-        ),
-        "flow": generate_conversation_flow_chart(
-            data, str(out / "chart_flow.png") if out else None,
-        ),
-    }
+    if out:
+        _store_cached(out, key, results)
+    return results
@@ -6,6 +6,12 @@ if python-pptx or moviepy are missing, the functions return None.
 """
 
 import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -367,17 +373,140 @@ def render_infographic_pptx(
 # 5e — Optional video conversion (PPTX slides → frames → MP4)
 # ---------------------------------------------------------------------------
 
+_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@lru_cache(maxsize=None)
+def _font(size: int):
+    """The slide font at *size*, loaded once per process."""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(_FONT_PATH, size)
+    except (OSError, IOError):
+        return ImageFont.load_default()
+
+
+def _hex_to_rgb(hex_str: str) -> tuple:
+    return tuple(int(hex_str[i:i+2], 16) for i in (0, 2, 4))
+
+
+def _slide_texts(slide) -> List[str]:
+    """All non-empty paragraphs on *slide*, in shape order."""
+    texts = []
+    for shape in slide.shapes:
+        if shape.has_text_frame:
+            for para in shape.text_frame.paragraphs:
+                text = para.text.strip()
+                if text:
+                    texts.append(text)
+    return texts
+
+
+def _rasterize_slide(texts: List[str], resolution: tuple):
+    """Draw a slide's text — title first, then body — onto a themed image."""
+    from PIL import Image, ImageDraw
+
+    width, height = resolution
+    img = Image.new("RGB", (width, height), _hex_to_rgb(_THEME["bg"]))
+    draw = ImageDraw.Draw(img)
+    title_rgb = _hex_to_rgb(_THEME["title"])
+    body_rgb = _hex_to_rgb(_THEME["body"])
+
+    y_pos = 80
+    for i, text in enumerate(texts):
+        color = title_rgb if i == 0 else body_rgb
+        font_size_val = 48 if i == 0 else 28
+        font = _font(font_size_val)
+
+        # Word-wrap long lines
+        max_chars = width // (font_size_val // 2 + 2)
+        lines = []
+        while text:
+            if len(text) <= max_chars:
+                lines.append(text)
+                break
+            split_at = text.rfind(" ", 0, max_chars)
+            if split_at == -1:
+                split_at = max_chars
+            lines.append(text[:split_at])
+            text = text[split_at:].lstrip()
+
+        for line in lines:
+            if y_pos > height - 60:
+                break
+            draw.text((60, y_pos), line, fill=color, font=font)
+            y_pos += font_size_val + 8
+
+        y_pos += 16  # spacing between items
+    return img
+
+
+def _ffmpeg_exe() -> Optional[str]:
+    """ffmpeg from imageio-ffmpeg (installed with moviepy), else from PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg")
+
+
+def _encode_stills_ffmpeg(ffmpeg: str, stills: List[Path], seconds_per_slide: float,
+                          output_path: Path) -> None:
+    """One video frame per slide: concat the stills with per-image durations.
+
+    Variable frame rate keeps the encoder from duplicating each still
+    ``seconds_per_slide * fps`` times.
+    """
+    listing = stills[0].parent / "slides.txt"
+    entries = [f"file '{p.name}'\nduration {seconds_per_slide}" for p in stills]
+    entries.append(f"file '{stills[-1].name}'")  # the concat demuxer ignores the last duration
+    listing.write_text("\n".join(entries) + "\n", encoding="utf-8")
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(listing),
+         "-fps_mode", "vfr", "-c:v", "libx264", "-tune", "stillimage", "-pix_fmt", "yuv420p",
+         "-movflags", "+faststart", str(output_path)],
+        check=True, capture_output=True,
+    )
+
+
+def _encode_stills_moviepy(images: list, seconds_per_slide: float, fps: int,
+                           output_path: Path) -> None:
+    """Fallback: one ``ImageClip`` per slide, so each still is converted once."""
+    import numpy as np
+    from moviepy.video.VideoClip import ImageClip
+    try:
+        from moviepy import concatenate_videoclips  # moviepy >= 2
+    except ImportError:
+        from moviepy.editor import concatenate_videoclips
+
+    clips = [ImageClip(np.asarray(img), duration=seconds_per_slide) for img in images]
+    video = concatenate_videoclips(clips)
+    video.write_videofile(
+        str(output_path),
+        fps=fps,
+        codec="libx264",
+        audio=False,
+        logger=None,
+    )
+    video.close()
+
+
 def render_video(
     pptx_path: str,
     output_path: str,
     seconds_per_slide: int = 3,
     fps: int = 24,
     resolution: tuple = (1920, 1080),
+    workers: Optional[int] = None,
 ) -> Optional[str]:
     """Convert PPTX slides to MP4 video using PIL + moviepy.
 
-    Renders each slide's text content onto a dark background image,
-    then stitches frames into an MP4 with moviepy.
+    Renders each slide's text content onto a dark background image (in
+    parallel, across *workers* threads), then encodes the stills — one
+    frame per slide with ffmpeg's concat demuxer, or one still clip per
+    slide with moviepy if that fails — so the work grows with the number
+    of slides, not frames.
 
     Returns the output path on success, or None if dependencies are missing.
     """
@@ -388,100 +517,47 @@ def render_video(
         return None
 
     try:
-        from moviepy.video.io.ImageSequenceClip import ImageSequenceClip
+        from moviepy.video.VideoClip import ImageClip  # noqa: F401
     except ImportError:
         logger.info("moviepy not installed -- skipping video generation.")
         return None
 
     try:
-        from PIL import Image, ImageDraw, ImageFont
+        import PIL  # noqa: F401
     except ImportError:
         logger.info("Pillow not installed -- skipping video generation.")
         return None
 
     try:
         prs = Presentation(pptx_path)
-        width, height = resolution
-        frames = []
-
-        # Parse hex colors
-        bg_rgb = tuple(int(_THEME["bg"][i:i+2], 16) for i in (0, 2, 4))
-        title_rgb = tuple(int(_THEME["title"][i:i+2], 16) for i in (0, 2, 4))
-        body_rgb = tuple(int(_THEME["body"][i:i+2], 16) for i in (0, 2, 4))
-
-        for slide in prs.slides:
-            img = Image.new("RGB", (width, height), bg_rgb)
-            draw = ImageDraw.Draw(img)
-
-            # Extract all text from the slide
-            texts = []
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    for para in shape.text_frame.paragraphs:
-                        text = para.text.strip()
-                        if text:
-                            texts.append(text)
-
-            # Draw title (first line) and body (remaining)
-            y_pos = 80
-            for i, text in enumerate(texts):
-                color = title_rgb if i == 0 else body_rgb
-                font_size_val = 48 if i == 0 else 28
-
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size_val)
-                except (OSError, IOError):
-                    font = ImageFont.load_default()
-
-                # Word-wrap long lines
-                max_chars = width // (font_size_val // 2 + 2)
-                lines = []
-                while text:
-                    if len(text) <= max_chars:
-                        lines.append(text)
-                        break
-                    split_at = text.rfind(" ", 0, max_chars)
-                    if split_at == -1:
-                        split_at = max_chars
-                    lines.append(text[:split_at])
-                    text = text[split_at:].lstrip()
-
-                for line in lines:
-                    if y_pos > height - 60:
-                        break
-                    draw.text((60, y_pos), line, fill=color, font=font)
-                    y_pos += font_size_val + 8
-
-                y_pos += 16  # spacing between items
-
-            # Each slide becomes N frames (seconds_per_slide * fps)
-            import tempfile
-            frame_path = tempfile.mktemp(suffix=".png")
-            img.save(frame_path)
-            frames.extend([frame_path] * (seconds_per_slide * fps))
-
-        if not frames:
+        slides = [_slide_texts(slide) for slide in prs.slides]
+        if not slides:
             logger.warning("No frames generated from PPTX slides.")
             return None
 
-        # Stitch into video
-        clip = ImageSequenceClip(frames, fps=fps)
         out = Path(output_path)
         out.parent.mkdir(parents=True, exist_ok=True)
-        clip.write_videofile(
-            str(out),
-            fps=fps,
-            codec="libx264",
-            audio=False,
-            logger=None,
-        )
+        workers = workers or min(len(slides), os.cpu_count() or 1)
+
+        with tempfile.TemporaryDirectory(prefix="slides-") as tmp:
+            def rasterize(item):
+                index, texts = item
+                img = _rasterize_slide(texts, resolution)
+                still = Path(tmp) / f"slide_{index:03d}.png"
+                img.save(still, compress_level=1)
+                return img, still
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                images, stills = zip(*pool.map(rasterize, enumerate(slides)))
 
-        # Clean up temp frame files
-        for f in set(frames):
+            ffmpeg = _ffmpeg_exe()
             try:
-                Path(f).unlink(missing_ok=True)
-            except Exception:
-                pass
+                if ffmpeg is None:
+                    raise FileNotFoundError("ffmpeg not found")
+                _encode_stills_ffmpeg(ffmpeg, list(stills), seconds_per_slide, out)
+            except (OSError, subprocess.CalledProcessError) as exc:
+                logger.debug(f"ffmpeg concat unavailable ({exc}); encoding with moviepy")
+                _encode_stills_moviepy(list(images), seconds_per_slide, fps, out)
 
         logger.info(f"Video saved to {output_path}")
         return str(out)
@@ -0,0 +1,286 @@
+"""Single-pass parser for LLM transcript output.
+
+Step 3 asks the model for a Python list of ``(speaker, text)`` tuples, but
+small models also answer with fragments of such a list, ``Speaker N:``
+dialogue, JSON, or plain prose.  Instead of trying a chain of full-text
+strategies (``literal_eval``, several regex passes, a split, a greedy JSON
+match), the text is tokenized once by one precompiled regex and a small
+state machine collects every candidate shape at the same time:
+
+* string literals and brackets build a tolerant literal tree, yielding
+  the strict list, stray tuple fragments and JSON objects/arrays;
+* ``Speaker N:`` labels at line starts are recorded as dialogue anchors.
+
+Every token is consumed in time proportional to its length and no token
+is rescanned, so parsing is linear in the input size even for malformed
+output.  The best shape is then picked in the same priority order the
+old strategy chain used.
+"""
+
+import logging
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Shapes, in priority order
+SHAPE_LIST = "python_list"      # the whole output is a valid list of 2-string tuples
+SHAPE_TUPLES = "tuples"         # ('Speaker N', '...') tuples recovered from broken output
+SHAPE_DIALOGUE = "dialogue"     # 'Speaker N: text' lines
+SHAPE_JSON = "json"             # JSON objects or [speaker, text] arrays
+SHAPE_MONOLOGUE = "monologue"   # nothing structured; whole text as Speaker 1
+
+STRUCTURED_SHAPES = (SHAPE_LIST, SHAPE_TUPLES, SHAPE_DIALOGUE, SHAPE_JSON)
+
+MIN_MONOLOGUE_CHARS = 30
+
+_TOKEN = re.compile(
+    r"""
+     (?P<label>(?<![^\n])[ \t]*\**[ \t]*(?P<spk>speaker[ \t_]*\d+)[ \t]*\**[ \t]*[:：\-—]\**[ \t]*)
+    |(?P<esc>\\(?:u[0-9a-fA-F]{4}|.))
+    |(?P<quote>['"])
+    |(?P<open>[\[\(\{])
+    |(?P<close>[\]\)\}])
+    |(?P<colon>:)
+    |(?P<sep>[,\n])
+    |(?P<run>[^'"\\\[\]\(\)\{\},:\n]+)
+    """,
+    re.VERBOSE | re.IGNORECASE | re.DOTALL,
+)
+# A quote only closes a string when what follows could end a literal;
+# otherwise it is an apostrophe (``'It's here'``) and stays in the text.
+_CLOSER_AHEAD = re.compile(r"[ \t\r\n]*(?:[,\)\]\}:]|$)")
+# String content up to the next quote, escape or newline (labels are only
+# recognized at line starts, so newlines go back through _TOKEN)
+_STR_BODY = re.compile(r"[^'\"\\\n]+")
+_SPEAKER_NAME = re.compile(r"\s*speaker\s*_?\s*\d+\s*$", re.IGNORECASE)
+_DIGITS = re.compile(r"\d+")
+_WS = re.compile(r"\s+")
+_BRACKETS = re.compile(r"[\[\]\(\)]")
+_FENCE_OPEN = re.compile(r"^```(?:python|json)?\s*\n?", re.MULTILINE)
+_FENCE_CLOSE = re.compile(r"\n?```\s*$", re.MULTILINE)
+_SMART_PUNCT = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+_ESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f",
+    "\\": "\\", "'": "'", '"': '"', "/": "/", "\n": "",
+}
+_SPEAKER_KEYS = ("speaker", "Speaker")
+_TEXT_KEYS = ("text", "dialogue", "content", "line")
+
+_ATOM = object()  # a bare number/name inside a container — never a valid string
+
+
+class ParsedTranscript(NamedTuple):
+    turns: List[Tuple[str, str]]
+    shape: Optional[str]
+
+
+def normalize_speaker(s: str) -> str:
+    """Normalize 'speaker1', 'SPEAKER 1', 'Speaker_2' → 'Speaker N'."""
+    m = _DIGITS.search(s)
+    return f"Speaker {m.group()}" if m else "Speaker 1"
+
+
+def clean_llm_output(raw_text: str) -> str:
+    """Strip code fences and normalize smart quotes/ellipses."""
+    cleaned = (raw_text or "").strip().translate(_SMART_PUNCT).replace("…", "...")
+    cleaned = _FENCE_OPEN.sub("", cleaned)
+    cleaned = _FENCE_CLOSE.sub("", cleaned)
+    return cleaned.strip()
+
+
+def _decode_escape(esc: str) -> str:
+    c = esc[1]
+    if c == "u" and len(esc) == 6:
+        return chr(int(esc[2:], 16))
+    return _ESCAPES.get(c, esc)
+
+
+def _pair(items) -> Optional[Tuple[str, str]]:
+    if len(items) == 2 and isinstance(items[0], str) and isinstance(items[1], str):
+        return items[0], items[1]
+    return None
+
+
+def _scan(text: str):
+    """One pass over *text*.  Returns (roots, clean, tuples, json_turns, labels)."""
+    stack = []              # frames: [opener, items, colons]
+    open_counts = {"[": 0, "(": 0, "{": 0}
+    roots = []              # completed top-level values
+    top_garbage = False     # non-space text outside any container
+    tuples = []             # ('Speaker N', text) from any '(' frame
+    json_turns = []         # from dict frames and [speaker, text] arrays
+    labels = []             # (speaker, label_start, content_start)
+    in_str = None           # quote char while inside a string literal
+    buf = []
+    closers = {"]": "[", ")": "(", "}": "{"}
+
+    pos, end = 0, len(text)
+    while pos < end:
+        if in_str and text[pos - 1] != "\n":
+            # Fast path: consume ordinary string content in one step
+            body = _STR_BODY.match(text, pos)
+            if body:
+                buf.append(body.group())
+                pos = body.end()
+                continue
+        m = _TOKEN.match(text, pos)
+        if m is None:  # lone trailing backslash
+            pos += 1
+            continue
+        pos = m.end()
+        kind = m.lastgroup
+        tok = m.group()
+
+        if kind == "label":
+            labels.append((m.group("spk"), m.start(), m.end()))
+            if in_str:
+                buf.append(tok)
+            elif stack:
+                stack[-1][1].append(_ATOM)
+            else:
+                top_garbage = True
+            continue
+
+        if in_str:
+            if kind == "esc":
+                buf.append(_decode_escape(tok))
+            elif kind == "quote" and tok == in_str and _CLOSER_AHEAD.match(text, m.end()):
+                stack[-1][1].append("".join(buf))
+                in_str = None
+            else:
+                buf.append(tok)
+            continue
+
+        if kind == "quote":
+            if stack:
+                in_str, buf = tok, []
+            else:
+                top_garbage = True
+        elif kind == "open":
+            stack.append([tok, [], 0])
+            open_counts[tok] += 1
+        elif kind == "close":
+            opener = closers[tok]
+            if not open_counts[opener]:
+                if not stack:
+                    top_garbage = True
+                continue
+            # Unwind frames left open by a missing closer
+            while stack[-1][0] != opener:
+                open_counts[stack.pop()[0]] -= 1
+            frame_open, items, colons = stack.pop()
+            open_counts[frame_open] -= 1
+            value = (frame_open, items)
+
+            if frame_open == "{":
+                if colons and len(items) % 2 == 0:
+                    obj = {}
+                    for k, v in zip(items[0::2], items[1::2]):
+                        if isinstance(k, str):
+                            obj[k] = v
+                    speaker = next((obj[k] for k in _SPEAKER_KEYS if isinstance(obj.get(k), str)), "Speaker 1")
+                    line = next((obj[k] for k in _TEXT_KEYS if isinstance(obj.get(k), str) and obj[k]), None)
+                    if line:
+                        json_turns.append((normalize_speaker(speaker), line))
+            else:
+                pair = _pair(items)
+                if pair:
+                    if frame_open == "(" and _SPEAKER_NAME.match(pair[0]):
+                        tuples.append((normalize_speaker(pair[0]), pair[1].strip()))
+                    elif frame_open == "[" and pair[1]:
+                        json_turns.append((normalize_speaker(pair[0]), pair[1]))
+
+            if stack:
+                stack[-1][1].append(value)
+            else:
+                roots.append(value)
+        elif kind == "colon":
+            if stack:
+                stack[-1][2] += 1
+            else:
+                top_garbage = True
+        elif kind == "run":
+            if tok.strip():
+                if stack:
+                    stack[-1][1].append(_ATOM)
+                else:
+                    top_garbage = True
+        elif kind == "esc":
+            top_garbage = True
+        # 'sep' outside strings carries no information
+
+    clean = not stack and in_str is None and not top_garbage
+    return roots, clean, tuples, json_turns, labels
+
+
+def _strict_list(roots, clean) -> Optional[List[Tuple[str, str]]]:
+    if not clean or len(roots) != 1 or roots[0][0] != "[":
+        return None
+    turns = []
+    for item in roots[0][1]:
+        if not isinstance(item, tuple) or item[0] not in ("(", "["):
+            return None
+        pair = _pair(item[1])
+        if pair is None:
+            return None
+        turns.append(pair)
+    return turns
+
+
+def _dialogue(text: str, labels) -> List[Tuple[str, str]]:
+    turns = []
+    for i, (speaker, _, content_start) in enumerate(labels):
+        end = labels[i + 1][1] if i + 1 < len(labels) else len(text)
+        line = _WS.sub(" ", text[content_start:end]).strip()
+        if line:
+            turns.append((normalize_speaker(speaker), line))
+    return turns
+
+
+def parse_transcript_with_shape(raw_text: str) -> ParsedTranscript:
+    """Parse LLM transcript output and report which shape it matched.
+
+    Shapes are tried in priority order: a strict Python list of tuples,
+    recovered ``('Speaker N', ...)`` tuples (at least two), ``Speaker N:``
+    dialogue, JSON, and finally a single-speaker monologue.  Returns
+    ``ParsedTranscript([], None)`` when nothing usable is found.  A
+    strict but empty list (``[]``) is reported as ``SHAPE_LIST`` with no
+    turns.
+    """
+    cleaned = clean_llm_output(raw_text)
+    if not cleaned:
+        return ParsedTranscript([], None)
+
+    roots, clean, tuples, json_turns, labels = _scan(cleaned)
+
+    strict = _strict_list(roots, clean)
+    if strict is not None:
+        return ParsedTranscript(strict, SHAPE_LIST)
+    if len(tuples) >= 2:
+        return ParsedTranscript(tuples, SHAPE_TUPLES)
+    if labels:
+        dialogue = _dialogue(cleaned, labels)
+        if dialogue:
+            return ParsedTranscript(dialogue, SHAPE_DIALOGUE)
+    if json_turns:
+        return ParsedTranscript(json_turns, SHAPE_JSON)
+
+    mono = _WS.sub(" ", _BRACKETS.sub(" ", cleaned)).strip()
+    if len(mono) > MIN_MONOLOGUE_CHARS:
+        return ParsedTranscript([("Speaker 1", mono)], SHAPE_MONOLOGUE)
+    return ParsedTranscript([], None)
+
+
+def parse_transcript_flexible(raw_text: str) -> List[Tuple[str, str]]:
+    """Parse LLM transcript output into ``(speaker, text)`` turns.
+
+    See :func:`parse_transcript_with_shape`; this returns only the turns.
+    """
+    turns, shape = parse_transcript_with_shape(raw_text)
+    if shape == SHAPE_MONOLOGUE:
+        logger.warning("All parsing strategies failed — using single-speaker monologue fallback")
+    elif shape and shape != SHAPE_LIST:
+        logger.info(f"Transcript parsed as {shape} ({len(turns)} turns)")
+    return turns
@@ -0,0 +1,131 @@
+"""Content-addressed cache of synthesized TTS segments.
+
+Each segment is keyed by a hash of everything that determines its audio —
+provider, endpoint, model, voice, output format and the normalized text —
+so Step 4 only calls TTS for turns that changed.  Re-generating audio after
+fixing one typo in the script re-synthesizes one segment.
+
+Entries live under ``<root>/<2-char prefix>/<key>.<ext>`` and are written
+atomically.  Hits refresh the entry's mtime, and :meth:`SegmentCache.evict`
+removes least-recently-used entries until the cache fits ``max_bytes``.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import unicodedata
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MB = 512
+CACHE_DIRNAME = "tts_cache"  # default location inside the Step 4 output dir
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace, so cosmetic edits still hit."""
+    return _WS.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def segment_key(provider: str, endpoint: str, model: str, voice: str,
+                response_format: str, text: str) -> str:
+    digest = hashlib.sha256()
+    for part in (provider, endpoint, model, voice, response_format, normalize_text(text)):
+        digest.update(str(part or "").encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class SegmentCache:
+    """Size-bounded LRU store of segment files addressed by :func:`segment_key`."""
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str, extension: str) -> Path:
+        return self.root / key[:2] / f"{key}.{extension}"
+
+    def fetch(self, key: str, extension: str, dest: Union[str, Path]) -> bool:
+        """Copy the entry for *key* to *dest*.  Returns False on a miss."""
+        path = self._path(key, extension)
+        try:
+            shutil.copyfile(path, dest)
+        except FileNotFoundError:
+            return False
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return True
+
+    def read(self, key: str, extension: str) -> Optional[bytes]:
+        """The entry for *key*, or None on a miss."""
+        path = self._path(key, extension)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def store(self, key: str, extension: str, src: Union[str, Path]) -> Optional[Path]:
+        """Add *src* as the entry for *key*.  Failures are logged, not raised."""
+        return self._write(key, extension, lambda tmp: shutil.copyfile(src, tmp), src)
+
+    def store_bytes(self, key: str, extension: str, data: bytes) -> Optional[Path]:
+        """Add *data* as the entry for *key*.  Failures are logged, not raised."""
+        return self._write(key, extension, lambda tmp: tmp.write_bytes(data), key)
+
+    def _write(self, key: str, extension: str, fill, label) -> Optional[Path]:
+        path = self._path(key, extension)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fill(tmp)
+            os.replace(tmp, path)
+            return path
+        except OSError as e:
+            logger.warning(f"Could not cache TTS segment {label}: {e}")
+            tmp.unlink(missing_ok=True)
+            return None
+
+    def _entries(self):
+        """``(mtime, size, path)`` of every entry; in-flight temp files are skipped."""
+        entries = []
+        for p in self.root.glob("*/*"):
+            if p.name.startswith("."):
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until within ``max_bytes``.  Returns bytes freed."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total - freed <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            freed += size
+        if freed:
+            logger.info(f"Evicted {freed / 1e6:.1f} MB from TTS cache {self.root}")
+        return freed
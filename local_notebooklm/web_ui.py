@@ -1116,7 +1116,7 @@ def _load_results_from_dir(d: str):
 
     audio_path = None
     for subdir in [os.path.join(d, "step4"), d]:
-        for ext in ["wav", "mp3", "ogg", "flac", "aac"]:
+        for ext in ["wav", "mp3", "ogg", "flac", "aac", "opus"]:
             candidate = os.path.join(subdir, f"podcast.{ext}")
             if os.path.exists(candidate):
                 audio_path = candidate
@@ -1457,14 +1457,14 @@ def _on_download_script(script_text, notebook_id):
     """Export the podcast script as a Markdown file.  Returns a file path for gr.File."""
     if not script_text or not script_text.strip():
         return None
-    import tempfile, ast
+    import tempfile
+    from local_notebooklm.steps.step3 import parse_transcript_flexible
     md_lines = ["# Podcast Script\n"]
-    try:
-        parsed = ast.literal_eval(script_text)
-        if isinstance(parsed, list):
-            for speaker, text in parsed:
-                md_lines.append(f"**{speaker}:** {text}\n")
-    except Exception:
+    parsed = parse_transcript_flexible(script_text)
+    if parsed:
+        for speaker, text in parsed:
+            md_lines.append(f"**{speaker}:** {text}\n")
+    else:
         md_lines.append(script_text)
     tmp = tempfile.NamedTemporaryFile(suffix=".md", prefix="podcast_script_", delete=False, mode="w")
     tmp.write("\n".join(md_lines))
@@ -1928,12 +1928,19 @@ def _on_regen_audio(edited_script, notebook_id, config_file, host_voice, cohost_
         yield _build_progress_html(0, 0, "No notebook selected."), None, ""
         return
 
-    import json as _json, pickle
+    import json as _json
     from pathlib import Path as _Path
     from local_notebooklm.config import validate_config, base_config
+    from local_notebooklm.steps.artifacts import SCRIPT_KIND, turns_from_pairs, write_turns
     from local_notebooklm.steps.helpers import set_provider
+    from local_notebooklm.steps.step3 import parse_transcript_flexible
     from local_notebooklm.steps.step4 import step4
 
+    parsed = parse_transcript_flexible(edited_script)
+    if not parsed:
+        yield _build_progress_html(0, 0, "Could not parse the edited script into speaker turns."), None, ""
+        return
+
     nb_dir = _notebook_mgr.get_notebook_dir(notebook_id)
     step3_dir = _Path(nb_dir) / "step3"
     step4_dir = _Path(nb_dir) / "step4"
@@ -1941,10 +1948,9 @@ def _on_regen_audio(edited_script, notebook_id, config_file, host_voice, cohost_
     step4_dir.mkdir(parents=True, exist_ok=True)
 
     # Write edited script to step3 output
-    pkl_path = step3_dir / "podcast_ready_data.pkl"
     txt_path = step3_dir / "podcast_ready_data.txt"
-    with open(pkl_path, 'wb') as f:
-        pickle.dump(edited_script, f)
+    write_turns(step3_dir / "podcast_ready_data.jsonl", turns_from_pairs(parsed), kind=SCRIPT_KIND)
+    (step3_dir / "podcast_ready_data.pkl").unlink(missing_ok=True)
     with open(txt_path, 'w', encoding='utf-8') as f:
         f.write(edited_script)
 
@@ -1982,7 +1988,7 @@ def _on_regen_audio(edited_script, notebook_id, config_file, host_voice, cohost_
         )
 
         audio_path = None
-        for ext in ["wav", "mp3", "ogg", "flac", "aac"]:
+        for ext in ["wav", "mp3", "ogg", "flac", "aac", "opus"]:
             candidate = os.path.join(str(step4_dir), f"podcast.{ext}")
             if os.path.exists(candidate):
                 audio_path = candidate
@@ -2090,6 +2096,8 @@ def _pipeline_worker(job: PipelineJob, input_path, config, skip_to,
                      language, full_preference, notebook_id):
     """Run the step1-step5 pipeline in a background thread.
 
+    The steps are the same pipeline graph :func:`podcast_processor`
+    runs, so stamps under *output_dir* let unchanged steps be reused.
     This is a regular function (NOT a generator).  It mutates *job*
     via ``job.update()`` so the polling generator can relay progress
     to the Gradio frontend.
@@ -2097,17 +2105,15 @@ def _pipeline_worker(job: PipelineJob, input_path, config, skip_to,
     import json as _json
     from pathlib import Path as _Path
     from local_notebooklm.config import validate_config, base_config
+    from local_notebooklm.pipeline import CANCELLED, FAILED, MISSING, STAMP_DIR, Pipeline
+    from local_notebooklm.processor import branch_nodes, skip_to_sets, step1_node, with_live_audio
     from local_notebooklm.steps.helpers import set_provider
-    from local_notebooklm.steps.step1 import step1
-    from local_notebooklm.steps.step2 import step2
-    from local_notebooklm.steps.step3 import step3
-    from local_notebooklm.steps.step4 import step4
-    from local_notebooklm.steps.step5 import step5
 
     capture = _LogCapture()
     _logging.getLogger("local_notebooklm").addHandler(capture)
 
     output_dir = job.output_dir
+    config = with_live_audio(config)  # feeds the Live preview player
 
     want_audio = "Podcast Audio" in outputs_to_generate
     want_html = "Infographic HTML" in outputs_to_generate
@@ -2146,147 +2152,67 @@ def _pipeline_worker(job: PipelineJob, input_path, config, skip_to,
             system_prompts[sn] = None
 
     current_step = 0
-    cleaned_text_file = None
-    transcript_file = None
     step_times: list[float] = []
 
-    try:
-        # ── Step 1: Extract text ─────────────────────────────
-        current_step += 1
-        job.update(current_step=current_step, step_label="Extracting text from document...")
-        step_start = time.time()
-
-        if not skip_to or skip_to <= 1:
-            cleaned_text_file = step1(
-                client=small_text_client,
-                input_path=input_path,
-                config=config,
-                output_dir=str(output_dirs["step1"]),
-                system_prompt=system_prompts["step1"],
-            )
-        else:
-            step1_files = list(output_dirs["step1"].glob("*.txt"))
-            if step1_files:
-                cleaned_text_file = str(sorted(step1_files, key=lambda x: x.stat().st_mtime, reverse=True)[0])
+    # Steps 1-3 report on the main label, Steps 4 and 5 on their own
+    # branch: they run concurrently since Step 5 only reads the Step 3
+    # transcript (or the Step 1 text).
+    step_labels = {
+        "step1": "Extracting text from document...",
+        "step2": "Generating transcript...",
+        "step3": "Optimizing for text-to-speech...",
+    }
+    branch_labels = {"step4": ("audio", "Generating audio..."),
+                     "step5": ("infographic", "Generating infographic...")}
+
+    def on_event(name, status):
+        nonlocal current_step
+        if status == "running":
+            current_step = max(current_step, order.index(name) + 1)
+            job.update(current_step=current_step)
+            if name in step_labels:
+                job.update(step_label=step_labels[name])
             else:
-                job.update(status="failed", error="No output files from Step 1. Cannot skip.",
-                           failed_step=current_step, log_text=capture.get_text())
-                _logging.getLogger("local_notebooklm").removeHandler(capture)
-                return
-
-        step_times.append(time.time() - step_start)
-        job.update(step_times=list(step_times))
-
-        if job.cancel_event.is_set():
-            job.update(status="cancelled", log_text=capture.get_text())
-            _logging.getLogger("local_notebooklm").removeHandler(capture)
-            return
-
-        # ── Steps 2-4: Podcast pipeline ──────────────────────
-        if want_audio:
-            # ── Step 2 ───────────────────────────────────────
-            current_step += 1
-            job.update(current_step=current_step, step_label="Generating transcript...")
-            step_start = time.time()
-
-            if not skip_to or skip_to <= 2:
-                _, transcript_file = step2(
-                    client=big_text_client,
-                    config=config,
-                    input_file=cleaned_text_file,
-                    output_dir=str(output_dirs["step2"]),
-                    format_type=format_type,
-                    length=length,
-                    style=style,
-                    preference_text=full_preference,
-                    system_prompt=system_prompts["step2"],
-                )
-            else:
-                step2_files = list(output_dirs["step2"].glob("*.pkl"))
-                if step2_files:
-                    transcript_file = str(sorted(step2_files, key=lambda x: x.stat().st_mtime, reverse=True)[0])
-                else:
-                    job.update(status="failed", error="No output files from Step 2. Cannot skip.",
-                               failed_step=current_step, log_text=capture.get_text())
-                    _logging.getLogger("local_notebooklm").removeHandler(capture)
-                    return
-
-            step_times.append(time.time() - step_start)
-            job.update(step_times=list(step_times))
-
-            if job.cancel_event.is_set():
-                job.update(status="cancelled", log_text=capture.get_text())
-                _logging.getLogger("local_notebooklm").removeHandler(capture)
-                return
-
-            # ── Step 3 ───────────────────────────────────────
-            current_step += 1
-            job.update(current_step=current_step, step_label="Optimizing for text-to-speech...")
-            step_start = time.time()
-
-            if not skip_to or skip_to <= 3:
-                step3(
-                    client=big_text_client,
-                    config=config,
-                    input_file=transcript_file,
-                    output_dir=str(output_dirs["step3"]),
-                    format_type=format_type,
-                    system_prompt=system_prompts["step3"],
-                    language=language,
-                )
+                job.update_branch(*branch_labels[name])
+        elif name in branch_labels:
+            job.update_branch(branch_labels[name][0], None)
 
-            step_times.append(time.time() - step_start)
-            job.update(step_times=list(step_times))
+    def on_progress(name, done, total):
+        branch, label = branch_labels[name]
+        unit = " segments" if name == "step4" else ""
+        job.update_branch(branch, f"{label} ({done}/{total}{unit})")
 
-            if job.cancel_event.is_set():
-                job.update(status="cancelled", log_text=capture.get_text())
-                _logging.getLogger("local_notebooklm").removeHandler(capture)
-                return
-
-            # ── Step 4 ───────────────────────────────────────
-            current_step += 1
-            job.update(current_step=current_step, step_label="Generating audio...")
-            step_start = time.time()
-
-            if not skip_to or skip_to <= 4:
-                step4(
-                    client=tts_client,
-                    config=config,
-                    input_dir=str(output_dirs["step3"]),
-                    output_dir=str(output_dirs["step4"]),
-                )
-
-            step_times.append(time.time() - step_start)
-            job.update(step_times=list(step_times))
+    try:
+        clients = (small_text_client, big_text_client, tts_client)
+        nodes = [step1_node(config, small_text_client, input_path,
+                            output_dirs["step1"], system_prompts["step1"])]
+        nodes += branch_nodes(
+            config, clients, system_prompts, output_dirs,
+            format_type, length, style, full_preference, language,
+            outputs=outputs_to_generate, transcript=want_audio,
+            skip_to=skip_to, progress=on_progress,
+        )
+        pipeline = Pipeline(nodes, output_base / STAMP_DIR)
+        order = pipeline.order
+        job.update(total_steps=len(order))
+        force, reuse = skip_to_sets(pipeline.nodes, skip_to)
+        results = pipeline.run(force=force, reuse=reuse, on_event=on_event,
+                               cancel_event=job.cancel_event)
+
+        step_times = [results[name].seconds for name in order if name in results]
+        job.update(step_times=list(step_times))
 
-            if job.cancel_event.is_set():
+        for name in order:
+            outcome = results[name]
+            if outcome.status == CANCELLED or job.cancel_event.is_set():
                 job.update(status="cancelled", log_text=capture.get_text())
                 _logging.getLogger("local_notebooklm").removeHandler(capture)
                 return
-
-        # ── Step 5: Generate infographic ─────────────────────
-        if want_any_infographic:
-            current_step += 1
-            job.update(current_step=current_step, step_label="Generating infographic...")
-            step_start = time.time()
-
-            if not skip_to or skip_to <= 5:
-                step5_input = str(output_dirs["step3"]) if want_audio else str(output_dirs["step1"])
-                try:
-                    step5(
-                        client=big_text_client,
-                        config=config,
-                        input_dir=step5_input,
-                        output_dir=str(output_dirs["step5"]),
-                        generate_html=want_html,
-                        generate_png=want_png,
-                        generate_pptx=want_pptx,
-                    )
-                except Exception as e:
-                    _log.warning("Step 5 (infographic) failed (non-fatal): %s", e)
-
-            step_times.append(time.time() - step_start)
-            job.update(step_times=list(step_times))
+            if outcome.status == FAILED and name == "step5":
+                _log.warning("Step 5 (infographic) failed (non-fatal): %s", outcome.error)
+            elif outcome.status in (FAILED, MISSING):
+                current_step = order.index(name) + 1
+                raise outcome.error
 
         # ── Record success ───────────────────────────────────
         log_text = capture.get_text()
@@ -2297,7 +2223,7 @@ def _pipeline_worker(job: PipelineJob, input_path, config, skip_to,
             generated = []
             # Check what was actually produced
             for subdir in [os.path.join(output_dir, "step4"), output_dir]:
-                for ext in ["wav", "mp3", "ogg", "flac", "aac"]:
+                for ext in ["wav", "mp3", "ogg", "flac", "aac", "opus"]:
                     if os.path.exists(os.path.join(subdir, f"podcast.{ext}")):
                         generated.append("Audio")
                         break
@@ -2587,6 +2513,29 @@ def process_podcast(pdf_file, url_input, config_file, format_type, length, style
             time.sleep(1.5)
 
 
+def _stream_live_audio(notebook_id):
+    """Play Step 4's audio while it is still being generated.
+
+    Runs next to :func:`process_podcast` and streams ``podcast.live.wav``
+    into the live player as segments land, so the first turn can be heard
+    one segment after Step 4 starts instead of after the whole pipeline.
+    """
+    from local_notebooklm.steps.live_audio import follow_frames, live_audio_path
+
+    job_id = notebook_id or "default"
+    for _ in range(20):  # the Generate handler may not have started the job yet
+        if is_running(job_id):
+            break
+        time.sleep(0.5)
+    job = get_job(job_id)
+    if job is None or not is_running(job_id):
+        return
+    step4_dir = os.path.join(job.output_dir, "step4")
+    for rate, frames in follow_frames(live_audio_path(step4_dir),
+                                      lambda: job.snapshot()["status"] != "running"):
+        yield rate, frames
+
+
 def _on_stop(notebook_id):
     """Cancel the background pipeline job for the given notebook."""
     job_id = notebook_id or "default"
@@ -2703,6 +2652,13 @@ def create_gradio_ui():
                         type="filepath",
                         elem_id="audio-player",
                     )
+                    live_audio_output = gr.Audio(
+                        label="Live preview",
+                        streaming=True,
+                        autoplay=False,
+                        interactive=False,
+                        elem_id="live-audio-player",
+                    )
                     waveform_display = gr.HTML(value="", elem_id="waveform-area")
                     audio_metrics_display = gr.HTML(value="", elem_id="audio-metrics")
 
@@ -3038,6 +2994,13 @@ def create_gradio_ui():
             show_progress="hidden",
         )
 
+        live_event = generate_button.click(
+            fn=_stream_live_audio,
+            inputs=[notebook_selector],
+            outputs=[live_audio_output],
+            show_progress="hidden",
+        )
+
         # ── Wiring — Batch all sources ───────────────────────
         batch_event = btn_batch.click(
             fn=_process_batch,
@@ -3058,7 +3021,7 @@ def create_gradio_ui():
             fn=_on_stop,
             inputs=[notebook_selector],
             outputs=None,
-            cancels=[gen_event, batch_event],
+            cancels=[gen_event, batch_event, live_event],
         )
 
         # ── Wiring — Retry failed step ───────────────────────
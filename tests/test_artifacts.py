@@ -0,0 +1,148 @@
+"""Tests for artifacts — versioned JSONL transcript turns and pickle migration."""
+
+import json
+import pickle
+import pytest
+
+from local_notebooklm.steps.artifacts import (
+    ARTIFACT_VERSION,
+    ArtifactError,
+    SCRIPT_KIND,
+    TRANSCRIPT_KIND,
+    Turn,
+    TurnWriter,
+    content_hash,
+    iter_turns,
+    migrate_directory,
+    migrate_pickle,
+    read_header,
+    read_turns,
+    render_text,
+    resolve_artifact,
+    turns_from_pairs,
+    turns_from_text,
+    write_turns,
+)
+
+
+class TestTurn:
+    def test_unpacks_like_tuple(self):
+        speaker, text = Turn("Speaker 1", "Hello")
+        assert (speaker, text) == ("Speaker 1", "Hello")
+        assert Turn("Speaker 1", "Hello") == ("Speaker 1", "Hello")
+
+    def test_hashable_like_tuple(self):
+        turns = {Turn("Speaker 1", "Hello"), Turn("Speaker 1", "Hello", 7)}
+        assert len(turns) == 1 and ("Speaker 1", "Hello") in turns
+
+    def test_has_no_instance_dict(self):
+        assert not hasattr(Turn("a", "b"), "__dict__")
+
+    def test_hash_depends_on_content(self):
+        assert Turn("Speaker 1", "Hi").digest == content_hash("Speaker 1", "Hi")
+        assert Turn("Speaker 1", "Hi").digest != Turn("Speaker 2", "Hi").digest
+
+    def test_record_round_trip(self):
+        turn = Turn("Speaker 2", "text", 10)
+        restored = Turn.from_record(turn.to_record())
+        assert restored == turn
+        assert (restored.start, restored.end, restored.digest) == (10, 14, turn.digest)
+
+
+class TestBuildingTurns:
+    def test_turns_from_text_offsets_point_into_source(self):
+        text = "Speaker 1: Hello there\n\n**Speaker 2**: Hi\nno label line\n"
+        turns = turns_from_text(text)
+        assert [t.speaker for t in turns] == ["Speaker 1", "Speaker 2", ""]
+        for turn in turns:
+            assert text[turn.start:turn.end] == turn.text
+
+    def test_turns_from_pairs_offsets(self):
+        turns = turns_from_pairs([("Speaker 1", "ab"), ("Speaker 2", "cd")])
+        joined = "\n".join(t.text for t in turns)
+        assert [joined[t.start:t.end] for t in turns] == ["ab", "cd"]
+
+    def test_render_text(self):
+        turns = turns_from_text("Speaker 1: Hi\nplain")
+        assert render_text(turns) == "Speaker 1: Hi\nplain"
+
+
+class TestReadWrite:
+    def test_round_trip(self, tmp_path):
+        turns = turns_from_pairs([("Speaker 1", "Hello"), ("Speaker 2", "Unicode — ok")])
+        path = write_turns(tmp_path / "a.jsonl", turns)
+        assert read_turns(path) == turns
+        assert read_header(path) == {
+            "format": "local-notebooklm/turns", "version": ARTIFACT_VERSION, "kind": SCRIPT_KIND,
+        }
+
+    def test_iter_turns_is_lazy(self, tmp_path):
+        path = write_turns(tmp_path / "a.jsonl", turns_from_pairs([("S", "x")] * 3))
+        it = iter_turns(path)
+        assert next(it).text == "x"
+
+    def test_failed_write_leaves_no_file(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        with pytest.raises(RuntimeError):
+            with TurnWriter(path) as writer:
+                writer.write(Turn("S", "x"))
+                raise RuntimeError("boom")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        path.write_text('{"speaker": "S", "text": "x"}\n')
+        with pytest.raises(ArtifactError, match="not a"):
+            read_turns(path)
+
+    def test_rejects_newer_version(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        path.write_text(json.dumps({"format": "local-notebooklm/turns", "version": 99}) + "\n")
+        with pytest.raises(ArtifactError, match="newer"):
+            read_turns(path)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_turns(tmp_path / "missing.jsonl")
+
+
+class TestMigration:
+    def test_migrates_step3_pickle(self, tmp_path):
+        pkl = tmp_path / "podcast_ready_data.pkl"
+        pkl.write_bytes(pickle.dumps("[('Speaker 1', 'Hello'), ('Speaker 2', 'Hi')]"))
+        path = migrate_pickle(pkl)
+        assert read_header(path)["kind"] == SCRIPT_KIND
+        assert read_turns(path) == [("Speaker 1", "Hello"), ("Speaker 2", "Hi")]
+
+    def test_migrates_step2_pickle(self, tmp_path):
+        pkl = tmp_path / "data.pkl"
+        pkl.write_bytes(pickle.dumps("Speaker 1: Hello\nSpeaker 2: Hi"))
+        path = migrate_pickle(pkl, remove=True)
+        assert read_header(path)["kind"] == TRANSCRIPT_KIND
+        assert [t.speaker for t in read_turns(path)] == ["Speaker 1", "Speaker 2"]
+        assert not pkl.exists()
+
+    def test_refuses_objects(self, tmp_path):
+        pkl = tmp_path / "evil.pkl"
+        pkl.write_bytes(pickle.dumps(ArtifactError("x")))
+        with pytest.raises(ArtifactError, match="Refusing"):
+            migrate_pickle(pkl)
+
+    def test_migrate_directory_drops_unsafe(self, tmp_path):
+        (tmp_path / "step3").mkdir()
+        (tmp_path / "step3" / "podcast_ready_data.pkl").write_bytes(
+            pickle.dumps([("Speaker 1", "Hello")])
+        )
+        (tmp_path / "evil.pkl").write_bytes(pickle.dumps(ArtifactError("x")))
+        migrated = migrate_directory(tmp_path)
+        assert [p.name for p in migrated] == ["podcast_ready_data.jsonl"]
+        assert list(tmp_path.rglob("*.pkl")) == []
+
+    def test_resolve_prefers_jsonl_and_migrates_pickle(self, tmp_path):
+        stem = tmp_path / "podcast_ready_data"
+        with pytest.raises(FileNotFoundError):
+            resolve_artifact(stem)
+        (tmp_path / "podcast_ready_data.pkl").write_bytes(pickle.dumps([("Speaker 1", "Hi")]))
+        path = resolve_artifact(stem)
+        assert path.suffix == ".jsonl"
+        assert resolve_artifact(path) == path
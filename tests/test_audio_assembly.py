@@ -0,0 +1,146 @@
+"""Tests for audio_assembly — streaming concatenation of TTS segments."""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from local_notebooklm.steps.audio_assembly import (
+    AssemblyError,
+    PcmSegment,
+    SegmentAssembler,
+    assemble_segments,
+    decode_segment,
+    subtype_for_bit_depth,
+)
+
+
+def _segment(path, values, rate=8000, subtype="PCM_16"):
+    sf.write(path, np.asarray(values, dtype="float32"), rate, subtype=subtype)
+    return path
+
+
+class TestAssembleSegments:
+    def test_concatenates_in_given_order(self, tmp_path):
+        a = _segment(tmp_path / "a.wav", np.full(100, 0.25))
+        b = _segment(tmp_path / "b.wav", np.full(50, -0.5))
+        report = assemble_segments([b, a], tmp_path / "out.wav")
+
+        data, rate = sf.read(report.path)
+        assert rate == 8000
+        assert len(data) == 150 == report.frames
+        assert data[0] == pytest.approx(-0.5, abs=1e-3)
+        assert data[-1] == pytest.approx(0.25, abs=1e-3)
+        assert report.segments == 2 and report.missing == [] and report.converted == []
+        assert report.duration == pytest.approx(150 / 8000)
+        assert not (tmp_path / "out.wav.part").exists()
+
+    def test_native_pcm_samples_copied_exactly(self, tmp_path):
+        values = np.arange(-300, 300, dtype="int16")
+        src = tmp_path / "a.wav"
+        sf.write(src, values, 16000, subtype="PCM_16")
+        out = tmp_path / "out.wav"
+
+        assembler = SegmentAssembler(out, block_frames=64)
+        assembler.append_file(src)
+        assembler.append_file(src)
+        assembler.close()
+
+        assert assembler._dtype == "int16"
+        assert sf.info(str(out)).subtype == "PCM_16"
+        data, _ = sf.read(out, dtype="int16")
+        assert np.array_equal(data, np.concatenate([values, values]))
+
+    def test_sample_rate_and_channels_normalized(self, tmp_path):
+        first = _segment(tmp_path / "a.wav", np.full(800, 0.5), rate=8000)
+        stereo = tmp_path / "b.wav"
+        sf.write(stereo, np.full((1600, 2), 0.5, dtype="float32"), 16000)
+        report = assemble_segments([first, stereo], tmp_path / "out.wav")
+
+        info = sf.info(str(report.path))
+        assert (info.samplerate, info.channels) == (8000, 1)
+        assert report.converted == [stereo]
+        assert abs(report.frames - 1600) <= 1
+        data, _ = sf.read(report.path)
+        assert np.allclose(data[800:], 0.5, atol=1e-3)
+
+    def test_resampling_is_continuous_across_blocks(self, tmp_path):
+        src = tmp_path / "a.wav"
+        ramp = np.linspace(-0.9, 0.9, 4410, dtype="float32")
+        sf.write(src, ramp, 44100, subtype="FLOAT")
+        out = tmp_path / "out.wav"
+
+        assembler = SegmentAssembler(out, sample_rate=22050, block_frames=100)
+        assembler.append_file(src)
+        assembler.close()
+
+        data, rate = sf.read(out)
+        assert rate == 22050
+        assert abs(len(data) - 2205) <= 1
+        assert np.allclose(np.diff(data), ramp[2] - ramp[0], atol=1e-4)
+
+    def test_explicit_format_overrides_first_segment(self, tmp_path):
+        a = _segment(tmp_path / "a.wav", np.zeros(100), rate=8000)
+        report = assemble_segments([a], tmp_path / "out.flac", sample_rate=16000, subtype="PCM_24")
+        info = sf.info(str(report.path))
+        assert (info.format, info.subtype, info.samplerate) == ("FLAC", "PCM_24", 16000)
+
+    def test_missing_segments_raise_and_list_all(self, tmp_path):
+        a = _segment(tmp_path / "a.wav", np.zeros(10))
+        (tmp_path / "broken.wav").write_bytes(b"not audio")
+        with pytest.raises(AssemblyError, match=r"2 of 3 .*gone\.wav, broken\.wav"):
+            assemble_segments([a, tmp_path / "gone.wav", tmp_path / "broken.wav"], tmp_path / "out.wav")
+        assert not (tmp_path / "out.wav").exists()
+
+    def test_missing_segments_skipped_and_reported(self, tmp_path):
+        a = _segment(tmp_path / "a.wav", np.zeros(10))
+        report = assemble_segments([a, tmp_path / "gone.wav"], tmp_path / "out.wav", skip_missing=True)
+        assert report.frames == 10
+        assert report.missing == [tmp_path / "gone.wav"]
+
+    def test_no_segments(self, tmp_path):
+        with pytest.raises(AssemblyError, match="No audio segments"):
+            assemble_segments([], tmp_path / "out.wav")
+
+
+class TestInMemorySegments:
+    def test_decode_raw_pcm_and_encoded_bytes(self, tmp_path):
+        values = np.arange(-5, 5, dtype="<i2")
+        seg = decode_segment(values.tobytes() + b"\x01", "pcm")  # odd trailing byte dropped
+        assert seg.sample_rate == 24000 and seg.channels == 1
+        assert np.array_equal(seg.samples[:, 0], values)
+        assert decode_segment(values.tobytes(), "pcm_16000").sample_rate == 16000
+
+        _segment(tmp_path / "a.flac", np.full(20, 0.5), rate=22050)
+        seg = decode_segment((tmp_path / "a.flac").read_bytes(), "flac")
+        assert seg.sample_rate == 22050 and len(seg.samples) == 20
+        with pytest.raises(AssemblyError, match="Cannot decode"):
+            decode_segment(b"not audio", "mp3")
+
+    def test_pcm_and_files_assemble_alike(self, tmp_path):
+        values = np.arange(-300, 300, dtype="int16")
+        file_seg = tmp_path / "a.wav"
+        sf.write(file_seg, values, 16000, subtype="PCM_16")
+
+        assembler = SegmentAssembler(tmp_path / "out.wav")
+        assert assembler.append(PcmSegment(values.reshape(-1, 1), 16000)) == 600
+        assembler.append(file_seg)
+        assembler.append(PcmSegment(values.reshape(-1, 1), 8000))  # resampled
+        assembler.close()
+
+        data, rate = sf.read(tmp_path / "out.wav", dtype="int16")
+        assert rate == 16000
+        assert np.array_equal(data[:1200], np.concatenate([values, values]))
+        assert len(data) == 1200 + 1198
+        assert assembler.converted == ["<memory>"]
+
+    def test_pcm_into_float_output(self, tmp_path):
+        assembler = SegmentAssembler(tmp_path / "out.wav", subtype="FLOAT")
+        assembler.append(PcmSegment(np.full((10, 1), 16384, dtype="int16"), 8000))
+        assembler.close()
+        assert sf.read(tmp_path / "out.wav")[0] == pytest.approx(np.full(10, 0.5))
+
+
+def test_subtype_for_bit_depth():
+    assert subtype_for_bit_depth("wav", 24) == "PCM_24"
+    assert subtype_for_bit_depth("mp3", 16) is None
+    assert subtype_for_bit_depth("wav", None) is None
@@ -0,0 +1,126 @@
+"""Tests for audio_encode — compressed final podcast encodings."""
+
+import shutil
+
+import numpy as np
+import pytest
+import soundfile as sf
+from unittest.mock import MagicMock, patch
+
+from local_notebooklm.steps.audio_assembly import assemble_segments
+from local_notebooklm.steps.audio_encode import (
+    ENCODINGS,
+    EncoderUnavailableError,
+    compression_level,
+    encoding_for,
+    open_writer,
+    supported_rate,
+)
+
+
+def _speechlike(path, seconds=2, rate=24000):
+    t = np.arange(int(seconds * rate)) / rate
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t)) / 2
+    sf.write(path, audio.astype("float32"), rate, subtype="PCM_16")
+    return path
+
+
+class TestSettings:
+    def test_encoding_lookup(self):
+        assert encoding_for("out/podcast.opus").subtype == "OPUS"
+        assert encoding_for("podcast.MP3").format == "MP3"
+        assert encoding_for("podcast.xyz") is None
+
+    def test_compression_levels(self):
+        assert compression_level(ENCODINGS["mp3"], 128) == pytest.approx((320 - 128) / 288)
+        assert compression_level(ENCODINGS["mp3"], 8) == 0.99
+        assert compression_level(ENCODINGS["mp3"], 80, sample_rate=24000) == pytest.approx(80 / 152)
+        # Opus levels are per channel
+        assert compression_level(ENCODINGS["opus"], 128, channels=2) == pytest.approx(1 - 58 / 250)
+        assert compression_level(ENCODINGS["wav"], 128) is None
+
+    def test_supported_rate(self):
+        assert supported_rate(ENCODINGS["opus"], 24000) == 24000
+        assert supported_rate(ENCODINGS["opus"], 44100) == 48000
+        assert supported_rate(ENCODINGS["opus"], 96000) == 48000
+        assert supported_rate(ENCODINGS["wav"], 44100) == 44100
+
+
+class TestEncodedAssembly:
+    @pytest.mark.parametrize("name", ["opus", "mp3", "ogg", "flac"])
+    def test_encodes_from_segments(self, tmp_path, name):
+        segments = [_speechlike(tmp_path / f"s{i}.wav") for i in range(2)]
+        report = assemble_segments(segments, tmp_path / f"podcast.{ENCODINGS[name].extension}")
+
+        info = sf.info(str(report.path))
+        assert info.format == ENCODINGS[name].format
+        assert info.duration == pytest.approx(4.0, abs=0.1)
+        assert 0 < report.size_bytes < report.pcm_bytes
+        assert report.seconds > 0
+
+    def test_opus_resamples_unsupported_rate(self, tmp_path):
+        segment = _speechlike(tmp_path / "s.wav", rate=22050)
+        report = assemble_segments([segment], tmp_path / "podcast.opus")
+        assert report.sample_rate == 24000
+        assert report.converted == [segment]
+
+    def test_bitrate_controls_size(self, tmp_path):
+        segments = [_speechlike(tmp_path / "s.wav", seconds=5)]
+        low = assemble_segments(segments, tmp_path / "low.mp3", bitrate_kbps=32)  # MPEG-2 at 24 kHz
+        high = assemble_segments(segments, tmp_path / "high.mp3", bitrate_kbps=192)
+        assert low.size_bytes * 8 / 5 / 1000 == pytest.approx(32, rel=0.25)
+        assert high.size_bytes > 4 * low.size_bytes
+
+    def test_aac_without_ffmpeg(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        with pytest.raises(EncoderUnavailableError, match="ffmpeg"):
+            open_writer(tmp_path / "podcast.aac", ENCODINGS["aac"], 24000, 1)
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_aac_with_ffmpeg(self, tmp_path):
+        report = assemble_segments([_speechlike(tmp_path / "s.wav")], tmp_path / "podcast.aac")
+        assert 0 < report.size_bytes < report.pcm_bytes
+
+
+def _config(**tts_extra):
+    return {
+        "Text-To-Speech-Model": {"model": "tts-1", "audio_format": "wav", "cache": False, **tts_extra},
+        "Host-Speaker-Voice": "v1",
+        "Co-Host-Speaker-1-Voice": "v2",
+        "Co-Host-Speaker-2-Voice": "v3",
+        "Co-Host-Speaker-3-Voice": "v4",
+        "Co-Host-Speaker-4-Voice": "v5",
+    }
+
+
+class TestStep4Encoding:
+    def _run(self, tmp_path, **tts_extra):
+        from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns
+        from local_notebooklm.steps.step4 import step4
+
+        write_turns(tmp_path / "podcast_ready_data.jsonl",
+                    turns_from_pairs([("Speaker 1", "Hello there."), ("Speaker 2", "Hi.")]))
+
+        def fake_speech(client, text, voice, model_name, response_format, output_path):
+            _speechlike(f"{output_path}.wav", seconds=1)
+
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=fake_speech):
+            return step4(client=MagicMock(), config=_config(**tts_extra),
+                         input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+
+    def test_output_format_encodes_while_synthesizing(self, tmp_path):
+        final = self._run(tmp_path, output_format="opus", output_bitrate_kbps=32)
+        assert final.endswith("podcast.opus")
+        assert sf.info(final).duration == pytest.approx(2.0, abs=0.1)
+        out = tmp_path / "out"
+        assert not (out / "podcast.wav").exists()
+        assert not (out / "podcast.live.wav").exists()
+
+    def test_keep_wav(self, tmp_path):
+        final = self._run(tmp_path, output_format="mp3", keep_wav=True, progressive=False)
+        assert final.endswith("podcast.mp3")
+        assert sf.info(str(tmp_path / "out" / "podcast.wav")).duration == pytest.approx(2.0)
+
+    def test_unknown_output_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            self._run(tmp_path, output_format="wma")
@@ -0,0 +1,187 @@
+"""Tests for browser_pool — the shared headless browser behind PNG export."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from local_notebooklm.steps.browser_pool import BrowserPool, BrowserUnavailableError
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+        self.contents = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def set_viewport_size(self, size):
+        pass
+
+    async def set_content(self, html, wait_until=None, timeout=None):
+        if not self.browser.connected:
+            raise RuntimeError("Target page, context or browser has been closed")
+        self.browser.active += 1
+        self.browser.peak = max(self.browser.peak, self.browser.active)
+        await asyncio.sleep(self.browser.delay)
+        self.browser.active -= 1
+        self.contents.append(html)
+
+    async def evaluate(self, expression):
+        return 2 if expression == "1 + 1" else 900
+
+    async def screenshot(self, path, full_page=False, timeout=None):
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG" + self.contents[-1].encode())
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, delay=0.0):
+        self.connected = True
+        self.delay = delay
+        self.pages = []
+        self.active = self.peak = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_page(self, viewport=None):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def crash(self):
+        self.connected = False
+        for page in self.pages:
+            page.closed = True
+
+
+def fake_launcher(delay=0.0):
+    browsers = []
+
+    async def launch():
+        browser = FakeBrowser(delay)
+        browsers.append(browser)
+
+        async def stop():
+            browser.connected = False
+
+        return browser, stop
+
+    return launch, browsers
+
+
+@pytest.fixture
+def pool_factory():
+    pools = []
+
+    def make(**kwargs):
+        launch, browsers = fake_launcher(kwargs.pop("delay", 0.0))
+        pool = BrowserPool(launcher=launch, health_interval=kwargs.pop("health_interval", 0), **kwargs)
+        pools.append(pool)
+        return pool, browsers
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+class TestBrowserPool:
+    def test_reuses_browser_and_pages(self, pool_factory, tmp_path):
+        pool, browsers = pool_factory()
+        for i in range(3):
+            out = tmp_path / f"{i}.png"
+            assert pool.render(f"<p>{i}</p>", str(out)) == str(out)
+            assert out.read_bytes() == b"\x89PNG" + f"<p>{i}</p>".encode()
+        assert pool.launches == 1
+        assert len(browsers[0].pages) == 1
+
+    def test_concurrent_renders_bounded_by_size(self, pool_factory, tmp_path):
+        pool, browsers = pool_factory(size=2, delay=0.05)
+        threads = [threading.Thread(target=pool.render, args=(f"<p>{i}</p>", str(tmp_path / f"{i}.png")))
+                   for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(list(tmp_path.glob("*.png"))) == 6
+        assert browsers[0].peak == 2
+        assert len(browsers[0].pages) == 2
+
+    def test_relaunches_after_crash(self, pool_factory, tmp_path):
+        pool, browsers = pool_factory()
+        pool.render("<p>a</p>", str(tmp_path / "a.png"))
+        browsers[0].crash()
+        pool.render("<p>b</p>", str(tmp_path / "b.png"))
+        assert pool.launches == 2
+        assert (tmp_path / "b.png").exists()
+
+    def test_retries_render_interrupted_by_crash(self, pool_factory, tmp_path):
+        pool, browsers = pool_factory()
+        pool.start()
+        browsers[0].connected = False  # dies with the page still open
+        pool.render("<p>a</p>", str(tmp_path / "a.png"))
+        assert pool.launches == 2
+        assert len(browsers[1].pages) == 1
+
+    def test_watchdog_relaunches(self, pool_factory):
+        pool, browsers = pool_factory(health_interval=0.01)
+        pool.start()
+        browsers[0].crash()
+        deadline = time.monotonic() + 2
+        while pool.launches < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.launches == 2
+        assert pool.healthy()
+
+    def test_launch_failure_propagates(self, tmp_path):
+        async def broken():
+            raise BrowserUnavailableError("Playwright is not installed")
+
+        pool = BrowserPool(launcher=broken, health_interval=0)
+        try:
+            with pytest.raises(BrowserUnavailableError):
+                pool.render("<p/>", str(tmp_path / "x.png"))
+            assert not pool.healthy()
+        finally:
+            pool.close()
+
+    def test_closed_pool_refuses_work(self, pool_factory, tmp_path):
+        pool, browsers = pool_factory()
+        pool.start()
+        pool.close()
+        assert not browsers[0].connected
+        with pytest.raises(BrowserUnavailableError):
+            pool.render("<p/>", str(tmp_path / "x.png"))
+
+
+class TestRenderPngUsesPool:
+    def test_renders_markup_through_shared_pool(self, tmp_path):
+        from local_notebooklm.steps.step5 import render_png
+
+        pool = MagicMock()
+        with patch("local_notebooklm.steps.step5._playwright_available", return_value=True), \
+                patch("local_notebooklm.steps.step5.get_browser_pool", return_value=pool) as get_pool:
+            out = render_png("unused.html", str(tmp_path / "out.png"), html_content="<p>x</p>", pages=3)
+        assert out == str(tmp_path / "out.png")
+        get_pool.assert_called_once_with(3)
+        pool.render.assert_called_once_with("<p>x</p>", str(tmp_path / "out.png"))
+
+    def test_render_failure_is_non_fatal(self, tmp_path):
+        from local_notebooklm.steps.step5 import render_png
+
+        html_file = tmp_path / "in.html"
+        html_file.write_text("<p>x</p>")
+        pool = MagicMock()
+        pool.render.side_effect = RuntimeError("boom")
+        with patch("local_notebooklm.steps.step5._playwright_available", return_value=True), \
+                patch("local_notebooklm.steps.step5.get_browser_pool", return_value=pool):
+            assert render_png(str(html_file), str(tmp_path / "out.png")) is None
+        pool.render.assert_called_once_with("<p>x</p>", str(tmp_path / "out.png"))
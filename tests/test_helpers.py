@@ -131,6 +131,22 @@ class TestGenerateSpeechRetry:
             )
 
 
+    @patch("local_notebooklm.steps.helpers.time.sleep")
+    def test_speech_bytes_returns_audio_with_retries(self, mock_sleep):
+        from local_notebooklm.steps.helpers import speech_bytes
+
+        mock_client = MagicMock()
+        response = MagicMock()
+        response.__enter__.return_value.read.return_value = b"\x00\x01"
+        mock_client.audio.speech.with_streaming_response.create.side_effect = [
+            ConnectionError("net error"),
+            response,
+        ]
+
+        assert speech_bytes(client=mock_client, text="hello", response_format="pcm") == b"\x00\x01"
+        assert mock_client.audio.speech.with_streaming_response.create.call_args.kwargs["response_format"] == "pcm"
+
+
 class TestExponentialBackoff:
     @patch("local_notebooklm.steps.helpers._call_llm", side_effect=[RuntimeError, RuntimeError, "ok"])
     @patch("local_notebooklm.steps.helpers.time.sleep")
@@ -143,3 +159,238 @@ class TestExponentialBackoff:
         )
         delays = [call.args[0] for call in mock_sleep.call_args_list]
         assert delays == [2, 4]  # base=2, then 4
+
+    @patch("local_notebooklm.steps.helpers._call_llm")
+    @patch("local_notebooklm.steps.helpers.time.sleep")
+    def test_rate_limit_shared_across_callers(self, mock_sleep, mock_call):
+        from local_notebooklm.steps.helpers import generate_text
+
+        client = MagicMock()
+        mock_call.side_effect = [RuntimeError("429 Too Many Requests"), "ok", "ok"]
+        generate_text(client=client, messages=[{"role": "user", "content": "hi"}])
+        mock_sleep.reset_mock()
+
+        # The backoff recorded by the first caller is still pending (sleep
+        # was mocked), so another caller on the same client waits it out
+        generate_text(client=client, messages=[{"role": "user", "content": "hi"}])
+        assert mock_sleep.call_count == 1
+        assert 0 < mock_sleep.call_args.args[0] <= 10
+
+        mock_sleep.reset_mock()
+        mock_call.side_effect = ["ok"]
+        generate_text(client=MagicMock(), messages=[{"role": "user", "content": "hi"}])
+        mock_sleep.assert_not_called()
+
+
+class TestOrderedStream:
+    def test_releases_in_index_order(self):
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        stream = OrderedStream()
+        seen = []
+        stream.subscribe(lambda idx, item: seen.append((idx, item)))
+        stream.put(2, "c")
+        stream.put(1, "b")
+        assert seen == []
+        assert stream.ready == 0
+        stream.put(0, "a")
+        assert seen == [(0, "a"), (1, "b"), (2, "c")]
+        assert stream.ready == 3
+
+    def test_late_subscriber_gets_prefix(self):
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        stream = OrderedStream()
+        stream.put(0, "a")
+        stream.put(2, "c")
+        seen = []
+        stream.subscribe(lambda idx, item: seen.append(item))
+        assert seen == ["a"]
+
+    def test_iteration_blocks_until_closed(self):
+        import threading
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        stream = OrderedStream()
+        collected = []
+        reader = threading.Thread(target=lambda: collected.extend(stream))
+        reader.start()
+        stream.put(1, "b")
+        stream.put(0, "a")
+        stream.close()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+        assert collected == ["a", "b"]
+
+    def test_iteration_raises_error_after_prefix(self):
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        stream = OrderedStream()
+        stream.put(0, "a")
+        stream.close(error=RuntimeError("boom"))
+        it = iter(stream)
+        assert next(it) == "a"
+        with pytest.raises(RuntimeError, match="boom"):
+            next(it)
+
+    def test_put_after_close_rejected(self):
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        stream = OrderedStream()
+        stream.close()
+        with pytest.raises(ValueError):
+            stream.put(0, "a")
+
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "turns": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"speaker": {"type": "string"}, "text": {"type": "string"}},
+                "required": ["speaker", "text"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["turns"],
+    "additionalProperties": False,
+}
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+
+
+def _openai_client(base_url=None):
+    from openai import OpenAI
+    return OpenAI(api_key="test", base_url=base_url)
+
+
+def _chat_response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+class TestStructuredOutput:
+    def test_mode_by_provider(self):
+        from anthropic import Anthropic
+        from local_notebooklm.steps.helpers import structured_output_mode
+
+        assert structured_output_mode(_openai_client()) == "json_schema"
+        assert structured_output_mode(_openai_client("http://localhost:11434/v1")) == "json_schema"
+        assert structured_output_mode(_openai_client("https://api.groq.com/openai/v1")) == "json_object"
+        assert structured_output_mode(Anthropic(api_key="test")) == "tool"
+        assert structured_output_mode(MagicMock()) == "off"
+        assert structured_output_mode(_openai_client(), "grammar") == "grammar"
+        with pytest.raises(ValueError, match="structured_output"):
+            structured_output_mode(_openai_client(), "xml")
+
+    def test_json_schema_request(self):
+        from local_notebooklm.steps.helpers import generate_structured
+
+        client = _openai_client()
+        with patch.object(client.chat.completions, "create",
+                          return_value=_chat_response('{"turns": []}')) as create:
+            result = generate_structured(client=client, messages=MESSAGES, schema=SCHEMA, schema_name="t")
+        assert result == {"turns": []}
+        fmt = create.call_args.kwargs["response_format"]
+        assert fmt["type"] == "json_schema"
+        assert fmt["json_schema"]["schema"] is SCHEMA
+
+    def test_grammar_request(self):
+        from local_notebooklm.steps.helpers import generate_structured
+
+        client = _openai_client("http://localhost:8080/v1")
+        with patch.object(client.chat.completions, "create",
+                          return_value=_chat_response('{"turns": []}')) as create:
+            generate_structured(client=client, messages=MESSAGES, schema=SCHEMA, mode="grammar")
+        grammar = create.call_args.kwargs["extra_body"]["grammar"]
+        assert grammar.startswith("root ::=")
+        assert "response_format" not in create.call_args.kwargs
+
+    def test_anthropic_tool_call(self):
+        from anthropic import Anthropic
+        from local_notebooklm.steps.helpers import generate_structured
+
+        client = Anthropic(api_key="test")
+        block = MagicMock(type="tool_use", input={"turns": [{"speaker": "Speaker 1", "text": "Hi"}]})
+        with patch.object(client.messages, "create", return_value=MagicMock(content=[block])) as create:
+            result = generate_structured(client=client, messages=MESSAGES, schema=SCHEMA, schema_name="t")
+        assert result["turns"][0]["text"] == "Hi"
+        kwargs = create.call_args.kwargs
+        assert kwargs["tool_choice"] == {"type": "tool", "name": "t"}
+        assert kwargs["tools"][0]["input_schema"] is SCHEMA
+        assert kwargs["system"] == "sys"
+
+    def test_rejected_mode_remembered(self):
+        from local_notebooklm.steps.helpers import generate_structured
+
+        client = _openai_client()
+        error = Exception("response_format json_schema is not supported")
+        with patch.object(client.chat.completions, "create", side_effect=error) as create:
+            assert generate_structured(client=client, messages=MESSAGES, schema=SCHEMA) is None
+            assert generate_structured(client=client, messages=MESSAGES, schema=SCHEMA) is None
+        assert create.call_count == 1
+
+    def test_invalid_json_raises_with_raw_reply(self):
+        from local_notebooklm.steps.helpers import (
+            StructuredOutputError, generate_structured, structured_output_mode,
+        )
+
+        client = _openai_client()
+        with patch.object(client.chat.completions, "create",
+                          return_value=_chat_response('{"turns": [')) as create:
+            with pytest.raises(StructuredOutputError) as excinfo:
+                generate_structured(client=client, messages=MESSAGES, schema=SCHEMA)
+        assert excinfo.value.raw == '{"turns": ['
+        assert create.call_count == 1
+        # Still supported: the next call asks for structured output again
+        assert structured_output_mode(client) == "json_schema"
+
+    def test_off_makes_no_call(self):
+        from local_notebooklm.steps.helpers import generate_structured
+
+        client = MagicMock()
+        assert generate_structured(client=client, messages=MESSAGES, schema=SCHEMA) is None
+        client.chat.completions.create.assert_not_called()
+
+    @patch("local_notebooklm.steps.helpers.time.sleep")
+    def test_transient_errors_retried(self, mock_sleep):
+        from local_notebooklm.steps.helpers import generate_structured
+
+        client = _openai_client()
+        side_effect = [ConnectionError("reset"), _chat_response('{"turns": []}')]
+        with patch.object(client.chat.completions, "create", side_effect=side_effect):
+            assert generate_structured(client=client, messages=MESSAGES, schema=SCHEMA) == {"turns": []}
+
+    def test_gbnf_covers_schema_types(self):
+        from local_notebooklm.steps.helpers import json_schema_to_gbnf
+
+        grammar = json_schema_to_gbnf({
+            "type": "object",
+            "properties": {
+                "n": {"type": "integer"},
+                "role": {"enum": ["Host", "Guest"]},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            },
+        })
+        assert r'"\"role\""' in grammar
+        assert r'"\"Host\"" | "\"Guest\""' in grammar
+        assert "integer ::=" in grammar and "string ::=" in grammar
+
+
+class TestCallStats:
+    def test_counts_and_rates(self):
+        from local_notebooklm.steps.helpers import CallStats
+
+        stats = CallStats()
+        for _ in range(4):
+            stats.incr("step3", "calls")
+        stats.incr("step3", "fixup")
+        assert stats.rate("step3", "fixup") == 0.25
+        assert stats.rate("step5", "fixup") == 0.0
+        assert stats.snapshot() == {"step3": {"calls": 4, "fixup": 1}}
+        assert "1 fixup (25%)" in stats.summary("step3")
+        stats.reset()
+        assert stats.get("step3", "calls") == 0
@@ -0,0 +1,95 @@
+"""Tests for live_audio — following the growing Step 4 output."""
+
+import struct
+import threading
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from local_notebooklm.steps.audio_assembly import SegmentAssembler
+from local_notebooklm.steps.live_audio import (
+    follow,
+    follow_frames,
+    read_layout,
+    read_range,
+)
+
+
+def _segments(tmp_path, count=3, frames=1000):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"seg{i}.wav"
+        sf.write(path, np.full(frames, i + 1, dtype="int16"), 8000, subtype="PCM_16")
+        paths.append(path)
+    return paths
+
+
+def _write_slowly(live_path, segments, done, delay=0.05):
+    assembler = SegmentAssembler(live_path, progressive=True)
+    for segment in segments:
+        assembler.append_file(segment)
+        time.sleep(delay)
+    assembler.close()
+    done.set()
+
+
+class TestFollow:
+    def test_streams_growing_file_to_the_end(self, tmp_path):
+        live = tmp_path / "podcast.live.wav"
+        done = threading.Event()
+        writer = threading.Thread(target=_write_slowly, args=(live, _segments(tmp_path), done))
+        writer.start()
+        data = b"".join(follow(live, done.is_set, poll_interval=0.01))
+        writer.join()
+
+        layout = read_layout(data)
+        assert struct.unpack_from("<I", data, 4)[0] == 0xFFFFFFFF
+        assert layout.data_size == 0xFFFFFFFF
+        samples = np.frombuffer(data[layout.data_offset:], dtype="<i2")
+        assert np.array_equal(samples, np.repeat(np.arange(1, 4, dtype="int16"), 1000))
+
+    def test_keeps_reading_after_rename(self, tmp_path):
+        live = tmp_path / "podcast.live.wav"
+        done = threading.Event()
+        segments = _segments(tmp_path, count=2)
+
+        def write_then_rename():
+            _write_slowly(live, segments, threading.Event())
+            live.rename(tmp_path / "podcast.wav")
+            done.set()
+
+        writer = threading.Thread(target=write_then_rename)
+        writer.start()
+        frames = list(follow_frames(live, done.is_set, poll_interval=0.01))
+        writer.join()
+
+        assert {rate for rate, _ in frames} == {8000}
+        assert sum(len(block) for _, block in frames) == 2000
+
+    def test_no_file_and_finished(self, tmp_path):
+        assert list(follow(tmp_path / "missing.wav", lambda: True)) == []
+
+
+def test_follow_frames_decodes_24_bit(tmp_path):
+    path = tmp_path / "podcast.live.wav"
+    sf.write(path, np.array([[0.5, -0.5]] * 10), 8000, subtype="PCM_24")
+    (rate, block), = follow_frames(path, lambda: True)
+    assert rate == 8000 and block.shape == (10, 2)
+    assert block[0, 0] / 2**31 == pytest.approx(0.5, abs=1e-4)
+    assert block[0, 1] / 2**31 == pytest.approx(-0.5, abs=1e-4)
+
+
+def test_read_range_patches_header(tmp_path):
+    path = tmp_path / "podcast.live.wav"
+    sf.write(path, np.zeros(100, dtype="int16"), 8000, subtype="PCM_16")
+    size = path.stat().st_size
+
+    head, current = read_range(path, 0, 7)
+    assert current == size
+    assert head[:4] == b"RIFF" and struct.unpack_from("<I", head, 4)[0] == 0xFFFFFFFF
+
+    tail, _ = read_range(path, size - 10)
+    assert tail == path.read_bytes()[-10:]
+    assert read_range(path, size)[0] == b""
@@ -0,0 +1,203 @@
+"""Tests for pipeline — the DAG engine with content-hash stamps."""
+
+import threading
+
+import pytest
+
+from local_notebooklm.pipeline import (
+    CACHED, CANCELLED, FAILED, MISSING, RAN, SKIPPED, Node, Pipeline, PipelineError,
+)
+
+
+class Recorder:
+    """Node run functions that write ``<name>.txt`` and count their calls."""
+
+    def __init__(self, tmp_path):
+        self.dir = tmp_path
+        self.calls = []
+        self.content = {}
+
+    def node(self, name, deps=(), params=None, **kwargs):
+        def run(inputs):
+            self.calls.append(name)
+            path = self.dir / f"{name}.txt"
+            text = self.content.get(name, name + "".join(sorted(inputs)))
+            path.write_text(text)
+            return str(path)
+
+        return Node(name=name, run=run, deps=tuple(deps), params=params or {},
+                    outputs=lambda result: [result], **kwargs)
+
+
+def chain(rec, style="normal"):
+    return [
+        rec.node("a"),
+        rec.node("b", deps=["a"], params={"style": style}),
+        rec.node("c", deps=["b"]),
+    ]
+
+
+class TestPipeline:
+    def test_second_run_is_cached(self, tmp_path):
+        rec = Recorder(tmp_path)
+        first = Pipeline(chain(rec), tmp_path / ".stamps").run()
+        assert {r.status for r in first.values()} == {RAN}
+
+        second = Pipeline(chain(rec), tmp_path / ".stamps").run()
+        assert {r.status for r in second.values()} == {CACHED}
+        assert second["c"].result == first["c"].result
+        assert rec.calls == ["a", "b", "c"]
+
+    def test_param_change_reruns_downstream_only(self, tmp_path):
+        rec = Recorder(tmp_path)
+        Pipeline(chain(rec), tmp_path / ".stamps").run()
+        rec.calls.clear()
+        rec.content["b"] = "casual"
+
+        results = Pipeline(chain(rec, style="casual"), tmp_path / ".stamps").run()
+
+        assert rec.calls == ["b", "c"]
+        assert results["a"].status == CACHED
+
+    def test_identical_output_stops_invalidation(self, tmp_path):
+        rec = Recorder(tmp_path)
+        Pipeline(chain(rec), tmp_path / ".stamps").run()
+        rec.calls.clear()
+
+        # b reruns for the new parameter but writes the same file
+        Pipeline(chain(rec, style="casual"), tmp_path / ".stamps").run()
+
+        assert rec.calls == ["b"]
+
+    def test_edited_output_reruns_node(self, tmp_path):
+        rec = Recorder(tmp_path)
+        Pipeline(chain(rec), tmp_path / ".stamps").run()
+        rec.calls.clear()
+        (tmp_path / "c.txt").write_text("edited by hand")
+
+        Pipeline(chain(rec), tmp_path / ".stamps").run()
+
+        assert rec.calls == ["c"]
+
+    def test_input_file_content_is_hashed(self, tmp_path):
+        rec = Recorder(tmp_path)
+        source = tmp_path / "doc.txt"
+        source.write_text("v1")
+
+        def nodes():
+            return [rec.node("a", inputs=(str(source),)), rec.node("b", deps=["a"])]
+
+        Pipeline(nodes(), tmp_path / ".stamps").run()
+        Pipeline(nodes(), tmp_path / ".stamps").run()
+        assert rec.calls == ["a", "b"]
+
+        source.write_text("v2")
+        rec.content["a"] = "a from v2"
+        Pipeline(nodes(), tmp_path / ".stamps").run()
+        assert rec.calls == ["a", "b", "a", "b"]
+
+    def test_force_reruns_fresh_nodes(self, tmp_path):
+        rec = Recorder(tmp_path)
+        Pipeline(chain(rec), tmp_path / ".stamps").run()
+        rec.calls.clear()
+
+        Pipeline(chain(rec), tmp_path / ".stamps").run(force={"b", "c"})
+
+        assert rec.calls == ["b", "c"]
+
+    def test_independent_nodes_run_concurrently(self, tmp_path):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait(inputs):
+            barrier.wait()  # deadlocks unless both branches run at once
+            return "done"
+
+        nodes = [
+            Node("root", run=lambda inputs: "root"),
+            Node("left", run=wait, deps=("root",)),
+            Node("right", run=wait, deps=("root",)),
+        ]
+        results = Pipeline(nodes, tmp_path).run()
+        assert results["left"].status == results["right"].status == RAN
+
+    def test_failure_skips_dependents_only(self, tmp_path):
+        events = []
+
+        def boom(inputs):
+            raise RuntimeError("boom")
+
+        nodes = [
+            Node("root", run=lambda inputs: "root"),
+            Node("bad", run=boom, deps=("root",)),
+            Node("after", run=lambda inputs: "x", deps=("bad",)),
+            Node("other", run=lambda inputs: "y", deps=("root",)),
+        ]
+        results = Pipeline(nodes, tmp_path).run(on_event=lambda n, s: events.append((n, s)))
+
+        assert results["bad"].status == FAILED
+        assert str(results["bad"].error) == "boom"
+        assert results["after"].status == SKIPPED
+        assert results["other"].status == RAN
+        assert ("bad", "running") in events and ("bad", FAILED) in events
+
+    def test_failed_node_is_not_stamped(self, tmp_path):
+        attempts = []
+
+        def flaky(inputs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            return "ok"
+
+        Pipeline([Node("n", run=flaky)], tmp_path).run()
+        results = Pipeline([Node("n", run=flaky)], tmp_path).run()
+        assert results["n"].status == RAN and len(attempts) == 2
+
+    def test_reuse_uses_discover_without_stamp(self, tmp_path):
+        found = tmp_path / "old.txt"
+        found.write_text("left by an earlier version")
+        nodes = [
+            Node("a", run=lambda inputs: pytest.fail("a must not run"),
+                 discover=lambda: str(found), outputs=lambda r: [r]),
+            Node("b", run=lambda inputs: inputs["a"], deps=("a",)),
+        ]
+        results = Pipeline(nodes, tmp_path / ".stamps").run(reuse={"a"})
+        assert results["a"].status == CACHED
+        assert results["b"].result == str(found)
+
+    def test_reuse_with_nothing_on_disk_is_missing(self, tmp_path):
+        nodes = [
+            Node("a", run=lambda inputs: "a", discover=lambda: None),
+            Node("b", run=lambda inputs: "b", deps=("a",)),
+        ]
+        results = Pipeline(nodes, tmp_path).run(reuse={"a"})
+        assert results["a"].status == MISSING
+        assert isinstance(results["a"].error, PipelineError)
+        assert results["b"].status == SKIPPED
+
+    def test_targets_limit_the_run(self, tmp_path):
+        rec = Recorder(tmp_path)
+        nodes = chain(rec) + [rec.node("d", deps=["a"])]
+        results = Pipeline(nodes, tmp_path / ".stamps").run(targets=["d"])
+        assert set(results) == {"a", "d"}
+
+    def test_cancel_stops_pending_nodes(self, tmp_path):
+        cancel = threading.Event()
+
+        def first(inputs):
+            cancel.set()
+            return "a"
+
+        nodes = [Node("a", run=first), Node("b", run=lambda inputs: "b", deps=("a",))]
+        results = Pipeline(nodes, tmp_path).run(cancel_event=cancel)
+        assert results["a"].status == RAN
+        assert results["b"].status == CANCELLED
+
+    def test_invalid_graphs_rejected(self, tmp_path):
+        run = lambda inputs: None  # noqa: E731
+        with pytest.raises(PipelineError, match="cycle"):
+            Pipeline([Node("a", run, deps=("b",)), Node("b", run, deps=("a",))], tmp_path)
+        with pytest.raises(PipelineError, match="unknown"):
+            Pipeline([Node("a", run, deps=("nope",))], tmp_path)
+        with pytest.raises(PipelineError, match="Duplicate"):
+            Pipeline([Node("a", run), Node("a", run)], tmp_path)
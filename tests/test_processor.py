@@ -0,0 +1,241 @@
+"""Tests for processor — pipeline orchestration and multi-variant fan-out."""
+
+import copy
+import json
+import threading
+from pathlib import Path
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from local_notebooklm.config import base_config
+from local_notebooklm.processor import parse_variant, podcast_processor
+
+
+class TestParseVariant:
+    def test_string(self):
+        assert parse_variant("podcast:long:casual") == {
+            "format": "podcast", "length": "long", "style": "casual",
+        }
+
+    def test_defaults(self):
+        assert parse_variant("lecture") == {
+            "format": "lecture", "length": "medium", "style": "normal",
+        }
+
+    def test_tuple_and_dict(self):
+        assert parse_variant(("summary", "short", "normal"))["length"] == "short"
+        assert parse_variant({"format": "debate"})["style"] == "normal"
+
+    @pytest.mark.parametrize("spec", ["", ":short", "a:b:c:d"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError, match="Invalid variant"):
+            parse_variant(spec)
+
+
+@patch("local_notebooklm.processor.set_provider", return_value=MagicMock())
+@patch("local_notebooklm.processor.validate_config")
+@patch("local_notebooklm.processor.step5")
+@patch("local_notebooklm.processor.step4")
+@patch("local_notebooklm.processor.step3")
+@patch("local_notebooklm.processor.step2")
+@patch("local_notebooklm.processor.step1")
+class TestVariants:
+    def test_step1_once_branches_concurrent(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        s1.return_value = str(tmp_path / "clean.txt")
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_step2(**kwargs):
+            barrier.wait()  # deadlocks unless both branches run at once
+            return kwargs["input_file"], str(tmp_path / "data.jsonl")
+
+        s2.side_effect = fake_step2
+        s4.side_effect = lambda **kw: kw["output_dir"] + "/podcast.wav"
+
+        ok, results = podcast_processor(
+            "doc.pdf", output_dir=str(tmp_path),
+            variants=["summary:short", ("podcast", "long", "casual")],
+        )
+
+        assert ok
+        assert s1.call_count == 1
+        assert set(results) == {"summary-short-normal", "podcast-long-casual"}
+        formats = sorted(c.kwargs["format_type"] for c in s2.call_args_list)
+        assert formats == ["podcast", "summary"]
+        for name, (success, audio) in results.items():
+            assert success
+            assert audio == str(tmp_path / "variants" / name / "step4") + "/podcast.wav"
+
+    def test_failed_variant_reported(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        s1.return_value = str(tmp_path / "clean.txt")
+        s2.side_effect = lambda **kw: (kw["input_file"], "data.jsonl")
+        s3.side_effect = lambda **kw: (_ for _ in ()).throw(RuntimeError("boom")) \
+            if kw["format_type"] == "debate" else None
+        s4.return_value = "podcast.wav"
+
+        ok, results = podcast_processor(
+            "doc.pdf", output_dir=str(tmp_path), variants=["debate", "lecture"],
+        )
+
+        assert not ok
+        assert results["debate-medium-normal"] == (False, "Error during generation: boom")
+        assert results["lecture-medium-normal"] == (True, "podcast.wav")
+
+    def test_variant_infographics_run_concurrently(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        s2.return_value = (None, "data.jsonl")
+        barrier = threading.Barrier(2, timeout=5)
+        s5.side_effect = lambda **kw: barrier.wait()  # deadlocks if Step 5s are serialized
+
+        ok, results = podcast_processor(
+            "doc.pdf", output_dir=str(tmp_path), variants=["debate", "lecture"],
+            outputs=["Infographic HTML"],
+        )
+
+        assert ok and s5.call_count == 2
+
+    def test_invalid_variant_rejected(self, s1, *_):
+        ok, msg = podcast_processor("doc.pdf", variants=["a:b:c:d"])
+        assert not ok and "Invalid variant" in msg
+        s1.assert_not_called()
+
+
+@patch("local_notebooklm.processor.set_provider", return_value=MagicMock())
+@patch("local_notebooklm.processor.validate_config")
+@patch("local_notebooklm.processor.step5")
+@patch("local_notebooklm.processor.step4")
+@patch("local_notebooklm.processor.step3")
+@patch("local_notebooklm.processor.step2")
+@patch("local_notebooklm.processor.step1")
+class TestAudioAndInfographic:
+    def test_step4_and_step5_run_concurrently(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        s2.return_value = (None, "data.jsonl")
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_step4(**kwargs):
+            barrier.wait()  # deadlocks unless Step 5 runs alongside
+            return "podcast.wav"
+
+        s4.side_effect = fake_step4
+        s5.side_effect = lambda **kw: barrier.wait()
+
+        ok, audio = podcast_processor("doc.pdf", output_dir=str(tmp_path))
+
+        assert ok and audio == "podcast.wav"
+        assert s5.call_args.kwargs["input_dir"] == str(tmp_path / "step3")
+        assert callable(s5.call_args.kwargs["progress_callback"])
+
+    def test_step5_failure_is_non_fatal(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        s2.return_value = (None, "data.jsonl")
+        s4.return_value = "podcast.wav"
+        s5.side_effect = RuntimeError("no infographic")
+
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path)) == (True, "podcast.wav")
+
+    def test_step4_failure_waits_for_step5(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        s2.return_value = (None, "data.jsonl")
+        s4.side_effect = RuntimeError("tts down")
+        finished = threading.Event()
+        s5.side_effect = lambda **kw: finished.set()
+
+        ok, msg = podcast_processor("doc.pdf", output_dir=str(tmp_path))
+
+        assert not ok and "tts down" in msg
+        assert finished.is_set()
+
+
+@patch("local_notebooklm.processor.set_provider", return_value=MagicMock())
+@patch("local_notebooklm.processor.validate_config")
+@patch("local_notebooklm.processor.step5")
+@patch("local_notebooklm.processor.step4")
+@patch("local_notebooklm.processor.step3")
+@patch("local_notebooklm.processor.step2")
+@patch("local_notebooklm.processor.step1")
+class TestIncrementalRuns:
+    @staticmethod
+    def fake_steps(tmp_path, s1, s2, s3, s4):
+        clean = tmp_path / "step1" / "clean.txt"
+
+        def fake_step1(**kw):
+            clean.write_text("cleaned")
+            return str(clean)
+
+        def fake_step2(**kw):
+            path = tmp_path / "step2" / "data.jsonl"
+            path.write_text(kw["style"])
+            return None, str(path)
+
+        def fake_step3(**kw):
+            script = Path(kw["input_file"]).read_text()
+            (tmp_path / "step3" / "podcast_ready_data.jsonl").write_text(script)
+
+        def fake_step4(**kw):
+            path = tmp_path / "step4" / "podcast.wav"
+            path.write_bytes(b"RIFF")
+            return str(path)
+
+        s1.side_effect, s2.side_effect = fake_step1, fake_step2
+        s3.side_effect, s4.side_effect = fake_step3, fake_step4
+
+    def test_style_change_reuses_step1(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        self.fake_steps(tmp_path, s1, s2, s3, s4)
+
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path))[0]
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path))[0]
+        assert (s1.call_count, s2.call_count, s3.call_count, s4.call_count) == (1, 1, 1, 1)
+
+        ok, audio = podcast_processor("doc.pdf", output_dir=str(tmp_path), style="casual")
+
+        assert ok and audio == str(tmp_path / "step4" / "podcast.wav")
+        assert s1.call_count == 1
+        assert (s2.call_count, s3.call_count, s4.call_count, s5.call_count) == (2, 2, 2, 2)
+        assert s2.call_args.kwargs["style"] == "casual"
+
+    def test_tts_provider_change_reruns_step4(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        self.fake_steps(tmp_path, s1, s2, s3, s4)
+        config = copy.deepcopy(base_config)
+        config["Text-To-Speech-Model"]["provider"] = {"name": "openai", "key": "k1"}
+        config_path = tmp_path / "config.json"
+
+        def run():
+            config_path.write_text(json.dumps(config))
+            return podcast_processor("doc.pdf", config_path=str(config_path),
+                                     output_dir=str(tmp_path))
+
+        assert run()[0]
+        config["Text-To-Speech-Model"]["provider"]["key"] = "rotated"
+        assert run()[0]
+        assert s4.call_count == 1  # credentials don't change the audio
+
+        config["Text-To-Speech-Model"]["provider"] = {"name": "custom", "endpoint": "http://tts",
+                                                      "key": "k1"}
+        assert run()[0]
+        assert s4.call_count == 2
+        assert (s1.call_count, s2.call_count, s3.call_count) == (1, 1, 1)
+
+    def test_live_audio_turns_on_preview_without_rerun(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        self.fake_steps(tmp_path, s1, s2, s3, s4)
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path))[0]
+        assert not s4.call_args.kwargs["config"]["Text-To-Speech-Model"].get("progressive")
+
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path), live_audio=True, skip_to=4)[0]
+        assert s4.call_args.kwargs["config"]["Text-To-Speech-Model"]["progressive"] is True
+        assert "progressive" not in base_config["Text-To-Speech-Model"]
+
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path), live_audio=True)[0]
+        assert s4.call_count == 2  # the live file alone doesn't change the stamp
+
+    def test_skip_to_reruns_later_steps(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        self.fake_steps(tmp_path, s1, s2, s3, s4)
+        podcast_processor("doc.pdf", output_dir=str(tmp_path))
+
+        assert podcast_processor("doc.pdf", output_dir=str(tmp_path), skip_to=4)[0]
+
+        assert (s1.call_count, s2.call_count, s3.call_count) == (1, 1, 1)
+        assert s4.call_count == 2
+
+    def test_skip_without_output_fails(self, s1, s2, s3, s4, s5, _v, _p, tmp_path):
+        ok, msg = podcast_processor("doc.pdf", output_dir=str(tmp_path), skip_to=2)
+
+        assert not ok
+        assert msg == "No output files found from Step 1. Cannot skip this step."
+        s2.assert_not_called()
@@ -0,0 +1,114 @@
+"""Tests for segment_manifest — resuming Step 4 after a failure."""
+
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+from unittest.mock import MagicMock, patch
+
+from local_notebooklm.steps.segment_manifest import DONE, FAILED, SegmentManifest
+
+
+def _segment(path, frames=80):
+    sf.write(path, np.zeros(frames), 8000)
+    return path
+
+
+class TestSegmentManifest:
+    def test_records_and_reloads(self, tmp_path):
+        seg = _segment(tmp_path / "podcast_segment_1.wav")
+        manifest = SegmentManifest(tmp_path / "manifest.json")
+        manifest.record(1, "k1", "alloy", seg)
+        manifest.record(2, "k2", "echo", tmp_path / "podcast_segment_2.wav", error=RuntimeError("tts down"))
+
+        reloaded = SegmentManifest(tmp_path / "manifest.json")
+        assert reloaded.entry(1)["status"] == DONE
+        assert reloaded.entry(1)["duration"] == pytest.approx(0.01)
+        assert reloaded.entry(2) == {"segment": 2, "file": "podcast_segment_2.wav", "key": "k2",
+                                     "voice": "echo", "status": FAILED, "error": "tts down"}
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_reusable_only_for_same_key_and_intact_file(self, tmp_path):
+        seg = _segment(tmp_path / "podcast_segment_1.wav")
+        manifest = SegmentManifest(tmp_path / "manifest.json")
+        manifest.record(1, "k1", "alloy", seg)
+
+        assert manifest.reusable(1, "k1", seg)
+        assert not manifest.reusable(1, "edited", seg)
+        assert not manifest.reusable(2, "k1", seg)
+        _segment(seg, frames=40)  # overwritten since
+        assert not manifest.reusable(1, "k1", seg)
+        seg.unlink()
+        assert not manifest.reusable(1, "k1", seg)
+
+    def test_corrupt_or_ignored_manifest_starts_fresh(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json")
+        assert SegmentManifest(path).entry(1) is None
+
+        seg = _segment(tmp_path / "s.wav")
+        SegmentManifest(path).record(1, "k1", "alloy", seg)
+        assert SegmentManifest(path, load=False).entry(1) is None
+
+    def test_retain_drops_segments_beyond_plan(self, tmp_path):
+        manifest = SegmentManifest(tmp_path / "manifest.json")
+        for i in (1, 2, 3):
+            manifest.record(i, f"k{i}", "alloy", _segment(tmp_path / f"s{i}.wav"))
+        manifest.retain(2)
+        manifest.record(1, "k1", "alloy", tmp_path / "s1.wav")
+        segments = json.loads((tmp_path / "manifest.json").read_text())["segments"]
+        assert [s["segment"] for s in segments] == [1, 2]
+
+
+def _config(**tts_extra):
+    return {
+        "Text-To-Speech-Model": {"model": "tts-1", "audio_format": "wav", "cache": False, **tts_extra},
+        "Host-Speaker-Voice": "v1",
+        "Co-Host-Speaker-1-Voice": "v2",
+        "Co-Host-Speaker-2-Voice": "v3",
+        "Co-Host-Speaker-3-Voice": "v4",
+        "Co-Host-Speaker-4-Voice": "v5",
+    }
+
+
+class TestStep4Resume:
+    def _run(self, tmp_path, turns, fail_on=None, **tts_extra):
+        from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns
+        from local_notebooklm.steps.step4 import step4
+
+        write_turns(tmp_path / "podcast_ready_data.jsonl", turns_from_pairs(turns))
+
+        def fake_speech(client, text, voice, model_name, response_format, output_path):
+            if text == fail_on:
+                raise RuntimeError("tts down")
+            sf.write(f"{output_path}.wav", np.full(10, len(text) / 100), 8000)
+
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=fake_speech) as tts:
+            try:
+                step4(client=MagicMock(), config=_config(max_concurrency=1, **tts_extra),
+                      input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+            finally:
+                return sorted(c.kwargs["text"] for c in tts.call_args_list)
+
+    def test_rerun_after_failure_only_synthesizes_the_rest(self, tmp_path):
+        turns = [(f"Speaker {i % 2 + 1}", f"turn {i}") for i in range(4)]
+        assert self._run(tmp_path, turns, fail_on="turn 3") == ["turn 0", "turn 1", "turn 2", "turn 3"]
+        manifest = json.loads((tmp_path / "out" / "segments" / "manifest.json").read_text())
+        assert [s["status"] for s in manifest["segments"]] == [DONE, DONE, DONE, FAILED]
+
+        assert self._run(tmp_path, turns) == ["turn 3"]
+        data, _ = sf.read(tmp_path / "out" / "podcast.wav")
+        assert len(data) == 40
+
+    def test_changed_text_or_voice_is_stale(self, tmp_path):
+        turns = [("Speaker 1", "one"), ("Speaker 2", "two"), ("Speaker 1", "three")]
+        self._run(tmp_path, turns)
+        turns[1] = ("Speaker 2", "two, edited")
+        turns[2] = ("Speaker 3", "three")
+        assert self._run(tmp_path, turns) == ["three", "two, edited"]
+
+    def test_resume_off_resynthesizes(self, tmp_path):
+        turns = [("Speaker 1", "one")]
+        self._run(tmp_path, turns)
+        assert self._run(tmp_path, turns, resume=False) == ["one"]
@@ -0,0 +1,125 @@
+"""Tests for segment_plan — splitting and packing turns into TTS requests."""
+
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+from unittest.mock import MagicMock, patch
+
+from local_notebooklm.steps.segment_plan import (
+    Piece,
+    plan_segments,
+    split_text,
+    turn_timings,
+    write_timing,
+)
+
+VOICES = {"Speaker 1": "alloy", "Speaker 2": "echo", "Speaker 3": "alloy"}
+
+
+class TestSplitText:
+    def test_short_text_untouched(self):
+        assert split_text("  Hello there.  ", 100) == ["Hello there."]
+        assert split_text("   ", 100) == []
+
+    def test_splits_at_sentences_and_repacks(self):
+        text = "One two. Three four! Five six? Seven."
+        assert split_text(text, 20) == ["One two. Three four!", "Five six? Seven."]
+
+    def test_falls_back_to_clauses_words_and_hard_cuts(self):
+        assert split_text("alpha beta, gamma delta, epsilon", 12) == ["alpha beta,", "gamma delta,", "epsilon"]
+        assert split_text("aaaa bbbb cccc", 9) == ["aaaa bbbb", "cccc"]
+        assert split_text("x" * 25, 10) == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_keeps_closing_quotes_and_cjk(self):
+        assert split_text('He said "Stop." Then left.', 16) == ['He said "Stop."', "Then left."]
+        assert split_text("你好。世界。再见。", 7) == ["你好。 世界。", "再见。"]
+
+    def test_pieces_never_exceed_budget(self):
+        text = " ".join(f"Sentence number {i}, with a clause." for i in range(200))
+        pieces = split_text(text, 120)
+        assert all(len(p) <= 120 for p in pieces)
+        assert " ".join(pieces).split() == text.split()
+
+
+class TestPlanSegments:
+    def test_packs_consecutive_same_voice_turns(self):
+        turns = [("Speaker 1", "Right!"), ("Speaker 3", "Exactly."), ("Speaker 2", "Hmm."), ("Speaker 1", "So.")]
+        plan = plan_segments(turns, VOICES.get, max_chars=100)
+        assert [(s.voice, s.text) for s in plan] == [
+            ("alloy", "Right! Exactly."), ("echo", "Hmm."), ("alloy", "So."),
+        ]
+        assert plan[0].pieces == (Piece(0, 6), Piece(1, 8))
+        assert plan[0].turns == [0, 1]
+
+    def test_long_turn_split_and_tail_packed_with_next(self):
+        turns = [("Speaker 1", "A" * 30 + ". " + "B" * 30 + "."), ("Speaker 3", "Short.")]
+        plan = plan_segments(turns, VOICES.get, max_chars=40)
+        assert [s.text for s in plan] == ["A" * 30 + ".", "B" * 30 + ". Short."]
+        assert [s.turns for s in plan] == [[0], [0, 1]]
+
+    def test_disabled_keeps_one_request_per_turn(self):
+        turns = [("Speaker 1", "Right!"), ("Speaker 1", "X" * 5000)]
+        plan = plan_segments(turns, VOICES.get, max_chars=0)
+        assert [s.text for s in plan] == ["Right!", "X" * 5000]
+
+
+class TestTimings:
+    def test_durations_shared_by_characters(self):
+        turns = [("Speaker 1", "aaa"), ("Speaker 1", "b"), ("Speaker 2", "cc")]
+        plan = plan_segments(turns, VOICES.get, max_chars=100)  # [aaa b] [cc]
+        timing = turn_timings(plan, [4.0, 1.0], turns)
+
+        assert timing["segments"] == [
+            {"segment": 1, "start": 0.0, "end": 4.0, "turns": [0, 1]},
+            {"segment": 2, "start": 4.0, "end": 5.0, "turns": [2]},
+        ]
+        assert timing["turns"] == [
+            {"turn": 0, "speaker": "Speaker 1", "start": 0.0, "end": 3.0},
+            {"turn": 1, "speaker": "Speaker 1", "start": 3.0, "end": 4.0},
+            {"turn": 2, "speaker": "Speaker 2", "start": 4.0, "end": 5.0},
+        ]
+
+    def test_split_turn_spans_segments_and_skipped_segments_take_no_time(self):
+        turns = [("Speaker 1", "One. Two."), ("Speaker 2", "Three.")]
+        plan = plan_segments(turns, VOICES.get, max_chars=5)  # [One.] [Two.] [Three.]
+        timing = turn_timings(plan, [1.0, 2.0, None], turns)
+        assert timing["turns"] == [{"turn": 0, "speaker": "Speaker 1", "start": 0.0, "end": 3.0}]
+
+    def test_write_timing_reads_segment_durations(self, tmp_path):
+        turns = [("Speaker 1", "Hi"), ("Speaker 2", "Hello")]
+        plan = plan_segments(turns, VOICES.get)
+        files = []
+        for i, frames in enumerate((8000, 4000), start=1):
+            files.append(tmp_path / f"podcast_segment_{i}.wav")
+            sf.write(files[-1], np.zeros(frames), 8000)
+        path = write_timing(tmp_path / "timing.json", plan, files, turns)
+        ends = [t["end"] for t in json.loads(path.read_text())["turns"]]
+        assert ends == [1.0, 1.5]
+
+
+def test_step4_packs_requests_and_writes_timing(tmp_path):
+    from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns
+    from local_notebooklm.steps.step4 import step4
+
+    turns = [("Speaker 1", "Right!"), ("Speaker 1", "Exactly."), ("Speaker 2", "Indeed.")]
+    write_turns(tmp_path / "podcast_ready_data.jsonl", turns_from_pairs(turns))
+    config = {
+        "Text-To-Speech-Model": {"model": "tts-1", "audio_format": "wav", "cache": False},
+        "Host-Speaker-Voice": "v1",
+        "Co-Host-Speaker-1-Voice": "v2",
+        "Co-Host-Speaker-2-Voice": "v3",
+        "Co-Host-Speaker-3-Voice": "v4",
+        "Co-Host-Speaker-4-Voice": "v5",
+    }
+
+    def fake_speech(client, text, voice, model_name, response_format, output_path):
+        sf.write(f"{output_path}.wav", np.zeros(800 * len(text)), 8000)
+
+    with patch("local_notebooklm.steps.step4.generate_speech", side_effect=fake_speech) as tts:
+        step4(client=MagicMock(), config=config, input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+
+    assert sorted(c.kwargs["text"] for c in tts.call_args_list) == ["Indeed.", "Right! Exactly."]
+    timing = json.loads((tmp_path / "out" / "timing.json").read_text())
+    assert [t["end"] for t in timing["turns"]] == pytest.approx([0.643, 1.5, 2.2], abs=1e-3)
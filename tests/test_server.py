@@ -0,0 +1,66 @@
+"""Tests for the FastAPI server — progressive audio streaming."""
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi.testclient import TestClient
+
+from local_notebooklm import server
+from local_notebooklm.steps.live_audio import LIVE_AUDIO_NAME, read_layout
+
+
+@pytest.fixture
+def client():
+    yield TestClient(server.app)
+    server.job_status.clear()
+
+
+def _live_job(tmp_path, frames=100):
+    step4_dir = tmp_path / "step4"
+    step4_dir.mkdir()
+    sf.write(step4_dir / LIVE_AUDIO_NAME, np.arange(frames, dtype="int16"), 8000, subtype="PCM_16")
+    server.job_status["job"] = {"status": "processing", "output_dir": str(tmp_path)}
+    return step4_dir / LIVE_AUDIO_NAME
+
+
+class TestStreamPodcast:
+    def test_range_on_growing_file(self, client, tmp_path):
+        live = _live_job(tmp_path)
+        size = live.stat().st_size
+
+        resp = client.get("/stream-podcast/job", headers={"Range": "bytes=0-"})
+        assert resp.status_code == 206
+        assert resp.headers["content-range"] == f"bytes 0-{size - 1}/*"
+        assert resp.headers["content-type"] == "audio/wav"
+        assert read_layout(resp.content).data_size == 0xFFFFFFFF
+
+        resp = client.get("/stream-podcast/job", headers={"Range": f"bytes={size - 4}-{size + 100}"})
+        assert resp.status_code == 206
+        assert resp.content == live.read_bytes()[-4:]
+
+        resp = client.get("/stream-podcast/job", headers={"Range": f"bytes={size}-"})
+        assert resp.status_code == 416
+
+    def test_follow_until_job_finishes(self, client, tmp_path, monkeypatch):
+        _live_job(tmp_path)
+        original = server.follow
+
+        def follow_then_finish(path, finished, **kwargs):
+            server.job_status["job"]["status"] = "completed"  # finish as soon as streaming starts
+            return original(path, finished, poll_interval=0.01)
+
+        monkeypatch.setattr(server, "follow", follow_then_finish)
+        resp = client.get("/stream-podcast/job")
+        layout = read_layout(resp.content)
+        assert np.array_equal(np.frombuffer(resp.content[layout.data_offset:], dtype="<i2"),
+                              np.arange(100, dtype="int16"))
+
+    def test_not_started_and_unknown(self, client, tmp_path):
+        server.job_status["job"] = {"status": "processing", "output_dir": str(tmp_path)}
+        resp = client.get("/stream-podcast/job")
+        assert resp.status_code == 404 and resp.headers["retry-after"] == "2"
+        assert client.get("/stream-podcast/nope").status_code == 404
+
+    def test_status_advertises_stream(self, client, tmp_path):
+        _live_job(tmp_path)
+        assert client.get("/job-status/job").json()["stream_url"] == "/stream-podcast/job"
@@ -178,3 +178,63 @@ class TestStep1Integration:
         # Order matters: A before B before C
         assert content.index("CLEANED_A") < content.index("CLEANED_B")
         assert content.index("CLEANED_B") < content.index("CLEANED_C")
+
+    @patch("local_notebooklm.steps.step1.generate_text")
+    @patch("local_notebooklm.steps.step1.load_input")
+    def test_stream_receives_chunks_in_order(self, mock_load, mock_gen, tmp_path):
+        """Subscribers see each cleaned chunk in document order, then close."""
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        mock_load.return_value = "aaa " * 40 + "bbb " * 40 + "ccc " * 40
+
+        def side_effect(**kwargs):
+            chunk = kwargs["messages"][0]["content"]
+            for tag in ("aaa", "bbb", "ccc"):
+                if tag in chunk:
+                    return f"CLEANED_{tag}"
+
+        mock_gen.side_effect = side_effect
+        config = {
+            "Step1": {"max_chars": 10000, "chunk_size": 60, "max_tokens": 512, "temperature": 0.7},
+            "Small-Text-Model": {"model": "test"},
+        }
+        stream = OrderedStream()
+        step1(
+            input_path="dummy.txt",
+            client=MagicMock(),
+            config=config,
+            output_dir=str(tmp_path),
+            stream=stream,
+        )
+        items = list(stream)
+        assert stream.closed
+        tags = [item[-3:] for item in items]
+        assert tags == sorted(tags)  # aaa... then bbb... then ccc...
+        assert set(tags) == {"aaa", "bbb", "ccc"}
+
+    @patch("local_notebooklm.steps.step1.generate_text")
+    @patch("local_notebooklm.steps.step1.load_input")
+    def test_failed_chunk_closes_stream_and_removes_output(self, mock_load, mock_gen, tmp_path):
+        from local_notebooklm.steps.helpers import OrderedStream
+
+        mock_load.return_value = "aaa " * 40 + "bbb " * 40
+        mock_gen.side_effect = lambda **kw: (
+            "ok" if "aaa" in kw["messages"][0]["content"] else (_ for _ in ()).throw(RuntimeError("down"))
+        )
+        config = {
+            "Step1": {"max_chars": 10000, "chunk_size": 60, "max_tokens": 512, "temperature": 0.7},
+            "Small-Text-Model": {"model": "test"},
+        }
+        stream = OrderedStream()
+        with pytest.raises(ChunkProcessingError):
+            step1(
+                input_path="dummy.txt",
+                client=MagicMock(),
+                config=config,
+                output_dir=str(tmp_path),
+                stream=stream,
+            )
+        assert stream.closed
+        with pytest.raises(ChunkProcessingError):
+            list(stream)
+        assert not (tmp_path / "clean_extracted_text.txt").exists()
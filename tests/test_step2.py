@@ -1,15 +1,19 @@
 """Tests for step2 — transcript generation from cleaned text."""
 
-import pickle
 import pytest
 from unittest.mock import MagicMock, patch, call
 
+from local_notebooklm.steps.artifacts import read_turns
 from local_notebooklm.steps.step2 import (
     FileReadError,
+    InvalidParameterError,
+    REDUCE_SEPARATOR,
     TranscriptError,
     TranscriptGenerationError,
     generate_transcript,
+    generate_transcript_map_reduce,
     read_input_file,
+    split_with_overlap,
     step2,
 )
 
@@ -203,6 +207,121 @@ class TestGenerateTranscript:
         assert mock_gen.call_count > 2
 
 
+# ---------------------------------------------------------------------------
+# TestMapReduce
+# ---------------------------------------------------------------------------
+
+def _map_reduce_side_effect(**kwargs):
+    """Echo the segment number for map calls; return framing for the reduce call."""
+    system = kwargs["messages"][0]["content"]
+    if "lead writer" in system:
+        return f"Speaker 1: Welcome!\n{REDUCE_SEPARATOR}\nSpeaker 1: Goodbye!"
+    return f"Speaker 2: body for {kwargs['messages'][1]['content'][:5]}"
+
+
+class TestMapReduce:
+    def test_split_with_overlap_covers_text(self):
+        chunks = split_with_overlap("abcdefghij", 4, 1)
+        assert chunks[0] == "abcd"
+        assert chunks[-1].endswith("j")
+        assert all(len(c) <= 4 for c in chunks)
+
+    @patch("local_notebooklm.steps.step2.generate_text")
+    def test_segments_ordered_between_intro_and_outro(self, mock_gen):
+        mock_gen.side_effect = _map_reduce_side_effect
+        result = generate_transcript_map_reduce(
+            client=MagicMock(),
+            model_name="m",
+            chunks=["AAAAA", "BBBBB", "CCCCC"],
+            length="long",
+            style="normal",
+            format_type="podcast",
+            preference_text="nothing",
+            max_tokens=100,
+            temperature=0.7,
+            max_workers=3,
+        )
+        lines = result.splitlines()
+        assert lines[0] == "Speaker 1: Welcome!"
+        assert lines[-1] == "Speaker 1: Goodbye!"
+        assert lines[1:4] == [
+            "Speaker 2: body for AAAAA",
+            "Speaker 2: body for BBBBB",
+            "Speaker 2: body for CCCCC",
+        ]
+        assert REDUCE_SEPARATOR not in result
+        assert mock_gen.call_count == 4  # 3 map + 1 reduce
+
+    @patch("local_notebooklm.steps.step2.wait_for_next_step")
+    @patch("local_notebooklm.steps.step2.generate_text")
+    @patch("local_notebooklm.steps.step2.time.sleep")
+    def test_map_reduce_mode_skips_inter_chunk_sleep(self, mock_sleep, mock_gen, mock_wait):
+        mock_gen.side_effect = _map_reduce_side_effect
+        generate_transcript(
+            client=MagicMock(),
+            model_name="test-model",
+            input_text="B" * 500,
+            length="medium",
+            style="normal",
+            format_type="podcast",
+            preference_text="nothing",
+            system_prompt=None,
+            max_tokens=4096,
+            temperature=0.7,
+            chunk_token_limit=10,
+            overlap_percent=10,
+            mode="map_reduce",
+        )
+        mock_sleep.assert_not_called()
+
+    @patch("local_notebooklm.steps.step2.wait_for_next_step")
+    @patch("local_notebooklm.steps.step2.generate_text")
+    def test_map_reduce_chunk_count_configurable(self, mock_gen, mock_wait):
+        mock_gen.side_effect = _map_reduce_side_effect
+        generate_transcript(
+            client=MagicMock(),
+            model_name="test-model",
+            input_text="B" * 500,
+            length="medium",
+            style="normal",
+            format_type="podcast",
+            preference_text="nothing",
+            system_prompt=None,
+            max_tokens=4096,
+            temperature=0.7,
+            chunk_token_limit=100,  # 350 chars: two segments without num_chunks
+            overlap_percent=10,
+            mode="map_reduce",
+            num_chunks=4,
+        )
+        assert mock_gen.call_count == 5  # 4 segments + reduce
+        segments = [c.kwargs["messages"][1]["content"] for c in mock_gen.call_args_list[:-1]]
+        assert "".join(segments) == "B" * 500  # disjoint despite overlap_percent
+
+    @patch("local_notebooklm.steps.step2.generate_text")
+    def test_map_failure_raises(self, mock_gen):
+        mock_gen.side_effect = RuntimeError("down")
+        with pytest.raises(TranscriptGenerationError, match="map-reduce"):
+            generate_transcript_map_reduce(
+                client=MagicMock(), model_name="m", chunks=["a", "b"],
+                length="long", style="normal", format_type="podcast",
+                preference_text="", max_tokens=10, temperature=0.5,
+            )
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        input_file = tmp_path / "input.txt"
+        input_file.write_text("content", encoding="utf-8")
+        config = _make_config()
+        config["Step2"]["mode"] = "bogus"
+        with pytest.raises(InvalidParameterError, match="bogus"):
+            step2(
+                client=MagicMock(),
+                config=config,
+                input_file=str(input_file),
+                output_dir=str(tmp_path / "out"),
+            )
+
+
 # ---------------------------------------------------------------------------
 # TestStep2Integration
 # ---------------------------------------------------------------------------
@@ -226,13 +345,13 @@ class TestStep2Integration:
 
         input_path, output_path = result
         assert str(input_file) == input_path
-        assert output_path.endswith(".pkl")
+        assert output_path.endswith(".jsonl")
 
-        # Verify pkl file
-        assert (output_dir / "data.pkl").exists()
-        with open(output_dir / "data.pkl", "rb") as f:
-            saved = pickle.load(f)
-        assert "Speaker 1" in saved
+        # Verify structured artifact
+        saved = read_turns(output_dir / "data.jsonl")
+        assert [t.speaker for t in saved] == ["Speaker 1", "Speaker 2"]
+        assert saved[0].text == "Welcome"
+        assert not (output_dir / "data.pkl").exists()
 
         # Verify txt file
         assert (output_dir / "data.txt").exists()
@@ -257,7 +376,7 @@ class TestStep2Integration:
         )
 
         assert output_dir.exists()
-        assert (output_dir / "data.pkl").exists()
+        assert (output_dir / "data.jsonl").exists()
 
     def test_missing_input_file_raises(self, tmp_path):
         with pytest.raises(FileReadError, match="not found"):
@@ -0,0 +1,164 @@
+"""Tests for step23 — fused Step 2+3 generation of TTS-ready turns."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from local_notebooklm.pipeline import Node, Pipeline
+from local_notebooklm.processor import _branch_result, branch_nodes, skip_to_sets
+from local_notebooklm.steps.artifacts import (
+    SCRIPT_KIND,
+    TRANSCRIPT_KIND,
+    read_header,
+    read_turns,
+    turns_from_text,
+    write_turns,
+)
+from local_notebooklm.steps.step2 import InvalidParameterError as Step2InvalidParameterError, step2
+from local_notebooklm.steps.step23 import (
+    FileReadError,
+    InvalidParameterError,
+    promote_script,
+    step23,
+)
+
+TURNS = "[('Speaker 1', 'Welcome to the show'), ('Speaker 2', 'Glad to be here')]"
+
+
+def _make_config(**step2_extra):
+    return {
+        "Big-Text-Model": {"model": "test-model"},
+        "Step1": {"temperature": 0.7},
+        "Step2": {"max_tokens": 4096, "temperature": 1, "mode": "fused", **step2_extra},
+        "Step3": {"max_tokens": 4096},
+    }
+
+
+def _run(tmp_path, text="Source document about tides.", config=None, **kwargs):
+    input_file = tmp_path / "clean.txt"
+    input_file.write_text(text, encoding="utf-8")
+    return step23(
+        client=MagicMock(),
+        config=config or _make_config(),
+        input_file=str(input_file),
+        step2_dir=str(tmp_path / "step2"),
+        step3_dir=str(tmp_path / "step3"),
+        **kwargs,
+    )
+
+
+@patch("local_notebooklm.steps.step3.wait_for_next_step")
+@patch("local_notebooklm.steps.step3.generate_text")
+class TestStep23:
+    def test_one_call_writes_both_steps(self, mock_gen, mock_wait, tmp_path):
+        mock_gen.return_value = TURNS
+
+        step2_file, step3_stem = _run(tmp_path, language="french")
+
+        assert mock_gen.call_count == 1
+        system = mock_gen.call_args.kwargs["messages"][0]["content"]
+        assert "podcast writer" in system
+        assert "ready-to-record version in french" in system
+        assert read_header(step2_file)["kind"] == SCRIPT_KIND
+        assert (tmp_path / "step2" / "data.txt").read_text() == (
+            "Speaker 1: Welcome to the show\nSpeaker 2: Glad to be here"
+        )
+        saved = read_turns(step3_stem + ".jsonl")
+        assert [t.as_tuple() for t in saved] == [
+            ("Speaker 1", "Welcome to the show"), ("Speaker 2", "Glad to be here"),
+        ]
+        assert "Speaker 2" in (tmp_path / "step3" / "podcast_ready_data.txt").read_text()
+
+    def test_custom_system_prompt_keeps_output_rules(self, mock_gen, mock_wait, tmp_path):
+        mock_gen.return_value = TURNS
+        _run(tmp_path, system_prompt="You write radio plays.")
+        system = mock_gen.call_args.kwargs["messages"][0]["content"]
+        assert system.startswith("You write radio plays.")
+        assert "Python list of tuples" in system
+
+    def test_long_input_is_chunked(self, mock_gen, mock_wait, tmp_path):
+        mock_gen.side_effect = [
+            "[('Speaker 1', 'Part one'), ('Speaker 2', 'Right')]",
+            "[('Speaker 1', 'Part two'), ('Speaker 2', 'Indeed')]",
+        ]
+        config = _make_config(chunk_token_limit=20, overlap_percent=0)
+        _, step3_stem = _run(tmp_path, text="x" * 120, config=config)
+
+        assert mock_gen.call_count == 2
+        texts = [t.text for t in read_turns(step3_stem + ".jsonl")]
+        assert texts == ["Part one", "Right", "Part two", "Indeed"]
+
+    def test_missing_input_raises(self, mock_gen, mock_wait, tmp_path):
+        with pytest.raises(FileReadError, match="not found"):
+            step23(client=MagicMock(), config=_make_config(), input_file=str(tmp_path / "nope.txt"),
+                   step2_dir=str(tmp_path / "s2"), step3_dir=str(tmp_path / "s3"))
+
+    def test_unknown_step3_mode(self, mock_gen, mock_wait, tmp_path):
+        config = _make_config()
+        config["Step3"]["mode"] = "parallel"
+        with pytest.raises(InvalidParameterError, match="Step3 mode"):
+            _run(tmp_path, config=config)
+
+
+class TestPromoteScript:
+    def test_script_artifact_promoted(self, tmp_path):
+        src = write_turns(tmp_path / "data.jsonl", turns_from_text("Speaker 1: Hi\nSpeaker 2: Hey"),
+                          kind=SCRIPT_KIND)
+        stem = promote_script(str(src), str(tmp_path / "step3"))
+        assert [t.as_tuple() for t in read_turns(stem + ".jsonl")] == [
+            ("Speaker 1", "Hi"), ("Speaker 2", "Hey"),
+        ]
+
+    def test_free_form_transcript_not_promoted(self, tmp_path):
+        src = write_turns(tmp_path / "data.jsonl", turns_from_text("Speaker 1: Hi"), kind=TRANSCRIPT_KIND)
+        assert promote_script(str(src), str(tmp_path / "step3")) is None
+        assert promote_script(str(tmp_path / "data.pkl"), str(tmp_path / "step3")) is None
+
+
+def test_step2_rejects_fused_mode(tmp_path):
+    with pytest.raises(Step2InvalidParameterError, match="step23"):
+        step2(client=MagicMock(), config=_make_config(), input_file="unused.txt",
+              output_dir=str(tmp_path))
+
+
+@patch("local_notebooklm.processor.step5")
+@patch("local_notebooklm.processor.step4", return_value="podcast.wav")
+@patch("local_notebooklm.processor.step3")
+@patch("local_notebooklm.processor.step2")
+class TestProcessorFusedBranch:
+    def _branch(self, tmp_path, skip_to=None):
+        dirs = {f"step{i}": tmp_path / f"step{i}" for i in range(2, 6)}
+        for d in dirs.values():
+            d.mkdir(parents=True, exist_ok=True)
+        clean = str(tmp_path / "clean.txt")
+        nodes = [Node("step1", run=lambda inputs: clean, discover=lambda: clean)]
+        nodes += branch_nodes(
+            _make_config(), (MagicMock(), MagicMock(), MagicMock()),
+            {"step2": None, "step3": None}, dirs,
+            "podcast", "short", "normal", "nothing", "english",
+            outputs=["Podcast Audio"], skip_to=skip_to,
+        )
+        pipeline = Pipeline(nodes, tmp_path / ".stamps")
+        force, reuse = skip_to_sets(pipeline.nodes, skip_to)
+        success, result = _branch_result(pipeline.run(force=force, reuse=reuse))
+        assert success, result
+        return result
+
+    @patch("local_notebooklm.processor.step23", return_value=("data.jsonl", "podcast_ready_data"))
+    def test_fused_replaces_steps_2_and_3(self, s23, s2, s3, s4, s5, tmp_path):
+        assert self._branch(tmp_path) == "podcast.wav"
+        s23.assert_called_once()
+        s2.assert_not_called()
+        s3.assert_not_called()
+
+    def test_skip_to_3_promotes_script(self, s2, s3, s4, s5, tmp_path):
+        (tmp_path / "step2").mkdir()
+        write_turns(tmp_path / "step2" / "data.jsonl", turns_from_text("Speaker 1: Hi"), kind=SCRIPT_KIND)
+        self._branch(tmp_path, skip_to=3)
+        s3.assert_not_called()
+        assert (tmp_path / "step3" / "podcast_ready_data.jsonl").exists()
+
+    def test_skip_to_3_runs_step3_for_free_form(self, s2, s3, s4, s5, tmp_path):
+        (tmp_path / "step2").mkdir()
+        write_turns(tmp_path / "step2" / "data.jsonl", turns_from_text("Speaker 1: Hi"), kind=TRANSCRIPT_KIND)
+        self._branch(tmp_path, skip_to=3)
+        s3.assert_called_once()
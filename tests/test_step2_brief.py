@@ -0,0 +1,133 @@
+"""Tests for step2_brief — hierarchical summarization of long inputs."""
+
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from local_notebooklm.steps.step2 import step2
+from local_notebooklm.steps.step2_brief import (
+    SummarizationError,
+    build_document_brief,
+)
+
+
+def _summary_side_effect(**kwargs):
+    """Every summary call returns a short fixed-size string tagged by kind."""
+    system = kwargs["messages"][0]["content"]
+    kind = "merge" if "combining" in system else "section"
+    return f"{kind} summary " + "x" * 40
+
+
+def _long_text(words=2000):
+    return " ".join(f"word{i}" for i in range(words))
+
+
+class TestBuildDocumentBrief:
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_short_text_returned_unchanged(self, mock_gen):
+        result = build_document_brief(MagicMock(), "m", "short text", brief_chars=100)
+        assert result == "short text"
+        mock_gen.assert_not_called()
+
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_builds_levels_until_within_budget(self, mock_gen, tmp_path):
+        mock_gen.side_effect = _summary_side_effect
+        text = _long_text()
+        brief = build_document_brief(
+            MagicMock(), "m", text,
+            cache_dir=str(tmp_path),
+            section_chars=1000,
+            fan_in=4,
+            brief_chars=200,
+        )
+        assert len(brief) <= 200
+        assert "merge summary" in brief
+        assert (tmp_path / "level_1.json").exists()
+        assert (tmp_path / "level_2.json").exists()
+
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_call_count_is_sections_plus_merges(self, mock_gen):
+        mock_gen.side_effect = _summary_side_effect
+        text = _long_text()
+        build_document_brief(MagicMock(), "m", text, section_chars=1000, fan_in=4, brief_chars=200)
+        section_calls = sum(
+            1 for c in mock_gen.call_args_list
+            if "condensing" in c.kwargs["messages"][0]["content"]
+        )
+        merge_calls = mock_gen.call_count - section_calls
+        # Merges shrink the tree by fan_in per level
+        assert merge_calls <= section_calls // 3 + 2
+
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_cache_reused_on_second_run(self, mock_gen, tmp_path):
+        mock_gen.side_effect = _summary_side_effect
+        text = _long_text()
+        kwargs = dict(cache_dir=str(tmp_path), section_chars=1000, fan_in=4, brief_chars=200)
+        first = build_document_brief(MagicMock(), "m", text, **kwargs)
+        calls = mock_gen.call_count
+        second = build_document_brief(MagicMock(), "m", text, **kwargs)
+        assert second == first
+        assert mock_gen.call_count == calls
+
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_cache_misses_for_other_model_or_format(self, mock_gen, tmp_path):
+        mock_gen.side_effect = _summary_side_effect
+        text = _long_text()
+        kwargs = dict(cache_dir=str(tmp_path), section_chars=1000, fan_in=4, brief_chars=200)
+        build_document_brief(MagicMock(), "m", text, **kwargs)
+        calls = mock_gen.call_count
+        build_document_brief(MagicMock(), "other-model", text, **kwargs)
+        assert mock_gen.call_count == 2 * calls
+        build_document_brief(MagicMock(), "m", text, format_type="lecture", **kwargs)
+        assert mock_gen.call_count == 3 * calls
+
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_corrupt_cache_ignored(self, mock_gen, tmp_path):
+        mock_gen.side_effect = _summary_side_effect
+        (tmp_path / "level_1.json").write_text("{not json")
+        brief = build_document_brief(
+            MagicMock(), "m", _long_text(), cache_dir=str(tmp_path),
+            section_chars=1000, brief_chars=200,
+        )
+        assert brief
+        json.loads((tmp_path / "level_1.json").read_text())
+
+    @patch("local_notebooklm.steps.step2_brief.generate_text", side_effect=RuntimeError("down"))
+    def test_llm_failure_wrapped(self, mock_gen):
+        with pytest.raises(SummarizationError, match="document brief"):
+            build_document_brief(MagicMock(), "m", _long_text(), section_chars=1000, brief_chars=200)
+
+    def test_fan_in_must_merge(self):
+        with pytest.raises(SummarizationError, match="fan_in"):
+            build_document_brief(MagicMock(), "m", _long_text(), brief_chars=10, fan_in=1)
+
+
+class TestStep2UsesBrief:
+    @patch("local_notebooklm.steps.step2.wait_for_next_step")
+    @patch("local_notebooklm.steps.step2.generate_text")
+    @patch("local_notebooklm.steps.step2_brief.generate_text")
+    def test_brief_feeds_transcript(self, mock_brief_gen, mock_gen, mock_wait, tmp_path):
+        mock_brief_gen.side_effect = _summary_side_effect
+        mock_gen.return_value = "Speaker 1: Hello"
+
+        input_file = tmp_path / "input.txt"
+        input_file.write_text(_long_text(), encoding="utf-8")
+        config = {
+            "Big-Text-Model": {"model": "test-model"},
+            "Step2": {
+                "max_tokens": 4096,
+                "temperature": 0.7,
+                "brief_threshold_chars": 5000,
+                "brief_section_chars": 1000,
+                "brief_chars": 1500,
+            },
+        }
+        step2(client=MagicMock(), config=config, input_file=str(input_file),
+              output_dir=str(tmp_path / "out"))
+
+        brief = (tmp_path / "out" / "document_brief.txt").read_text()
+        assert len(brief) <= 1500
+        sent = mock_gen.call_args.kwargs["messages"][1]["content"]
+        assert sent == brief
+        assert {c.kwargs["max_tokens"] for c in mock_brief_gen.call_args_list} == {4096}
+        assert {c.kwargs["temperature"] for c in mock_brief_gen.call_args_list} == {0.7}
@@ -4,13 +4,19 @@ import pickle
 import pytest
 from unittest.mock import MagicMock, patch
 
+from local_notebooklm.steps.artifacts import TRANSCRIPT_KIND, read_turns, turns_from_text, write_turns
+from local_notebooklm.steps.helpers import StructuredOutputError, llm_stats
 from local_notebooklm.steps.step3 import (
     FileReadError,
+    InvalidParameterError,
     TranscriptError,
     TranscriptGenerationError,
+    build_outline,
     generate_rewritten_transcript,
+    generate_rewritten_transcript_concurrent,
     generate_rewritten_transcript_with_overlap,
     read_pickle_file,
+    smooth_seams,
     step3,
     validate_transcript_format,
 )
@@ -66,6 +72,12 @@ class TestReadPickleFile:
         with pytest.raises(FileReadError, match="not found"):
             read_pickle_file("/nonexistent/file.pkl")
 
+    def test_refuses_pickled_objects(self, tmp_path):
+        p = tmp_path / "evil.pkl"
+        _write_pkl(p, MagicMock)
+        with pytest.raises(FileReadError, match="Refusing"):
+            read_pickle_file(str(p))
+
     def test_corrupt_pickle(self, tmp_path):
         p = tmp_path / "bad.pkl"
         p.write_bytes(b"not a valid pickle at all")
@@ -299,6 +311,106 @@ class TestGenerateRewrittenTranscriptWithOverlap:
             )
 
 
+class TestSmoothSeams:
+    def test_drops_repeated_leading_turns(self):
+        parts = [
+            [("Speaker 1", "Welcome to the show."), ("Speaker 2", "Today we cover neural networks in depth.")],
+            [("Speaker 2", "Today we cover neural networks in depth!"), ("Speaker 1", "Let's start with layers.")],
+        ]
+        assert smooth_seams(parts) == [
+            ("Speaker 1", "Welcome to the show."),
+            ("Speaker 2", "Today we cover neural networks in depth."),
+            ("Speaker 1", "Let's start with layers."),
+        ]
+
+    def test_merges_same_speaker_across_seam(self):
+        parts = [
+            [("Speaker 1", "Hi"), ("Speaker 2", "First point.")],
+            [("Speaker 2", "And a second point."), ("Speaker 1", "Nice.")],
+        ]
+        result = smooth_seams(parts)
+        assert result[1] == ("Speaker 2", "First point. And a second point.")
+        assert len(result) == 3
+
+    def test_keeps_distinct_turns(self):
+        parts = [[("Speaker 1", "Alpha beta gamma delta")], [("Speaker 2", "Epsilon zeta eta theta")]]
+        assert len(smooth_seams(parts)) == 2
+
+    def test_single_part_unchanged(self):
+        part = [("Speaker 1", "a"), ("Speaker 1", "a")]
+        assert smooth_seams([part]) == part
+
+
+class TestConcurrentRewrite:
+    def test_outline_is_deterministic(self):
+        chunks = ["First idea here. More text.", "Second   idea\nhere! Rest."]
+        assert build_outline(chunks) == "1. First idea here.\n2. Second idea here!"
+        assert build_outline(chunks) == build_outline(list(chunks))
+
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text")
+    def test_chunks_use_source_context_and_keep_order(self, mock_gen, mock_wait):
+        def fake(**kwargs):
+            user = kwargs["messages"][1]["content"]
+            part = user.split("This is part ")[1].split(" ")[0]
+            return f"[('Speaker 1', 'Turn from part {part} alpha'), ('Speaker 2', 'Reply in part {part} beta')]"
+
+        mock_gen.side_effect = fake
+        text = "A" * 100 + "B" * 100 + "C" * 50
+        result = generate_rewritten_transcript_concurrent(
+            client=MagicMock(),
+            model_name="m",
+            input_text=text,
+            max_tokens=100,
+            temperature=0.7,
+            format_type="podcast",
+            system_prompt=None,
+            language="english",
+            chunk_size=100,
+            overlap_percent=10,
+        )
+
+        assert mock_gen.call_count == 3
+        prompts = sorted(c.kwargs["messages"][1]["content"] for c in mock_gen.call_args_list)
+        # Middle chunk sees the tail of the first and head of the last source chunk
+        middle = next(p for p in prompts if p.startswith("B"))
+        assert "A" * 10 in middle and "C" * 10 in middle
+        assert "Turn from part" not in middle  # no previous output in the prompt
+        parts = [int(t.split("part ")[1].split(" ")[0]) for t in result.split("'") if "part " in t]
+        assert parts == sorted(parts)
+
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text", side_effect=RuntimeError("down"))
+    def test_failure_wrapped(self, mock_gen, mock_wait):
+        with pytest.raises(TranscriptGenerationError, match="concurrent"):
+            generate_rewritten_transcript_concurrent(
+                client=MagicMock(), model_name="m", input_text="x" * 300,
+                max_tokens=100, temperature=0.7, format_type="podcast",
+                system_prompt=None, language="english", chunk_size=100,
+            )
+
+    @patch("local_notebooklm.steps.step3.generate_rewritten_transcript_concurrent")
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    def test_step3_selects_concurrent_mode(self, mock_wait, mock_conc, tmp_path):
+        mock_conc.return_value = VALID_TRANSCRIPT
+        input_pkl = tmp_path / "data.pkl"
+        _write_pkl(input_pkl, "X" * 10000)
+        config = _make_config()
+        config["Step3"]["mode"] = "concurrent"
+
+        step3(client=MagicMock(), config=config, input_file=str(input_pkl),
+              output_dir=str(tmp_path / "out"))
+
+        mock_conc.assert_called_once()
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        config = _make_config()
+        config["Step3"]["mode"] = "bogus"
+        with pytest.raises(InvalidParameterError, match="mode"):
+            step3(client=MagicMock(), config=config, input_file="x.pkl",
+                  output_dir=str(tmp_path))
+
+
 # ---------------------------------------------------------------------------
 # TestStep3Integration
 # ---------------------------------------------------------------------------
@@ -323,12 +435,10 @@ class TestStep3Integration:
 
         input_path, output_path = result
 
-        # Verify pkl output
-        pkl_path = output_dir / "podcast_ready_data.pkl"
-        assert pkl_path.exists()
-        with open(pkl_path, "rb") as f:
-            saved = pickle.load(f)
-        assert "Speaker 1" in saved
+        # Verify structured artifact
+        saved = read_turns(output_dir / "podcast_ready_data.jsonl")
+        assert saved and saved[0].speaker == "Speaker 1"
+        assert not (output_dir / "podcast_ready_data.pkl").exists()
 
         # Verify txt output
         txt_path = output_dir / "podcast_ready_data.txt"
@@ -381,6 +491,23 @@ class TestStep3Integration:
                 output_dir=str(output_dir),
             )
 
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text")
+    def test_reads_jsonl_artifact(self, mock_gen, mock_wait, tmp_path):
+        mock_gen.return_value = VALID_TRANSCRIPT
+        input_jsonl = tmp_path / "data.jsonl"
+        write_turns(input_jsonl, turns_from_text("Speaker 1: Hello\nSpeaker 2: Hi"), kind=TRANSCRIPT_KIND)
+
+        step3(
+            client=MagicMock(),
+            config=_make_config(),
+            input_file=str(input_jsonl),
+            output_dir=str(tmp_path / "out"),
+        )
+
+        sent = mock_gen.call_args.kwargs["messages"][1]["content"]
+        assert sent == "Speaker 1: Hello\nSpeaker 2: Hi"
+
     def test_missing_input_file_raises(self, tmp_path):
         with pytest.raises(FileReadError, match="not found"):
             step3(
@@ -407,7 +534,7 @@ class TestStep3Integration:
         )
 
         assert output_dir.exists()
-        assert (output_dir / "podcast_ready_data.pkl").exists()
+        assert (output_dir / "podcast_ready_data.jsonl").exists()
 
     @patch("local_notebooklm.steps.step3.wait_for_next_step")
     @patch("local_notebooklm.steps.step3.generate_text")
@@ -471,3 +598,85 @@ class TestStep3Integration:
         call_args = mock_gen.call_args
         messages = call_args.kwargs.get("messages") or call_args[1].get("messages")
         assert "podcast" in messages[0]["content"].lower()
+
+
+class TestStructuredOutput:
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text")
+    @patch("local_notebooklm.steps.step3.generate_structured")
+    def test_structured_turns_skip_text_parsing(self, mock_struct, mock_gen, mock_wait, tmp_path):
+        mock_struct.return_value = {"turns": [
+            {"speaker": "speaker1", "text": "It's structured"},
+            {"speaker": "Speaker 2", "text": "No fix-up needed"},
+        ]}
+        input_jsonl = tmp_path / "data.jsonl"
+        write_turns(input_jsonl, turns_from_text("Speaker 1: Hello"), kind=TRANSCRIPT_KIND)
+
+        step3(client=MagicMock(), config=_make_config(),
+              input_file=str(input_jsonl), output_dir=str(tmp_path / "out"))
+
+        mock_gen.assert_not_called()
+        saved = read_turns(tmp_path / "out" / "podcast_ready_data.jsonl")
+        assert [t.as_tuple() for t in saved] == [
+            ("Speaker 1", "It's structured"), ("Speaker 2", "No fix-up needed"),
+        ]
+        kwargs = mock_struct.call_args.kwargs
+        assert kwargs["mode"] == "auto"
+        assert "JSON object" in kwargs["messages"][0]["content"]
+
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text")
+    @patch("local_notebooklm.steps.step3.generate_structured", return_value=None)
+    def test_unsupported_falls_back_and_counts_fixups(self, mock_struct, mock_gen, mock_wait, tmp_path):
+        mock_gen.side_effect = ["not tuple format", VALID_TRANSCRIPT]
+        input_pkl = tmp_path / "data.pkl"
+        _write_pkl(input_pkl, "raw input text")
+        calls, fixups = llm_stats.get("step3", "calls"), llm_stats.get("step3", "fixup")
+
+        step3(client=MagicMock(), config=_make_config(),
+              input_file=str(input_pkl), output_dir=str(tmp_path / "out"))
+
+        assert mock_gen.call_count == 2
+        assert llm_stats.get("step3", "calls") == calls + 1
+        assert llm_stats.get("step3", "fixup") == fixups + 1
+
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text")
+    @patch("local_notebooklm.steps.step3.generate_structured")
+    def test_malformed_structured_reply_repaired_locally(self, mock_struct, mock_gen, mock_wait, tmp_path):
+        mock_struct.side_effect = StructuredOutputError("not JSON", raw=(
+            '{"turns": [{"speaker": "Speaker 1", "text": "Cut short"}, {"speaker": "Speaker 2", "te'
+        ))
+        input_pkl = tmp_path / "data.pkl"
+        _write_pkl(input_pkl, "raw input text")
+        fixups = llm_stats.get("step3", "structured_fixup")
+
+        step3(client=MagicMock(), config=_make_config(),
+              input_file=str(input_pkl), output_dir=str(tmp_path / "out"))
+
+        mock_gen.assert_not_called()
+        assert mock_struct.call_count == 1
+        assert llm_stats.get("step3", "structured_fixup") == fixups + 1
+        saved = read_turns(tmp_path / "out" / "podcast_ready_data.jsonl")
+        assert [t.as_tuple() for t in saved] == [("Speaker 1", "Cut short")]
+
+    @patch("local_notebooklm.steps.step3.wait_for_next_step")
+    @patch("local_notebooklm.steps.step3.generate_text", return_value=VALID_TRANSCRIPT)
+    @patch("local_notebooklm.steps.step3.generate_structured")
+    def test_off_skips_structured_call(self, mock_struct, mock_gen, mock_wait, tmp_path):
+        config = _make_config()
+        config["Big-Text-Model"]["structured_output"] = "off"
+        input_pkl = tmp_path / "data.pkl"
+        _write_pkl(input_pkl, "raw input text")
+
+        step3(client=MagicMock(), config=config,
+              input_file=str(input_pkl), output_dir=str(tmp_path / "out"))
+
+        mock_struct.assert_not_called()
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        config = _make_config()
+        config["Big-Text-Model"]["structured_output"] = "xml"
+        with pytest.raises(InvalidParameterError, match="structured_output"):
+            step3(client=MagicMock(), config=config,
+                  input_file="unused.jsonl", output_dir=str(tmp_path / "out"))
@@ -104,6 +104,20 @@ class TestLoadPodcastData:
         assert len(result) == 2
         assert result[0] == ("Speaker 1", "Hello")
 
+    def test_pickled_turn_list(self, tmp_path):
+        import pickle
+
+        pkl_path = tmp_path / "data.pkl"
+        pkl_path.write_bytes(pickle.dumps([("Speaker 1", "Hello"), ("Speaker 2", "Hi there")]))
+        assert load_podcast_data(pkl_path) == [("Speaker 1", "Hello"), ("Speaker 2", "Hi there")]
+
+    def test_valid_jsonl(self, tmp_path):
+        from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns
+
+        path = write_turns(tmp_path / "podcast_ready_data.jsonl",
+                           turns_from_pairs([("Speaker 1", "Hello"), ("Speaker 2", "Hi there")]))
+        assert load_podcast_data(path) == [("Speaker 1", "Hello"), ("Speaker 2", "Hi there")]
+
     def test_invalid_pickle_content(self, tmp_path):
         import pickle
 
@@ -132,3 +146,323 @@ class TestStep4Validation:
                 input_dir=str(tmp_path),
                 output_dir=str(tmp_path / "out"),
             )
+
+
+def _tts_config(**tts_extra):
+    return {
+        "Text-To-Speech-Model": {"model": "tts-1", "audio_format": "wav", **tts_extra},
+        "Host-Speaker-Voice": "v1",
+        "Co-Host-Speaker-1-Voice": "v2",
+        "Co-Host-Speaker-2-Voice": "v3",
+        "Co-Host-Speaker-3-Voice": "v4",
+        "Co-Host-Speaker-4-Voice": "v5",
+    }
+
+
+def _write_script(step3_dir, turns):
+    from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns
+
+    write_turns(step3_dir / "podcast_ready_data.jsonl", turns_from_pairs(turns))
+
+
+class TestParallelSynthesis:
+    """Segments are synthesized concurrently and assembled in turn order."""
+
+    def _fake_speech(self, active, peak, lock, fail_on=None):
+        import time
+        import numpy as np
+        import soundfile as sf
+
+        def fake(client, text, voice, model_name, response_format, output_path):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            try:
+                if text == fail_on:
+                    raise RuntimeError("tts down")
+                # Later turns finish first
+                time.sleep(0.05 / (int(text.split()[-1]) + 1))
+                value = int(text.split()[-1]) / 100
+                sf.write(f"{output_path}.{response_format}", np.full(10, value), 8000)
+            finally:
+                with lock:
+                    active[0] -= 1
+        return fake
+
+    def test_ordered_assembly_with_bounded_concurrency(self, tmp_path):
+        import threading
+        import soundfile as sf
+        from local_notebooklm.steps.step4 import step4
+
+        turns = [(f"Speaker {i % 2 + 1}", f"turn {i}") for i in range(8)]
+        _write_script(tmp_path, turns)
+        active, peak, lock = [0], [0], threading.Lock()
+        progress = []
+
+        with patch("local_notebooklm.steps.step4.generate_speech",
+                   side_effect=self._fake_speech(active, peak, lock)) as mock_speech:
+            final = step4(client=MagicMock(), config=_tts_config(max_concurrency=3),
+                          input_dir=str(tmp_path), output_dir=str(tmp_path / "out"),
+                          progress_callback=lambda done, total: progress.append((done, total)))
+
+        data, rate = sf.read(final)
+        assert rate == 8000
+        assert [round(v * 100) for v in data[::10]] == list(range(8))
+        assert 1 < peak[0] <= 3
+        assert progress[-1] == (8, 8) and len(progress) == 8
+        voices = {c.kwargs["text"]: c.kwargs["voice"] for c in mock_speech.call_args_list}
+        assert voices["turn 0"] == "v1" and voices["turn 1"] == "v2"
+
+    def test_stale_segments_ignored(self, tmp_path):
+        import threading
+        import numpy as np
+        import soundfile as sf
+        from local_notebooklm.steps.step4 import step4
+
+        _write_script(tmp_path, [("Speaker 1", "turn 1")])
+        segments = tmp_path / "out" / "segments"
+        segments.mkdir(parents=True)
+        sf.write(segments / "podcast_segment_2.wav", np.zeros(50), 8000)  # from a longer earlier run
+
+        active, peak, lock = [0], [0], threading.Lock()
+        with patch("local_notebooklm.steps.step4.generate_speech",
+                   side_effect=self._fake_speech(active, peak, lock)):
+            final = step4(client=MagicMock(), config=_tts_config(),
+                          input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+        assert len(sf.read(final)[0]) == 10
+
+    def test_failed_segment_raises(self, tmp_path):
+        import threading
+        from local_notebooklm.steps.step4 import step4
+
+        _write_script(tmp_path, [(f"Speaker {i % 2 + 1}", f"turn {i}") for i in range(4)])
+        active, peak, lock = [0], [0], threading.Lock()
+        with patch("local_notebooklm.steps.step4.generate_speech",
+                   side_effect=self._fake_speech(active, peak, lock, fail_on="turn 2")):
+            with pytest.raises(AudioGenerationError, match="Segment 3/4"):
+                step4(client=MagicMock(), config=_tts_config(),
+                      input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+
+
+    def test_segments_delivered_while_later_ones_run(self, tmp_path):
+        import threading
+        import numpy as np
+        import soundfile as sf
+        from local_notebooklm.steps.step4 import synthesize_segments
+
+        first_delivered = threading.Event()
+        waited = []
+
+        def fake(client, text, voice, model_name, response_format, output_path):
+            if text == "turn 3":
+                waited.append(first_delivered.wait(timeout=5))
+            sf.write(f"{output_path}.wav", np.zeros(10), 8000)
+
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=fake):
+            synthesize_segments(MagicMock(), _tts_config(max_concurrency=4),
+                                [("Speaker 1", f"turn {i}") for i in range(4)], tmp_path, "wav",
+                                on_segment=lambda path: first_delivered.set())
+        assert waited == [True]
+
+
+class TestTtsConcurrency:
+    def test_provider_defaults_and_override(self):
+        from local_notebooklm.steps.step4 import DEFAULT_TTS_CONCURRENCY, tts_concurrency
+
+        assert tts_concurrency(_tts_config(provider={"name": "openai"})) == 8
+        assert tts_concurrency(_tts_config(provider={"name": "ollama"})) == 1
+        assert tts_concurrency(_tts_config(provider={"name": "unknown"})) == DEFAULT_TTS_CONCURRENCY
+        assert tts_concurrency(_tts_config(provider={"name": "openai"}, max_concurrency=16)) == 16
+
+    def test_shared_slots_follow_limit_changes(self):
+        from local_notebooklm.steps.step4 import _slots_for
+
+        client = MagicMock()
+        slots = _slots_for(client, 2)
+        assert _slots_for(client, 2) is slots
+        wider = _slots_for(client, 3)
+        assert wider is not slots
+        assert [wider.acquire(blocking=False) for _ in range(4)] == [True, True, True, False]
+
+    def test_voice_for_speaker(self):
+        from local_notebooklm.steps.step4 import voice_for_speaker
+
+        config = _tts_config()
+        assert [voice_for_speaker(config, f"Speaker {i}") for i in range(1, 6)] == ["v1", "v2", "v3", "v4", "v5"]
+        assert voice_for_speaker(config, "Speaker 9") == "v2"
+
+
+class TestSegmentCacheInStep4:
+    def _fake_speech(self, client, text, voice, model_name, response_format, output_path):
+        import numpy as np
+        import soundfile as sf
+
+        sf.write(f"{output_path}.{response_format}", np.full(10, len(text) / 100), 8000)
+
+    def test_regeneration_only_synthesizes_changed_turns(self, tmp_path):
+        import soundfile as sf
+        from local_notebooklm.steps.step4 import step4
+
+        turns = [("Speaker 1", "Hello there"), ("Speaker 2", "Hi"), ("Speaker 1", "Bye now")]
+        _write_script(tmp_path, turns)
+        out = tmp_path / "out"
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=self._fake_speech) as tts:
+            step4(client=MagicMock(), config=_tts_config(), input_dir=str(tmp_path), output_dir=str(out))
+            assert tts.call_count == 3
+
+            turns[1] = ("Speaker 2", "Hi, fixed typo")
+            _write_script(tmp_path, turns)
+            final = step4(client=MagicMock(), config=_tts_config(), input_dir=str(tmp_path), output_dir=str(out))
+
+        assert tts.call_count == 4
+        assert tts.call_args.kwargs["text"] == "Hi, fixed typo"
+        data, _ = sf.read(final)
+        assert round(data[10] * 100) == len("Hi, fixed typo")
+        assert (out / "tts_cache").is_dir()
+
+    def test_cache_can_be_disabled(self, tmp_path):
+        from local_notebooklm.steps.step4 import step4
+
+        _write_script(tmp_path, [("Speaker 1", "Hello")])
+        config = _tts_config(cache=False, resume=False)
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=self._fake_speech) as tts:
+            for _ in range(2):
+                step4(client=MagicMock(), config=config, input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+        assert tts.call_count == 2
+        assert not (tmp_path / "out" / "tts_cache").exists()
+
+
+class TestLiveOutput:
+    """Step 4 grows podcast.live.wav in turn order while segments finish."""
+
+    def _fake_speech(self, client, text, voice, model_name, response_format, output_path):
+        import time
+        import numpy as np
+        import soundfile as sf
+
+        index = int(text.split()[-1])
+        time.sleep(0.02 * (3 - index))  # later turns finish first
+        sf.write(f"{output_path}.{response_format.split('_')[0]}", np.full(10, index / 10), 8000)
+
+    def test_live_file_becomes_final_wav(self, tmp_path):
+        import soundfile as sf
+        from local_notebooklm.steps.step4 import synthesize_segments
+
+        _write_script(tmp_path, [(f"Speaker {i % 2 + 1}", f"turn {i}") for i in range(3)])
+        out = tmp_path / "out"
+        delivered = []
+        real = synthesize_segments
+
+        def spy(*args, on_segment=None, **kwargs):
+            def record(path):
+                delivered.append(path.name)
+                on_segment(path)
+                assert sf.info(str(out / "podcast.live.wav")).frames == 10 * len(delivered)
+            return real(*args, on_segment=record, **kwargs)
+
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=self._fake_speech), \
+                patch("local_notebooklm.steps.step4.synthesize_segments", side_effect=spy):
+            final = step4(client=MagicMock(), config=_tts_config(cache=False, progressive=True),
+                          input_dir=str(tmp_path), output_dir=str(out))
+
+        assert delivered == [f"podcast_segment_{i}.wav" for i in range(1, 4)]
+        data, _ = sf.read(final)
+        assert [round(v * 10) for v in data[::10]] == [0, 1, 2]
+        assert not (out / "podcast.live.wav").exists()
+
+    def test_live_file_removed_for_other_formats(self, tmp_path):
+        import soundfile as sf
+
+        _write_script(tmp_path, [(f"Speaker {i % 2 + 1}", f"turn {i}") for i in range(3)])
+        out = tmp_path / "out"
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=self._fake_speech):
+            final = step4(client=MagicMock(), config=_tts_config(cache=False, audio_format="flac",
+                                                                  progressive=True),
+                          input_dir=str(tmp_path), output_dir=str(out))
+        assert sf.info(final).frames == 30
+        assert not (out / "podcast.live.wav").exists()
+
+    def test_progressive_off_by_default(self, tmp_path):
+        from local_notebooklm.steps.audio_assembly import SegmentAssembler
+
+        _write_script(tmp_path, [("Speaker 1", "turn 0")])
+        out = tmp_path / "out"
+        with patch("local_notebooklm.steps.step4.generate_speech", side_effect=self._fake_speech), \
+                patch("local_notebooklm.steps.step4.SegmentAssembler", wraps=SegmentAssembler) as assembler:
+            step4(client=MagicMock(), config=_tts_config(cache=False),
+                  input_dir=str(tmp_path), output_dir=str(out))
+        assert [c.args[0] for c in assembler.call_args_list] == [f"{out}/podcast.wav"]
+        assert not assembler.call_args.kwargs.get("progressive")
+        assert (out / "podcast.wav").exists()
+
+
+class TestInMemorySegments:
+    """in_memory requests raw PCM and feeds the assembler without segment files."""
+
+    def _fake_pcm(self, held, lock):
+        import numpy as np
+
+        def fake(client, text, voice, model_name, response_format):
+            with lock:
+                held[0] += 1
+                held[1] = max(held[1], held[0])
+            return np.full(10, int(text.split()[-1]) * 100, dtype="<i2").tobytes()
+        return fake
+
+    def _run(self, tmp_path, turns=8, **tts_extra):
+        import threading
+
+        _write_script(tmp_path, [(f"Speaker {i % 2 + 1}", f"turn {i}") for i in range(turns)])
+        held, lock = [0, 0], threading.Lock()
+        config = _tts_config(provider={"name": "openai"}, in_memory=True, **tts_extra)
+
+        def delivered(segment):
+            with lock:
+                held[0] -= 1
+
+        with patch("local_notebooklm.steps.step4.speech_bytes", side_effect=self._fake_pcm(held, lock)) as tts, \
+                patch("local_notebooklm.steps.step4.generate_speech") as file_tts:
+            from local_notebooklm.steps import step4 as module
+            real = module.synthesize_segments
+
+            def spy(*args, **kwargs):
+                on_segment = kwargs["on_segment"]
+                kwargs["on_segment"] = lambda seg: (delivered(seg), on_segment(seg))
+                return real(*args, **kwargs)
+
+            with patch("local_notebooklm.steps.step4.synthesize_segments", side_effect=spy):
+                final = step4(client=MagicMock(), config=config,
+                              input_dir=str(tmp_path), output_dir=str(tmp_path / "out"))
+        assert not file_tts.called
+        return final, tts, held[1]
+
+    def test_pcm_segments_never_touch_disk(self, tmp_path):
+        import soundfile as sf
+
+        final, tts, peak = self._run(tmp_path, cache=False, max_buffered_segments=3)
+        assert tts.call_args.kwargs["response_format"] == "pcm"
+        data, rate = sf.read(final, dtype="int16")
+        assert rate == 24000
+        assert list(data[::10]) == [i * 100 for i in range(8)]
+        assert peak <= 3
+        assert not list((tmp_path / "out" / "segments").iterdir())
+
+    def test_cache_stores_raw_responses_and_keep_segments_writes_wavs(self, tmp_path):
+        import soundfile as sf
+
+        self._run(tmp_path, turns=2, keep_segments=True)
+        out = tmp_path / "out"
+        assert len(list((out / "tts_cache").glob("*/*.pcm"))) == 2
+        assert sf.info(str(out / "segments" / "podcast_segment_2.wav")).frames == 10
+        assert (out / "segments" / "manifest.json").exists()
+
+        _, tts, _ = self._run(tmp_path, turns=2, keep_segments=True)
+        assert tts.call_count == 0  # resumed from the kept segments
+
+    def test_in_memory_format(self):
+        from local_notebooklm.steps.step4 import in_memory_format
+
+        assert in_memory_format(_tts_config(provider={"name": "openai"})) == "pcm"
+        assert in_memory_format(_tts_config(provider={"name": "elevenlabs"}), 16000) == "pcm_16000"
+        assert in_memory_format(_tts_config(provider={"name": "elevenlabs"}), 48000) == "pcm_24000"
+        assert in_memory_format(_tts_config(provider={"name": "ollama"}, audio_format="mp3")) == "mp3"
@@ -2,15 +2,21 @@
 
 import json
 import pickle
+import sys
+import threading
 import pytest
 from unittest.mock import MagicMock, patch
 
+from local_notebooklm.steps.helpers import StructuredOutputError, llm_stats
 from local_notebooklm.steps.step5 import (
     InfographicError,
+    chunk_transcript,
     extract_structured_data,
     load_transcript_text,
+    merge_chunk_extractions,
     render_infographic_html,
     render_png,
+    speaker_stats,
     step5,
 )
 from local_notebooklm.steps.step5_pptx import (
@@ -21,7 +27,9 @@ from local_notebooklm.steps.step5_charts import (
     generate_all_charts,
     generate_conversation_flow_chart,
     generate_speaker_distribution_chart,
+    generate_svg_charts,
     generate_topic_importance_chart,
+    svg_speaker_distribution_chart,
 )
 
 
@@ -77,6 +85,16 @@ class TestLoadTranscriptText:
         assert "Speaker 1: Hello" in result
         assert "Speaker 2: Hi" in result
 
+    def test_loads_jsonl_artifact(self, tmp_path):
+        from local_notebooklm.steps.artifacts import turns_from_pairs, write_turns
+
+        write_turns(tmp_path / "podcast_ready_data.jsonl",
+                    turns_from_pairs([("Speaker 1", "Hello"), ("Speaker 2", "Hi")]))
+        with open(tmp_path / "podcast_ready_data.pkl", "wb") as f:
+            pickle.dump("from pkl", f)
+        result = load_transcript_text(str(tmp_path))
+        assert result == "Speaker 1: Hello\nSpeaker 2: Hi"
+
     def test_txt_takes_priority_over_pkl(self, tmp_path):
         (tmp_path / "podcast_ready_data.txt").write_text("from txt", encoding="utf-8")
         with open(tmp_path / "podcast_ready_data.pkl", "wb") as f:
@@ -131,6 +149,192 @@ class TestExtractStructuredData:
         with pytest.raises(InfographicError, match="missing keys"):
             extract_structured_data(MagicMock(), self._make_config(), "transcript")
 
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.generate_structured", return_value=SAMPLE_DATA)
+    def test_structured_output_used_when_supported(self, mock_struct, mock_gen):
+        result = extract_structured_data(MagicMock(), self._make_config(), "transcript")
+        assert result == SAMPLE_DATA
+        mock_gen.assert_not_called()
+        schema = mock_struct.call_args.kwargs["schema"]
+        assert set(schema["required"]) == {
+            "title", "summary", "topics", "key_takeaways",
+            "notable_quotes", "speakers", "conversation_flow",
+        }
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.generate_structured",
+           return_value={"infographic": {"title": "partial", "summary": "s",
+                                         "topics": SAMPLE_DATA["topics"]}})
+    def test_incomplete_structured_output_repaired_locally(self, mock_struct, mock_gen):
+        fixups = llm_stats.get("step5", "structured_fixup")
+        result = extract_structured_data(MagicMock(), self._make_config(), "transcript")
+        assert result["title"] == "partial"
+        assert result["key_takeaways"] == [] and result["notable_quotes"] == []
+        mock_gen.assert_not_called()
+        assert llm_stats.get("step5", "structured_fixup") == fixups + 1
+
+    @pytest.mark.parametrize("reply", [
+        {"title": "partial", "summary": "s"},
+        {"title": " ", "summary": "s", "topics": SAMPLE_DATA["topics"]},
+        {},
+    ])
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.generate_structured")
+    def test_structured_output_without_core_keys_raises(self, mock_struct, mock_gen, reply):
+        mock_struct.return_value = reply
+        with pytest.raises(InfographicError, match="missing"):
+            extract_structured_data(MagicMock(), self._make_config(), "transcript")
+        mock_gen.assert_not_called()
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.generate_structured")
+    def test_malformed_structured_output_repaired_locally(self, mock_struct, mock_gen):
+        raw = "Here you go:\n```json\n" + json.dumps(SAMPLE_DATA) + "\n```"
+        mock_struct.side_effect = StructuredOutputError("not JSON", raw=raw)
+        result = extract_structured_data(MagicMock(), self._make_config(), "transcript")
+        assert result["title"] == "AI Revolution"
+        mock_gen.assert_not_called()
+
+
+def _part(i, **extra):
+    part = {
+        "summary": f"Part {i} summary.",
+        "topics": [{"name": "Shared Topic", "description": f"d{i}", "importance": 3},
+                   {"name": f"Topic {i}", "description": "only here", "importance": 2}],
+        "key_takeaways": [f"Takeaway {i}", "Common takeaway"],
+        "notable_quotes": [{"speaker": "Speaker 1", "quote": f"line {i} said"}],
+        "speakers": [{"label": "Speaker 1", "role": "Host", "line_count": 99}],
+        "conversation_flow": [{"speaker": "Speaker 1", "topic": f"Beat {i}"}],
+    }
+    part.update(extra)
+    return part
+
+
+class TestChunkedExtraction:
+    TRANSCRIPT = "\n".join(f"Speaker {i % 2 + 1}: line {i} said" for i in range(40))
+
+    def _config(self, **step5):
+        return {"Big-Text-Model": {"model": "m", "structured_output": "off"},
+                "Step5": {"chunk_chars": 200, **step5}}
+
+    def test_chunk_transcript_keeps_turns_whole(self):
+        chunks = chunk_transcript(self.TRANSCRIPT, 200)
+        assert len(chunks) > 1
+        assert all(len(c) <= 200 for c in chunks)
+        assert "\n".join(chunks) == self.TRANSCRIPT
+        long_line = chunk_transcript("word " * 100, 50)  # no line breaks: split on words
+        assert len(long_line) == 10 and all(len(c) < 50 for c in long_line)
+
+    def test_speaker_stats_counted_locally(self):
+        assert speaker_stats(self.TRANSCRIPT) == {"Speaker 1": 20, "Speaker 2": 20}
+        assert speaker_stats("Plain extracted text.\nNo speakers here.") == {}
+
+    def test_merge_ranks_and_dedupes(self):
+        parts = [_part(i) for i in range(3)]
+        parts[2]["notable_quotes"].insert(0, {"speaker": "Speaker 2", "quote": "Never said this"})
+        merged = merge_chunk_extractions(parts, self.TRANSCRIPT)
+
+        assert merged["topics"][0] == {"name": "Shared Topic", "description": "d0", "importance": 3}
+        assert [t["name"] for t in merged["topics"][1:]] == ["Topic 0", "Topic 1", "Topic 2"]
+        assert merged["key_takeaways"] == ["Takeaway 0", "Takeaway 1", "Takeaway 2", "Common takeaway"]
+        assert [q["quote"] for q in merged["notable_quotes"]][-1] == "Never said this"
+        assert [f["topic"] for f in merged["conversation_flow"]] == ["Beat 0", "Beat 1", "Beat 2"]
+
+    def test_fallback_summary_covers_whole_transcript(self):
+        merged = merge_chunk_extractions([_part(i) for i in range(6)], "")
+        assert merged["summary"] == "Part 0 summary. Part 2 summary. Part 5 summary."
+
+    def test_flow_thinned_evenly(self):
+        parts = [_part(i, conversation_flow=[{"speaker": "Speaker 1", "topic": f"Beat {i}.{j}"}
+                                             for j in range(4)]) for i in range(5)]
+        flow = merge_chunk_extractions(parts, "")["conversation_flow"]
+        assert len(flow) == 10
+        assert flow[0]["topic"] == "Beat 0.0" and flow[-1]["topic"] == "Beat 4.3"
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    def test_long_transcript_extracted_per_chunk(self, mock_gen):
+        def reply(client, messages, **kwargs):
+            if "ONE PART" in messages[0]["content"]:
+                return json.dumps(_part(0, speakers=[{"label": "Speaker 2", "role": "Guest",
+                                                      "line_count": 1}]))
+            return json.dumps({"title": "Merged", "summary": "Whole episode."})
+
+        mock_gen.side_effect = reply
+        data = extract_structured_data(MagicMock(), self._config(), self.TRANSCRIPT)
+
+        chunks = len(chunk_transcript(self.TRANSCRIPT, 200))
+        assert mock_gen.call_count == chunks + 1
+        assert all(c.kwargs["max_tokens"] == 2048 for c in mock_gen.call_args_list[:-1])
+        assert data["title"] == "Merged" and data["summary"] == "Whole episode."
+        # Counted from the transcript, not the LLM's estimates; roles kept
+        assert data["speakers"] == [{"label": "Speaker 1", "role": "Host", "line_count": 20},
+                                    {"label": "Speaker 2", "role": "Guest", "line_count": 20}]
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    def test_failed_chunk_is_skipped(self, mock_gen):
+        calls = []
+
+        def reply(client, messages, **kwargs):
+            calls.append(messages[1]["content"])
+            if len(calls) == 1:
+                return "not json"
+            if "ONE PART" in messages[0]["content"]:
+                return json.dumps(_part(len(calls)))
+            raise RuntimeError("headline call down")
+
+        mock_gen.side_effect = reply
+        data = extract_structured_data(MagicMock(), self._config(max_concurrency=1), self.TRANSCRIPT)
+        assert data["title"] == "Shared Topic"  # headline fallback
+        assert data["summary"].startswith("Part ")
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    def test_chunk_with_exhausted_retries_is_skipped(self, mock_gen):
+        calls = []
+
+        def reply(client, messages, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("generate_text failed after 3 attempts: timeout")
+            if "ONE PART" in messages[0]["content"]:
+                return json.dumps(_part(len(calls)))
+            return json.dumps({"title": "Merged", "summary": "Whole episode."})
+
+        mock_gen.side_effect = reply
+        data = extract_structured_data(MagicMock(), self._config(max_concurrency=1), self.TRANSCRIPT)
+        assert data["title"] == "Merged"
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.generate_structured")
+    def test_empty_headline_falls_back_to_top_topic(self, mock_struct, mock_gen):
+        def reply(client, messages, **kwargs):
+            if "ONE PART" in messages[0]["content"]:
+                return _part(0)
+            return {"title": "", "summary": ""}
+
+        mock_struct.side_effect = reply
+        config = self._config()
+        config["Big-Text-Model"]["structured_output"] = "auto"
+        data = extract_structured_data(MagicMock(), config, self.TRANSCRIPT)
+        assert data["title"] == "Shared Topic"
+        assert data["summary"].startswith("Part 0 summary.")
+        mock_gen.assert_not_called()
+
+    @patch("local_notebooklm.steps.step5.generate_text", side_effect=RuntimeError("provider down"))
+    def test_all_chunks_failing_raises(self, mock_gen):
+        with pytest.raises(InfographicError, match="all .* transcript chunks"):
+            extract_structured_data(MagicMock(), self._config(), self.TRANSCRIPT)
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    def test_short_transcript_single_call(self, mock_gen):
+        mock_gen.return_value = json.dumps(SAMPLE_DATA)
+        data = extract_structured_data(MagicMock(), self._config(chunk_chars=10000), self.TRANSCRIPT)
+        assert mock_gen.call_count == 1
+        assert data["speakers"][0] == {"label": "Speaker 1", "role": "Host", "line_count": 20}
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError, match="extraction"):
+            extract_structured_data(MagicMock(), self._config(extraction="fast"), "x")
+
 
 # ---------------------------------------------------------------------------
 # TestRenderInfographicHtml
@@ -218,6 +422,26 @@ class TestStep5Integration:
             saved = json.load(f)
         assert saved["title"] == "AI Revolution"
 
+    @patch("local_notebooklm.steps.step5.generate_text")
+    def test_outputs_render_concurrently(self, mock_gen, tmp_path):
+        input_dir = tmp_path / "step3"
+        input_dir.mkdir()
+        (input_dir / "podcast_ready_data.txt").write_text("Speaker 1: Hello\nSpeaker 2: Hi there")
+        mock_gen.return_value = json.dumps(SAMPLE_DATA)
+        barrier = threading.Barrier(2, timeout=5)  # deadlocks unless PNG and PPTX overlap
+        progress = []
+
+        with patch("local_notebooklm.steps.step5.render_png", side_effect=lambda *a, **kw: barrier.wait()), \
+                patch("local_notebooklm.steps.step5._render_pptx_and_video",
+                      side_effect=lambda *a: barrier.wait()):
+            step5(MagicMock(), {"Big-Text-Model": {"model": "m"}, "Step5": {"chart_workers": 0}},
+                  str(input_dir), str(tmp_path / "step5"),
+                  progress_callback=lambda done, total: progress.append((done, total)))
+
+        assert (tmp_path / "step5" / "infographic.html").exists()
+        assert progress[0] == (1, 4) and progress[-1] == (4, 4)
+        assert sorted(progress) == progress
+
     def test_missing_transcript_raises(self, tmp_path):
         with pytest.raises(InfographicError, match="No transcript found"):
             step5(MagicMock(), {"Big-Text-Model": {"model": "m"}}, str(tmp_path), str(tmp_path / "out"))
@@ -298,6 +522,78 @@ class TestPptxGeneration:
         assert (output_dir / "infographic.pptx").exists()
 
 
+class _FakeClip:
+    def __init__(self, img, duration=None):
+        self.img, self.duration = img, duration
+
+
+def _fake_moviepy(monkeypatch):
+    """Install stand-in moviepy modules that record the clips they are given."""
+    written = []
+    video = MagicMock()
+    video.write_videofile.side_effect = lambda path, **kw: written.append((path, kw))
+    concat = MagicMock(return_value=video)
+    clip_module = MagicMock(ImageClip=_FakeClip)
+    modules = {"moviepy": MagicMock(concatenate_videoclips=concat), "moviepy.video": MagicMock(),
+               "moviepy.video.VideoClip": clip_module}
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return concat, written
+
+
+class TestRenderVideo:
+    def _pptx(self, tmp_path):
+        out = tmp_path / "infographic.pptx"
+        render_infographic_pptx(SAMPLE_DATA, str(out))
+        return out
+
+    def test_font_loaded_once(self):
+        from local_notebooklm.steps.step5_pptx import _font
+        assert _font(28) is _font(28)
+
+    def test_rasterize_slide(self):
+        from local_notebooklm.steps.step5_pptx import _rasterize_slide
+        img = _rasterize_slide(["Title", "A body line " * 20], (640, 360))
+        assert img.size == (640, 360)
+        assert len(img.getcolors(640 * 360)) > 1  # text was drawn
+
+    def test_ffmpeg_concat_one_frame_per_slide(self, tmp_path, monkeypatch):
+        pptx = self._pptx(tmp_path)
+        concat, _ = _fake_moviepy(monkeypatch)
+        seen = {}
+
+        def fake_run(cmd, **kwargs):
+            listing = cmd[cmd.index("-i") + 1]
+            seen["listing"] = open(listing).read()
+            seen["cmd"] = cmd
+            open(cmd[-1], "wb").write(b"mp4")
+
+        with patch("local_notebooklm.steps.step5_pptx._ffmpeg_exe", return_value="ffmpeg"), \
+                patch("local_notebooklm.steps.step5_pptx.subprocess.run", side_effect=fake_run):
+            result = render_video(str(pptx), str(tmp_path / "out.mp4"), seconds_per_slide=2)
+
+        assert result == str(tmp_path / "out.mp4")
+        from pptx import Presentation
+        slides = len(Presentation(str(pptx)).slides)
+        assert seen["listing"].count("duration 2") == slides
+        assert seen["listing"].count("file ") == slides + 1
+        assert "vfr" in seen["cmd"]
+        concat.assert_not_called()
+
+    def test_moviepy_fallback_uses_still_clips(self, tmp_path, monkeypatch):
+        pptx = self._pptx(tmp_path)
+        concat, written = _fake_moviepy(monkeypatch)
+        with patch("local_notebooklm.steps.step5_pptx._ffmpeg_exe", return_value=None):
+            result = render_video(str(pptx), str(tmp_path / "out.mp4"), resolution=(320, 180))
+
+        assert result == str(tmp_path / "out.mp4")
+        clips = concat.call_args[0][0]
+        assert len(clips) == 6
+        assert all(c.duration == 3 and c.img.shape == (180, 320, 3) for c in clips)
+        assert written == [(str(tmp_path / "out.mp4"),
+                            {"fps": 24, "codec": "libx264", "audio": False, "logger": None})]
+
+
 # ---------------------------------------------------------------------------
 # TestChartGeneration
 # ---------------------------------------------------------------------------
@@ -377,6 +673,95 @@ class TestChartGeneration:
         assert (tmp_path / "chart_flow.png").exists()
 
 
+    def test_png_encoded_once_for_uri_and_file(self, tmp_path):
+        import base64
+
+        results = generate_all_charts(SAMPLE_DATA, str(tmp_path))
+        uri, png = results["topics"]
+        assert base64.b64decode(uri.split(",", 1)[1]) == (tmp_path / "chart_topics.png").read_bytes()
+
+    def test_cached_by_data_hash(self, tmp_path):
+        first = generate_all_charts(SAMPLE_DATA, str(tmp_path))
+        with patch("local_notebooklm.steps.step5_charts._render_chart") as render:
+            assert generate_all_charts(SAMPLE_DATA, str(tmp_path)) == first
+            assert not render.called
+            changed = dict(SAMPLE_DATA, topics=SAMPLE_DATA["topics"][:1])
+            generate_all_charts(changed, str(tmp_path))
+            assert render.call_count == 3
+
+    def test_worker_processes(self, tmp_path):
+        results = generate_all_charts(SAMPLE_DATA, str(tmp_path), workers=2)
+        assert all(v and v[0].startswith("data:image/png;base64,") for v in results.values())
+        assert (tmp_path / "chart_flow.png").exists()
+
+
+# ---------------------------------------------------------------------------
+# TestSvgCharts
+# ---------------------------------------------------------------------------
+
+class TestSvgCharts:
+    SVG = "{http://www.w3.org/2000/svg}"
+
+    def test_charts_are_valid_svg(self, tmp_path):
+        import xml.etree.ElementTree as ET
+
+        results = generate_all_charts(SAMPLE_DATA, str(tmp_path), backend="svg")
+        trees = {name: ET.fromstring(markup) for name, (markup, _) in results.items()}
+        assert len(trees["topics"].findall(f"{self.SVG}rect")) == 2 + 2  # background, plot area, bars
+        assert len(trees["speakers"].findall(f"{self.SVG}path")) == 2
+        assert len(trees["flow"].findall(f"{self.SVG}circle")) == 5
+        assert (tmp_path / "chart_flow.svg").read_text(encoding="utf-8") == results["flow"][0]
+        assert not (tmp_path / "chart_flow.png").exists()
+
+    def test_escapes_text_and_handles_edge_cases(self):
+        import xml.etree.ElementTree as ET
+
+        data = {"topics": [{"name": "<R&D> \"quotes\"", "importance": 4}],
+                "speakers": [{"label": "Solo", "line_count": 3}, {"label": "Quiet", "line_count": 0}],
+                "conversation_flow": [{"speaker": "A & B", "topic": "x<y"}]}
+        results = generate_svg_charts(data)
+        for markup, _ in results.values():
+            ET.fromstring(markup)
+        assert "&lt;R&amp;D&gt;" in results["topics"][0]
+        assert "<circle" in results["speakers"][0]  # one speaker with all lines: a full ring
+        assert svg_speaker_distribution_chart({"speakers": [{"label": "A", "line_count": 0}]}) is None
+        assert generate_svg_charts({}) == {"topics": None, "speakers": None, "flow": None}
+
+    def test_html_inlines_svg(self):
+        charts = generate_svg_charts(SAMPLE_DATA)
+        html = render_infographic_html(SAMPLE_DATA, charts=charts)
+        assert html.count("<svg ") == 3
+        assert "data:image/png" not in html
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.render_png", return_value=None)
+    def test_step5_svg_backend(self, mock_png, mock_gen, tmp_path):
+        (tmp_path / "podcast_ready_data.txt").write_text("Speaker 1: Hi")
+        mock_gen.return_value = json.dumps(SAMPLE_DATA)
+        config = {"Big-Text-Model": {"model": "m"}, "Step5": {"chart_backend": "svg"}}
+        out = tmp_path / "out"
+        with patch("local_notebooklm.steps.step5.warm_chart_workers") as warm:
+            step5(MagicMock(), config, str(tmp_path), str(out), generate_pptx=False)
+        assert not warm.called  # matplotlib is never needed
+        assert (out / "infographic.html").read_text(encoding="utf-8").count("<svg ") == 3
+        assert not (out / "chart_topics.png").exists()
+
+    @patch("local_notebooklm.steps.step5.generate_text")
+    @patch("local_notebooklm.steps.step5.render_png", return_value=None)
+    def test_no_worker_processes_by_default(self, mock_png, mock_gen, tmp_path):
+        (tmp_path / "podcast_ready_data.txt").write_text("Speaker 1: Hi")
+        mock_gen.return_value = json.dumps(SAMPLE_DATA)
+        config = {"Big-Text-Model": {"model": "m"}}
+        with patch("local_notebooklm.steps.step5_charts._chart_pool") as pool:
+            step5(MagicMock(), config, str(tmp_path), str(tmp_path / "out"), generate_pptx=False)
+        # Spawned workers would re-import an unguarded caller's __main__
+        assert not pool.called
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown chart backend"):
+            generate_all_charts(SAMPLE_DATA, backend="ascii")
+
+
 # ---------------------------------------------------------------------------
 # TestChartGracefulDegradation
 # ---------------------------------------------------------------------------
@@ -0,0 +1,121 @@
+"""Tests for transcript_parser — single-pass parsing of LLM transcript output."""
+
+import re
+
+import pytest
+
+from local_notebooklm.steps import transcript_parser
+from local_notebooklm.steps.transcript_parser import (
+    SHAPE_DIALOGUE,
+    SHAPE_JSON,
+    SHAPE_LIST,
+    SHAPE_MONOLOGUE,
+    SHAPE_TUPLES,
+    normalize_speaker,
+    parse_transcript_flexible,
+    parse_transcript_with_shape,
+)
+
+
+class TestShapes:
+    def test_strict_list_keeps_speaker_names(self):
+        turns, shape = parse_transcript_with_shape("[('Host', 'Hello'), ('Guest', \"Hi\")]")
+        assert shape == SHAPE_LIST
+        assert turns == [("Host", "Hello"), ("Guest", "Hi")]
+
+    def test_empty_list(self):
+        assert parse_transcript_with_shape("[]") == ([], SHAPE_LIST)
+
+    def test_escapes_decoded(self):
+        turns, _ = parse_transcript_with_shape(r"[('Speaker 1', 'It\'s a \"test\"\n'), ('Speaker 2', 'café')]")
+        assert turns == [("Speaker 1", 'It\'s a "test"\n'), ("Speaker 2", "café")]
+
+    def test_code_fence_and_smart_quotes(self):
+        raw = "```python\n[(‘Speaker 1’, “Hello”), ('Speaker 2', 'Hi')]\n```"
+        assert parse_transcript_with_shape(raw) == ([("Speaker 1", "Hello"), ("Speaker 2", "Hi")], SHAPE_LIST)
+
+    def test_tuples_recovered_from_prose(self):
+        raw = "Sure! Here it is:\n[('speaker1', 'First'), ('SPEAKER 2', 'Second')\nHope this helps"
+        turns, shape = parse_transcript_with_shape(raw)
+        assert shape == SHAPE_TUPLES
+        assert turns == [("Speaker 1", "First"), ("Speaker 2", "Second")]
+
+    def test_unescaped_apostrophes_recovered(self):
+        raw = "[('Speaker 1', 'It's great, isn't it'), ('Speaker 2', 'Yes it's')]"
+        turns, _ = parse_transcript_with_shape(raw)
+        assert turns == [("Speaker 1", "It's great, isn't it"), ("Speaker 2", "Yes it's")]
+
+    def test_dialogue(self):
+        raw = "Intro text\n**Speaker 1**: Hello there\n  continued line\nSpeaker_2 — Hi!"
+        turns, shape = parse_transcript_with_shape(raw)
+        assert shape == SHAPE_DIALOGUE
+        assert turns == [("Speaker 1", "Hello there continued line"), ("Speaker 2", "Hi!")]
+
+    def test_json_objects(self):
+        raw = 'Output: [{"speaker": "Speaker 1", "text": "A"}, {"Speaker": "2", "dialogue": "B"}]'
+        turns, shape = parse_transcript_with_shape(raw)
+        assert shape == SHAPE_JSON
+        assert turns == [("Speaker 1", "A"), ("Speaker 2", "B")]
+
+    def test_json_arrays_with_other_names(self):
+        raw = 'Result: [["Host", "Hello"], ["Guest 2", "Hi"]] done'
+        assert parse_transcript_with_shape(raw) == ([("Speaker 1", "Hello"), ("Speaker 2", "Hi")], SHAPE_JSON)
+
+    def test_monologue(self):
+        raw = "This is just a long paragraph of prose without any structure at all."
+        turns, shape = parse_transcript_with_shape(raw)
+        assert shape == SHAPE_MONOLOGUE
+        assert turns == [("Speaker 1", raw)]
+
+    @pytest.mark.parametrize("raw", ["", "   ", "nope", "{'key': 'value'}", "[('Speaker 1',)]"])
+    def test_nothing_usable(self, raw):
+        assert parse_transcript_with_shape(raw) == ([], None)
+
+    def test_non_string_items_not_strict(self):
+        assert parse_transcript_with_shape("[(1, 'text')]").shape is None
+
+    def test_flexible_returns_turns_only(self):
+        assert parse_transcript_flexible("Speaker 1: Hi") == [("Speaker 1", "Hi")]
+
+
+class TestRobustness:
+    def test_normalize_speaker(self):
+        assert normalize_speaker("speaker_3") == "Speaker 3"
+        assert normalize_speaker("Host") == "Speaker 1"
+
+    @pytest.mark.parametrize("unit", ["'", "(", "[('Speaker 1', '", "\\", "{\"a\": ", "Speaker 1:"])
+    def test_pathological_input_is_linear(self, unit, monkeypatch):
+        # Count regex calls rather than time them, so a busy box can't fail it
+        calls = [0]
+
+        class Counting:
+            def __init__(self, pattern):
+                self._pattern = pattern
+
+            def __getattr__(self, name):
+                attr = getattr(self._pattern, name)
+
+                def counted(*args, **kwargs):
+                    calls[0] += 1
+                    return attr(*args, **kwargs)
+
+                return counted if callable(attr) else attr
+
+        for name, value in vars(transcript_parser).items():
+            if isinstance(value, re.Pattern):
+                monkeypatch.setattr(transcript_parser, name, Counting(value))
+
+        def regex_calls(raw):
+            calls[0] = 0
+            parse_transcript_with_shape(raw)
+            return calls[0]
+
+        small, large = regex_calls(unit * 2000), regex_calls(unit * 20000)
+        # 10x input must cost about 10x the scanning steps, not 100x
+        assert large <= small * 12 + 10
+
+    def test_unclosed_brackets_recover_inner_tuples(self):
+        raw = "[[('Speaker 1', 'One'), ('Speaker 2', 'Two'), ('Speaker 1', 'Thr"
+        turns, shape = parse_transcript_with_shape(raw)
+        assert shape == SHAPE_TUPLES
+        assert turns == [("Speaker 1", "One"), ("Speaker 2", "Two")]
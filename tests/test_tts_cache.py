@@ -0,0 +1,65 @@
+"""Tests for tts_cache — content-addressed TTS segment cache."""
+
+import os
+
+from local_notebooklm.steps.tts_cache import SegmentCache, normalize_text, segment_key
+
+
+def _key(text="Hello world", voice="alloy"):
+    return segment_key("openai", "", "tts-1", voice, "wav", text)
+
+
+class TestSegmentKey:
+    def test_cosmetic_whitespace_ignored(self):
+        assert _key("Hello   world\n") == _key("Hello world")
+        assert normalize_text("Café") == "Café"
+
+    def test_every_field_matters(self):
+        base = _key()
+        assert _key("Hello world!") != base
+        assert _key(voice="nova") != base
+        assert segment_key("openai", "", "tts-1", "alloy", "mp3", "Hello world") != base
+        assert segment_key("custom", "http://kokoro", "tts-1", "alloy", "wav", "Hello world") != base
+
+
+class TestSegmentCache:
+    def test_store_and_fetch(self, tmp_path):
+        cache = SegmentCache(tmp_path / "cache")
+        src = tmp_path / "seg.wav"
+        src.write_bytes(b"RIFFdata")
+
+        assert not cache.fetch(_key(), "wav", tmp_path / "out.wav")
+        cache.store(_key(), "wav", src)
+        assert cache.fetch(_key(), "wav", tmp_path / "out.wav")
+        assert (tmp_path / "out.wav").read_bytes() == b"RIFFdata"
+
+    def test_store_and_read_bytes(self, tmp_path):
+        cache = SegmentCache(tmp_path / "cache")
+        assert cache.read(_key(), "pcm") is None
+        cache.store_bytes(_key(), "pcm", b"\x00\x01")
+        assert cache.read(_key(), "pcm") == b"\x00\x01"
+        assert not list((tmp_path / "cache").glob("*/.*.tmp"))
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = SegmentCache(tmp_path / "cache", max_bytes=250)
+        src = tmp_path / "seg.wav"
+        src.write_bytes(b"x" * 100)
+        keys = [_key(f"turn {i}") for i in range(3)]
+        for age, key in enumerate(keys):
+            path = cache.store(key, "wav", src)
+            os.utime(path, (1000 + age, 1000 + age))
+        # Touch the oldest so the middle one becomes least recently used
+        assert cache.fetch(keys[0], "wav", tmp_path / "out.wav")
+
+        assert cache.evict() == 100
+        assert cache.size() == 200
+        assert not cache.fetch(keys[1], "wav", tmp_path / "out.wav")
+        assert cache.fetch(keys[0], "wav", tmp_path / "out.wav")
+        assert cache.fetch(keys[2], "wav", tmp_path / "out.wav")
+
+    def test_temp_files_not_counted(self, tmp_path):
+        cache = SegmentCache(tmp_path / "cache", max_bytes=0)
+        (tmp_path / "cache" / "ab").mkdir()
+        (tmp_path / "cache" / "ab" / ".abc.wav.123.tmp").write_bytes(b"x" * 10)
+        assert cache.size() == 0
+        assert cache.evict() == 0